@@ -3,13 +3,47 @@ Algoritmos de grafos para cálculo de rotas
 """
 
 from .grafo import Grafo, Aresta
-from .dijkstra import Dijkstra
+from .dijkstra import Dijkstra, ResultadoDijkstra
+from .filas import FilaBinaria, FilaDaria, FilaDial, FilaRadix, criar_fila
 from .bfs import BuscaLargura, BuscaProfundidade
+from .sssp_dinamico import CaminhosDinamicos
+from .csa import Conexao, TabelaConexoes, ConnectionScan
+from .alcance import Alcance, BuscaLimitada
+from .geometria import fecho_convexo
+from .grafo_compacto import GrafoCompacto
+from .alt import Landmarks, BuscaALT, ResultadoALT
+from .restricoes import Restricoes, Mascara, MascarasRestricao
+from .itinerario import OrdemVisitas, ResultadoOrdem
+from .criticos import Tarjan, AnaliseCriticos
 
 __all__ = [
     "Grafo",
     "Aresta",
     "Dijkstra",
+    "ResultadoDijkstra",
+    "FilaBinaria",
+    "FilaDaria",
+    "FilaDial",
+    "FilaRadix",
+    "criar_fila",
     "BuscaLargura",
-    "BuscaProfundidade"
+    "BuscaProfundidade",
+    "CaminhosDinamicos",
+    "Conexao",
+    "TabelaConexoes",
+    "ConnectionScan",
+    "Alcance",
+    "BuscaLimitada",
+    "fecho_convexo",
+    "GrafoCompacto",
+    "Landmarks",
+    "BuscaALT",
+    "ResultadoALT",
+    "Restricoes",
+    "Mascara",
+    "MascarasRestricao",
+    "OrdemVisitas",
+    "ResultadoOrdem",
+    "Tarjan",
+    "AnaliseCriticos"
 ]
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Busca limitada por orçamento (distância, tempo, combustível e número de
+trechos) para encontrar os aeroportos alcançáveis a partir de uma origem.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from .grafo import Grafo
+
+
+@dataclass
+class Alcance:
+    """Aeroporto alcançado e o custo do melhor caminho encontrado"""
+    codigo: str
+    distancia_km: int
+    tempo_min: int
+    paradas: int
+    anterior: Optional[str]
+    combustivel_litros: float = 0.0
+
+
+class BuscaLimitada:
+    """
+    Variante de Dijkstra/BFS que não expande caminhos acima do orçamento.
+    
+    A busca é ordenada pela métrica de peso escolhida ou, sem ela, pelo
+    primeiro critério limitado (km, minutos, litros, depois trechos). Com
+    mais de um limite, cada aeroporto guarda os rótulos não dominados, de
+    modo que um caminho mais longo porém com menos trechos ainda é
+    considerado. O custo é proporcional à região alcançada, não ao
+    grafo inteiro.
+    """
+    
+    @staticmethod
+    def explorar(
+        grafo: Grafo,
+        origem: str,
+        max_km: Optional[int] = None,
+        max_min: Optional[int] = None,
+        max_paradas: Optional[int] = None,
+        max_litros: Optional[float] = None,
+        peso: Optional[str] = None
+    ) -> Iterator[Alcance]:
+        """
+        Gera os aeroportos alcançáveis dentro do orçamento, em ordem crescente
+        do critério principal.
+        
+        Args:
+            grafo: Grafo contendo as rotas
+            origem: Código IATA do aeroporto de origem
+            max_km: Distância máxima acumulada
+            max_min: Tempo máximo acumulado
+            max_paradas: Número máximo de trechos
+            max_litros: Combustível máximo acumulado
+            peso: Critério principal da ordem: 'distancia', 'tempo' ou
+                'combustivel' (None = primeiro limite informado)
+            
+        Yields:
+            Alcance de cada aeroporto (a origem não é incluída)
+        """
+        if not grafo.tem_vertice(origem):
+            return
+        
+        # Custos: (km, minutos, litros, trechos)
+        limites = (max_km, max_min, max_litros, max_paradas)
+        if peso is not None:
+            principal = ("distancia", "tempo", "combustivel").index(peso)
+        else:
+            principal = next(i for i in range(4) if limites[i] is not None or i == 3)
+        ordem = (principal,) + tuple(i for i in range(4) if i != principal)
+        criterios = [i for i in range(4) if limites[i] is not None or i == principal]
+        
+        contador = itertools.count()
+        inicial = (0, 0, 0.0, 0)
+        fila: List[Tuple[tuple, int, tuple, str, Optional[str]]] = [((0, 0, 0, 0), next(contador), inicial, origem, None)]
+        rotulos: Dict[str, List[tuple]] = {origem: [tuple(0 for _ in criterios)]}
+        alcancados = {origem}
+        
+        while fila:
+            _, _, custos, u, anterior = heapq.heappop(fila)
+            
+            if u not in alcancados:
+                alcancados.add(u)
+                yield Alcance(u, custos[0], custos[1], custos[3], anterior, custos[2])
+            
+            for aresta in grafo.vizinhos(u):
+                novo = (
+                    custos[0] + aresta.peso, custos[1] + aresta.tempo,
+                    custos[2] + aresta.combustivel, custos[3] + 1
+                )
+                
+                # Fora do orçamento: não expande
+                if any(limites[i] is not None and novo[i] > limites[i] for i in range(4)):
+                    continue
+                
+                projecao = tuple(novo[i] for i in criterios)
+                existentes = rotulos.setdefault(aresta.destino, [])
+                if any(all(a <= b for a, b in zip(rotulo, projecao)) for rotulo in existentes):
+                    continue
+                existentes[:] = [r for r in existentes if not all(b <= a for a, b in zip(r, projecao))]
+                existentes.append(projecao)
+                
+                chave = tuple(novo[i] for i in ordem)
+                heapq.heappush(fila, (chave, next(contador), novo, aresta.destino, u))
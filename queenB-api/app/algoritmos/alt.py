@@ -0,0 +1,351 @@
+"""
+ALT: busca A* orientada ao destino com limites inferiores obtidos de
+landmarks (vértices de referência) pela desigualdade triangular.
+"""
+
+import heapq
+import random
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from .grafo_compacto import GrafoCompacto
+
+# Distância de/para um landmark quando não há caminho
+SEM_DISTANCIA = -1
+# Landmarks usados por consulta: os que dão o maior limite na origem
+ATIVOS_PADRAO = 4
+
+
+@dataclass
+class ResultadoALT:
+    """Caminho ponto a ponto e o tamanho do espaço de busca explorado"""
+    caminho: Optional[List[int]]  # índices dos vértices; None sem caminho
+    distancia: int
+    tempo: int
+    visitados: int  # vértices definidos (retirados da fila)
+    relaxados: int  # arcos examinados
+
+
+class Landmarks:
+    """
+    Distâncias pré-calculadas de e para k landmarks.
+    
+    Para um landmark L, a desigualdade triangular dá dois limites
+    inferiores para d(v, t):
+        
+        d(L, t) - d(L, v)    e    d(v, L) - d(t, L)
+    
+    O maior deles entre os landmarks é uma heurística admissível e
+    consistente para A*. Os vetores são int64 organizados por vértice
+    (posição v * k + i): os k valores de um vértice ficam contíguos.
+    """
+    
+    def __init__(self, escolhidos: List[int], de_landmark: array, ate_landmark: array, selecao: str = ""):
+        self.escolhidos = escolhidos
+        self.de_landmark = de_landmark
+        self.ate_landmark = ate_landmark
+        self.selecao = selecao
+    
+    @property
+    def quantidade(self) -> int:
+        return len(self.escolhidos)
+    
+    @property
+    def tamanho_bytes(self) -> int:
+        return self.de_landmark.itemsize * (len(self.de_landmark) + len(self.ate_landmark))
+    
+    @staticmethod
+    def preprocessar(
+        compacto: GrafoCompacto,
+        quantidade: int,
+        selecao: str = "distante",
+        semente: int = 0,
+        fila: str = "binaria"
+    ) -> "Landmarks":
+        """
+        Escolhe os landmarks e calcula as distâncias de e para cada um.
+        
+        Args:
+            compacto: Grafo compilado
+            quantidade: Número de landmarks (k)
+            selecao: 'distante' (maximiza a distância aos já escolhidos) ou
+                'evitar' (heurística avoid: cobre regiões da árvore de caminhos
+                mínimos onde os limites atuais são fracos)
+            semente: Semente das raízes sorteadas por 'evitar'; fixa, para
+                que todos os workers escolham os mesmos landmarks
+            fila: Fila de prioridade dos Dijkstra do pré-processamento
+        
+        Returns:
+            Landmarks do grafo
+        
+        Raises:
+            ValueError: Se o método de seleção é desconhecido
+        """
+        if selecao not in ("distante", "evitar"):
+            raise ValueError(f"Seleção de landmarks desconhecida: '{selecao}'")
+        
+        n = compacto.total_vertices
+        transposto = compacto.transposto()
+        aleatorio = random.Random(semente)
+        escolhidos: List[int] = []
+        de: List[List[float]] = []
+        ate: List[List[float]] = []
+        
+        while len(escolhidos) < min(quantidade, n):
+            landmark = None
+            if selecao == "evitar":
+                landmark = Landmarks._proximo_evitar(compacto, escolhidos, de, ate, aleatorio, fila)
+            if landmark is None:
+                landmark = Landmarks._proximo_distante(compacto, escolhidos, de, ate, fila)
+            if landmark is None:
+                break
+            escolhidos.append(landmark)
+            de.append(compacto.dijkstra(landmark, fila=fila)[0])
+            ate.append(transposto.dijkstra(landmark, fila=fila)[0])
+        
+        k = len(escolhidos)
+        de_landmark = array("q", [SEM_DISTANCIA]) * (n * k)
+        ate_landmark = array("q", [SEM_DISTANCIA]) * (n * k)
+        infinito = float("inf")
+        for i in range(k):
+            for v in range(n):
+                if de[i][v] != infinito:
+                    de_landmark[v * k + i] = int(de[i][v])
+                if ate[i][v] != infinito:
+                    ate_landmark[v * k + i] = int(ate[i][v])
+        return Landmarks(escolhidos, de_landmark, ate_landmark, selecao)
+    
+    @staticmethod
+    def _proximo_distante(
+        compacto: GrafoCompacto,
+        escolhidos: List[int],
+        de: List[List[float]],
+        ate: List[List[float]],
+        fila: str = "binaria"
+    ) -> Optional[int]:
+        """
+        Vértice alcançável que maximiza a menor distância (ida + volta) aos
+        landmarks já escolhidos. O primeiro é o mais distante do vértice de
+        maior grau, que tende a estar na maior componente.
+        """
+        n = compacto.total_vertices
+        infinito = float("inf")
+        if not escolhidos:
+            deslocamentos = compacto.deslocamentos
+            inicio = max(range(n), key=lambda v: deslocamentos[v + 1] - deslocamentos[v], default=None)
+            if inicio is None:
+                return None
+            pontuacao = compacto.dijkstra(inicio, fila=fila)[0]
+        else:
+            pontuacao = [
+                min(de[i][v] + ate[i][v] for i in range(len(escolhidos)))
+                for v in range(n)
+            ]
+        
+        marcados = set(escolhidos)
+        melhor, melhor_valor = None, -1.0
+        for v in range(n):
+            valor = pontuacao[v]
+            # Vértices de outras componentes não recebem landmark
+            if v not in marcados and valor != infinito and valor > melhor_valor:
+                melhor, melhor_valor = v, valor
+        return melhor
+    
+    @staticmethod
+    def _proximo_evitar(
+        compacto: GrafoCompacto,
+        escolhidos: List[int],
+        de: List[List[float]],
+        ate: List[List[float]],
+        aleatorio: random.Random,
+        fila: str = "binaria"
+    ) -> Optional[int]:
+        """
+        Heurística avoid (Goldberg e Werneck): na árvore de caminhos mínimos
+        de uma raiz sorteada, cada vértice pesa d(r, v) menos o limite atual
+        para d(r, v); subárvores que já contêm um landmark pesam zero. A
+        partir da raiz desce-se sempre pelo filho de maior peso acumulado, e
+        a folha alcançada vira o próximo landmark.
+        
+        Returns:
+            Índice do landmark ou None se todos os limites já são exatos
+        """
+        n = compacto.total_vertices
+        deslocamentos = compacto.deslocamentos
+        candidatas = [v for v in range(n) if deslocamentos[v + 1] > deslocamentos[v]]
+        if not candidatas:
+            return None
+        raiz = aleatorio.choice(candidatas)
+        
+        distancia, anterior, _ = compacto.dijkstra(raiz, fila=fila)
+        filhos: List[List[int]] = [[] for _ in range(n)]
+        for v in range(n):
+            if anterior[v] != -1:
+                filhos[anterior[v]].append(v)
+        
+        # Pré-ordem a partir da raiz; percorrida ao contrário, filhos vêm antes dos pais
+        preordem = []
+        pilha = [raiz]
+        while pilha:
+            v = pilha.pop()
+            preordem.append(v)
+            pilha.extend(filhos[v])
+        
+        infinito = float("inf")
+        marcados = set(escolhidos)
+        tamanho = [0.0] * n
+        coberto = [False] * n
+        for v in reversed(preordem):
+            limite = 0.0
+            for i in range(len(escolhidos)):
+                if de[i][v] != infinito and de[i][raiz] != infinito:
+                    limite = max(limite, de[i][v] - de[i][raiz])
+                if ate[i][raiz] != infinito and ate[i][v] != infinito:
+                    limite = max(limite, ate[i][raiz] - ate[i][v])
+            
+            soma = distancia[v] - limite
+            coberto[v] = v in marcados
+            for filho in filhos[v]:
+                coberto[v] = coberto[v] or coberto[filho]
+                soma += tamanho[filho]
+            tamanho[v] = 0.0 if coberto[v] else soma
+        
+        if tamanho[raiz] <= 0:
+            return None
+        
+        atual = raiz
+        while True:
+            proximo = max(filhos[atual], key=tamanho.__getitem__, default=None)
+            if proximo is None or tamanho[proximo] <= 0:
+                return atual
+            atual = proximo
+    
+    def selecionar(self, origem: int, destino: int, maximo: int = ATIVOS_PADRAO) -> List[int]:
+        """
+        Landmarks (posições em `escolhidos`) que dão os maiores limites para
+        d(origem, destino); os demais são ignorados na consulta.
+        """
+        limites = []
+        for i in range(self.quantidade):
+            limite = self._limite(i, origem, destino)
+            if limite > 0:
+                limites.append((limite, i))
+        limites.sort(reverse=True)
+        return [i for _, i in limites[:maximo]]
+    
+    def _limite(self, i: int, v: int, t: int) -> float:
+        """Limite inferior para d(v, t) dado pelo landmark i"""
+        k = self.quantidade
+        d_lv, d_lt = self.de_landmark[v * k + i], self.de_landmark[t * k + i]
+        d_vl, d_tl = self.ate_landmark[v * k + i], self.ate_landmark[t * k + i]
+        limite = 0
+        if d_lv >= 0:
+            if d_lt < 0:
+                return float("inf")
+            limite = max(limite, d_lt - d_lv)
+        if d_tl >= 0:
+            if d_vl < 0:
+                return float("inf")
+            limite = max(limite, d_vl - d_tl)
+        return limite
+
+
+class BuscaALT:
+    """
+    A* sobre o grafo compilado com a heurística dos landmarks. Sem
+    landmarks a heurística é zero e a busca é um Dijkstra ponto a ponto
+    (parando no destino), o que permite comparar os espaços de busca.
+    """
+    
+    @staticmethod
+    def buscar(
+        compacto: GrafoCompacto,
+        origem: int,
+        destino: int,
+        landmarks: Optional[Landmarks] = None,
+        ativos: int = ATIVOS_PADRAO
+    ) -> Tuple[ResultadoALT, List[int]]:
+        """
+        Menor caminho entre dois vértices.
+        
+        Args:
+            compacto: Grafo compilado (o mesmo usado no pré-processamento)
+            origem: Índice do vértice de origem
+            destino: Índice do vértice de destino
+            landmarks: Índice ALT (None = Dijkstra)
+            ativos: Máximo de landmarks considerados na consulta
+        
+        Returns:
+            Tupla (ResultadoALT, landmarks usados)
+        """
+        infinito = float("inf")
+        deslocamentos, destinos, pesos, tempos = (
+            compacto.deslocamentos, compacto.destinos, compacto.pesos, compacto.tempos
+        )
+        
+        usados = landmarks.selecionar(origem, destino, ativos) if landmarks is not None else []
+        if usados:
+            k = landmarks.quantidade
+            de_landmark, ate_landmark = landmarks.de_landmark, landmarks.ate_landmark
+            referencias = [
+                (i, de_landmark[destino * k + i], ate_landmark[destino * k + i])
+                for i in usados
+            ]
+        
+        def potencial(v: int) -> float:
+            melhor = 0
+            if not usados:
+                return melhor
+            base = v * k
+            for i, d_lt, d_tl in referencias:
+                d_lv = de_landmark[base + i]
+                if d_lv >= 0:
+                    # v alcançável a partir de L, destino não: v não alcança o destino
+                    if d_lt < 0:
+                        return infinito
+                    if d_lt - d_lv > melhor:
+                        melhor = d_lt - d_lv
+                if d_tl >= 0:
+                    d_vl = ate_landmark[base + i]
+                    if d_vl < 0:
+                        return infinito
+                    if d_vl - d_tl > melhor:
+                        melhor = d_vl - d_tl
+            return melhor
+        
+        distancia = {origem: 0}
+        anterior = {origem: -1}
+        tempo = {origem: 0}
+        potenciais = {origem: potencial(origem)}
+        # Empates na chave favorecem o vértice mais distante da origem (mais perto do destino)
+        fila = [(potenciais[origem], 0, origem)]
+        visitados = 0
+        relaxados = 0
+        
+        while fila:
+            _, dist_negativa, u = heapq.heappop(fila)
+            dist_u = -dist_negativa
+            if dist_u > distancia[u]:
+                continue
+            
+            visitados += 1
+            if u == destino:
+                caminho = GrafoCompacto.reconstruir(anterior, destino)
+                return ResultadoALT(caminho, dist_u, tempo[u], visitados, relaxados), usados
+            
+            for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                relaxados += 1
+                v = destinos[posicao]
+                nova_dist = dist_u + pesos[posicao]
+                if nova_dist < distancia.get(v, infinito):
+                    h = potenciais.get(v)
+                    if h is None:
+                        h = potenciais[v] = potencial(v)
+                    if h == infinito:
+                        continue
+                    distancia[v] = nova_dist
+                    anterior[v] = u
+                    tempo[v] = tempo[u] + tempos[posicao]
+                    heapq.heappush(fila, (nova_dist + h, -nova_dist, v))
+        
+        return ResultadoALT(None, 0, 0, visitados, relaxados), usados
@@ -0,0 +1,180 @@
+"""
+Pontos únicos de falha da malha: aeroportos de articulação, rotas-ponte e
+componentes biconexos (Tarjan iterativo sobre a malha sem sentido).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+
+@dataclass
+class AnaliseCriticos:
+    """
+    Resultado da análise de uma versão do grafo. Vértices e arestas são
+    índices de `codigos` e `arestas`.
+    
+    A ordem de descoberta e o tamanho da subárvore de cada vértice na
+    busca em profundidade bastam para saber, sem nova busca, em que
+    grupos a malha se parte quando uma articulação sai.
+    """
+    codigos: List[str]
+    arestas: List[Tuple[int, int, int]]  # (u, v, id_rota)
+    articulacoes: Dict[int, int]  # vértice -> pares origem-destino desconectados entre os demais
+    pontes: Dict[int, int]  # aresta -> pares origem-destino desconectados
+    componentes: List[List[int]]  # componentes biconexos (vértices)
+    conexo: List[int]  # componente conexo de cada vértice
+    tamanhos_conexos: List[int]
+    descoberta: List[int]
+    subarvore: List[int]
+    separados: Dict[int, List[int]]  # articulação -> filhos cujas subárvores ficam isoladas
+    
+    def total_grupos(self, v: int) -> int:
+        """Em quantos grupos o componente conexo de v se parte quando v sai"""
+        filhos = self.separados.get(v, [])
+        restantes = self.tamanhos_conexos[self.conexo[v]] - 1 - sum(self.subarvore[c] for c in filhos)
+        return len(filhos) + (1 if restantes > 0 else 0)
+    
+    def grupos_sem(self, v: int) -> List[List[int]]:
+        """
+        Grupos de vértices que continuam ligados entre si quando v sai (só
+        o componente conexo de v; os demais não mudam). Maiores primeiro.
+        """
+        filhos = self.separados.get(v, [])
+        intervalos = [(self.descoberta[c], self.descoberta[c] + self.subarvore[c]) for c in filhos]
+        grupos: List[List[int]] = [[] for _ in range(len(filhos) + 1)]
+        componente = self.conexo[v]
+        for w in range(len(self.codigos)):
+            if w == v or self.conexo[w] != componente:
+                continue
+            ordem = self.descoberta[w]
+            for i, (inicio, fim) in enumerate(intervalos):
+                if inicio <= ordem < fim:
+                    grupos[i].append(w)
+                    break
+            else:
+                grupos[-1].append(w)
+        return sorted((g for g in grupos if g), key=len, reverse=True)
+    
+    @staticmethod
+    def pares_entre(grupos: List[List[int]]) -> Iterator[Tuple[int, int]]:
+        """Pares (u, w) de vértices em grupos diferentes"""
+        for i, grupo in enumerate(grupos):
+            for outro in grupos[i + 1:]:
+                for u in grupo:
+                    for w in outro:
+                        yield u, w
+
+
+class Tarjan:
+    """
+    Articulações, pontes e componentes biconexos em O(V + E), com pilha
+    explícita (a recursão estouraria em malhas longas).
+    
+    Cada rota é uma aresta própria: duas rotas entre o mesmo par (ou uma
+    em cada sentido) nunca formam ponte, pois fechar uma mantém a outra.
+    """
+    
+    @staticmethod
+    def analisar(codigos: List[str], arestas: List[Tuple[int, int, int]]) -> AnaliseCriticos:
+        """
+        Args:
+            codigos: Código de cada vértice
+            arestas: (u, v, id_rota) por rota, sem considerar o sentido
+        
+        Returns:
+            AnaliseCriticos
+        """
+        n = len(codigos)
+        adjacencia: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        for e, (u, v, _) in enumerate(arestas):
+            if u != v:
+                adjacencia[u].append((v, e))
+                adjacencia[v].append((u, e))
+        
+        descoberta = [-1] * n
+        menor = [0] * n
+        subarvore = [1] * n
+        conexo = [-1] * n
+        tamanhos_conexos: List[int] = []
+        separados: Dict[int, List[int]] = {}
+        pontes_arestas: List[Tuple[int, int]] = []  # (aresta, vértice abaixo dela)
+        componentes: List[List[int]] = []
+        pilha_arestas: List[int] = []
+        raizes = set()
+        relogio = 0
+        
+        for raiz in range(n):
+            if descoberta[raiz] != -1:
+                continue
+            componente = len(tamanhos_conexos)
+            raizes.add(raiz)
+            descoberta[raiz] = menor[raiz] = relogio
+            relogio += 1
+            conexo[raiz] = componente
+            # Quadros: [vértice, aresta de chegada, próximo vizinho a examinar]
+            pilha = [[raiz, -1, 0]]
+            
+            while pilha:
+                quadro = pilha[-1]
+                v, chegada, i = quadro
+                vizinhos = adjacencia[v]
+                if i < len(vizinhos):
+                    quadro[2] = i + 1
+                    w, e = vizinhos[i]
+                    if e == chegada:
+                        continue
+                    if descoberta[w] == -1:
+                        descoberta[w] = menor[w] = relogio
+                        relogio += 1
+                        conexo[w] = componente
+                        pilha_arestas.append(e)
+                        pilha.append([w, e, 0])
+                    elif descoberta[w] < descoberta[v]:
+                        # Aresta de retorno a um ancestral (vista uma vez, de baixo)
+                        pilha_arestas.append(e)
+                        if descoberta[w] < menor[v]:
+                            menor[v] = descoberta[w]
+                    continue
+                
+                pilha.pop()
+                if not pilha:
+                    continue
+                u = pilha[-1][0]
+                subarvore[u] += subarvore[v]
+                if menor[v] < menor[u]:
+                    menor[u] = menor[v]
+                if menor[v] >= descoberta[u]:
+                    # u separa a subárvore de v do restante: fecha um componente biconexo
+                    separados.setdefault(u, []).append(v)
+                    vertices = set()
+                    while True:
+                        e = pilha_arestas.pop()
+                        vertices.add(arestas[e][0])
+                        vertices.add(arestas[e][1])
+                        if e == chegada:
+                            break
+                    componentes.append(sorted(vertices))
+                    if menor[v] > descoberta[u]:
+                        pontes_arestas.append((chegada, v))
+            
+            tamanhos_conexos.append(subarvore[raiz])
+        
+        articulacoes: Dict[int, int] = {}
+        for u, filhos in list(separados.items()):
+            # A raiz separa todos os filhos; só é articulação com dois ou mais
+            if u in raizes and len(filhos) < 2:
+                del separados[u]
+                continue
+            restantes = tamanhos_conexos[conexo[u]] - 1
+            grupos = [subarvore[c] for c in filhos]
+            grupos.append(restantes - sum(grupos))
+            articulacoes[u] = (restantes * restantes - sum(g * g for g in grupos)) // 2
+        
+        pontes = {
+            e: subarvore[v] * (tamanhos_conexos[conexo[v]] - subarvore[v])
+            for e, v in pontes_arestas
+        }
+        return AnaliseCriticos(
+            codigos, arestas, articulacoes, pontes, componentes, conexo,
+            tamanhos_conexos, descoberta, subarvore, separados
+        )
@@ -0,0 +1,433 @@
+"""
+Overlay multinível personalizável (CRP): partição aninhada dos vértices,
+cliques entre os vértices de fronteira de cada célula recalculados por
+métrica (customização) e busca multinível sobre os cliques.
+"""
+
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+from .grafo_compacto import GrafoCompacto
+
+
+@dataclass
+class ResultadoCRP:
+    """Caminho encontrado na busca multinível e o espaço de busca explorado"""
+    caminho: Optional[List[int]]  # índices dos vértices; None sem caminho
+    arcos: List[int]  # posições dos arcos no grafo compilado
+    custo: float
+    visitados: int  # vértices definidos (retirados da fila)
+    relaxados: int  # arcos e atalhos examinados
+
+
+class Particao:
+    """
+    Partição aninhada dos vértices em níveis: celulas[l][v] é a célula do
+    vértice v no nível l (0 = células menores). Toda célula do nível l está
+    contida em uma única célula do nível l + 1.
+    """
+    
+    def __init__(self, celulas: List[List[int]]):
+        self.celulas = celulas
+    
+    @property
+    def niveis(self) -> int:
+        return len(self.celulas)
+    
+    def quantidade(self, nivel: int) -> int:
+        """Número de células do nível"""
+        return max(self.celulas[nivel], default=-1) + 1
+    
+    @staticmethod
+    def por_regioes(
+        compacto: GrafoCompacto,
+        regioes: Sequence[Tuple[Hashable, ...]],
+        tamanho_maximo: int
+    ) -> "Particao":
+        """
+        Particiona pelas regiões de cada vértice, da mais ampla para a mais
+        restrita (ex.: (país, estado)): cada prefixo vira um nível. Regiões
+        com mais de `tamanho_maximo` vértices são subdivididas no nível 0
+        por crescimento em largura. Níveis que não refinam o nível acima e
+        níveis com uma única célula são descartados.
+        
+        Args:
+            compacto: Grafo compilado
+            regioes: Tupla de regiões de cada vértice (por índice)
+            tamanho_maximo: Máximo de vértices por célula do nível 0
+        
+        Returns:
+            Particao do grafo
+        """
+        n = compacto.total_vertices
+        profundidade = max((len(r) for r in regioes), default=0)
+        niveis = [
+            Particao._numerar([tuple(r[:tamanho]) for r in regioes])
+            for tamanho in range(profundidade, 0, -1)
+        ]
+        base = niveis[0] if niveis else [0] * n
+        niveis.insert(0, Particao._subdividir(compacto, base, tamanho_maximo))
+        
+        quantidades = [max(nivel, default=-1) + 1 for nivel in niveis]
+        celulas = [
+            nivel for i, nivel in enumerate(niveis)
+            if quantidades[i] > 1 and (i == 0 or quantidades[i] != quantidades[i - 1])
+        ]
+        return Particao(celulas)
+    
+    @staticmethod
+    def _numerar(rotulos: List[Hashable]) -> List[int]:
+        """Numera os rótulos distintos na ordem em que aparecem"""
+        numeros: Dict[Hashable, int] = {}
+        return [numeros.setdefault(rotulo, len(numeros)) for rotulo in rotulos]
+    
+    @staticmethod
+    def _subdividir(compacto: GrafoCompacto, base: List[int], tamanho_maximo: int) -> List[int]:
+        """Divide as células grandes em blocos conexos de até tamanho_maximo vértices"""
+        n = compacto.total_vertices
+        deslocamentos, destinos = list(compacto.deslocamentos), list(compacto.destinos)
+        membros: Dict[int, List[int]] = {}
+        for v in range(n):
+            membros.setdefault(base[v], []).append(v)
+        
+        celulas = [-1] * n
+        proxima = 0
+        for celula, vertices in membros.items():
+            if len(vertices) <= tamanho_maximo:
+                for v in vertices:
+                    celulas[v] = proxima
+                proxima += 1
+                continue
+            
+            for semente in vertices:
+                if celulas[semente] != -1:
+                    continue
+                celulas[semente] = proxima
+                tamanho = 1
+                fila = deque([semente])
+                while fila and tamanho < tamanho_maximo:
+                    u = fila.popleft()
+                    for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                        w = destinos[posicao]
+                        if celulas[w] == -1 and base[w] == celula:
+                            celulas[w] = proxima
+                            tamanho += 1
+                            fila.append(w)
+                            if tamanho >= tamanho_maximo:
+                                break
+                proxima += 1
+        return celulas
+
+
+class Overlay:
+    """
+    Parte do overlay que não depende da métrica: para cada nível, os
+    vértices de fronteira (extremidades de arcos entre células diferentes)
+    de cada célula.
+    """
+    
+    def __init__(self, compacto: GrafoCompacto, particao: Particao):
+        self.particao = particao
+        self.deslocamentos = list(compacto.deslocamentos)
+        self.destinos = list(compacto.destinos)
+        n = compacto.total_vertices
+        
+        # Vértice de saída de cada arco (para localizar a célula de arcos alterados)
+        self.origens = [0] * len(self.destinos)
+        for u in range(n):
+            for posicao in range(self.deslocamentos[u], self.deslocamentos[u + 1]):
+                self.origens[posicao] = u
+        
+        # fronteiras[l][c]: vértices de fronteira da célula c; posicoes[l][v]: posição de v nela
+        self.fronteiras: List[List[List[int]]] = []
+        self.posicoes: List[Dict[int, int]] = []
+        for nivel, celulas in enumerate(particao.celulas):
+            na_fronteira = [False] * n
+            for posicao, w in enumerate(self.destinos):
+                u = self.origens[posicao]
+                if celulas[u] != celulas[w]:
+                    na_fronteira[u] = na_fronteira[w] = True
+            
+            fronteiras: List[List[int]] = [[] for _ in range(particao.quantidade(nivel))]
+            posicoes: Dict[int, int] = {}
+            for v in range(n):
+                if na_fronteira[v]:
+                    posicoes[v] = len(fronteiras[celulas[v]])
+                    fronteiras[celulas[v]].append(v)
+            self.fronteiras.append(fronteiras)
+            self.posicoes.append(posicoes)
+    
+    @property
+    def niveis(self) -> int:
+        return self.particao.niveis
+    
+    def resumo(self) -> List[Dict[str, int]]:
+        """Células, vértices de fronteira e entradas de clique por nível"""
+        return [
+            {
+                "celulas": len(fronteiras),
+                "fronteira": sum(len(f) for f in fronteiras),
+                "entradas_cliques": sum(len(f) * len(f) for f in fronteiras)
+            }
+            for fronteiras in self.fronteiras
+        ]
+
+
+class Customizacao:
+    """
+    Cliques de uma métrica: para cada célula, a matriz (fronteira x
+    fronteira, em lista plana) das distâncias entre seus vértices de
+    fronteira usando apenas caminhos dentro da célula.
+    
+    No nível 0 os cliques vêm de buscas sobre os arcos da célula; no nível
+    l, de buscas sobre os cliques do nível l - 1 e os arcos entre subcélulas.
+    """
+    
+    def __init__(self, overlay: Overlay, pesos: List[float], cliques: List[List[List[float]]], recalculadas: int):
+        self.overlay = overlay
+        self.pesos = pesos
+        self.cliques = cliques
+        self.recalculadas = recalculadas
+    
+    @staticmethod
+    def calcular(overlay: Overlay, pesos: Sequence[float], anterior: Optional["Customizacao"] = None) -> "Customizacao":
+        """
+        Calcula os cliques de todas as células para os pesos informados.
+        
+        Com a customização anterior do mesmo overlay, só as células que
+        contêm arcos com peso alterado (e as que as contêm nos níveis acima)
+        são recalculadas.
+        
+        Args:
+            overlay: Estrutura do overlay
+            pesos: Peso de cada arco do grafo compilado
+            anterior: Customização anterior da mesma métrica (opcional)
+        
+        Returns:
+            Customizacao com os cliques
+        """
+        pesos = list(pesos)
+        celulas = overlay.particao.celulas
+        
+        sujas: Optional[List[Set[int]]] = None
+        if anterior is not None and anterior.overlay is overlay:
+            sujas = [set() for _ in range(overlay.niveis)]
+            for posicao, (antigo, novo) in enumerate(zip(anterior.pesos, pesos)):
+                if antigo == novo:
+                    continue
+                u, w = overlay.origens[posicao], overlay.destinos[posicao]
+                for nivel in range(overlay.niveis):
+                    if celulas[nivel][u] == celulas[nivel][w]:
+                        sujas[nivel].add(celulas[nivel][u])
+        
+        cliques: List[List[List[float]]] = []
+        recalculadas = 0
+        for nivel in range(overlay.niveis):
+            do_nivel = []
+            for celula in range(len(overlay.fronteiras[nivel])):
+                if sujas is not None and celula not in sujas[nivel]:
+                    do_nivel.append(anterior.cliques[nivel][celula])
+                    continue
+                do_nivel.append(Customizacao._clique(overlay, pesos, cliques, nivel, celula))
+                recalculadas += 1
+            cliques.append(do_nivel)
+        return Customizacao(overlay, pesos, cliques, recalculadas)
+    
+    @staticmethod
+    def _clique(overlay: Overlay, pesos: List[float], cliques: List[List[List[float]]], nivel: int, celula: int) -> List[float]:
+        """Distâncias entre os vértices de fronteira da célula (lista plana b x b)"""
+        infinito = float("inf")
+        fronteira = overlay.fronteiras[nivel][celula]
+        posicoes = overlay.posicoes[nivel]
+        b = len(fronteira)
+        matriz = [infinito] * (b * b)
+        deslocamentos, destinos = overlay.deslocamentos, overlay.destinos
+        da_celula = overlay.particao.celulas[nivel]
+        if nivel > 0:
+            inferior = overlay.particao.celulas[nivel - 1]
+            fronteiras_inferiores = overlay.fronteiras[nivel - 1]
+            posicoes_inferiores = overlay.posicoes[nivel - 1]
+            cliques_inferiores = cliques[nivel - 1]
+        
+        for i, origem in enumerate(fronteira):
+            distancia = {origem: 0}
+            fila = [(0, origem)]
+            while fila:
+                dist_u, u = heapq.heappop(fila)
+                if dist_u > distancia[u]:
+                    continue
+                j = posicoes.get(u)
+                if j is not None:
+                    matriz[i * b + j] = dist_u
+                
+                if nivel > 0:
+                    # Atalhos da subcélula de u
+                    subcelula = inferior[u]
+                    vizinhos = fronteiras_inferiores[subcelula]
+                    linha = cliques_inferiores[subcelula]
+                    k = len(vizinhos)
+                    inicio = posicoes_inferiores[u] * k
+                    for m, w in enumerate(vizinhos):
+                        nova_dist = dist_u + linha[inicio + m]
+                        if nova_dist < distancia.get(w, infinito):
+                            distancia[w] = nova_dist
+                            heapq.heappush(fila, (nova_dist, w))
+                
+                for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                    w = destinos[posicao]
+                    if da_celula[w] != celula:
+                        continue
+                    # Arcos internos à subcélula já estão nos atalhos
+                    if nivel > 0 and inferior[w] == inferior[u]:
+                        continue
+                    nova_dist = dist_u + pesos[posicao]
+                    if nova_dist < distancia.get(w, infinito):
+                        distancia[w] = nova_dist
+                        heapq.heappush(fila, (nova_dist, w))
+        return matriz
+
+
+class BuscaCRP:
+    """
+    Dijkstra multinível: cada vértice é examinado no nível mais alto em que
+    sua célula não contém a origem nem o destino, usando os atalhos do
+    clique dessa célula e os arcos que saem dela. Perto da origem e do
+    destino a busca usa os arcos originais.
+    """
+    
+    @staticmethod
+    def buscar(customizacao: Customizacao, origem: int, destino: int) -> ResultadoCRP:
+        """
+        Menor caminho pela métrica da customização.
+        
+        Args:
+            customizacao: Cliques da métrica
+            origem: Índice do vértice de origem
+            destino: Índice do vértice de destino
+        
+        Returns:
+            ResultadoCRP com os atalhos já desempacotados em arcos
+        """
+        infinito = float("inf")
+        overlay = customizacao.overlay
+        pesos, cliques = customizacao.pesos, customizacao.cliques
+        deslocamentos, destinos = overlay.deslocamentos, overlay.destinos
+        celulas = overlay.particao.celulas
+        niveis = range(overlay.niveis - 1, -1, -1)
+        
+        def nivel_de(v: int) -> int:
+            for nivel in niveis:
+                celula = celulas[nivel][v]
+                if celula != celulas[nivel][origem] and celula != celulas[nivel][destino]:
+                    return nivel
+            return -1
+        
+        distancia = {origem: 0}
+        # anterior[v] = (u, posição do arco ou -1, nível do atalho ou -1)
+        anterior: Dict[int, Tuple[int, int, int]] = {}
+        fila = [(0, origem)]
+        visitados = 0
+        relaxados = 0
+        
+        while fila:
+            dist_u, u = heapq.heappop(fila)
+            if dist_u > distancia[u]:
+                continue
+            visitados += 1
+            if u == destino:
+                break
+            
+            nivel = nivel_de(u)
+            j = overlay.posicoes[nivel].get(u) if nivel >= 0 else None
+            if j is None:
+                for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                    relaxados += 1
+                    w = destinos[posicao]
+                    nova_dist = dist_u + pesos[posicao]
+                    if nova_dist < distancia.get(w, infinito):
+                        distancia[w] = nova_dist
+                        anterior[w] = (u, posicao, -1)
+                        heapq.heappush(fila, (nova_dist, w))
+                continue
+            
+            da_celula = celulas[nivel]
+            celula = da_celula[u]
+            fronteira = overlay.fronteiras[nivel][celula]
+            linha = cliques[nivel][celula]
+            inicio = j * len(fronteira)
+            for m, w in enumerate(fronteira):
+                if m == j:
+                    continue
+                relaxados += 1
+                nova_dist = dist_u + linha[inicio + m]
+                if nova_dist < distancia.get(w, infinito):
+                    distancia[w] = nova_dist
+                    anterior[w] = (u, -1, nivel)
+                    heapq.heappush(fila, (nova_dist, w))
+            
+            for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                w = destinos[posicao]
+                if da_celula[w] == celula:
+                    continue
+                relaxados += 1
+                nova_dist = dist_u + pesos[posicao]
+                if nova_dist < distancia.get(w, infinito):
+                    distancia[w] = nova_dist
+                    anterior[w] = (u, posicao, -1)
+                    heapq.heappush(fila, (nova_dist, w))
+        
+        if destino not in distancia:
+            return ResultadoCRP(None, [], 0, visitados, relaxados)
+        
+        arcos: List[int] = []
+        atual = destino
+        while atual != origem:
+            u, posicao, nivel = anterior[atual]
+            if posicao >= 0:
+                arcos.append(posicao)
+            else:
+                arcos.extend(reversed(BuscaCRP._desempacotar(customizacao, nivel, u, atual)))
+            atual = u
+        arcos.reverse()
+        
+        caminho = [origem] + [destinos[posicao] for posicao in arcos]
+        return ResultadoCRP(caminho, arcos, distancia[destino], visitados, relaxados)
+    
+    @staticmethod
+    def _desempacotar(customizacao: Customizacao, nivel: int, origem: int, destino: int) -> List[int]:
+        """Arcos do menor caminho entre dois vértices de fronteira dentro da célula do atalho"""
+        infinito = float("inf")
+        overlay = customizacao.overlay
+        pesos = customizacao.pesos
+        deslocamentos, destinos = overlay.deslocamentos, overlay.destinos
+        da_celula = overlay.particao.celulas[nivel]
+        celula = da_celula[origem]
+        
+        distancia = {origem: 0}
+        arco_anterior: Dict[int, int] = {}
+        fila = [(0, origem)]
+        while fila:
+            dist_u, u = heapq.heappop(fila)
+            if dist_u > distancia[u]:
+                continue
+            if u == destino:
+                break
+            for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                w = destinos[posicao]
+                if da_celula[w] != celula:
+                    continue
+                nova_dist = dist_u + pesos[posicao]
+                if nova_dist < distancia.get(w, infinito):
+                    distancia[w] = nova_dist
+                    arco_anterior[w] = posicao
+                    heapq.heappush(fila, (nova_dist, w))
+        
+        arcos = []
+        atual = destino
+        while atual != origem:
+            posicao = arco_anterior[atual]
+            arcos.append(posicao)
+            atual = overlay.origens[posicao]
+        arcos.reverse()
+        return arcos
@@ -0,0 +1,196 @@
+"""
+Connection Scan Algorithm (CSA) para roteamento por horários de voos.
+Percorre uma única vez o vetor de conexões (voos) ordenado por partida.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class Conexao(NamedTuple):
+    """Um voo programado entre dois aeroportos (tempos em minutos)"""
+    origem: str
+    destino: str
+    partida: int
+    chegada: int
+    id_voo: int
+    codigo_voo: Optional[str] = None
+
+
+class TabelaConexoes:
+    """
+    Vetor de conexões ordenado por horário de partida, com o tempo
+    mínimo de conexão de cada aeroporto.
+    """
+    
+    def __init__(self, conexoes: List[Conexao], conexao_minima: Dict[str, int], conexao_minima_padrao: int = 0):
+        self.conexoes = sorted(conexoes, key=lambda c: (c.partida, c.chegada))
+        self.partidas = [c.partida for c in self.conexoes]
+        self.conexao_minima = conexao_minima
+        self.conexao_minima_padrao = conexao_minima_padrao
+    
+    def minimo_conexao(self, aeroporto: str) -> int:
+        """Tempo mínimo de conexão no aeroporto, em minutos"""
+        return self.conexao_minima.get(aeroporto, self.conexao_minima_padrao)
+    
+    def inicio(self, partida: int) -> int:
+        """Índice da primeira conexão que parte em `partida` ou depois"""
+        return bisect_left(self.partidas, partida)
+    
+    def __len__(self) -> int:
+        return len(self.conexoes)
+
+
+class ConnectionScan:
+    """
+    Consultas de chegada mais cedo e de perfil sobre uma TabelaConexoes.
+    
+    Uma conexão pode ser tomada em um aeroporto intermediário se partir ao
+    menos `minimo_conexao` minutos após a chegada; na origem basta partir
+    no horário solicitado ou depois.
+    """
+    
+    @staticmethod
+    def chegada_mais_cedo(
+        tabela: TabelaConexoes,
+        origem: str,
+        destino: str,
+        partida: int,
+        limite: Optional[int] = None
+    ) -> Optional[List[Conexao]]:
+        """
+        Calcula a viagem que chega mais cedo ao destino.
+        
+        Args:
+            tabela: Conexões ordenadas por partida
+            origem: Código IATA do aeroporto de origem
+            destino: Código IATA do aeroporto de destino
+            partida: Horário mínimo de partida (minutos)
+            limite: Ignora conexões que partem após este horário
+        
+        Returns:
+            Lista de conexões da viagem ou None se não houver viagem
+        """
+        if origem == destino:
+            return []
+        
+        infinito = float('inf')
+        chegada: Dict[str, float] = {}
+        # Horário a partir do qual é possível embarcar em cada aeroporto
+        pronto: Dict[str, float] = {origem: partida}
+        entrada: Dict[str, Conexao] = {}
+        
+        conexoes = tabela.conexoes
+        for i in range(tabela.inicio(partida), len(conexoes)):
+            c = conexoes[i]
+            
+            # Nenhuma conexão posterior pode melhorar a chegada ao destino
+            if c.partida >= chegada.get(destino, infinito):
+                break
+            if limite is not None and c.partida > limite:
+                break
+            
+            if c.destino == origem:
+                continue
+            if pronto.get(c.origem, infinito) <= c.partida and c.chegada < chegada.get(c.destino, infinito):
+                chegada[c.destino] = c.chegada
+                pronto[c.destino] = c.chegada + tabela.minimo_conexao(c.destino)
+                entrada[c.destino] = c
+        
+        if destino not in entrada:
+            return None
+        
+        # Reconstrói a viagem do destino até a origem
+        viagem = []
+        atual = destino
+        while atual != origem:
+            c = entrada[atual]
+            viagem.insert(0, c)
+            atual = c.origem
+        return viagem
+    
+    @staticmethod
+    def perfil(
+        tabela: TabelaConexoes,
+        origem: str,
+        destino: str,
+        inicio: int,
+        fim: int,
+        limite: Optional[int] = None
+    ) -> List[List[Conexao]]:
+        """
+        Calcula o perfil origem-destino: todas as viagens Pareto-ótimas
+        (partida mais tarde, chegada mais cedo) que partem em [inicio, fim].
+        
+        As conexões são percorridas em ordem decrescente de partida; cada
+        aeroporto guarda seu perfil até o destino como pares (partida,
+        chegada) com partidas decrescentes e chegadas estritamente decrescentes.
+        
+        Args:
+            tabela: Conexões ordenadas por partida
+            origem: Código IATA do aeroporto de origem
+            destino: Código IATA do aeroporto de destino
+            inicio: Partida mais cedo aceita (minutos)
+            fim: Partida mais tarde aceita (minutos)
+            limite: Ignora conexões que partem após este horário
+        
+        Returns:
+            Viagens ordenadas por horário de partida
+        """
+        if origem == destino:
+            return []
+        
+        infinito = float('inf')
+        # Por aeroporto: partidas negadas (crescentes, para bisect) e entradas
+        # (partida, chegada, conexão, próximo trecho)
+        partidas_neg: Dict[str, List[int]] = {}
+        entradas: Dict[str, List[Tuple[int, int, Conexao, Optional[Tuple[str, int]]]]] = {}
+        
+        conexoes = tabela.conexoes
+        primeira = tabela.inicio(inicio)
+        ultima = len(conexoes) if limite is None else bisect_right(tabela.partidas, limite)
+        
+        for i in range(ultima - 1, primeira - 1, -1):
+            c = conexoes[i]
+            
+            # Partidas da origem fora da janela não podem dominar as de dentro
+            if c.origem == origem and c.partida > fim:
+                continue
+            
+            if c.destino == destino:
+                chegada, proximo = c.chegada, None
+            else:
+                chegada, proximo = infinito, None
+                deps = partidas_neg.get(c.destino)
+                if deps:
+                    embarque = c.chegada + tabela.minimo_conexao(c.destino)
+                    # Entrada com a menor partida >= embarque (melhor chegada)
+                    indice = bisect_right(deps, -embarque) - 1
+                    if indice >= 0:
+                        chegada = entradas[c.destino][indice][1]
+                        proximo = (c.destino, indice)
+            
+            if chegada == infinito:
+                continue
+            
+            lista = entradas.setdefault(c.origem, [])
+            deps_origem = partidas_neg.setdefault(c.origem, [])
+            if lista and chegada >= lista[-1][1]:
+                continue
+            if lista and lista[-1][0] == c.partida:
+                lista.pop()
+                deps_origem.pop()
+            lista.append((c.partida, chegada, c, proximo))
+            deps_origem.append(-c.partida)
+        
+        viagens = []
+        for partida, _, c, proximo in reversed(entradas.get(origem, [])):
+            if partida > fim:
+                break
+            viagem = [c]
+            while proximo is not None:
+                aeroporto, indice = proximo
+                _, _, c, proximo = entradas[aeroporto][indice]
+                viagem.append(c)
+            viagens.append(viagem)
+        return viagens
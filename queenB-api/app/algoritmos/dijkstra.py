@@ -3,18 +3,23 @@ Algoritmo de Dijkstra para encontrar o menor caminho entre aeroportos.
 Portado de Dijkstra.java
 """
 
-import heapq
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from .grafo import Grafo
+from operator import attrgetter
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from .grafo import Grafo, METRICAS, METRICAS_INTEIRAS
+from .filas import criar_fila
 
 
 @dataclass
 class ResultadoDijkstra:
     """Resultado da execução do algoritmo de Dijkstra"""
-    distancia: Dict[str, int]
+    distancia: Dict[str, int]  # custo acumulado na métrica
     anterior: Dict[str, Optional[str]]
     tempo_total: Dict[str, int]  # tempo acumulado
+    metrica: str = "distancia"
+    # Filhos de cada vértice na árvore; montado no primeiro reparo incremental
+    # (CaminhosDinamicos) e mantido junto com `anterior` a partir dele
+    filhos: Optional[Dict[str, Set[str]]] = field(default=None, repr=False)
 
 
 class Dijkstra:
@@ -24,21 +29,26 @@ class Dijkstra:
     """
     
     @staticmethod
-    def executar(grafo: Grafo, origem: str) -> ResultadoDijkstra:
+    def executar(grafo: Grafo, origem: str, metrica: str = "distancia", fila: str = "binaria") -> ResultadoDijkstra:
         """
         Executa o algoritmo de Dijkstra a partir de um aeroporto de origem.
         
         Args:
             grafo: Grafo contendo as rotas
             origem: Código IATA do aeroporto de origem
+            metrica: Peso minimizado: 'distancia', 'tempo' ou 'combustivel'
+            fila: Fila de prioridade: 'binaria', 'daria', 'dial' ou 'radix'
+                (as duas últimas só com pesos inteiros; senão, binária)
             
         Returns:
-            ResultadoDijkstra com distâncias e caminhos anteriores
+            ResultadoDijkstra com custos e caminhos anteriores
         """
+        custo = attrgetter(METRICAS[metrica])
         distancia = {}
         anterior = {}
         tempo_total = {}
-        fila: List[Tuple[int, str]] = []
+        fila_prioridade = criar_fila(fila, metrica in METRICAS_INTEIRAS)
+        inserir, extrair = fila_prioridade.operacoes()
         
         # Inicializa todas as distâncias como infinito
         for vertice in grafo.vertices():
@@ -48,10 +58,10 @@ class Dijkstra:
         
         # Distância da origem para ela mesma é 0
         distancia[origem] = 0
-        heapq.heappush(fila, (0, origem))
+        inserir((0, origem))
         
-        while fila:
-            dist_u, u = heapq.heappop(fila)
+        while fila_prioridade:
+            dist_u, u = extrair()
             
             # Se já encontramos um caminho melhor, ignora
             if dist_u > distancia[u]:
@@ -60,15 +70,16 @@ class Dijkstra:
             # Explora todos os vizinhos
             for aresta in grafo.vizinhos(u):
                 v = aresta.destino
-                nova_dist = distancia[u] + aresta.peso
+                nova_dist = distancia[u] + custo(aresta)
                 
-                if nova_dist < distancia[v]:
+                # .get: o grafo pode ganhar vértices durante a execução (atualização incremental)
+                if nova_dist < distancia.get(v, float('inf')):
                     distancia[v] = nova_dist
                     anterior[v] = u
                     tempo_total[v] = tempo_total[u] + aresta.tempo
-                    heapq.heappush(fila, (nova_dist, v))
+                    inserir((nova_dist, v))
         
-        return ResultadoDijkstra(distancia, anterior, tempo_total)
+        return ResultadoDijkstra(distancia, anterior, tempo_total, metrica)
     
     @staticmethod
     def reconstruir_caminho(anterior: Dict[str, Optional[str]], destino: str) -> List[str]:
@@ -92,7 +103,12 @@ class Dijkstra:
         return caminho
     
     @staticmethod
-    def encontrar_menor_caminho(grafo: Grafo, origem: str, destino: str) -> Optional[Tuple[List[str], int, int]]:
+    def encontrar_menor_caminho(
+        grafo: Grafo,
+        origem: str,
+        destino: str,
+        metrica: str = "distancia"
+    ) -> Optional[Tuple[List[str], int, int]]:
         """
         Encontra o menor caminho entre origem e destino.
         
@@ -100,14 +116,15 @@ class Dijkstra:
             grafo: Grafo contendo as rotas
             origem: Código IATA do aeroporto de origem
             destino: Código IATA do aeroporto de destino
+            metrica: Peso minimizado: 'distancia', 'tempo' ou 'combustivel'
             
         Returns:
-            Tupla (caminho, distância_total, tempo_total) ou None se não houver caminho
+            Tupla (caminho, custo_total, tempo_total) ou None se não houver caminho
         """
         if not grafo.tem_vertice(origem) or not grafo.tem_vertice(destino):
             return None
         
-        resultado = Dijkstra.executar(grafo, origem)
+        resultado = Dijkstra.executar(grafo, origem, metrica)
         
         # Se a distância é infinita, não há caminho
         if resultado.distancia[destino] == float('inf'):
@@ -0,0 +1,234 @@
+"""
+Filas de prioridade para o Dijkstra: heap binário (heapq), heap d-ário
+indexado com decrease-key, baldes de Dial e radix heap.
+"""
+
+import heapq
+from functools import partial
+from typing import Any, Callable, Dict, List, Tuple
+
+# Filas disponíveis e as que exigem chaves inteiras (pesos inteiros não negativos)
+FILAS = ("binaria", "daria", "dial", "radix")
+FILAS_INTEIRAS = ("dial", "radix")
+
+
+class FilaBinaria(list):
+    """
+    Heap binário do heapq com remoção preguiçosa: melhorar a chave de um
+    item insere outra entrada, e as antigas são descartadas por quem
+    extrai (chave maior que a distância já conhecida).
+    
+    É a própria lista do heap, e operacoes() devolve heappush/heappop
+    parciais: o laço do Dijkstra chama as funções em C diretamente, sem
+    custo a mais que o heapq em linha.
+    """
+    
+    def operacoes(self) -> Tuple[Callable, Callable]:
+        """Funções (inserir(entrada), extrair()) ligadas a esta fila"""
+        return partial(heapq.heappush, self), partial(heapq.heappop, self)
+    
+    def inserir(self, entrada: Tuple[Any, Any]) -> None:
+        """Insere (chave, item) ou melhora a chave do item"""
+        heapq.heappush(self, entrada)
+    
+    def extrair(self) -> Tuple[Any, Any]:
+        """Remove e retorna (chave, item) de menor chave"""
+        return heapq.heappop(self)
+
+
+class FilaDaria:
+    """
+    Heap d-ário indexado: cada item aparece uma vez e melhorar sua chave o
+    sobe no heap (decrease-key), sem entradas obsoletas. Aridade maior
+    deixa a árvore mais rasa (inserções e melhorias mais baratas) à custa
+    de extrações que comparam mais filhos.
+    """
+    
+    def __init__(self, aridade: int = 4):
+        self.aridade = aridade
+        self._chaves: List[Any] = []
+        self._itens: List[Any] = []
+        self._posicao: Dict[Any, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._itens)
+    
+    def operacoes(self) -> Tuple[Callable, Callable]:
+        """Funções (inserir(entrada), extrair()) ligadas a esta fila"""
+        return self.inserir, self.extrair
+    
+    def inserir(self, entrada: Tuple[Any, Any]) -> None:
+        """Insere (chave, item) ou melhora a chave do item (chaves maiores são ignoradas)"""
+        chave, item = entrada
+        i = self._posicao.get(item)
+        if i is None:
+            i = len(self._itens)
+            self._chaves.append(chave)
+            self._itens.append(item)
+        elif chave < self._chaves[i]:
+            self._chaves[i] = chave
+        else:
+            return
+        self._subir(i, chave, item)
+    
+    def extrair(self) -> Tuple[Any, Any]:
+        """Remove e retorna (chave, item) de menor chave"""
+        chaves, itens = self._chaves, self._itens
+        chave, item = chaves[0], itens[0]
+        del self._posicao[item]
+        
+        ultima_chave, ultimo = chaves.pop(), itens.pop()
+        if itens:
+            self._descer(ultima_chave, ultimo)
+        return chave, item
+    
+    def _subir(self, i: int, chave, item) -> None:
+        chaves, itens, posicao, d = self._chaves, self._itens, self._posicao, self.aridade
+        while i > 0:
+            pai = (i - 1) // d
+            if chaves[pai] <= chave:
+                break
+            chaves[i], itens[i] = chaves[pai], itens[pai]
+            posicao[itens[i]] = i
+            i = pai
+        chaves[i], itens[i] = chave, item
+        posicao[item] = i
+    
+    def _descer(self, chave, item) -> None:
+        """Coloca (chave, item) na raiz e desce até a posição correta"""
+        chaves, itens, posicao, d = self._chaves, self._itens, self._posicao, self.aridade
+        n = len(itens)
+        i = 0
+        while True:
+            primeiro = d * i + 1
+            if primeiro >= n:
+                break
+            menor = primeiro
+            menor_chave = chaves[primeiro]
+            for filho in range(primeiro + 1, min(primeiro + d, n)):
+                if chaves[filho] < menor_chave:
+                    menor, menor_chave = filho, chaves[filho]
+            if chave <= menor_chave:
+                break
+            chaves[i], itens[i] = menor_chave, itens[menor]
+            posicao[itens[i]] = i
+            i = menor
+        chaves[i], itens[i] = chave, item
+        posicao[item] = i
+
+
+class FilaDial:
+    """
+    Baldes de Dial para chaves inteiras monotônicas: um balde por valor de
+    chave e um cursor que só avança. Inserir e extrair são O(1); o cursor
+    percorre no total a maior distância alcançada. Remoção preguiçosa,
+    como na binária.
+    """
+    
+    def __init__(self):
+        self._baldes: Dict[int, List[Any]] = {}
+        self._atual = 0
+        self._tamanho = 0
+    
+    def __len__(self) -> int:
+        return self._tamanho
+    
+    def operacoes(self) -> Tuple[Callable, Callable]:
+        """Funções (inserir(entrada), extrair()) ligadas a esta fila"""
+        return self.inserir, self.extrair
+    
+    def inserir(self, entrada: Tuple[int, Any]) -> None:
+        """Insere (chave, item), com chave nunca menor que a última extraída"""
+        chave, item = entrada
+        balde = self._baldes.get(chave)
+        if balde is None:
+            self._baldes[chave] = [item]
+        else:
+            balde.append(item)
+        self._tamanho += 1
+    
+    def extrair(self) -> Tuple[int, Any]:
+        """Remove e retorna (chave, item) de menor chave"""
+        baldes = self._baldes
+        atual = self._atual
+        balde = baldes.get(atual)
+        while not balde:
+            if balde is not None:
+                del baldes[atual]
+            atual += 1
+            balde = baldes.get(atual)
+        self._atual = atual
+        self._tamanho -= 1
+        return atual, balde.pop()
+
+
+class FilaRadix:
+    """
+    Radix heap para chaves inteiras monotônicas: o balde de uma chave é o
+    tamanho em bits do seu XOR com a última chave extraída. Ao esvaziar o
+    balde 0, o menor balde não vazio é redistribuído a partir do seu
+    mínimo; cada entrada muda de balde no máximo uma vez por bit.
+    """
+    
+    def __init__(self):
+        self._baldes: List[List[Tuple[int, Any]]] = [[] for _ in range(65)]
+        self._ultima = 0
+        self._tamanho = 0
+    
+    def __len__(self) -> int:
+        return self._tamanho
+    
+    def operacoes(self) -> Tuple[Callable, Callable]:
+        """Funções (inserir(entrada), extrair()) ligadas a esta fila"""
+        return self.inserir, self.extrair
+    
+    def inserir(self, entrada: Tuple[int, Any]) -> None:
+        """Insere (chave, item), com chave nunca menor que a última extraída"""
+        self._baldes[(entrada[0] ^ self._ultima).bit_length()].append(entrada)
+        self._tamanho += 1
+    
+    def extrair(self) -> Tuple[int, Any]:
+        """Remove e retorna (chave, item) de menor chave"""
+        baldes = self._baldes
+        if not baldes[0]:
+            i = 1
+            while not baldes[i]:
+                i += 1
+            balde = baldes[i]
+            baldes[i] = []
+            ultima = min(chave for chave, _ in balde)
+            self._ultima = ultima
+            for entrada in balde:
+                baldes[(entrada[0] ^ ultima).bit_length()].append(entrada)
+        self._tamanho -= 1
+        return baldes[0].pop()
+
+
+def criar_fila(tipo: str = "binaria", chaves_inteiras: bool = True):
+    """
+    Cria a fila de prioridade pelo nome.
+    
+    Args:
+        tipo: 'binaria', 'daria', 'dial' ou 'radix'
+        chaves_inteiras: Se as chaves são inteiras; 'dial' e 'radix' usam a
+            binária quando não são (ex.: métrica de combustível)
+    
+    Returns:
+        Fila com inserir((chave, item)), extrair() -> (chave, item), len()
+            e operacoes() -> (inserir, extrair) para laços quentes
+    
+    Raises:
+        ValueError: Se o tipo é desconhecido
+    """
+    if tipo not in FILAS:
+        raise ValueError(f"Fila de prioridade desconhecida: '{tipo}'")
+    if tipo in FILAS_INTEIRAS and not chaves_inteiras:
+        tipo = "binaria"
+    
+    if tipo == "daria":
+        return FilaDaria()
+    if tipo == "dial":
+        return FilaDial()
+    if tipo == "radix":
+        return FilaRadix()
+    return FilaBinaria()
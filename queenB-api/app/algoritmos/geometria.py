@@ -0,0 +1,41 @@
+"""
+Funções geométricas sobre coordenadas de aeroportos
+"""
+
+from typing import List, Tuple
+
+Ponto = Tuple[float, float]
+
+
+def _produto_vetorial(o: Ponto, a: Ponto, b: Ponto) -> float:
+    """Produto vetorial de OA x OB (positivo = giro anti-horário)"""
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def fecho_convexo(pontos: List[Ponto]) -> List[Ponto]:
+    """
+    Calcula o fecho convexo pelo algoritmo da cadeia monótona (Andrew).
+    
+    Args:
+        pontos: Lista de pontos (longitude, latitude)
+        
+    Returns:
+        Vértices do fecho em sentido anti-horário, sem repetir o primeiro
+    """
+    pontos = sorted(set(pontos))
+    if len(pontos) <= 2:
+        return pontos
+    
+    inferior: List[Ponto] = []
+    for p in pontos:
+        while len(inferior) >= 2 and _produto_vetorial(inferior[-2], inferior[-1], p) <= 0:
+            inferior.pop()
+        inferior.append(p)
+    
+    superior: List[Ponto] = []
+    for p in reversed(pontos):
+        while len(superior) >= 2 and _produto_vetorial(superior[-2], superior[-1], p) <= 0:
+            superior.pop()
+        superior.append(p)
+    
+    return inferior[:-1] + superior[:-1]
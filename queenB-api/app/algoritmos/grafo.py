@@ -3,9 +3,18 @@ Estrutura de Grafo para representar rotas aéreas.
 Portado de Grafo.java
 """
 
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
+# Métricas de peso dos arcos -> atributo da Aresta que as guarda
+METRICAS = {
+    "distancia": "peso",
+    "tempo": "tempo",
+    "combustivel": "combustivel"
+}
+# Métricas com pesos inteiros (admitem filas de prioridade por baldes)
+METRICAS_INTEIRAS = ("distancia", "tempo")
+
 
 @dataclass
 class Aresta:
@@ -13,6 +22,12 @@ class Aresta:
     destino: str
     peso: int  # distância em km
     tempo: int = 0  # tempo em minutos
+    id_rota: Optional[int] = None  # rota de origem no banco (permite atualizações incrementais)
+    combustivel: float = 0.0  # litros
+    
+    def custo(self, metrica: str) -> float:
+        """Peso da aresta na métrica ('distancia', 'tempo' ou 'combustivel')"""
+        return getattr(self, METRICAS[metrica])
     
     def __str__(self):
         return f"{self.destino} ({self.peso} km)"
@@ -20,35 +35,306 @@ class Aresta:
 
 class Grafo:
     """
-    Grafo bidirecional para representar rotas aéreas entre aeroportos.
+    Grafo para representar rotas aéreas entre aeroportos; cada rota vale
+    nos dois sentidos (bidirecional) ou só no sentido cadastrado.
+    
+    Arestas com `id_rota` podem ser atualizadas incrementalmente
+    (reponderar, remover/desativar e readicionar/reativar) em O(grau).
+    Remoções e substituições trocam a lista de adjacência inteira em vez
+    de alterá-la no lugar, para não afetar buscas em andamento.
+    
+    Com os arcos paralelos mesclados (ver `mesclar_paralelas`), as listas
+    de adjacência guardam só os arcos dominantes de cada par; o índice de
+    rotas continua com todas, e as atualizações refazem o par afetado.
     """
     
     def __init__(self):
         self.adjacencias: Dict[str, List[Aresta]] = {}
+        # id_rota -> (origem, aresta no sentido origem->destino, bidirecional)
+        self._arestas: Dict[int, Tuple[str, Aresta, bool]] = {}
+        # vértice -> rotas que o têm como extremidade
+        self._incidentes: Dict[str, Set[int]] = {}
+        # Se True, só os arcos dominantes entre arcos paralelos de rotas ficam na adjacência
+        self.paralelas_mescladas = False
     
     def adicionar_vertice(self, vertice: str) -> None:
         """Adiciona um vértice (aeroporto) ao grafo"""
         if vertice not in self.adjacencias:
             self.adjacencias[vertice] = []
     
-    def adicionar_aresta(self, origem: str, destino: str, peso: int, tempo: int = 0, bidirecional: bool = True) -> None:
+    def adicionar_aresta(
+        self,
+        origem: str,
+        destino: str,
+        peso: int,
+        tempo: int = 0,
+        bidirecional: bool = True,
+        id_rota: Optional[int] = None,
+        combustivel: float = 0.0
+    ) -> None:
         """
         Adiciona uma aresta (rota) ao grafo.
         
+        Com `id_rota`, a operação é idempotente: uma aresta já existente
+        com o mesmo ID é substituída (usado também para reativar rotas).
+        
         Args:
             origem: Código IATA do aeroporto de origem
             destino: Código IATA do aeroporto de destino
             peso: Distância em km
             tempo: Tempo estimado em minutos
             bidirecional: Se True, adiciona rota nos dois sentidos
+            id_rota: ID da rota no banco (opcional)
+            combustivel: Combustível necessário em litros
         """
+        if id_rota is not None and id_rota in self._arestas:
+            self.remover_aresta(id_rota)
+        
         self.adicionar_vertice(origem)
         self.adicionar_vertice(destino)
         
-        self.adjacencias[origem].append(Aresta(destino, peso, tempo))
+        aresta = Aresta(destino, peso, tempo, id_rota, combustivel)
+        if id_rota is not None:
+            self._arestas[id_rota] = (origem, aresta, bidirecional)
+            self._incidentes.setdefault(origem, set()).add(id_rota)
+            self._incidentes.setdefault(destino, set()).add(id_rota)
+            if self.paralelas_mescladas:
+                self._recompor_par(origem, destino, bidirecional)
+                return
+        
+        self.adjacencias[origem].append(aresta)
         
         if bidirecional:
-            self.adjacencias[destino].append(Aresta(origem, peso, tempo))
+            self.adjacencias[destino].append(Aresta(origem, peso, tempo, id_rota, combustivel))
+    
+    def registrar_aresta(self, id_rota: int, origem: str, aresta: Aresta, bidirecional: bool = True) -> None:
+        """
+        Registra o índice de uma rota cujas arestas já estão nas listas de
+        adjacência (usado ao reconstruir o grafo de um snapshot).
+        """
+        self._arestas[id_rota] = (origem, aresta, bidirecional)
+        self._incidentes.setdefault(origem, set()).add(id_rota)
+        self._incidentes.setdefault(aresta.destino, set()).add(id_rota)
+    
+    def reponderar_aresta(self, id_rota: int, peso: int, tempo: int = 0, combustivel: float = 0.0) -> bool:
+        """
+        Altera distância, tempo e combustível de uma aresta existente.
+        
+        Returns:
+            False se a rota não está no grafo
+        """
+        registro = self._arestas.get(id_rota)
+        if registro is None:
+            return False
+        
+        origem, aresta, bidirecional = registro
+        self._arestas[id_rota] = (origem, Aresta(aresta.destino, peso, tempo, id_rota, combustivel), bidirecional)
+        if self.paralelas_mescladas:
+            self._recompor_par(origem, aresta.destino, bidirecional)
+            return True
+        
+        extremos = [origem, aresta.destino] if bidirecional else [origem]
+        for vertice in extremos:
+            self.adjacencias[vertice] = [
+                Aresta(a.destino, peso, tempo, id_rota, combustivel) if a.id_rota == id_rota else a
+                for a in self.adjacencias[vertice]
+            ]
+        return True
+    
+    def remover_aresta(self, id_rota: int) -> bool:
+        """
+        Remove (desativa) uma aresta pelo ID da rota.
+        
+        Returns:
+            False se a rota não está no grafo
+        """
+        registro = self._arestas.pop(id_rota, None)
+        if registro is None:
+            return False
+        
+        origem, aresta, bidirecional = registro
+        self._incidentes.get(origem, set()).discard(id_rota)
+        self._incidentes.get(aresta.destino, set()).discard(id_rota)
+        if self.paralelas_mescladas:
+            self._recompor_par(origem, aresta.destino, bidirecional)
+            return True
+        
+        extremos = [origem, aresta.destino] if bidirecional else [origem]
+        for vertice in extremos:
+            self.adjacencias[vertice] = [
+                a for a in self.adjacencias[vertice] if a.id_rota != id_rota
+            ]
+        return True
+    
+    @staticmethod
+    def dominantes(paralelas: List[Aresta]) -> List[Aresta]:
+        """
+        Menor conjunto de arcos paralelos (mesmo par origem -> destino) que
+        contém um de menor peso em cada métrica, na ordem recebida. Entre
+        empatados, ficam os que cobrem mais métricas e, depois, os de menor
+        ID de rota.
+        
+        Os demais nunca melhoram um caminho em nenhuma métrica: os caminhos
+        mínimos e seus custos são os mesmos usando só os escolhidos.
+        """
+        if len(paralelas) < 2:
+            return list(paralelas)
+        
+        # Para cada arco, as métricas em que ele tem o menor peso
+        minimos = {metrica: min(a.custo(metrica) for a in paralelas) for metrica in METRICAS}
+        cobertas = [
+            {metrica for metrica, minimo in minimos.items() if a.custo(metrica) == minimo}
+            for a in paralelas
+        ]
+        ordem = sorted(range(len(paralelas)), key=lambda i: (-len(cobertas[i]), paralelas[i].id_rota or 0, i))
+        
+        faltando = set(METRICAS)
+        escolhidos = set()
+        for i in ordem:
+            if cobertas[i] & faltando:
+                escolhidos.add(i)
+                faltando -= cobertas[i]
+        return [aresta for i, aresta in enumerate(paralelas) if i in escolhidos]
+    
+    def mesclar_paralelas(self) -> Tuple[int, int]:
+        """
+        Remove das listas de adjacência os arcos paralelos de rotas não
+        dominantes (ex.: A->B e B->A cadastradas como bidirecionais geram
+        dois arcos em cada sentido) e passa a manter a mesclagem nas
+        atualizações incrementais.
+        
+        Returns:
+            Tupla (arcos antes, arcos depois)
+        """
+        antes = self.total_arcos()
+        for vertice, adjacencia in list(self.adjacencias.items()):
+            por_destino: Dict[str, List[Aresta]] = {}
+            for aresta in adjacencia:
+                if aresta.id_rota is not None:
+                    por_destino.setdefault(aresta.destino, []).append(aresta)
+            if all(len(paralelas) == 1 for paralelas in por_destino.values()):
+                continue
+            
+            mantidas = {id(a) for paralelas in por_destino.values() for a in Grafo.dominantes(paralelas)}
+            self.adjacencias[vertice] = [a for a in adjacencia if a.id_rota is None or id(a) in mantidas]
+        
+        self.paralelas_mescladas = True
+        return antes, self.total_arcos()
+    
+    def _recompor_par(self, origem: str, destino: str, bidirecional: bool) -> None:
+        """Refaz, a partir do índice de rotas, os arcos do par nos sentidos afetados"""
+        self._recompor_arcos(origem, destino)
+        if bidirecional and destino != origem:
+            self._recompor_arcos(destino, origem)
+    
+    def _recompor_arcos(self, origem: str, destino: str) -> None:
+        """Arcos origem -> destino das rotas: só os dominantes, na posição do primeiro"""
+        adjacencia = self.adjacencias.get(origem)
+        if adjacencia is None:
+            return
+        
+        paralelas = []
+        for id_rota in sorted(self._incidentes.get(origem, ())):
+            registro = self._arestas.get(id_rota)
+            if registro is None:
+                continue
+            inicio, aresta, bidirecional = registro
+            if inicio == origem and aresta.destino == destino:
+                paralelas.append(aresta)
+            elif bidirecional and inicio == destino and aresta.destino == origem:
+                paralelas.append(Aresta(destino, aresta.peso, aresta.tempo, id_rota, aresta.combustivel))
+        
+        do_par = [i for i, a in enumerate(adjacencia) if a.destino == destino and a.id_rota is not None]
+        posicao = do_par[0] if do_par else len(adjacencia)
+        outras = [a for a in adjacencia if a.destino != destino or a.id_rota is None]
+        self.adjacencias[origem] = outras[:posicao] + Grafo.dominantes(paralelas) + outras[posicao:]
+    
+    def remover_vertice(self, vertice: str) -> None:
+        """Remove (desativa) um vértice e todas as rotas que o têm como extremidade"""
+        for id_rota in list(self._incidentes.get(vertice, ())):
+            self.remover_aresta(id_rota)
+        self._incidentes.pop(vertice, None)
+        self.adjacencias.pop(vertice, None)
+    
+    def extremos(self, id_rota: int) -> Optional[Tuple[str, str, bool]]:
+        """Retorna (origem, destino, bidirecional) de uma rota no grafo, ou None"""
+        registro = self._arestas.get(id_rota)
+        if registro is None:
+            return None
+        origem, aresta, bidirecional = registro
+        return origem, aresta.destino, bidirecional
+    
+    def rotas_incidentes(self, vertice: str) -> List[int]:
+        """IDs das rotas que têm o vértice como extremidade"""
+        return list(self._incidentes.get(vertice, ()))
+    
+    def predecessores(self, vertice: str) -> List[Tuple[str, Aresta]]:
+        """
+        Retorna os arcos que chegam ao vértice como pares (vértice anterior, aresta).
+        
+        Considera as arestas identificadas por `id_rota`.
+        """
+        entrantes = []
+        for id_rota in list(self._incidentes.get(vertice, ())):
+            registro = self._arestas.get(id_rota)
+            if registro is None:
+                continue
+            origem, aresta, bidirecional = registro
+            if aresta.destino == vertice:
+                entrantes.append((origem, aresta))
+            if bidirecional and origem == vertice:
+                entrantes.append((aresta.destino, Aresta(vertice, aresta.peso, aresta.tempo, id_rota, aresta.combustivel)))
+        return entrantes
+    
+    def total_arestas(self) -> int:
+        """Quantidade de arestas identificadas por rota"""
+        return len(self._arestas)
+    
+    def total_arcos(self) -> int:
+        """Quantidade de arcos nas listas de adjacência"""
+        return sum(len(adjacencia) for adjacencia in list(self.adjacencias.values()))
+    
+    def arcos_sem_mesclar(self) -> int:
+        """Arcos que as listas de adjacência teriam sem a mesclagem de paralelos"""
+        registrados = sum(2 if bidirecional else 1 for _, _, bidirecional in list(self._arestas.values()))
+        sem_rota = sum(
+            1 for adjacencia in list(self.adjacencias.values()) for a in adjacencia if a.id_rota is None
+        )
+        return registrados + sem_rota
+    
+    def rotas_registradas(self) -> List[Tuple[int, str, Aresta, bool]]:
+        """Rotas do índice como (id_rota, origem, aresta origem->destino, bidirecional)"""
+        return [
+            (id_rota, origem, aresta, bidirecional)
+            for id_rota, (origem, aresta, bidirecional) in list(self._arestas.items())
+        ]
+    
+    def assinatura(self, ids_vertices: Dict[str, int]) -> Tuple[int, int, int, int, int, int, int, int]:
+        """
+        Resumo das arestas identificadas por rota, para comparar com o banco:
+        (quantidade, soma dos IDs, soma das distâncias, soma dos tempos,
+        soma de ID * distância, soma de ID * ID do aeroporto de origem,
+        soma de ID * ID do aeroporto de destino, soma dos mililitros de
+        combustível truncados).
+        
+        Args:
+            ids_vertices: ID no banco de cada vértice (-1 se ausente)
+        """
+        total = soma_ids = soma_pesos = soma_tempos = soma_ponderada = 0
+        soma_origens = soma_destinos = soma_combustivel = 0
+        for id_rota, (origem, aresta, _) in list(self._arestas.items()):
+            total += 1
+            soma_ids += id_rota
+            soma_pesos += aresta.peso
+            soma_tempos += aresta.tempo
+            soma_ponderada += id_rota * aresta.peso
+            soma_origens += id_rota * ids_vertices.get(origem, -1)
+            soma_destinos += id_rota * ids_vertices.get(aresta.destino, -1)
+            soma_combustivel += int(aresta.combustivel * 1000)
+        return (
+            total, soma_ids, soma_pesos, soma_tempos, soma_ponderada,
+            soma_origens, soma_destinos, soma_combustivel
+        )
     
     def vizinhos(self, vertice: str) -> List[Aresta]:
         """Retorna lista de arestas (vizinhos) de um vértice"""
@@ -0,0 +1,504 @@
+"""
+Grafo compacto em formato CSR (Compressed Sparse Row) com layout binário
+plano, que pode ser lido sem cópia de um buffer (memória compartilhada
+ou arquivo mapeado em memória).
+"""
+
+import struct
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from .grafo import Grafo, Aresta, METRICAS_INTEIRAS
+from .filas import criar_fila
+
+# Cabeçalho: mágico, versão dos dados, vértices, arcos, bytes dos códigos,
+# bytes dos nomes, rotas registradas, opções
+MAGICO = 0x34474251  # 'QBG4'
+CABECALHO = struct.Struct("<qqqqqqqq")
+
+# Opções com que o grafo foi montado (bits do cabeçalho)
+OPCAO_DIRIGIDO = 1
+OPCAO_PARALELAS_MESCLADAS = 2
+
+# Inteiros por rota no registro: id, origem, destino, bidirecional, distância, tempo
+CAMPOS_REGISTRO = 6
+
+
+class GrafoCompacto:
+    """
+    Grafo dirigido em CSR: os arcos de saída do vértice i ocupam as
+    posições deslocamentos[i]..deslocamentos[i+1]-1 de destinos e de cada
+    coluna de peso (pesos = distância, tempos, combustíveis), que
+    compartilham a mesma estrutura de vértices e arcos.
+    
+    Cada arco guarda o ID da rota: positivo no sentido cadastrado
+    (origem -> destino), negativo no sentido inverso e 0 sem rota.
+    
+    O registro opcional guarda todas as rotas do índice do Grafo (inclusive
+    as que não têm arco por terem sido mescladas com paralelas), para que
+    o snapshot reconstrua o índice completo.
+    
+    Layout binário (little-endian, alinhado a 8 bytes):
+    cabeçalho | deslocamentos (V+1 x int64) | pesos (A x int64) |
+    tempos (A x int64) | combustíveis (A x float64) | rotas (A x int64) |
+    IDs dos aeroportos (V x int64) | registro (R x 6 x int64) |
+    combustíveis do registro (R x float64) |
+    destinos (A x int32) | códigos IATA (UTF-8, '\\n') | nomes (UTF-8, '\\0')
+    """
+    
+    def __init__(
+        self,
+        codigos: List[str],
+        deslocamentos: Sequence[int],
+        destinos: Sequence[int],
+        pesos: Sequence[int],
+        tempos: Sequence[int],
+        versao: int = 0,
+        rotas: Optional[Sequence[int]] = None,
+        ids: Optional[Sequence[int]] = None,
+        nomes: Optional[List[str]] = None,
+        combustiveis: Optional[Sequence[float]] = None,
+        registro: Optional[Sequence[int]] = None,
+        combustiveis_registro: Optional[Sequence[float]] = None,
+        opcoes: int = 0
+    ):
+        self.codigos = codigos
+        self.indice = {codigo: i for i, codigo in enumerate(codigos)}
+        self.deslocamentos = deslocamentos
+        self.destinos = destinos
+        self.pesos = pesos
+        self.tempos = tempos
+        self.versao = versao
+        self.rotas = rotas if rotas is not None else array("q", bytes(8 * len(destinos)))
+        self.ids = ids if ids is not None else array("q", [-1] * len(codigos))
+        self.nomes = nomes if nomes is not None else [""] * len(codigos)
+        self.combustiveis = combustiveis if combustiveis is not None else array("d", bytes(8 * len(destinos)))
+        self.registro = registro if registro is not None else array("q")
+        self.combustiveis_registro = combustiveis_registro if combustiveis_registro is not None else array("d")
+        self.opcoes = opcoes
+    
+    @staticmethod
+    def de_grafo(
+        grafo: Grafo,
+        versao: int = 0,
+        aeroportos: Optional[Dict[str, dict]] = None,
+        com_registro: bool = False,
+        opcoes: int = 0
+    ) -> "GrafoCompacto":
+        """
+        Compila um Grafo em CSR, preservando a ordem dos arcos de cada vértice.
+        
+        Args:
+            grafo: Grafo em memória
+            versao: Versão dos dados que o grafo representa
+            aeroportos: Dicionário {código: {'id', 'nome'}} (opcional)
+            com_registro: Inclui o registro de rotas (necessário para para_grafo
+                quando há arcos paralelos mesclados)
+            opcoes: Bits OPCAO_* com que o grafo foi montado
+        
+        Returns:
+            GrafoCompacto equivalente
+        """
+        aeroportos = aeroportos or {}
+        codigos = sorted(grafo.vertices())
+        indice = {codigo: i for i, codigo in enumerate(codigos)}
+        deslocamentos = array("q", [0])
+        destinos = array("i")
+        pesos = array("q")
+        tempos = array("q")
+        combustiveis = array("d")
+        rotas = array("q")
+        
+        for codigo in codigos:
+            for aresta in grafo.vizinhos(codigo):
+                destinos.append(indice[aresta.destino])
+                pesos.append(int(aresta.peso))
+                tempos.append(int(aresta.tempo or 0))
+                combustiveis.append(float(aresta.combustivel or 0.0))
+                if aresta.id_rota is None:
+                    rotas.append(0)
+                else:
+                    origem, _, _ = grafo.extremos(aresta.id_rota)
+                    rotas.append(aresta.id_rota if origem == codigo else -aresta.id_rota)
+            deslocamentos.append(len(destinos))
+        
+        registro = array("q")
+        combustiveis_registro = array("d")
+        if com_registro:
+            for id_rota, origem, aresta, bidirecional in grafo.rotas_registradas():
+                registro.extend((
+                    id_rota, indice[origem], indice[aresta.destino],
+                    int(bidirecional), int(aresta.peso), int(aresta.tempo or 0)
+                ))
+                combustiveis_registro.append(float(aresta.combustivel or 0.0))
+        
+        ids = array("q", [aeroportos.get(codigo, {}).get('id', -1) for codigo in codigos])
+        nomes = [aeroportos.get(codigo, {}).get('nome') or "" for codigo in codigos]
+        return GrafoCompacto(
+            codigos, deslocamentos, destinos, pesos, tempos, versao, rotas, ids, nomes, combustiveis,
+            registro, combustiveis_registro, opcoes
+        )
+    
+    def para_grafo(self) -> Tuple[Grafo, Dict[str, dict]]:
+        """
+        Reconstrói o Grafo em memória, com as listas de adjacência na
+        mesma ordem do grafo compilado.
+        
+        Returns:
+            Tupla (Grafo, dicionário de aeroportos por código IATA)
+        """
+        grafo = Grafo()
+        codigos = self.codigos
+        # Listas Python são bem mais rápidas de percorrer que memoryviews
+        deslocamentos, destinos, pesos, tempos, combustiveis, rotas = (
+            list(self.deslocamentos), list(self.destinos), list(self.pesos),
+            list(self.tempos), list(self.combustiveis), list(self.rotas)
+        )
+        
+        diretas: Dict[int, Tuple[str, Aresta]] = {}
+        inversas: Set[int] = set()
+        for u, codigo in enumerate(codigos):
+            inicio, fim = deslocamentos[u], deslocamentos[u + 1]
+            adjacencia = [
+                Aresta(codigos[destino], peso, tempo, abs(rota) or None, combustivel)
+                for destino, peso, tempo, rota, combustivel in zip(
+                    destinos[inicio:fim], pesos[inicio:fim], tempos[inicio:fim],
+                    rotas[inicio:fim], combustiveis[inicio:fim]
+                )
+            ]
+            for aresta, rota in zip(adjacencia, rotas[inicio:fim]):
+                if rota > 0:
+                    diretas[rota] = (codigo, aresta)
+                elif rota < 0:
+                    inversas.add(-rota)
+            grafo.adjacencias[codigo] = adjacencia
+        
+        if self.total_registradas:
+            registro = list(self.registro)
+            for k, combustivel in enumerate(self.combustiveis_registro):
+                id_rota, origem, destino, bidirecional, peso, tempo = registro[k * CAMPOS_REGISTRO:(k + 1) * CAMPOS_REGISTRO]
+                aresta = Aresta(codigos[destino], peso, tempo, id_rota, combustivel)
+                grafo.registrar_aresta(id_rota, codigos[origem], aresta, bool(bidirecional))
+        else:
+            # Sem registro: cada rota tem seu arco direto (e o inverso, se bidirecional)
+            for id_rota, (origem, aresta) in diretas.items():
+                grafo.registrar_aresta(id_rota, origem, aresta, id_rota in inversas)
+        grafo.paralelas_mescladas = bool(self.opcoes & OPCAO_PARALELAS_MESCLADAS)
+        
+        aeroportos_map = {
+            codigo: {'id': self.ids[i], 'codigo': codigo, 'nome': self.nomes[i]}
+            for i, codigo in enumerate(codigos)
+            if self.ids[i] >= 0
+        }
+        return grafo, aeroportos_map
+    
+    @property
+    def total_vertices(self) -> int:
+        return len(self.codigos)
+    
+    @property
+    def total_arcos(self) -> int:
+        return len(self.destinos)
+    
+    @property
+    def total_registradas(self) -> int:
+        return len(self.combustiveis_registro)
+    
+    def coluna(self, metrica: str) -> Sequence[float]:
+        """
+        Vetor de pesos dos arcos na métrica.
+        
+        Raises:
+            ValueError: Se a métrica é desconhecida
+        """
+        if metrica == "distancia":
+            return self.pesos
+        if metrica == "tempo":
+            return self.tempos
+        if metrica == "combustivel":
+            return self.combustiveis
+        raise ValueError(f"Métrica desconhecida: '{metrica}'")
+    
+    def serializar(self) -> bytes:
+        """Retorna o grafo no layout binário"""
+        codigos = "\n".join(self.codigos).encode("utf-8")
+        nomes = "\0".join(self.nomes).encode("utf-8")
+        partes = [
+            CABECALHO.pack(
+                MAGICO, self.versao, self.total_vertices, self.total_arcos,
+                len(codigos), len(nomes), self.total_registradas, self.opcoes
+            ),
+            array("q", self.deslocamentos).tobytes(),
+            array("q", self.pesos).tobytes(),
+            array("q", self.tempos).tobytes(),
+            array("d", self.combustiveis).tobytes(),
+            array("q", self.rotas).tobytes(),
+            array("q", self.ids).tobytes(),
+            array("q", self.registro).tobytes(),
+            array("d", self.combustiveis_registro).tobytes(),
+            array("i", self.destinos).tobytes(),
+            codigos,
+            nomes
+        ]
+        return b"".join(partes)
+    
+    @staticmethod
+    def ler_cabecalho(buffer) -> Tuple[int, int, int, int, int, int, int]:
+        """
+        Lê o cabeçalho de um buffer serializado.
+        
+        Returns:
+            Tupla (versão, vértices, arcos, bytes dos códigos, bytes dos nomes,
+            rotas registradas, opções)
+        
+        Raises:
+            ValueError: Se o buffer não contém um grafo compacto
+        """
+        if len(buffer) < CABECALHO.size:
+            raise ValueError("Buffer menor que o cabeçalho do grafo compacto")
+        magico, versao, vertices, arcos, bytes_codigos, bytes_nomes, registradas, opcoes = CABECALHO.unpack_from(buffer, 0)
+        if magico != MAGICO:
+            raise ValueError("Buffer não contém um grafo compacto")
+        
+        tamanho = (
+            CABECALHO.size + 8 * (vertices + 1 + 4 * arcos + vertices + (CAMPOS_REGISTRO + 1) * registradas)
+            + 4 * arcos + bytes_codigos + bytes_nomes
+        )
+        if len(buffer) < tamanho:
+            raise ValueError("Buffer do grafo compacto truncado")
+        return versao, vertices, arcos, bytes_codigos, bytes_nomes, registradas, opcoes
+    
+    @staticmethod
+    def de_buffer(buffer) -> "GrafoCompacto":
+        """
+        Reconstrói o grafo a partir do layout binário sem copiar os arcos:
+        os vetores são memoryviews sobre o próprio buffer.
+        
+        Args:
+            buffer: Objeto com protocolo de buffer (bytes, mmap, SharedMemory.buf)
+        
+        Returns:
+            GrafoCompacto apoiado no buffer (que deve permanecer aberto)
+        """
+        versao, vertices, arcos, bytes_codigos, bytes_nomes, registradas, opcoes = GrafoCompacto.ler_cabecalho(buffer)
+        visao = memoryview(buffer)
+        
+        posicao = CABECALHO.size
+        
+        def fatia(tamanho: int, formato: str) -> memoryview:
+            nonlocal posicao
+            bytes_item = struct.calcsize(formato)
+            parte = visao[posicao:posicao + tamanho * bytes_item].cast(formato)
+            posicao += tamanho * bytes_item
+            return parte
+        
+        deslocamentos = fatia(vertices + 1, "q")
+        pesos = fatia(arcos, "q")
+        tempos = fatia(arcos, "q")
+        combustiveis = fatia(arcos, "d")
+        rotas = fatia(arcos, "q")
+        ids = fatia(vertices, "q")
+        registro = fatia(CAMPOS_REGISTRO * registradas, "q")
+        combustiveis_registro = fatia(registradas, "d")
+        destinos = fatia(arcos, "i")
+        codigos = bytes(visao[posicao:posicao + bytes_codigos]).decode("utf-8")
+        posicao += bytes_codigos
+        nomes = bytes(visao[posicao:posicao + bytes_nomes]).decode("utf-8")
+        
+        return GrafoCompacto(
+            codigos.split("\n") if vertices else [],
+            deslocamentos, destinos, pesos, tempos, versao,
+            rotas, ids, nomes.split("\0") if vertices else [], combustiveis,
+            registro, combustiveis_registro, opcoes
+        )
+    
+    def transposto(self) -> "GrafoCompacto":
+        """
+        Grafo com todos os arcos invertidos (mesma tabela de vértices); as
+        distâncias a partir de um vértice no transposto são as distâncias
+        até ele no grafo original.
+        """
+        n = self.total_vertices
+        deslocamentos, destinos, pesos, tempos, combustiveis, rotas = (
+            list(self.deslocamentos), list(self.destinos), list(self.pesos),
+            list(self.tempos), list(self.combustiveis), list(self.rotas)
+        )
+        
+        grau = [0] * (n + 1)
+        for v in destinos:
+            grau[v + 1] += 1
+        for i in range(n):
+            grau[i + 1] += grau[i]
+        novos_deslocamentos = array("q", grau)
+        
+        proxima = grau[:n]
+        novos_destinos = array("i", bytes(4 * len(destinos)))
+        novos_pesos = array("q", bytes(8 * len(destinos)))
+        novos_tempos = array("q", bytes(8 * len(destinos)))
+        novos_combustiveis = array("d", bytes(8 * len(destinos)))
+        novas_rotas = array("q", bytes(8 * len(destinos)))
+        for u in range(n):
+            for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                v = destinos[posicao]
+                alvo = proxima[v]
+                proxima[v] += 1
+                novos_destinos[alvo] = u
+                novos_pesos[alvo] = pesos[posicao]
+                novos_tempos[alvo] = tempos[posicao]
+                novos_combustiveis[alvo] = combustiveis[posicao]
+                novas_rotas[alvo] = -rotas[posicao]
+        
+        return GrafoCompacto(
+            self.codigos, novos_deslocamentos, novos_destinos, novos_pesos, novos_tempos,
+            self.versao, novas_rotas, self.ids, self.nomes, novos_combustiveis
+        )
+    
+    def liberar(self) -> None:
+        """Solta as memoryviews sobre o buffer (necessário para fechá-lo)"""
+        for vetor in (
+            self.deslocamentos, self.destinos, self.pesos, self.tempos, self.combustiveis,
+            self.rotas, self.ids, self.registro, self.combustiveis_registro
+        ):
+            if isinstance(vetor, memoryview):
+                vetor.release()
+    
+    def dijkstra(
+        self,
+        origem: int,
+        alvos: Optional[Set[int]] = None,
+        metrica: str = "distancia",
+        vertices_bloqueados: Optional[Sequence[int]] = None,
+        arcos_bloqueados: Optional[Sequence[int]] = None,
+        fila: str = "binaria"
+    ) -> Tuple[List[float], List[int], List[int]]:
+        """
+        Dijkstra sobre índices de vértices.
+        
+        Args:
+            origem: Índice do vértice de origem
+            alvos: Se informado, para assim que todos forem definidos
+            metrica: Coluna de peso minimizada ('distancia', 'tempo' ou 'combustivel')
+            vertices_bloqueados: Mapa por vértice (não zero = não pode ser usado)
+            arcos_bloqueados: Mapa por posição de arco (não zero = não pode ser usado)
+            fila: Fila de prioridade ('binaria', 'daria', 'dial' ou 'radix')
+        
+        Returns:
+            Tupla (custo na métrica, anterior (-1 = nenhum), tempo acumulado) por índice
+        """
+        infinito = float("inf")
+        n = self.total_vertices
+        distancia = [infinito] * n
+        anterior = [-1] * n
+        tempo = [0] * n
+        deslocamentos, destinos, pesos, tempos = self.deslocamentos, self.destinos, self.coluna(metrica), self.tempos
+        pendentes = set(alvos) if alvos else None
+        
+        fila_prioridade = criar_fila(fila, metrica in METRICAS_INTEIRAS)
+        inserir, extrair = fila_prioridade.operacoes()
+        distancia[origem] = 0
+        inserir((0, origem))
+        
+        while fila_prioridade:
+            dist_u, u = extrair()
+            if dist_u > distancia[u]:
+                continue
+            
+            if pendentes is not None:
+                pendentes.discard(u)
+                if not pendentes:
+                    break
+            
+            for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                if arcos_bloqueados is not None and arcos_bloqueados[posicao]:
+                    continue
+                v = destinos[posicao]
+                nova_dist = dist_u + pesos[posicao]
+                if nova_dist < distancia[v]:
+                    # Vértice bloqueado só é consultado quando melhoraria
+                    if vertices_bloqueados is not None and vertices_bloqueados[v]:
+                        continue
+                    distancia[v] = nova_dist
+                    anterior[v] = u
+                    tempo[v] = tempo[u] + tempos[posicao]
+                    inserir((nova_dist, v))
+        
+        return distancia, anterior, tempo
+    
+    def bfs(
+        self,
+        origem: int,
+        destino: int,
+        vertices_bloqueados: Optional[Sequence[int]] = None,
+        arcos_bloqueados: Optional[Sequence[int]] = None
+    ) -> Optional[List[int]]:
+        """Caminho com menor número de trechos (índices) ou None, evitando os bloqueados"""
+        if origem == destino:
+            return [origem]
+        
+        anterior = {origem: -1}
+        fila = deque([origem])
+        deslocamentos, destinos = self.deslocamentos, self.destinos
+        
+        while fila:
+            u = fila.popleft()
+            for posicao in range(deslocamentos[u], deslocamentos[u + 1]):
+                if arcos_bloqueados is not None and arcos_bloqueados[posicao]:
+                    continue
+                v = destinos[posicao]
+                if v in anterior or (vertices_bloqueados is not None and vertices_bloqueados[v]):
+                    continue
+                anterior[v] = u
+                if v == destino:
+                    return self.reconstruir(anterior, destino)
+                fila.append(v)
+        return None
+    
+    @staticmethod
+    def reconstruir(anterior, destino: int) -> List[int]:
+        """Reconstrói o caminho até o destino a partir dos anteriores (-1 = origem)"""
+        caminho = []
+        atual = destino
+        while atual != -1:
+            caminho.append(atual)
+            atual = anterior[atual]
+        caminho.reverse()
+        return caminho
+    
+    def distancia_tempo(self, caminho: List[int], arcos_bloqueados: Optional[Sequence[int]] = None) -> Tuple[int, int]:
+        """Distância e tempo de um caminho usando o primeiro arco (não bloqueado) entre cada par"""
+        distancia_total = 0
+        tempo_total = 0
+        for u, v in zip(caminho, caminho[1:]):
+            for posicao in range(self.deslocamentos[u], self.deslocamentos[u + 1]):
+                if self.destinos[posicao] == v and not (arcos_bloqueados is not None and arcos_bloqueados[posicao]):
+                    distancia_total += self.pesos[posicao]
+                    tempo_total += self.tempos[posicao]
+                    break
+        return distancia_total, tempo_total
+    
+    def totais(
+        self,
+        caminho: List[int],
+        metrica: str = "distancia",
+        arcos_bloqueados: Optional[Sequence[int]] = None
+    ) -> Tuple[int, int, float]:
+        """
+        Distância, tempo e combustível de um caminho usando, entre cada par,
+        o arco não bloqueado de menor peso na métrica (o mesmo que o Dijkstra escolhe).
+        """
+        coluna = self.coluna(metrica)
+        distancia_total = 0
+        tempo_total = 0
+        combustivel_total = 0.0
+        for u, v in zip(caminho, caminho[1:]):
+            melhor = None
+            for posicao in range(self.deslocamentos[u], self.deslocamentos[u + 1]):
+                if arcos_bloqueados is not None and arcos_bloqueados[posicao]:
+                    continue
+                if self.destinos[posicao] == v and (melhor is None or coluna[posicao] < coluna[melhor]):
+                    melhor = posicao
+            if melhor is not None:
+                distancia_total += self.pesos[melhor]
+                tempo_total += self.tempos[melhor]
+                combustivel_total += self.combustiveis[melhor]
+        return distancia_total, tempo_total, combustivel_total
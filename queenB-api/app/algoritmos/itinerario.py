@@ -0,0 +1,293 @@
+"""
+Ordem de visita de várias paradas (caixeiro-viajante sobre a matriz de
+custos entre aeroportos): Held-Karp exato para poucas paradas e, acima
+disso, heurísticas construtivas melhoradas por 2-opt e Or-opt.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Paradas a partir das quais Held-Karp dá lugar às heurísticas
+EXATO_MAX_PADRAO = 13
+# Melhoria mínima aceita pelas buscas locais (evita ciclos por arredondamento)
+EPSILON = 1e-9
+
+
+@dataclass
+class ResultadoOrdem:
+    """Ordem de visita encontrada (índices da matriz) e seu custo"""
+    ordem: List[int]
+    custo: float
+    metodo: str  # 'held-karp' ou 'heuristica'
+    otimo: bool
+
+
+class OrdemVisitas:
+    """
+    Resolve a ordem de visita sobre uma matriz de custos (não precisa ser
+    simétrica; infinito = sem caminho). A parada 0 é sempre a primeira.
+    
+    Os três formatos de itinerário viram um caminho com início e fim
+    fixos: o retorno à origem usa uma cópia da parada 0 como fim, e o fim
+    livre usa um vértice fictício alcançável de qualquer parada a custo zero.
+    """
+    
+    @staticmethod
+    def resolver(
+        custos: List[List[float]],
+        retornar: bool = False,
+        fim: Optional[int] = None,
+        exato_max: int = EXATO_MAX_PADRAO,
+        tempo_max_s: float = 0.5,
+        semente: int = 0
+    ) -> Optional[ResultadoOrdem]:
+        """
+        Encontra a ordem de menor custo que visita todas as paradas.
+        
+        Args:
+            custos: Matriz n x n de custos entre paradas
+            retornar: Se o itinerário volta à parada 0 ao final
+            fim: Parada fixa no final (ignorada com retornar)
+            exato_max: Máximo de paradas resolvidas por Held-Karp
+            tempo_max_s: Orçamento das melhorias heurísticas
+            semente: Semente das perturbações (mesma consulta, mesma resposta)
+        
+        Returns:
+            ResultadoOrdem (a ordem termina em 0 quando retornar) ou None se
+            nenhuma ordem liga todas as paradas
+        """
+        n = len(custos)
+        infinito = float("inf")
+        if n == 1:
+            return ResultadoOrdem([0, 0] if retornar else [0], 0.0, "held-karp", True)
+        
+        # Caminho de 0 até 'alvo' passando por todas as demais
+        matriz = [list(linha) for linha in custos]
+        if retornar or fim is None:
+            for i, linha in enumerate(matriz):
+                linha.append(custos[i][0] if retornar else 0.0)
+            matriz.append([infinito] * (n + 1))
+            alvo = n
+        else:
+            alvo = fim
+        
+        if n <= exato_max:
+            caminho, custo = OrdemVisitas.held_karp(matriz, 0, alvo)
+            metodo, otimo = "held-karp", True
+        else:
+            caminho, custo = OrdemVisitas.heuristica(matriz, 0, alvo, tempo_max_s, semente)
+            metodo, otimo = "heuristica", False
+        
+        if caminho is None or custo == infinito:
+            return None
+        if alvo == n:
+            caminho = caminho[:-1] + ([0] if retornar else [])
+        return ResultadoOrdem(caminho, custo, metodo, otimo)
+    
+    @staticmethod
+    def held_karp(matriz: List[List[float]], inicio: int, fim: int):
+        """
+        Programação dinâmica sobre subconjuntos: custo[S][j] é o menor custo
+        de sair do início, visitar exatamente S e parar em j. O(2^m · m²)
+        para m paradas intermediárias.
+        
+        Returns:
+            Tupla (caminho, custo) ou (None, infinito)
+        """
+        infinito = float("inf")
+        meios = [v for v in range(len(matriz)) if v != inicio and v != fim]
+        m = len(meios)
+        if m == 0:
+            return [inicio, fim], matriz[inicio][fim]
+        
+        entre = [[matriz[a][b] for b in meios] for a in meios]
+        total = 1 << m
+        custo = [[infinito] * m for _ in range(total)]
+        pai = [[-1] * m for _ in range(total)]
+        for j in range(m):
+            custo[1 << j][j] = matriz[inicio][meios[j]]
+        
+        for conjunto in range(1, total):
+            linha = custo[conjunto]
+            for j in range(m):
+                base = linha[j]
+                if base == infinito or not conjunto >> j & 1:
+                    continue
+                saidas = entre[j]
+                for k in range(m):
+                    if conjunto >> k & 1:
+                        continue
+                    novo = base + saidas[k]
+                    seguinte = conjunto | (1 << k)
+                    if novo < custo[seguinte][k]:
+                        custo[seguinte][k] = novo
+                        pai[seguinte][k] = j
+        
+        completo = total - 1
+        melhor, ultimo = infinito, -1
+        for j in range(m):
+            valor = custo[completo][j] + matriz[meios[j]][fim]
+            if valor < melhor:
+                melhor, ultimo = valor, j
+        if ultimo == -1:
+            return None, infinito
+        
+        ordem = []
+        conjunto, j = completo, ultimo
+        while j != -1:
+            ordem.append(meios[j])
+            conjunto, j = conjunto ^ (1 << j), pai[conjunto][j]
+        return [inicio] + ordem[::-1] + [fim], melhor
+    
+    @staticmethod
+    def heuristica(matriz: List[List[float]], inicio: int, fim: int, tempo_max_s: float, semente: int = 0):
+        """
+        Vizinho mais próximo e inserção mais barata; a melhor das duas passa
+        por 2-opt e Or-opt até um ótimo local. No tempo restante, perturbações
+        (double-bridge) seguidas de nova busca local tentam escapar dele.
+        
+        Trechos sem caminho recebem um custo maior que qualquer ordem viável,
+        para que as buscas locais os eliminem quando possível.
+        
+        Returns:
+            Tupla (caminho, custo) ou (None, infinito)
+        """
+        infinito = float("inf")
+        limite = time.perf_counter() + tempo_max_s
+        finitos = [c for linha in matriz for c in linha if c != infinito]
+        penalidade = sum(finitos) + 1.0
+        penalizada = [[c if c != infinito else penalidade for c in linha] for linha in matriz]
+        
+        candidatos = [
+            OrdemVisitas._vizinho_mais_proximo(penalizada, inicio, fim),
+            OrdemVisitas._insercao_mais_barata(penalizada, inicio, fim)
+        ]
+        melhor = min(
+            (OrdemVisitas._busca_local(penalizada, c, limite) for c in candidatos),
+            key=lambda c: OrdemVisitas.custo(penalizada, c)
+        )
+        melhor_custo = OrdemVisitas.custo(penalizada, melhor)
+        
+        # Perturbação exige ao menos 4 paradas intermediárias
+        aleatorio = random.Random(semente)
+        tentativas = 0
+        while len(melhor) >= 6 and tentativas < 50 * len(melhor) and time.perf_counter() < limite:
+            tentativas += 1
+            a, b, c = sorted(aleatorio.sample(range(1, len(melhor) - 1), 3))
+            perturbado = melhor[:a] + melhor[b:c] + melhor[a:b] + melhor[c:]
+            perturbado = OrdemVisitas._busca_local(penalizada, perturbado, limite)
+            valor = OrdemVisitas.custo(penalizada, perturbado)
+            if valor < melhor_custo - EPSILON:
+                melhor, melhor_custo = perturbado, valor
+        
+        custo = OrdemVisitas.custo(matriz, melhor)
+        if custo == infinito:
+            return None, infinito
+        return melhor, custo
+    
+    @staticmethod
+    def custo(matriz: List[List[float]], caminho: List[int]) -> float:
+        return sum(matriz[a][b] for a, b in zip(caminho, caminho[1:]))
+    
+    @staticmethod
+    def _vizinho_mais_proximo(matriz: List[List[float]], inicio: int, fim: int) -> List[int]:
+        restantes = set(range(len(matriz))) - {inicio, fim}
+        caminho = [inicio]
+        while restantes:
+            atual = matriz[caminho[-1]]
+            proximo = min(restantes, key=lambda v: (atual[v], v))
+            restantes.discard(proximo)
+            caminho.append(proximo)
+        return caminho + [fim]
+    
+    @staticmethod
+    def _insercao_mais_barata(matriz: List[List[float]], inicio: int, fim: int) -> List[int]:
+        """Insere, a cada passo, a parada e posição que menos aumentam o custo"""
+        restantes = set(range(len(matriz))) - {inicio, fim}
+        caminho = [inicio, fim]
+        while restantes:
+            melhor = None
+            for v in sorted(restantes):
+                para_v, de_v = [linha[v] for linha in matriz], matriz[v]
+                for posicao in range(1, len(caminho)):
+                    a, b = caminho[posicao - 1], caminho[posicao]
+                    acrescimo = para_v[a] + de_v[b] - matriz[a][b]
+                    if melhor is None or acrescimo < melhor[0]:
+                        melhor = (acrescimo, v, posicao)
+            _, v, posicao = melhor
+            caminho.insert(posicao, v)
+            restantes.discard(v)
+        return caminho
+    
+    @staticmethod
+    def _busca_local(matriz: List[List[float]], caminho: List[int], limite: float) -> List[int]:
+        """Alterna 2-opt e Or-opt até nenhum melhorar ou o tempo acabar"""
+        caminho = list(caminho)
+        while time.perf_counter() < limite:
+            if OrdemVisitas._dois_opt(matriz, caminho):
+                continue
+            if not OrdemVisitas._or_opt(matriz, caminho):
+                break
+        return caminho
+    
+    @staticmethod
+    def _dois_opt(matriz: List[List[float]], caminho: List[int]) -> bool:
+        """
+        Aplica a primeira inversão de trecho interno caminho[i..j] que reduz
+        o custo. Somas prefixadas nos dois sentidos dão o custo do trecho
+        invertido em O(1), também com custos assimétricos.
+        
+        Returns:
+            Se alguma inversão foi aplicada
+        """
+        n = len(caminho)
+        ida = [0.0] * n
+        volta = [0.0] * n
+        for k in range(1, n):
+            a, b = caminho[k - 1], caminho[k]
+            ida[k] = ida[k - 1] + matriz[a][b]
+            volta[k] = volta[k - 1] + matriz[b][a]
+        
+        for i in range(1, n - 2):
+            antes = caminho[i - 1]
+            entrada_atual = matriz[antes][caminho[i]]
+            for j in range(i + 1, n - 1):
+                depois = caminho[j + 1]
+                atual = entrada_atual + (ida[j] - ida[i]) + matriz[caminho[j]][depois]
+                invertido = matriz[antes][caminho[j]] + (volta[j] - volta[i]) + matriz[caminho[i]][depois]
+                if invertido < atual - EPSILON:
+                    caminho[i:j + 1] = caminho[i:j + 1][::-1]
+                    return True
+        return False
+    
+    @staticmethod
+    def _or_opt(matriz: List[List[float]], caminho: List[int]) -> bool:
+        """
+        Aplica o primeiro deslocamento de um segmento interno de 1 a 3
+        paradas (sem inverter) para outra posição que reduz o custo.
+        
+        Returns:
+            Se algum deslocamento foi aplicado
+        """
+        n = len(caminho)
+        for tamanho in (1, 2, 3):
+            for i in range(1, n - tamanho):
+                primeiro, ultimo = caminho[i], caminho[i + tamanho - 1]
+                antes, depois = caminho[i - 1], caminho[i + tamanho]
+                ganho = matriz[antes][primeiro] + matriz[ultimo][depois] - matriz[antes][depois]
+                if ganho <= EPSILON:
+                    continue
+                for k in range(n - 1):
+                    if i - 1 <= k <= i + tamanho - 1:
+                        continue
+                    a, b = caminho[k], caminho[k + 1]
+                    acrescimo = matriz[a][primeiro] + matriz[ultimo][b] - matriz[a][b]
+                    if acrescimo < ganho - EPSILON:
+                        segmento = caminho[i:i + tamanho]
+                        del caminho[i:i + tamanho]
+                        destino = k + 1 if k < i else k + 1 - tamanho
+                        caminho[destino:destino] = segmento
+                        return True
+        return False
@@ -0,0 +1,134 @@
+"""
+Restrições de consulta (aeroportos e países a evitar, alcance máximo por
+trecho) compiladas em mapas de bloqueio sobre o grafo compacto.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from .grafo_compacto import GrafoCompacto
+
+# Limites de trecho distintos cujos mapas de arcos ficam em memória
+LIMITES_TRECHO_MAX = 32
+
+
+@dataclass(frozen=True)
+class Restricoes:
+    """Restrições de uma consulta, normalizadas (ordenadas e sem repetição)"""
+    aeroportos: Tuple[str, ...] = ()  # códigos IATA a evitar
+    paises: Tuple[str, ...] = ()  # países a evitar (minúsculas)
+    max_trecho_km: Optional[int] = None
+    
+    @property
+    def vazia(self) -> bool:
+        return not self.aeroportos and not self.paises and self.max_trecho_km is None
+    
+    @property
+    def chave(self) -> str:
+        """Representação canônica, usada como chave de cache"""
+        partes = []
+        if self.aeroportos:
+            partes.append("aeroportos=" + ",".join(self.aeroportos))
+        if self.paises:
+            partes.append("paises=" + ",".join(self.paises))
+        if self.max_trecho_km is not None:
+            partes.append(f"max_trecho_km={self.max_trecho_km}")
+        return ";".join(partes)
+
+
+@dataclass
+class Mascara:
+    """
+    Mapas de bloqueio de uma consulta: um byte por vértice e por arco
+    (posição no CSR), 1 = bloqueado. None quando nada daquele tipo é bloqueado.
+    """
+    vertices: Optional[bytes] = None
+    arcos: Optional[bytes] = None
+    
+    def bloqueia_vertice(self, v: int) -> bool:
+        return self.vertices is not None and self.vertices[v] == 1
+
+
+class MascarasRestricao:
+    """
+    Mapas pré-compilados a partir dos atributos de aeroportos e rotas de
+    uma versão do grafo compacto.
+    
+    Cada país tem seu mapa de vértices calculado uma vez; os mapas de arcos
+    por alcance máximo de trecho são calculados na primeira consulta que
+    usa o limite e mantidos (LRU). Compilar uma consulta só combina mapas
+    prontos (OU bit a bit em inteiros, feito em C), sem percorrer o grafo,
+    e a busca consulta um byte por arco e por vértice alcançado.
+    """
+    
+    def __init__(self, compacto: GrafoCompacto, paises: List[str]):
+        """
+        Args:
+            compacto: Grafo compilado
+            paises: País de cada vértice (mesma ordem de compacto.codigos)
+        """
+        self.compacto = compacto
+        n = compacto.total_vertices
+        
+        por_pais: Dict[str, bytearray] = {}
+        for v, pais in enumerate(paises):
+            chave = (pais or "").strip().lower()
+            if chave:
+                por_pais.setdefault(chave, bytearray(n))[v] = 1
+        self._por_pais: Dict[str, bytes] = {pais: bytes(mapa) for pais, mapa in por_pais.items()}
+        self._por_limite: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def paises(self) -> List[str]:
+        return list(self._por_pais)
+    
+    @property
+    def limites_trecho(self) -> List[int]:
+        with self._lock:
+            return list(self._por_limite)
+    
+    def _arcos_acima(self, limite: int) -> bytes:
+        """Mapa dos arcos com distância acima do limite"""
+        with self._lock:
+            mapa = self._por_limite.get(limite)
+            if mapa is not None:
+                self._por_limite.move_to_end(limite)
+                return mapa
+        
+        mapa = bytes(peso > limite for peso in self.compacto.pesos)
+        with self._lock:
+            self._por_limite[limite] = mapa
+            while len(self._por_limite) > LIMITES_TRECHO_MAX:
+                self._por_limite.popitem(last=False)
+        return mapa
+    
+    def compilar(self, restricoes: Restricoes) -> Mascara:
+        """
+        Combina os mapas pré-compilados para as restrições da consulta.
+        
+        Aeroportos ou países desconhecidos no grafo não bloqueiam nada.
+        """
+        n = self.compacto.total_vertices
+        vertices = None
+        
+        mapas = [self._por_pais[pais] for pais in restricoes.paises if pais in self._por_pais]
+        if mapas:
+            combinado = 0
+            for mapa in mapas:
+                combinado |= int.from_bytes(mapa, "little")
+            vertices = bytearray(combinado.to_bytes(n, "little"))
+        
+        indices = [self.compacto.indice[c] for c in restricoes.aeroportos if c in self.compacto.indice]
+        if indices:
+            if vertices is None:
+                vertices = bytearray(n)
+            for v in indices:
+                vertices[v] = 1
+        
+        arcos = None
+        if restricoes.max_trecho_km is not None:
+            arcos = self._arcos_acima(restricoes.max_trecho_km)
+        
+        return Mascara(bytes(vertices) if vertices is not None else None, arcos)
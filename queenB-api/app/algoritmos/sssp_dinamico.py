@@ -0,0 +1,158 @@
+"""
+Manutenção dinâmica de caminhos mínimos (estilo Ramalingam-Reps).
+Repara um ResultadoDijkstra após inserção, remoção ou mudança de peso de
+arestas, recalculando apenas a parte afetada da árvore de caminhos.
+"""
+
+import heapq
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .grafo import Grafo, METRICAS
+from .dijkstra import ResultadoDijkstra
+
+
+class CaminhosDinamicos:
+    """
+    Reparo incremental de árvores de caminhos mínimos de origem única.
+    
+    O grafo já deve refletir as alterações; `arcos` são os pares
+    (origem, destino) cujas arestas foram inseridas, removidas ou reponderadas.
+    """
+    
+    @staticmethod
+    def reparar(grafo: Grafo, resultado: ResultadoDijkstra, arcos: Iterable[Tuple[str, str]]) -> ResultadoDijkstra:
+        """
+        Atualiza no lugar a árvore de caminhos mínimos após alterações em arcos.
+        
+        1. Arcos alterados que pertencem à árvore invalidam a subárvore
+           abaixo deles (conjunto afetado), cujas distâncias são zeradas.
+        2. Cada vértice afetado recebe a melhor distância vinda de um
+           predecessor não afetado; arcos que ficaram mais baratos semeiam
+           melhorias diretas.
+        3. Uma propagação no estilo Dijkstra, a partir apenas desses vértices,
+           fecha o reparo.
+        
+        Só são tocadas as entradas de vértices afetados ou melhorados: o
+        índice de filhos da árvore é montado uma vez, no primeiro reparo, e
+        mantido a cada troca de pai. Leitores concorrentes devem sincronizar
+        com quem chama (ver GrafoService._lock).
+        
+        Args:
+            grafo: Grafo já atualizado
+            resultado: Árvore calculada antes das alterações (modificada)
+            arcos: Pares (origem, destino) alterados
+            
+        Returns:
+            O próprio resultado, equivalente a executar Dijkstra no grafo
+            atualizado, na mesma métrica da árvore original
+        """
+        custo = attrgetter(METRICAS[resultado.metrica])
+        infinito = float('inf')
+        distancia = resultado.distancia
+        anterior = resultado.anterior
+        tempo_total = resultado.tempo_total
+        arcos = list(arcos)
+        
+        if resultado.filhos is None:
+            resultado.filhos = CaminhosDinamicos._indice_filhos(anterior)
+        filhos = resultado.filhos
+        
+        def definir_pai(vertice: str, pai: Optional[str]) -> None:
+            antigo = anterior.get(vertice)
+            if antigo is not None:
+                irmaos = filhos.get(antigo)
+                if irmaos is not None:
+                    irmaos.discard(vertice)
+                    if not irmaos:
+                        del filhos[antigo]
+            if pai is not None:
+                filhos.setdefault(pai, set()).add(vertice)
+            anterior[vertice] = pai
+        
+        # Vértices novos no grafo (extremos de arcos inseridos) ainda inalcançados
+        for origem, destino in arcos:
+            for vertice in (origem, destino):
+                if vertice not in distancia and grafo.tem_vertice(vertice):
+                    distancia[vertice] = infinito
+                    anterior[vertice] = None
+                    tempo_total[vertice] = 0
+        
+        afetados = CaminhosDinamicos._subarvores_afetadas(anterior, filhos, arcos)
+        for vertice in afetados:
+            distancia[vertice] = infinito
+            definir_pai(vertice, None)
+            tempo_total[vertice] = 0
+        
+        fila: List[Tuple[float, str]] = []
+        
+        # Vértices afetados: melhor entrada a partir da parte intacta da árvore
+        for vertice in afetados:
+            melhor, pai, tempo = infinito, None, 0
+            for predecessor, aresta in grafo.predecessores(vertice):
+                if predecessor in afetados:
+                    continue
+                nova_dist = distancia.get(predecessor, infinito) + custo(aresta)
+                if nova_dist < melhor:
+                    melhor, pai, tempo = nova_dist, predecessor, tempo_total[predecessor] + aresta.tempo
+            if melhor < infinito:
+                distancia[vertice] = melhor
+                definir_pai(vertice, pai)
+                tempo_total[vertice] = tempo
+                heapq.heappush(fila, (melhor, vertice))
+        
+        # Arcos inseridos ou mais baratos
+        for origem, destino in arcos:
+            dist_origem = distancia.get(origem, infinito)
+            if dist_origem == infinito:
+                continue
+            for aresta in grafo.vizinhos(origem):
+                if aresta.destino != destino:
+                    continue
+                nova_dist = dist_origem + custo(aresta)
+                if nova_dist < distancia.get(destino, infinito):
+                    distancia[destino] = nova_dist
+                    definir_pai(destino, origem)
+                    tempo_total[destino] = tempo_total[origem] + aresta.tempo
+                    heapq.heappush(fila, (nova_dist, destino))
+        
+        # Propagação restrita aos vértices cuja distância mudou
+        while fila:
+            dist_u, u = heapq.heappop(fila)
+            if dist_u > distancia[u]:
+                continue
+            for aresta in grafo.vizinhos(u):
+                v = aresta.destino
+                nova_dist = dist_u + custo(aresta)
+                if nova_dist < distancia.get(v, infinito):
+                    distancia[v] = nova_dist
+                    definir_pai(v, u)
+                    tempo_total[v] = tempo_total[u] + aresta.tempo
+                    heapq.heappush(fila, (nova_dist, v))
+        
+        return resultado
+    
+    @staticmethod
+    def _indice_filhos(anterior: Dict[str, Optional[str]]) -> Dict[str, Set[str]]:
+        """Filhos de cada vértice na árvore descrita por `anterior`"""
+        filhos: Dict[str, Set[str]] = {}
+        for vertice, pai in anterior.items():
+            if pai is not None:
+                filhos.setdefault(pai, set()).add(vertice)
+        return filhos
+    
+    @staticmethod
+    def _subarvores_afetadas(
+        anterior: Dict[str, Optional[str]],
+        filhos: Dict[str, Set[str]],
+        arcos: List[Tuple[str, str]]
+    ) -> Set[str]:
+        """Vértices cujo caminho na árvore passa por algum arco alterado"""
+        afetados: Set[str] = set()
+        pilha = [destino for origem, destino in arcos if anterior.get(destino) == origem]
+        while pilha:
+            vertice = pilha.pop()
+            if vertice in afetados:
+                continue
+            afetados.add(vertice)
+            pilha.extend(filhos.get(vertice, ()))
+        return afetados
@@ -16,6 +16,75 @@ class Settings(BaseSettings):
     API_TITLE: str = "API de Roteirização de Aeroportos"
     API_VERSION: str = "1.0.0"
     
+    # Nível dos logs da aplicação (ex.: relatório de migrações com os planos
+    # de consulta antes e depois, avisos do snapshot e do cache L2)
+    LOG_LEVEL: str = "INFO"
+    
+    # Log de alterações: quantas versões recentes mantêm histórico completo
+    ALTERACOES_RETIDAS: int = 1000
+    
+    # Intervalo entre verificações do grafo em memória contra o banco (segundos)
+    INTERVALO_VERIFICACAO_GRAFO_S: int = 60
+    
+    # Snapshot binário do grafo ao lado do banco (<DATABASE_PATH>.grafo)
+    SNAPSHOT_GRAFO: bool = True
+    
+    # Cache L2 de caminhos em SQLite ao lado do banco (<DATABASE_PATH>.cache), em MB (0 = desativado)
+    CACHE_CAMINHOS_MAX_MB: int = 32
+    
+    # Intervalo com que workers ociosos verificam escritas de outros processos (segundos)
+    INTERVALO_SINCRONIZACAO_S: float = 1.0
+    
+    # Grafo dirigido: cada rota vale só no sentido origem -> destino (a volta
+    # precisa de rota própria). Com a mesclagem, entre arcos paralelos do
+    # mesmo par só ficam os de menor peso em alguma métrica
+    GRAFO_DIRIGIDO: bool = False
+    GRAFO_MESCLAR_PARALELAS: bool = True
+    
+    # Máximo de árvores de caminhos mínimos (por origem) mantidas em memória
+    ARVORES_CAMINHOS_MAX: int = 32
+    
+    # Voos programados: conexão mínima padrão (aeroportos sem valor próprio)
+    # e horizonte máximo de uma viagem nas consultas por horário
+    CONEXAO_MINIMA_PADRAO_MIN: int = 45
+    HORIZONTE_VIAGEM_H: int = 48
+    
+    # Agendador de endpoints custosos: threads e fila por classe, e tempo
+    # máximo de espera na fila antes de responder 503
+    AGENDADOR_CAMINHOS_WORKERS: int = 4
+    AGENDADOR_CAMINHOS_FILA: int = 32
+    AGENDADOR_EXPORTACAO_WORKERS: int = 2
+    AGENDADOR_EXPORTACAO_FILA: int = 8
+    AGENDADOR_TEMPO_MAX_FILA_S: float = 5.0
+    
+    # Pool de processos para buscas (0 = desativado). Consultas individuais
+    # vão ao pool apenas em grafos com ao menos POOL_LIMIAR_ARCOS arcos
+    POOL_PROCESSOS: int = 0
+    POOL_LIMIAR_ARCOS: int = 50000
+    
+    # Fila de prioridade do Dijkstra por motor: árvores sobre o Grafo e
+    # grafo compacto (rotas restritas, pool e landmarks do ALT). Opções:
+    # 'binaria', 'daria', 'dial' ou 'radix'; as duas últimas exigem pesos
+    # inteiros e usam a binária na métrica de combustível. Comparação em
+    # benchmarks/filas_prioridade.py
+    DIJKSTRA_FILA: str = "binaria"
+    DIJKSTRA_COMPACTO_FILA: str = "binaria"
+    
+    # ALT (A* com landmarks): quantidade de landmarks, pré-processados a cada
+    # versão do grafo, e método de escolha ('distante' ou 'evitar')
+    ALT_LANDMARKS: int = 8
+    ALT_SELECAO: str = "distante"
+    
+    # Overlay multinível (CRP): máximo de vértices por célula do nível mais
+    # fino (regiões maiores são subdivididas)
+    OVERLAY_TAMANHO_CELULA: int = 64
+    
+    # Itinerário por várias paradas: máximo de aeroportos por consulta, até
+    # quantos a ordem é exata (Held-Karp) e orçamento das heurísticas acima disso
+    ITINERARIO_MAX_PARADAS: int = 50
+    ITINERARIO_EXATO_MAX: int = 13
+    ITINERARIO_TEMPO_MAX_MS: int = 500
+    
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8080,http://localhost:4200"
 
@@ -34,6 +103,16 @@ class Settings(BaseSettings):
         """Retorna Path absoluto do banco SQLite"""
         return Path(self.DATABASE_PATH).resolve()
     
+    @property
+    def snapshot_grafo_path(self) -> Path:
+        """Retorna Path do snapshot binário do grafo"""
+        return Path(f"{self.DATABASE_PATH}.grafo")
+    
+    @property
+    def cache_caminhos_path(self) -> Path:
+        """Retorna Path do banco SQLite do cache L2 de caminhos"""
+        return Path(f"{self.DATABASE_PATH}.cache")
+    
     @property
     def allowed_origins_list(self) -> list:
         """Retorna lista de origens permitidas"""
@@ -74,75 +74,10 @@ def execute_insert(query: str, params: tuple = None) -> int:
 
 def init_database():
     """
-    Inicializa o banco de dados SQLite com as tabelas necessárias.
+    Inicializa o banco de dados SQLite aplicando as migrações pendentes.
+    
+    Returns:
+        Relatório das migrações aplicadas (vazio se o esquema já estava atualizado)
     """
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Tabela de usuários
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS usuario (
-                id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                senha_hash TEXT NOT NULL,
-                ativo INTEGER DEFAULT 1,
-                data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Tabela de aeroportos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS aeroporto (
-                id_aeroporto INTEGER PRIMARY KEY AUTOINCREMENT,
-                codigo_iata TEXT NOT NULL UNIQUE,
-                nome TEXT NOT NULL,
-                cidade TEXT,
-                estado TEXT,
-                pais TEXT,
-                latitude REAL,
-                longitude REAL,
-                fuso_horario TEXT,
-                ativo INTEGER DEFAULT 1,
-                data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Tabela de rotas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rota (
-                id_rota INTEGER PRIMARY KEY AUTOINCREMENT,
-                id_aeroporto_origem INTEGER NOT NULL,
-                id_aeroporto_destino INTEGER NOT NULL,
-                distancia_km INTEGER NOT NULL,
-                tempo_estimado_min INTEGER,
-                combustivel_litros REAL,
-                ativo INTEGER DEFAULT 1,
-                data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (id_aeroporto_origem) REFERENCES aeroporto(id_aeroporto),
-                FOREIGN KEY (id_aeroporto_destino) REFERENCES aeroporto(id_aeroporto)
-            )
-        """)
-        
-        # Índices para melhorar performance
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_rota_origem 
-            ON rota(id_aeroporto_origem)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_rota_destino 
-            ON rota(id_aeroporto_destino)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_aeroporto_codigo 
-            ON aeroporto(codigo_iata)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_usuario_email 
-            ON usuario(email)
-        """)
-        
-        conn.commit()
\ No newline at end of file
+    from .migracoes import aplicar_migracoes
+    return aplicar_migracoes()
\ No newline at end of file
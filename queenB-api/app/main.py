@@ -2,14 +2,27 @@
 Aplicação FastAPI - API de Roteirização de Aeroportos
 """
 
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .routers import caminhos, usuarios, aeroportos, rotas, dados
+from .routers import caminhos, usuarios, aeroportos, rotas, voos, dados, eventos
 from .database import init_database
+from .services.pool_caminhos import pool_caminhos
+from .services.sincronizacao import sincronizador, MiddlewareSincronizacao
+from .services.grafo_service import GrafoService
 
-# Inicializa banco de dados SQLite
-init_database()
+# Logs da aplicação (os do Uvicorn/Gunicorn têm configuração própria)
+logging.basicConfig(
+    level=settings.LOG_LEVEL.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
+# Inicializa banco de dados SQLite; o relatório das migrações aplicadas
+# (planos de consulta antes e depois) também sai no log
+relatorio_migracoes = init_database()
+sincronizador.iniciar()
 
 # Cria aplicação FastAPI
 app = FastAPI(
@@ -31,13 +44,17 @@ app = FastAPI(
     - Cálculo automático de pesos (distância, combustível)
     
     **Módulo de Rotas:**
-    - Algoritmo de Dijkstra (menor distância)
+    - Algoritmo de Dijkstra (menor distância, tempo ou combustível)
     - Algoritmo BFS (menor número de paradas)
+    - ALT: A* com landmarks (menor distância, busca orientada ao destino)
+    - Overlay multinível (menor distância, tempo ou combustível)
+    - Itinerário por várias paradas (melhor ordem de visita)
     - Comparação entre algoritmos
     
     **Módulo de Dados:**
     - Exportação de grafo completo em JSON
     - Estatísticas do sistema
+    - Aeroportos e rotas críticos (pontos únicos de falha)
     - Dados para visualização
     
     ### Tecnologias:
@@ -57,12 +74,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Aplica escritas de outros workers antes de cada requisição
+app.add_middleware(MiddlewareSincronizacao)
+
+# Relatório das migrações desta inicialização, exposto em /dados/metricas
+app.state.migracoes = relatorio_migracoes
+
 # Registra todos os routers
 app.include_router(usuarios.router)      # Módulo de Usuário
 app.include_router(aeroportos.router)    # CRUD Aeroportos
 app.include_router(rotas.router)         # CRUD Rotas
+app.include_router(voos.router)          # CRUD Voos programados
 app.include_router(caminhos.router)      # Algoritmos (Dijkstra, BFS)
 app.include_router(dados.router)         # Exportação JSON
+app.include_router(eventos.router)       # Alterações em tempo real (SSE)
+
+
+@app.on_event("startup")
+async def iniciar_sincronizacao():
+    """Acompanha escritas de outros workers mesmo sem requisições"""
+    asyncio.create_task(sincronizador.monitorar(settings.INTERVALO_SINCRONIZACAO_S))
+
+
+@app.on_event("shutdown")
+def encerrar_pool():
+    """Encerra os processos de cálculo e libera a memória compartilhada"""
+    pool_caminhos.encerrar()
+
+
+@app.on_event("shutdown")
+def salvar_snapshot_grafo():
+    """Grava o grafo atual para que a próxima inicialização não o reconstrua"""
+    sincronizador.sincronizar()
+    GrafoService.salvar_snapshot(sincronizador.versao_log)
 
 
 @app.get("/")
@@ -84,6 +128,7 @@ def root():
             "aeroportos": {
                 "criar": "POST /aeroportos",
                 "listar": "GET /aeroportos",
+                "busca": "GET /aeroportos/busca?q=sao",
                 "buscar": "GET /aeroportos/{id}",
                 "atualizar": "PUT /aeroportos/{id}",
                 "deletar": "DELETE /aeroportos/{id}"
@@ -95,16 +140,36 @@ def root():
                 "atualizar": "PUT /rotas/{id}",
                 "deletar": "DELETE /rotas/{id}"
             },
+            "voos": {
+                "criar": "POST /voos",
+                "listar": "GET /voos",
+                "buscar": "GET /voos/{id}",
+                "atualizar": "PUT /voos/{id}",
+                "deletar": "DELETE /voos/{id}"
+            },
             "algoritmos": {
-                "dijkstra": "GET /caminhos/menor?origem=GRU&destino=REC",
-                "bfs": "GET /caminhos/bfs?origem=GRU&destino=GIG",
-                "comparar": "GET /caminhos/comparar?origem=GRU&destino=REC"
+                "dijkstra": "GET /caminhos/menor?origem=GRU&destino=REC&peso=tempo",
+                "bfs": "GET /caminhos/bfs?origem=GRU&destino=GIG&evitar=BSB",
+                "alt": "GET /caminhos/alt?origem=GRU&destino=REC",
+                "overlay": "GET /caminhos/overlay?origem=GRU&destino=REC&metrica=tempo",
+                "itinerario": "GET /caminhos/itinerario?aeroportos=GRU,BSB,REC,FOR,MAO&retornar=true",
+                "comparar": "GET /caminhos/comparar?origem=GRU&destino=REC",
+                "horario": "GET /caminhos/horario?origem=GRU&destino=REC&partida=2025-01-10T08:00",
+                "alcance": "GET /caminhos/alcance?origem=GRU&max_km=3000",
+                "lote": "POST /caminhos/lote"
             },
             "dados": {
                 "grafo_json": "GET /dados/grafo",
+                "grafo_delta": "GET /dados/grafo/delta?desde=0",
                 "aeroportos_json": "GET /dados/aeroportos",
                 "rotas_json": "GET /dados/rotas",
-                "estatisticas": "GET /dados/estatisticas"
+                "estatisticas": "GET /dados/estatisticas",
+                "criticos": "GET /dados/criticos",
+                "impacto_fechamento": "GET /dados/criticos/impacto?aeroporto=FOR",
+                "metricas": "GET /dados/metricas"
+            },
+            "eventos": {
+                "alteracoes_sse": "GET /eventos"
             }
         }
     }
@@ -0,0 +1,390 @@
+"""
+Migrações versionadas do esquema SQLite (controladas por PRAGMA user_version)
+"""
+
+import logging
+import sqlite3
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+from .database import get_db
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Migracao:
+    """Uma migração do esquema, aplicada uma única vez em ordem de versão"""
+    versao: int
+    descricao: str
+    aplicar: Callable[[sqlite3.Cursor], None]
+
+
+# Consultas mais frequentes da API, cujos planos são reportados a cada migração
+CONSULTAS_MONITORADAS: Dict[str, str] = {
+    "grafo_rotas_ativas": """
+        SELECT r.id_rota, r.distancia_km, r.tempo_estimado_min,
+               ao.codigo_iata, ad.codigo_iata
+        FROM rota r
+        INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
+        INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
+        WHERE r.ativo = 1
+    """,
+    "aeroporto_por_iata": "SELECT id_aeroporto FROM aeroporto WHERE codigo_iata = 'GRU' COLLATE NOCASE",
+    "rota_por_par_od": "SELECT id_rota FROM rota WHERE id_aeroporto_origem = 1 AND id_aeroporto_destino = 2",
+    "rotas_ativas_por_origem": "SELECT * FROM rota WHERE ativo = 1 AND id_aeroporto_origem = 1",
+    "aeroportos_ativos": "SELECT * FROM aeroporto WHERE ativo = 1 ORDER BY nome",
+    "voos_ativos_por_partida": "SELECT * FROM voo WHERE ativo = 1 ORDER BY partida",
+}
+
+
+def _m001_esquema_inicial(cursor: sqlite3.Cursor) -> None:
+    """Tabelas de usuários, aeroportos e rotas com os índices originais"""
+    # Tabela de usuários
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS usuario (
+            id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            senha_hash TEXT NOT NULL,
+            ativo INTEGER DEFAULT 1,
+            data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # Tabela de aeroportos
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS aeroporto (
+            id_aeroporto INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_iata TEXT NOT NULL UNIQUE,
+            nome TEXT NOT NULL,
+            cidade TEXT,
+            estado TEXT,
+            pais TEXT,
+            latitude REAL,
+            longitude REAL,
+            fuso_horario TEXT,
+            ativo INTEGER DEFAULT 1,
+            data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # Tabela de rotas
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rota (
+            id_rota INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_aeroporto_origem INTEGER NOT NULL,
+            id_aeroporto_destino INTEGER NOT NULL,
+            distancia_km INTEGER NOT NULL,
+            tempo_estimado_min INTEGER,
+            combustivel_litros REAL,
+            ativo INTEGER DEFAULT 1,
+            data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (id_aeroporto_origem) REFERENCES aeroporto(id_aeroporto),
+            FOREIGN KEY (id_aeroporto_destino) REFERENCES aeroporto(id_aeroporto)
+        )
+    """)
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rota_origem ON rota(id_aeroporto_origem)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rota_destino ON rota(id_aeroporto_destino)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_aeroporto_codigo ON aeroporto(codigo_iata)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_usuario_email ON usuario(email)")
+
+
+def _m002_busca_textual_aeroportos(cursor: sqlite3.Cursor) -> None:
+    """Índice FTS5 de aeroportos mantido por triggers"""
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS aeroporto_fts USING fts5(
+            nome,
+            cidade,
+            estado,
+            pais,
+            codigo_iata,
+            content='aeroporto',
+            content_rowid='id_aeroporto',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='1 2 3'
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS aeroporto_fts_insert
+        AFTER INSERT ON aeroporto BEGIN
+            INSERT INTO aeroporto_fts (rowid, nome, cidade, estado, pais, codigo_iata)
+            VALUES (new.id_aeroporto, new.nome, new.cidade, new.estado, new.pais, new.codigo_iata);
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS aeroporto_fts_delete
+        AFTER DELETE ON aeroporto BEGIN
+            INSERT INTO aeroporto_fts (aeroporto_fts, rowid, nome, cidade, estado, pais, codigo_iata)
+            VALUES ('delete', old.id_aeroporto, old.nome, old.cidade, old.estado, old.pais, old.codigo_iata);
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS aeroporto_fts_update
+        AFTER UPDATE OF nome, cidade, estado, pais, codigo_iata ON aeroporto BEGIN
+            INSERT INTO aeroporto_fts (aeroporto_fts, rowid, nome, cidade, estado, pais, codigo_iata)
+            VALUES ('delete', old.id_aeroporto, old.nome, old.cidade, old.estado, old.pais, old.codigo_iata);
+            INSERT INTO aeroporto_fts (rowid, nome, cidade, estado, pais, codigo_iata)
+            VALUES (new.id_aeroporto, new.nome, new.cidade, new.estado, new.pais, new.codigo_iata);
+        END
+    """)
+    
+    # Indexa aeroportos cadastrados antes da criação do índice
+    cursor.execute("INSERT INTO aeroporto_fts (aeroporto_fts) VALUES ('rebuild')")
+
+
+def _m003_indice_iata_nocase(cursor: sqlite3.Cursor) -> None:
+    """Índice para buscas por IATA sem diferenciar maiúsculas"""
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_aeroporto_codigo_nocase
+        ON aeroporto(codigo_iata COLLATE NOCASE)
+    """)
+
+
+def _m004_indices_desempenho(cursor: sqlite3.Cursor) -> None:
+    """Índices compostos e parciais para rotas ativas e unicidade do par origem/destino"""
+    duplicadas = cursor.execute("""
+        SELECT id_aeroporto_origem, id_aeroporto_destino, COUNT(*) AS total
+        FROM rota
+        GROUP BY id_aeroporto_origem, id_aeroporto_destino
+        HAVING COUNT(*) > 1
+    """).fetchall()
+    if duplicadas:
+        raise RuntimeError(
+            f"Rotas duplicadas para o mesmo par origem/destino impedem a migração: {duplicadas}"
+        )
+    
+    # Um par origem/destino por rota; também atende buscas por origem
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_rota_origem_destino
+        ON rota(id_aeroporto_origem, id_aeroporto_destino)
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_rota_origem")
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_rota_ativo_origem_destino
+        ON rota(ativo, id_aeroporto_origem, id_aeroporto_destino)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_rota_ativa_origem
+        ON rota(id_aeroporto_origem) WHERE ativo = 1
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_rota_ativa_destino
+        ON rota(id_aeroporto_destino) WHERE ativo = 1
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_aeroporto_ativo_nome
+        ON aeroporto(nome) WHERE ativo = 1
+    """)
+
+
+def _m005_log_alteracoes(cursor: sqlite3.Cursor) -> None:
+    """Log monotônico de alterações em aeroportos e rotas, alimentado por triggers"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS alteracao (
+            versao INTEGER PRIMARY KEY AUTOINCREMENT,
+            entidade TEXT NOT NULL,
+            id_entidade INTEGER NOT NULL,
+            operacao TEXT NOT NULL,
+            data_alteracao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_alteracao_entidade
+        ON alteracao(entidade, id_entidade)
+    """)
+    
+    # Triggers gravam a alteração na mesma transação da escrita
+    for entidade, chave in (("aeroporto", "id_aeroporto"), ("rota", "id_rota")):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {entidade}_alteracao_insert
+            AFTER INSERT ON {entidade} BEGIN
+                INSERT INTO alteracao (entidade, id_entidade, operacao)
+                VALUES ('{entidade}', new.{chave}, 'criacao');
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {entidade}_alteracao_update
+            AFTER UPDATE ON {entidade} BEGIN
+                INSERT INTO alteracao (entidade, id_entidade, operacao)
+                VALUES (
+                    '{entidade}', new.{chave},
+                    CASE WHEN old.ativo = 1 AND new.ativo = 0 THEN 'remocao' ELSE 'atualizacao' END
+                );
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {entidade}_alteracao_delete
+            AFTER DELETE ON {entidade} BEGIN
+                INSERT INTO alteracao (entidade, id_entidade, operacao)
+                VALUES ('{entidade}', old.{chave}, 'remocao');
+            END
+        """)
+
+
+def _m006_voos_programados(cursor: sqlite3.Cursor) -> None:
+    """Voos programados por rota e tempo mínimo de conexão por aeroporto"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS voo (
+            id_voo INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_rota INTEGER NOT NULL,
+            codigo_voo TEXT,
+            invertido INTEGER DEFAULT 0,
+            partida TIMESTAMP NOT NULL,
+            chegada TIMESTAMP NOT NULL,
+            ativo INTEGER DEFAULT 1,
+            data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (id_rota) REFERENCES rota(id_rota)
+        )
+    """)
+    
+    # Varredura do CSA lê os voos ativos já ordenados por partida
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voo_ativo_partida
+        ON voo(partida) WHERE ativo = 1
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_voo_rota ON voo(id_rota)")
+    
+    colunas = [c['name'] for c in cursor.execute("PRAGMA table_info(aeroporto)").fetchall()]
+    if 'conexao_minima_min' not in colunas:
+        cursor.execute("ALTER TABLE aeroporto ADD COLUMN conexao_minima_min INTEGER")
+
+
+
+def _m007_log_alteracoes_voos(cursor: sqlite3.Cursor) -> None:
+    """Voos também no log, para que outros processos vejam alterações de horários"""
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS voo_alteracao_insert
+        AFTER INSERT ON voo BEGIN
+            INSERT INTO alteracao (entidade, id_entidade, operacao)
+            VALUES ('voo', new.id_voo, 'criacao');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS voo_alteracao_update
+        AFTER UPDATE ON voo BEGIN
+            INSERT INTO alteracao (entidade, id_entidade, operacao)
+            VALUES (
+                'voo', new.id_voo,
+                CASE WHEN old.ativo = 1 AND new.ativo = 0 THEN 'remocao' ELSE 'atualizacao' END
+            );
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS voo_alteracao_delete
+        AFTER DELETE ON voo BEGIN
+            INSERT INTO alteracao (entidade, id_entidade, operacao)
+            VALUES ('voo', old.id_voo, 'remocao');
+        END
+    """)
+
+
+
+def _m008_identificador_instancia(cursor: sqlite3.Cursor) -> None:
+    """
+    Identificador aleatório do banco: distingue um banco recriado (cujo log
+    de alterações recomeça do zero) para caches persistidos fora dele
+    """
+    cursor.execute("CREATE TABLE IF NOT EXISTS instancia (id TEXT NOT NULL)")
+    cursor.execute("INSERT INTO instancia (id) VALUES (?)", (uuid.uuid4().hex,))
+
+
+MIGRACOES: List[Migracao] = [
+    Migracao(1, "Esquema inicial", _m001_esquema_inicial),
+    Migracao(2, "Busca textual (FTS5) de aeroportos", _m002_busca_textual_aeroportos),
+    Migracao(3, "Índice IATA sem diferenciar maiúsculas", _m003_indice_iata_nocase),
+    Migracao(4, "Índices compostos/parciais e rota única por par", _m004_indices_desempenho),
+    Migracao(5, "Log de alterações de aeroportos e rotas", _m005_log_alteracoes),
+    Migracao(6, "Voos programados e tempo mínimo de conexão", _m006_voos_programados),
+    Migracao(7, "Log de alterações de voos", _m007_log_alteracoes_voos),
+    Migracao(8, "Identificador da instância do banco", _m008_identificador_instancia),
+]
+
+
+def planos_consultas(cursor: sqlite3.Cursor) -> Dict[str, List[str]]:
+    """
+    Retorna o plano (EXPLAIN QUERY PLAN) de cada consulta monitorada.
+    
+    Consultas que ainda não podem ser planejadas (tabelas inexistentes)
+    aparecem com lista vazia.
+    """
+    planos = {}
+    for nome, query in CONSULTAS_MONITORADAS.items():
+        try:
+            linhas = cursor.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+        except sqlite3.OperationalError:
+            planos[nome] = []
+            continue
+        planos[nome] = [linha['detail'] for linha in linhas]
+    return planos
+
+
+def aplicar_migracoes() -> List[dict]:
+    """
+    Aplica, em ordem, as migrações com versão maior que PRAGMA user_version.
+    
+    Cada migração roda em sua própria transação junto com a atualização
+    de user_version. Ao final, se algo foi aplicado, atualiza as
+    estatísticas do planejador com ANALYZE.
+    
+    Returns:
+        Relatório por migração aplicada com os planos das consultas
+        monitoradas antes e depois
+    """
+    relatorio = []
+    
+    with get_db() as conn:
+        # Transações controladas explicitamente (BEGIN/COMMIT)
+        conn.isolation_level = None
+        cursor = conn.cursor()
+        
+        versao_atual = cursor.execute("PRAGMA user_version").fetchone()['user_version']
+        
+        for migracao in MIGRACOES:
+            if migracao.versao <= versao_atual:
+                continue
+            
+            planos_antes = planos_consultas(cursor)
+            
+            cursor.execute("BEGIN IMMEDIATE")
+            # Outro processo pode ter aplicado a migração enquanto aguardávamos o lock
+            if cursor.execute("PRAGMA user_version").fetchone()['user_version'] >= migracao.versao:
+                cursor.execute("ROLLBACK")
+                continue
+            try:
+                migracao.aplicar(cursor)
+                cursor.execute(f"PRAGMA user_version = {migracao.versao}")
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                logger.exception("Falha na migração %d (%s)", migracao.versao, migracao.descricao)
+                raise
+            
+            planos_depois = planos_consultas(cursor)
+            
+            logger.info("Migração %d aplicada: %s", migracao.versao, migracao.descricao)
+            for nome in CONSULTAS_MONITORADAS:
+                if planos_antes[nome] != planos_depois[nome]:
+                    logger.info(
+                        "  %s: %s -> %s",
+                        nome, "; ".join(planos_antes[nome]) or "-", "; ".join(planos_depois[nome])
+                    )
+            
+            relatorio.append({
+                "versao": migracao.versao,
+                "descricao": migracao.descricao,
+                "planos": {
+                    nome: {"antes": planos_antes[nome], "depois": planos_depois[nome]}
+                    for nome in CONSULTAS_MONITORADAS
+                }
+            })
+        
+        if relatorio:
+            cursor.execute("ANALYZE")
+    
+    return relatorio
@@ -2,6 +2,6 @@
 Routers da API
 """
 
-from . import caminhos, usuarios, aeroportos, rotas, dados
+from . import caminhos, usuarios, aeroportos, rotas, voos, dados, eventos
 
-__all__ = ["caminhos", "usuarios", "aeroportos", "rotas", "dados"]
\ No newline at end of file
+__all__ = ["caminhos", "usuarios", "aeroportos", "rotas", "voos", "dados", "eventos"]
\ No newline at end of file
@@ -2,9 +2,11 @@
 Endpoints para CRUD de Aeroportos
 """
 
+import re
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from typing import Optional
 from ..database import execute_query, execute_insert
+from ..services.alteracoes import notificar_alteracao
 from ..schemas.aeroporto import (
     AeroportoCadastro, AeroportoEdicao,
     AeroportoResposta, AeroportoListaResposta
@@ -14,6 +16,22 @@ from ..auth import verificar_token
 
 router = APIRouter(prefix="/aeroportos", tags=["Aeroportos"])
 
+# Pesos do bm25 por coluna do índice: nome, cidade, estado, pais, codigo_iata
+PESOS_BUSCA = (5.0, 3.0, 1.0, 1.0, 10.0)
+
+
+def _montar_consulta_fts(termo: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma consulta FTS5 de prefixo.
+    
+    Cada palavra vira um termo de prefixo entre aspas ("sao"* "pau"*),
+    combinados com AND implícito. Retorna None se não houver palavras.
+    """
+    palavras = re.findall(r"\w+", termo)
+    if not palavras:
+        return None
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
 
 @router.post("", response_model=AeroportoResposta, status_code=status.HTTP_201_CREATED)
 def criar_aeroporto(
@@ -31,11 +49,12 @@ def criar_aeroporto(
     - **cidade**, **estado**, **pais**
     - **latitude**, **longitude**: Coordenadas geográficas
     - **fuso_horario**: Fuso horário (ex: America/Sao_Paulo)
+    - **conexao_minima_min**: Tempo mínimo de conexão em minutos
     
     Requer autenticação.
     """
     # Verifica se código IATA já existe
-    query_check = "SELECT id_aeroporto FROM aeroporto WHERE UPPER(codigo_iata) = UPPER(?)"
+    query_check = "SELECT id_aeroporto FROM aeroporto WHERE codigo_iata = ? COLLATE NOCASE"
     resultado = execute_query(query_check, (dados.codigo_iata,))
     
     if resultado:
@@ -47,8 +66,8 @@ def criar_aeroporto(
     # Insere aeroporto
     query_insert = """
         INSERT INTO aeroporto 
-        (codigo_iata, nome, cidade, estado, pais, latitude, longitude, fuso_horario)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        (codigo_iata, nome, cidade, estado, pais, latitude, longitude, fuso_horario, conexao_minima_min)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
     aeroporto_id = execute_insert(query_insert, (
         dados.codigo_iata.upper(),
@@ -58,12 +77,14 @@ def criar_aeroporto(
         dados.pais,
         dados.latitude,
         dados.longitude,
-        dados.fuso_horario
+        dados.fuso_horario,
+        dados.conexao_minima_min
     ))
     
     # Busca aeroporto criado
     query_select = "SELECT * FROM aeroporto WHERE id_aeroporto = ?"
     aeroporto = execute_query(query_select, (aeroporto_id,))[0]
+    notificar_alteracao("aeroporto", aeroporto_id, "criacao", aeroporto)
     
     return AeroportoResposta(**aeroporto)
 
@@ -94,7 +115,7 @@ def listar_aeroportos(
         params.append(f"%{pais}%")
     
     if codigo_iata:
-        query += " AND UPPER(codigo_iata) = UPPER(?)"
+        query += " AND codigo_iata = ? COLLATE NOCASE"
         params.append(codigo_iata)
     
     query += " ORDER BY nome"
@@ -107,6 +128,46 @@ def listar_aeroportos(
     )
 
 
+@router.get("/busca", response_model=AeroportoListaResposta)
+def buscar_aeroportos_texto(
+    q: str = Query(..., min_length=1, max_length=100, description="Texto da busca (nome, cidade, estado, país ou IATA)"),
+    limite: int = Query(10, ge=1, le=50, description="Número máximo de resultados"),
+    ativo: Optional[int] = Query(None, ge=0, le=1, description="Filtrar por status (0=inativo, 1=ativo)")
+):
+    """
+    Busca textual de aeroportos com correspondência por prefixo.
+    
+    Usa o índice FTS5 sobre nome, cidade, estado, país e código IATA,
+    ignorando acentos e maiúsculas. Resultados ordenados por relevância (bm25).
+    Indicado para autocomplete: `/aeroportos/busca?q=sao pa`
+    """
+    consulta = _montar_consulta_fts(q)
+    if consulta is None:
+        return AeroportoListaResposta(total=0, aeroportos=[])
+    
+    query = """
+        SELECT a.*
+        FROM aeroporto_fts f
+        INNER JOIN aeroporto a ON a.id_aeroporto = f.rowid
+        WHERE aeroporto_fts MATCH ?
+    """
+    params = [consulta]
+    
+    if ativo is not None:
+        query += " AND a.ativo = ?"
+        params.append(ativo)
+    
+    query += f" ORDER BY bm25(aeroporto_fts, {', '.join(str(p) for p in PESOS_BUSCA)}) LIMIT ?"
+    params.append(limite)
+    
+    aeroportos = execute_query(query, tuple(params))
+    
+    return AeroportoListaResposta(
+        total=len(aeroportos),
+        aeroportos=[AeroportoResposta(**a) for a in aeroportos]
+    )
+
+
 @router.get("/{aeroporto_id}", response_model=AeroportoResposta)
 def buscar_aeroporto(aeroporto_id: int):
     """
@@ -156,7 +217,7 @@ def atualizar_aeroporto(
     
     if dados.codigo_iata is not None:
         # Verifica se novo código IATA já existe
-        query_iata = "SELECT id_aeroporto FROM aeroporto WHERE UPPER(codigo_iata) = UPPER(?) AND id_aeroporto != ?"
+        query_iata = "SELECT id_aeroporto FROM aeroporto WHERE codigo_iata = ? COLLATE NOCASE AND id_aeroporto != ?"
         res_iata = execute_query(query_iata, (dados.codigo_iata, aeroporto_id))
         if res_iata:
             raise HTTPException(
@@ -194,6 +255,10 @@ def atualizar_aeroporto(
         campos.append("fuso_horario = ?")
         valores.append(dados.fuso_horario)
     
+    if dados.conexao_minima_min is not None:
+        campos.append("conexao_minima_min = ?")
+        valores.append(dados.conexao_minima_min)
+    
     if dados.ativo is not None:
         campos.append("ativo = ?")
         valores.append(dados.ativo)
@@ -212,6 +277,11 @@ def atualizar_aeroporto(
     # Busca aeroporto atualizado
     query_select = "SELECT * FROM aeroporto WHERE id_aeroporto = ?"
     aeroporto = execute_query(query_select, (aeroporto_id,))[0]
+    notificar_alteracao(
+        "aeroporto", aeroporto_id,
+        "remocao" if dados.ativo == 0 else "atualizacao",
+        aeroporto
+    )
     
     return AeroportoResposta(**aeroporto)
 
@@ -242,6 +312,7 @@ def deletar_aeroporto(
     # Soft delete - marca como inativo
     query_delete = "UPDATE aeroporto SET ativo = 0 WHERE id_aeroporto = ?"
     execute_insert(query_delete, (aeroporto_id,))
+    notificar_alteracao("aeroporto", aeroporto_id, "remocao")
     
     return MensagemResposta(
         mensagem=f"Aeroporto ID {aeroporto_id} desativado com sucesso",
@@ -1,31 +1,83 @@
 """
-Endpoints para cálculo de caminhos (Dijkstra e BFS)
+Endpoints para cálculo de caminhos (Dijkstra, BFS e horários)
 """
 
-from fastapi import APIRouter, HTTPException, Query
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from ..services.grafo_service import GrafoService
-from ..schemas.caminho import RespostaCaminho, ErroRota
+from ..services.overlay_service import OverlayService
+from ..services.horarios_service import HorariosService
+from ..services.itinerario_service import ItinerarioService
+from ..config import settings
+from ..services.agendador import agendador
+from ..schemas.caminho import (
+    RespostaCaminho, RespostaALT, RespostaMetrica, RespostaItinerario, RespostaHorario, ConsultaLote, RespostaLote, ErroRota
+)
 
 router = APIRouter(prefix="/caminhos", tags=["Algoritmos"])
 
 
+def _calcular_com_restricoes(
+    calcular: Callable[..., Any],
+    evitar: Optional[str],
+    evitar_paises: Optional[str],
+    max_trecho_km: Optional[int],
+    *args
+) -> Any:
+    """
+    Interpreta as restrições e chama `calcular(*args, restricoes)`.
+    
+    Roda no executor do agendador: resolver os aeroportos a evitar pode
+    consultar o banco, o que bloquearia o event loop.
+    
+    Returns:
+        Resultado do cálculo ou ErroRota se um aeroporto a evitar não existe
+    """
+    restricoes = GrafoService.interpretar_restricoes(evitar, evitar_paises, max_trecho_km)
+    if isinstance(restricoes, ErroRota):
+        return restricoes
+    return calcular(*args, restricoes)
+
+
 @router.get("/menor", response_model=RespostaCaminho)
-def calcular_menor_caminho(
+async def calcular_menor_caminho(
+    request: Request,
     origem: str = Query(..., description="Código IATA ou ID do aeroporto de origem"),
-    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino")
+    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino"),
+    peso: str = Query("distancia", pattern="^(distancia|tempo|combustivel)$", description="Métrica minimizada: 'distancia', 'tempo' ou 'combustivel'"),
+    evitar: Optional[str] = Query(None, description="Aeroportos a evitar (códigos IATA ou IDs separados por vírgula)"),
+    evitar_paises: Optional[str] = Query(None, description="Países a evitar (separados por vírgula)"),
+    max_trecho_km: Optional[int] = Query(None, gt=0, description="Distância máxima de cada trecho (alcance da aeronave)")
 ):
     """
-    **Algoritmo de Dijkstra** - Calcula o caminho com menor distância total.
+    **Algoritmo de Dijkstra** - Calcula o caminho de menor custo na métrica
+    `peso` (padrão: distância total).
+    
+    Distância, tempo e combustível são colunas de peso do mesmo grafo; cada
+    métrica tem suas próprias árvores de caminhos e entradas no cache.
+    Rotas sem combustível cadastrado usam a distância vezes o consumo médio
+    (litros/km) das demais.
     
     Retorna:
     - Caminho completo com todos os aeroportos
     - Distância total em km
     - Tempo estimado em minutos
     - Número de paradas
+    - **peso** e **custo_total**: Métrica usada e custo do caminho nela
+    
+    Restrições opcionais (`evitar`, `evitar_paises`, `max_trecho_km`) são
+    aplicadas na própria busca por mapas de bloqueio pré-compilados, sem
+    copiar o grafo.
     
-    Exemplo: `/caminhos/menor?origem=GRU&destino=REC`
+    Exemplo: `/caminhos/menor?origem=GRU&destino=REC&peso=tempo&evitar=BSB`
     """
-    resultado = GrafoService.calcular_menor_caminho(origem, destino)
+    resultado = await agendador.executar(
+        "caminhos", request, _calcular_com_restricoes, GrafoService.calcular_menor_caminho,
+        evitar, evitar_paises, max_trecho_km, origem, destino, peso
+    )
     
     if isinstance(resultado, ErroRota):
         raise HTTPException(status_code=404, detail=resultado.dict())
@@ -34,9 +86,13 @@ def calcular_menor_caminho(
 
 
 @router.get("/bfs", response_model=RespostaCaminho)
-def calcular_caminho_bfs(
+async def calcular_caminho_bfs(
+    request: Request,
     origem: str = Query(..., description="Código IATA ou ID do aeroporto de origem"),
-    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino")
+    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino"),
+    evitar: Optional[str] = Query(None, description="Aeroportos a evitar (códigos IATA ou IDs separados por vírgula)"),
+    evitar_paises: Optional[str] = Query(None, description="Países a evitar (separados por vírgula)"),
+    max_trecho_km: Optional[int] = Query(None, gt=0, description="Distância máxima de cada trecho (alcance da aeronave)")
 ):
     """
     **Algoritmo BFS** - Calcula o caminho com menor número de paradas.
@@ -50,9 +106,186 @@ def calcular_caminho_bfs(
     - Distância total (informativa)
     - Tempo estimado (informativo)
     
-    Exemplo: `/caminhos/bfs?origem=GRU&destino=GIG`
+    Aceita as mesmas restrições de `/caminhos/menor`.
+    
+    Exemplo: `/caminhos/bfs?origem=GRU&destino=GIG&evitar_paises=Argentina`
+    """
+    resultado = await agendador.executar(
+        "caminhos", request, _calcular_com_restricoes, GrafoService.calcular_caminho_bfs,
+        evitar, evitar_paises, max_trecho_km, origem, destino
+    )
+    
+    if isinstance(resultado, ErroRota):
+        raise HTTPException(status_code=404, detail=resultado.dict())
+    
+    return resultado
+
+
+@router.get("/alt", response_model=RespostaALT)
+async def calcular_caminho_alt(
+    request: Request,
+    origem: str = Query(..., description="Código IATA ou ID do aeroporto de origem"),
+    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino"),
+    comparar: bool = Query(True, description="Executa também o Dijkstra ponto a ponto para comparação")
+):
+    """
+    **ALT** (A*, landmarks, desigualdade triangular) - Menor distância total
+    com busca orientada ao destino.
+    
+    Distâncias de e para alguns aeroportos de referência (landmarks),
+    pré-calculadas a cada versão do grafo, dão limites inferiores para a
+    distância restante; a busca deixa de expandir regiões que se afastam
+    do destino. O resultado é o mesmo do Dijkstra.
+    
+    Retorna, além do caminho:
+    - **landmarks**: Landmarks usados na consulta
+    - **espaco_busca**: Vértices visitados, arcos relaxados e tempo de
+      'alt' e, com `comparar=true`, do 'dijkstra' ponto a ponto
+    
+    Exemplo: `/caminhos/alt?origem=GRU&destino=REC`
+    """
+    resultado = await agendador.executar(
+        "caminhos", request, GrafoService.calcular_caminho_alt, origem, destino, comparar
+    )
+    
+    if isinstance(resultado, ErroRota):
+        raise HTTPException(status_code=404, detail=resultado.dict())
+    
+    return resultado
+
+
+@router.get("/overlay", response_model=RespostaMetrica)
+async def calcular_caminho_overlay(
+    request: Request,
+    origem: str = Query(..., description="Código IATA ou ID do aeroporto de origem"),
+    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino"),
+    metrica: str = Query("distancia", pattern="^(distancia|tempo|combustivel)$", description="Métrica: 'distancia', 'tempo' ou 'combustivel'")
+):
+    """
+    **Overlay multinível** (CRP) - Caminho de menor custo na métrica escolhida.
+    
+    Os aeroportos são particionados uma vez (por país e estado; regiões
+    grandes são subdivididas) e cada célula guarda as menores distâncias
+    entre seus aeroportos de fronteira. Esses cliques são recalculados por
+    métrica (customização) só nas células cujas rotas mudaram, de modo que
+    trocar de métrica ou atualizar pesos em massa não refaz o
+    pré-processamento. A busca atravessa células distantes pelos cliques.
+    
+    Retorna, além do caminho:
+    - **metrica** e **custo_total**: Custo do caminho na métrica
+    - **espaco_busca**: Vértices visitados, arcos e atalhos relaxados e tempo
+    
+    Rotas sem combustível cadastrado usam a distância vezes o consumo médio
+    (litros/km) das demais.
+    
+    Exemplo: `/caminhos/overlay?origem=GRU&destino=REC&metrica=tempo`
+    """
+    resultado = await agendador.executar(
+        "caminhos", request, OverlayService.calcular_caminho, origem, destino, metrica
+    )
+    
+    if isinstance(resultado, ErroRota):
+        raise HTTPException(status_code=404, detail=resultado.dict())
+    
+    return resultado
+
+
+@router.get("/itinerario", response_model=RespostaItinerario)
+async def calcular_itinerario(
+    request: Request,
+    aeroportos: str = Query(..., description="Aeroportos a visitar (códigos IATA ou IDs separados por vírgula); o primeiro é a partida"),
+    peso: str = Query("distancia", pattern="^(distancia|tempo|combustivel)$", description="Métrica minimizada: 'distancia', 'tempo' ou 'combustivel'"),
+    retornar: bool = Query(False, description="Termina o itinerário de volta no primeiro aeroporto"),
+    fixar_destino: bool = Query(False, description="Mantém o último aeroporto informado como final"),
+    evitar: Optional[str] = Query(None, description="Aeroportos a evitar (códigos IATA ou IDs separados por vírgula)"),
+    evitar_paises: Optional[str] = Query(None, description="Países a evitar (separados por vírgula)"),
+    max_trecho_km: Optional[int] = Query(None, gt=0, description="Distância máxima de cada trecho (alcance da aeronave)")
+):
+    """
+    **Itinerário** - Visita todos os aeroportos informados na ordem de menor
+    custo na métrica `peso`, partindo do primeiro.
+    
+    Os custos entre todos os pares saem de uma busca por aeroporto no grafo
+    compilado. Até ITINERARIO_EXATO_MAX aeroportos a ordem é exata
+    (Held-Karp); acima disso, vizinho mais próximo e inserção mais barata
+    melhorados por 2-opt e Or-opt dentro de ITINERARIO_TEMPO_MAX_MS.
+    
+    Retorna, além do caminho completo (trechos costurados):
+    - **ordem**: Aeroportos informados na ordem de visita
+    - **trechos**: Distância, tempo, custo e paradas entre visitas consecutivas
+    - **metodo** e **otimo**: 'held-karp' (ótimo) ou 'heuristica'
+    - **tempo_ms**: Tempo da matriz de custos e da ordenação
+    
+    Aceita as mesmas restrições de `/caminhos/menor`.
+    
+    Exemplo: `/caminhos/itinerario?aeroportos=GRU,BSB,REC,FOR,MAO&retornar=true`
+    """
+    paradas = [a.strip() for a in aeroportos.split(",") if a.strip()]
+    if len(paradas) > settings.ITINERARIO_MAX_PARADAS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Informe no máximo {settings.ITINERARIO_MAX_PARADAS} aeroportos"
+        )
+    if retornar and fixar_destino:
+        raise HTTPException(status_code=400, detail="Use retornar ou fixar_destino, não ambos")
+    
+    resultado = await agendador.executar(
+        "caminhos", request, _calcular_com_restricoes, ItinerarioService.calcular_itinerario,
+        evitar, evitar_paises, max_trecho_km, paradas, peso, retornar, fixar_destino
+    )
+    
+    if isinstance(resultado, ErroRota):
+        raise HTTPException(status_code=404, detail=resultado.dict())
+    
+    return resultado
+
+
+@router.post("/lote", response_model=RespostaLote)
+async def calcular_lote(request: Request, dados: ConsultaLote):
+    """
+    Calcula vários caminhos em uma única requisição (até 1000 consultas).
+    
+    Consultas são agrupadas por origem: uma busca atende todos os destinos
+    da mesma origem. Com o pool de processos ativo (POOL_PROCESSOS > 0),
+    as buscas rodam em paralelo em outros processos sobre o grafo publicado
+    em memória compartilhada.
+    
+    Com `algoritmo: "dijkstra"`, `peso` escolhe a métrica minimizada
+    ('distancia', 'tempo' ou 'combustivel').
+    
+    Cada resultado é um RespostaCaminho ou um ErroRota (`sucesso: false`).
+    """
+    consultas = [(c.origem, c.destino) for c in dados.consultas]
+    resultados = await agendador.executar(
+        "caminhos", request, GrafoService.calcular_lote, consultas, dados.algoritmo, dados.peso
+    )
+    
+    return RespostaLote(total=len(resultados), resultados=resultados)
+
+
+@router.get("/horario", response_model=RespostaHorario)
+async def calcular_caminho_horario(
+    request: Request,
+    origem: str = Query(..., description="Código IATA ou ID do aeroporto de origem"),
+    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino"),
+    partida: datetime = Query(..., description="Horário mínimo de partida (sem fuso = UTC)"),
+    janela_min: int = Query(0, ge=0, le=1440, description="Janela de partidas para consulta de perfil")
+):
     """
-    resultado = GrafoService.calcular_caminho_bfs(origem, destino)
+    **Connection Scan Algorithm** - Viagens pelos voos programados.
+    
+    Considera horários de partida/chegada e o tempo mínimo de conexão
+    de cada aeroporto.
+    
+    - Sem `janela_min`: viagem que chega mais cedo ao destino
+    - Com `janela_min`: todas as viagens Pareto-ótimas (partida mais tarde,
+      chegada mais cedo) que partem dentro da janela
+    
+    Exemplo: `/caminhos/horario?origem=GRU&destino=REC&partida=2025-01-10T08:00`
+    """
+    resultado = await agendador.executar(
+        "caminhos", request, HorariosService.calcular_viagens, origem, destino, partida, janela_min
+    )
     
     if isinstance(resultado, ErroRota):
         raise HTTPException(status_code=404, detail=resultado.dict())
@@ -60,20 +293,64 @@ def calcular_caminho_bfs(
     return resultado
 
 
+@router.get("/alcance")
+async def calcular_alcance(
+    request: Request,
+    origem: str = Query(..., description="Código IATA ou ID do aeroporto de origem"),
+    max_km: Optional[int] = Query(None, gt=0, description="Distância máxima acumulada em km"),
+    max_min: Optional[int] = Query(None, gt=0, description="Tempo máximo acumulado em minutos"),
+    max_paradas: Optional[int] = Query(None, ge=1, description="Número máximo de trechos"),
+    contorno: bool = Query(False, description="Inclui o fecho convexo das coordenadas ao final"),
+    max_litros: Optional[float] = Query(None, gt=0, description="Combustível máximo acumulado em litros"),
+    peso: Optional[str] = Query(None, pattern="^(distancia|tempo|combustivel)$", description="Métrica da ordem: 'distancia', 'tempo' ou 'combustivel'")
+):
+    """
+    **Alcance** - Aeroportos alcançáveis dentro de um orçamento.
+    
+    Ao menos um limite deve ser informado; com vários, todos são respeitados.
+    A resposta é NDJSON (um aeroporto por linha, em ordem crescente da
+    métrica `peso` ou, sem ela, do primeiro limite informado) enviada à
+    medida que a busca avança. Com `contorno=true`, a última linha traz
+    `{"contorno": <Polygon GeoJSON>}`.
+    
+    Exemplo: `/caminhos/alcance?origem=GRU&max_litros=20000&peso=tempo`
+    """
+    if max_km is None and max_min is None and max_paradas is None and max_litros is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Informe ao menos um limite: max_km, max_min, max_litros ou max_paradas"
+        )
+    
+    resultado = await agendador.executar(
+        "caminhos", request, GrafoService.calcular_alcance,
+        origem, max_km, max_min, max_paradas, contorno, max_litros, peso
+    )
+    
+    if isinstance(resultado, ErroRota):
+        raise HTTPException(status_code=404, detail=resultado.dict())
+    
+    linhas = (json.dumps(linha, ensure_ascii=False) + "\n" for linha in resultado)
+    return StreamingResponse(agendador.iterar("caminhos", linhas), media_type="application/x-ndjson")
+
+
 @router.get("/comparar")
-def comparar_algoritmos(
+async def comparar_algoritmos(
+    request: Request,
     origem: str = Query(..., description="Código IATA ou ID do aeroporto de origem"),
-    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino")
+    destino: str = Query(..., description="Código IATA ou ID do aeroporto de destino"),
+    peso: str = Query("distancia", pattern="^(distancia|tempo|combustivel)$", description="Métrica minimizada: 'distancia', 'tempo' ou 'combustivel'")
 ):
     """
     Compara resultados de Dijkstra e BFS lado a lado.
     
     Útil para visualizar diferenças entre:
-    - Menor distância (Dijkstra)
+    - Menor custo na métrica `peso` (Dijkstra)
     - Menor número de paradas (BFS)
     """
-    dijkstra = GrafoService.calcular_menor_caminho(origem, destino)
-    bfs = GrafoService.calcular_caminho_bfs(origem, destino)
+    dijkstra = await agendador.executar(
+        "caminhos", request, GrafoService.calcular_menor_caminho, origem, destino, peso
+    )
+    bfs = await agendador.executar("caminhos", request, GrafoService.calcular_caminho_bfs, origem, destino)
     
     if isinstance(dijkstra, ErroRota):
         raise HTTPException(status_code=404, detail=dijkstra.dict())
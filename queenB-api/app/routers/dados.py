@@ -2,16 +2,35 @@
 Endpoints para exportação de dados em JSON
 """
 
-from fastapi import APIRouter, Query
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from typing import Optional, List, Dict, Any, Tuple
+from ..config import settings
 from ..database import execute_query
+from ..algoritmos.grafo import Aresta
 from ..services.grafo_service import GrafoService
+from ..services.resolvedor_aeroportos import resolvedor_aeroportos
+from ..services.cache_exportacao import cache_exportacao
+from ..services.delta_grafo import DeltaGrafoService
+from ..services.coalescencia import metricas_coalescencia
+from ..services.agendador import agendador
+from ..services.cache_caminhos import cache_caminhos
+from ..services.overlay_service import OverlayService
+from ..services.criticos_service import CriticosService
+from ..schemas.caminho import ErroRota
+
+try:
+    import msgpack
+except ImportError:  # msgpack é opcional: sem ele, formato=msgpack fica indisponível
+    msgpack = None
 
 router = APIRouter(prefix="/dados", tags=["Dados JSON"])
 
 
 @router.get("/grafo")
-def exportar_grafo_json() -> Dict[str, Any]:
+async def exportar_grafo_json(
+    request: Request,
+    formato: str = Query("json", pattern="^(json|colunar|msgpack)$", description="Formato: 'json', 'colunar' ou 'msgpack'")
+) -> Response:
     """
     Exporta o grafo completo em formato JSON.
     
@@ -20,51 +39,167 @@ def exportar_grafo_json() -> Dict[str, Any]:
     - **arestas**: Lista de rotas (arestas)
     - **estatisticas**: Métricas do grafo
     
+    Formatos:
+    - 'json': Um objeto por vértice e por aresta
+    - 'colunar': Listas paralelas por atributo; arestas referenciam vértices
+      pela posição na tabela de vértices
+    - 'msgpack': Estrutura colunar codificada em MessagePack
+    
     Útil para visualização e processamento externo.
+    Respostas em cache por versão dos dados, com ETag e gzip/brotli; a
+    geração (cache miss) roda no executor limitado de exportações.
+    """
+    if formato == "msgpack" and msgpack is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Formato msgpack indisponível (pacote msgpack não instalado)"
+        )
+    
+    chave = ("grafo",) if formato == "json" else ("grafo", formato)
+    entrada = cache_exportacao.consultar(chave)
+    if entrada is None:
+        entrada = await agendador.executar("exportacao", request, _obter_exportacao_grafo, formato)
+    return cache_exportacao.responder(request, entrada)
+
+
+def _obter_exportacao_grafo(formato: str):
+    """Gera (ou obtém do cache) a exportação do grafo no formato pedido"""
+    if formato == "json":
+        return cache_exportacao.obter(("grafo",), _montar_grafo)
+    if formato == "colunar":
+        return cache_exportacao.obter(("grafo", "colunar"), _montar_grafo_colunar)
+    return cache_exportacao.obter(
+        ("grafo", "msgpack"),
+        _montar_grafo_colunar,
+        serializar=lambda conteudo: msgpack.packb(conteudo, use_bin_type=True),
+        media_type="application/x-msgpack"
+    )
+
+
+@router.get("/grafo/delta")
+def exportar_delta_grafo(
+    desde: int = Query(..., ge=0, description="Última versão do grafo que o cliente possui")
+) -> Dict[str, Any]:
+    """
+    Retorna apenas os vértices e arestas alterados desde uma versão.
+    
+    O cliente obtém a versão inicial em `/dados/grafo` (campo **versao**)
+    e depois sincroniza com `/dados/grafo/delta?desde=<versao>`:
+    - **vertices** / **arestas**: inserir ou substituir
+    - **vertices_removidos** / **arestas_removidas**: IDs a remover
+    - **versao**: valor a usar no próximo `desde`
+    - **resincronizar**: se verdadeiro, baixar `/dados/grafo` novamente
+    """
+    return DeltaGrafoService.calcular_delta(desde)
+
+
+# Campos de cada vértice nas exportações do grafo
+CAMPOS_VERTICE = ("cidade", "estado", "pais", "latitude", "longitude", "fuso_horario")
+
+
+def _vertices_grafo(
+    rotas: List[Tuple[int, str, Aresta, bool]],
+    aeroportos_map: Dict[str, dict]
+) -> List[Tuple[str, dict, dict]]:
+    """
+    Aeroportos extremos de alguma rota, ordenados por ID, como tuplas
+    (código, dados do grafo {'id', 'nome'}, cadastro completo).
+    """
+    codigos = {origem for _, origem, _, _ in rotas}
+    codigos.update(aresta.destino for _, _, aresta, _ in rotas)
+    vertices = [
+        (codigo, aeroportos_map[codigo], resolvedor_aeroportos.por_codigo(codigo) or {})
+        for codigo in codigos
+    ]
+    vertices.sort(key=lambda vertice: vertice[1]['id'])
+    return vertices
+
+
+def _montar_grafo_colunar() -> Dict[str, Any]:
+    """
+    Monta o grafo em layout colunar.
+    
+    As colunas são preenchidas direto das rotas do grafo em memória (sem
+    dicionários por aresta); origem/destino das arestas são índices na
+    tabela de vértices.
+    """
+    versao, rotas, aeroportos_map, estimadas = GrafoService.rotas_exportacao()
+    vertices_grafo = _vertices_grafo(rotas, aeroportos_map)
+    
+    vertices: Dict[str, list] = {
+        "id": [info['id'] for _, info, _ in vertices_grafo],
+        "codigo_iata": [codigo for codigo, _, _ in vertices_grafo],
+        "nome": [info['nome'] for _, info, _ in vertices_grafo]
+    }
+    for campo in CAMPOS_VERTICE:
+        vertices[campo] = [aero.get(campo) for _, _, aero in vertices_grafo]
+    
+    # Posição do vértice na tabela
+    indice = {codigo: i for i, codigo in enumerate(vertices["codigo_iata"])}
+    arestas = {
+        "id": [id_rota for id_rota, _, _, _ in rotas],
+        "origem": [indice[origem] for _, origem, _, _ in rotas],
+        "destino": [indice[aresta.destino] for _, _, aresta, _ in rotas],
+        "distancia_km": [aresta.peso for _, _, aresta, _ in rotas],
+        "tempo_estimado_min": [aresta.tempo or None for _, _, aresta, _ in rotas],
+        "combustivel_litros": [
+            None if id_rota in estimadas else aresta.combustivel for id_rota, _, aresta, _ in rotas
+        ]
+    }
+    
+    total_vertices = len(vertices["id"])
+    total_arestas = len(arestas["id"])
+    
+    return {
+        "grafo": {
+            "vertices": vertices,
+            "arestas": arestas
+        },
+        "estatisticas": {
+            "total_vertices": total_vertices,
+            "total_arestas": total_arestas,
+            "densidade": total_arestas / (total_vertices * (total_vertices - 1)) if total_vertices > 1 else 0
+        },
+        "tipo": "grafo_dirigido" if settings.GRAFO_DIRIGIDO else "grafo_bidirecional",
+        "formato": "colunar",
+        "versao": versao
+    }
+
+
+def _montar_grafo() -> Dict[str, Any]:
+    """
+    Monta o conteúdo da exportação do grafo completo, a partir do grafo em
+    memória (o mesmo usado nos cálculos de caminhos).
+    
+    Rotas sem tempo ou combustível cadastrado saem com null, como no banco.
     """
-    grafo, aeroportos_map = GrafoService.construir_grafo()
+    versao, rotas, aeroportos_map, estimadas = GrafoService.rotas_exportacao()
     
     # Converte vértices (aeroportos)
     vertices = []
-    for codigo, info in aeroportos_map.items():
-        # Busca informações completas do aeroporto
-        query = "SELECT * FROM aeroporto WHERE codigo_iata = ?"
-        aero = execute_query(query, (codigo,))
-        if aero:
-            vertices.append({
-                "id": aero[0]['id_aeroporto'],
-                "codigo_iata": codigo,
-                "nome": info['nome'],
-                "cidade": aero[0].get('cidade'),
-                "estado": aero[0].get('estado'),
-                "pais": aero[0].get('pais'),
-                "latitude": aero[0].get('latitude'),
-                "longitude": aero[0].get('longitude'),
-                "fuso_horario": aero[0].get('fuso_horario')
-            })
+    for codigo, info, aero in _vertices_grafo(rotas, aeroportos_map):
+        vertices.append({
+            "id": info['id'],
+            "codigo_iata": codigo,
+            "nome": info['nome'],
+            "cidade": aero.get('cidade'),
+            "estado": aero.get('estado'),
+            "pais": aero.get('pais'),
+            "latitude": aero.get('latitude'),
+            "longitude": aero.get('longitude'),
+            "fuso_horario": aero.get('fuso_horario')
+        })
     
     # Converte arestas (rotas)
     arestas = []
-    query_rotas = """
-        SELECT 
-            r.*,
-            ao.codigo_iata as origem_codigo,
-            ad.codigo_iata as destino_codigo
-        FROM rota r
-        INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
-        INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
-        WHERE r.ativo = 1
-    """
-    rotas = execute_query(query_rotas)
-    
-    for rota in rotas:
+    for id_rota, origem, aresta, _ in rotas:
         arestas.append({
-            "id": rota['id_rota'],
-            "origem": rota['origem_codigo'],
-            "destino": rota['destino_codigo'],
-            "distancia_km": rota['distancia_km'],
-            "tempo_estimado_min": rota['tempo_estimado_min'],
-            "combustivel_litros": rota.get('combustivel_litros')
+            "id": id_rota,
+            "origem": origem,
+            "destino": aresta.destino,
+            "distancia_km": aresta.peso,
+            "tempo_estimado_min": aresta.tempo or None,
+            "combustivel_litros": None if id_rota in estimadas else aresta.combustivel
         })
     
     # Estatísticas
@@ -80,15 +215,17 @@ def exportar_grafo_json() -> Dict[str, Any]:
             "arestas": arestas
         },
         "estatisticas": estatisticas,
-        "tipo": "grafo_bidirecional"
+        "tipo": "grafo_dirigido" if settings.GRAFO_DIRIGIDO else "grafo_bidirecional",
+        "versao": versao
     }
 
 
 @router.get("/aeroportos")
 def exportar_aeroportos_json(
+    request: Request,
     ativo: Optional[int] = Query(None, ge=0, le=1, description="Filtrar por status"),
     pais: Optional[str] = Query(None, description="Filtrar por país")
-) -> Dict[str, Any]:
+) -> Response:
     """
     Exporta lista de aeroportos em formato JSON.
     
@@ -97,7 +234,17 @@ def exportar_aeroportos_json(
     - **pais**: Nome do país
     
     Formato ideal para consumo por frontend ou outras APIs.
+    Respostas em cache por versão dos dados, com ETag e gzip/brotli.
     """
+    entrada = cache_exportacao.obter(
+        ("aeroportos", ativo, pais),
+        lambda: _montar_aeroportos(ativo, pais)
+    )
+    return cache_exportacao.responder(request, entrada)
+
+
+def _montar_aeroportos(ativo: Optional[int], pais: Optional[str]) -> Dict[str, Any]:
+    """Monta o conteúdo da exportação de aeroportos"""
     query = "SELECT * FROM aeroporto WHERE 1=1"
     params = []
     
@@ -125,9 +272,10 @@ def exportar_aeroportos_json(
 
 @router.get("/rotas")
 def exportar_rotas_json(
+    request: Request,
     ativo: Optional[int] = Query(None, ge=0, le=1, description="Filtrar por status"),
     formato: str = Query("completo", description="Formato: 'completo' ou 'simples'")
-) -> Dict[str, Any]:
+) -> Response:
     """
     Exporta lista de rotas em formato JSON.
     
@@ -138,7 +286,17 @@ def exportar_rotas_json(
       - 'simples': Apenas IDs e distâncias
     
     Útil para alimentar visualizações de mapas e grafos.
+    Respostas em cache por versão dos dados, com ETag e gzip/brotli.
     """
+    entrada = cache_exportacao.obter(
+        ("rotas", ativo, formato),
+        lambda: _montar_rotas(ativo, formato)
+    )
+    return cache_exportacao.responder(request, entrada)
+
+
+def _montar_rotas(ativo: Optional[int], formato: str) -> Dict[str, Any]:
+    """Monta o conteúdo da exportação de rotas"""
     if formato == "completo":
         query = """
             SELECT 
@@ -270,4 +428,103 @@ def obter_estatisticas() -> Dict[str, Any]:
             "vertices": stats_aero['ativos'],
             "arestas": stats_rotas['ativas']
         }
+    }
+
+
+@router.get("/criticos")
+def obter_criticos() -> Dict[str, Any]:
+    """
+    Pontos únicos de falha da malha ativa.
+    
+    - **articulacoes**: Aeroportos cujo fechamento parte a malha, com o
+      número de grupos resultantes e de pares origem-destino que deixam de
+      ter ligação (mais críticos primeiro)
+    - **pontes**: Rotas sem alternativa entre suas extremidades, com os
+      pares desconectados pelo seu cancelamento
+    - **componentes_biconexos**: Grupos de aeroportos que continuam ligados
+      após o fechamento de qualquer um deles (maiores primeiro)
+    
+    Calculado uma vez por versão do grafo (Tarjan, O(V + E)). O sentido das
+    rotas é ignorado: um par só conta como desconectado quando não resta
+    ligação em nenhum sentido.
+    """
+    return CriticosService.resumo()
+
+
+@router.get("/criticos/impacto")
+def obter_impacto_fechamento(
+    aeroporto: str = Query(..., description="Código IATA ou ID do aeroporto fechado"),
+    limite_pares: int = Query(100, ge=0, le=10000, description="Máximo de pares desconectados listados")
+) -> Dict[str, Any]:
+    """
+    E se este aeroporto fechar? Usa a análise em cache de `/dados/criticos`.
+    
+    Retorna:
+    - **articulacao**: Se o fechamento parte a malha
+    - **rotas_fechadas**: Rotas ativas que usam o aeroporto
+    - **maior_grupo**: Aeroportos que continuam ligados entre si
+    - **grupos_isolados**: Grupos que perdem a ligação com o maior
+    - **pares_desconectados** e **pares**: Total de pares origem-destino
+      (entre os demais aeroportos) que deixam de ter ligação e os primeiros
+      `limite_pares` deles
+    
+    Exemplo: `/dados/criticos/impacto?aeroporto=FOR`
+    """
+    resultado = CriticosService.impacto(aeroporto, limite_pares)
+    if isinstance(resultado, ErroRota):
+        raise HTTPException(status_code=404, detail=resultado.dict())
+    return resultado
+
+
+@router.get("/metricas")
+def obter_metricas(request: Request) -> Dict[str, Any]:
+    """
+    Métricas de coalescência, do agendador de endpoints custosos, do
+    grafo em memória, do cache L2 de caminhos, do índice ALT, do overlay
+    multinível e dos mapas de restrição, e o relatório das migrações.
+    
+    **coalescencia**, para cada coalescedor ('consultas' de caminhos e
+    'reconstrucoes' de estruturas em memória):
+    - **requisicoes**: Total de solicitações
+    - **execucoes**: Computações realmente executadas
+    - **coalescidas**: Solicitações atendidas por uma execução em andamento
+    - **erros**: Execuções que terminaram em exceção
+    - **em_andamento**: Execuções em curso
+    
+    **agendador**, para cada classe ('caminhos' e 'exportacao'): threads,
+    fila, aceitas, rejeitadas (503 por fila cheia), expiradas (503 por
+    espera), canceladas (cliente desconectado) e tempo médio de execução.
+    
+    **grafo**: sentido das rotas (dirigido ou não), rotas, arcos que as
+    listas de adjacência teriam sem mesclar paralelos e arcos atuais.
+    
+    **cache_caminhos**: acertos, faltas, inserções e erros deste processo;
+    entradas e bytes ocupados no arquivo compartilhado pelos workers.
+    
+    **alt**: landmarks escolhidos, versão do grafo a que se referem, bytes
+    dos vetores de distâncias e duração do último pré-processamento.
+    
+    **overlay**: células, vértices de fronteira e entradas de clique por
+    nível; para cada métrica customizada, células recalculadas e duração.
+    
+    **restricoes**: versão dos mapas de bloqueio, países mapeados e limites
+    de trecho com mapa de arcos em memória.
+    
+    **criticos**: versão da última análise de articulações e pontes,
+    quantidades encontradas e duração.
+    
+    **migracoes**: migrações aplicadas na inicialização, com os planos das
+    consultas monitoradas antes e depois (vazio se o esquema já estava
+    atualizado ou se foram aplicadas por outro processo).
+    """
+    return {
+        "coalescencia": metricas_coalescencia(),
+        "agendador": agendador.metricas(),
+        "grafo": GrafoService.metricas_grafo(),
+        "cache_caminhos": cache_caminhos.metricas(),
+        "alt": GrafoService.metricas_alt(),
+        "overlay": OverlayService.metricas(),
+        "restricoes": GrafoService.metricas_restricoes(),
+        "criticos": CriticosService.metricas(),
+        "migracoes": getattr(request.app.state, "migracoes", [])
     }
\ No newline at end of file
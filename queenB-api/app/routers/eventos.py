@@ -0,0 +1,69 @@
+"""
+Endpoint de Server-Sent Events com alterações de aeroportos e rotas
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator
+from fastapi import APIRouter, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from ..services.eventos import broker_eventos, Assinatura
+
+router = APIRouter(prefix="/eventos", tags=["Eventos"])
+
+# Intervalo entre comentários de keep-alive (segundos)
+INTERVALO_KEEPALIVE = 15
+# Janela para agrupar rajadas de alterações em um único envio (segundos)
+JANELA_COALESCENCIA = 0.05
+
+
+async def _fluxo_eventos(assinatura: Assinatura) -> AsyncIterator[str]:
+    """Gera mensagens SSE para uma assinatura até o cliente desconectar"""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                await asyncio.wait_for(assinatura.sinal.wait(), timeout=INTERVALO_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            
+            await asyncio.sleep(JANELA_COALESCENCIA)
+            eventos, resincronizar = assinatura.retirar()
+            
+            if resincronizar:
+                yield "event: resincronizar\ndata: {}\n\n"
+                continue
+            
+            for evento in eventos:
+                dados = json.dumps(jsonable_encoder(evento), ensure_ascii=False)
+                yield f"id: {evento['versao']}\nevent: {evento['entidade']}\ndata: {dados}\n\n"
+    finally:
+        broker_eventos.cancelar(assinatura)
+
+
+@router.get("")
+async def assinar_eventos(request: Request):
+    """
+    Fluxo SSE (text/event-stream) de alterações confirmadas.
+    
+    Tipos de evento:
+    - **aeroporto** / **rota** / **voo**: `{"entidade", "id", "operacao", "versao", "dados"}`
+      com operacao 'criacao', 'atualizacao' ou 'remocao'; `versao` (também o
+      `id:` do evento) é a versão do log de alterações, que pode ser passada
+      a `/dados/grafo/delta?desde=`
+    - **resincronizar**: o cliente perdeu eventos e deve recarregar as listas
+    
+    Rajadas de alterações na mesma entidade são agrupadas em um único evento.
+    Uso no navegador: `new EventSource('/eventos')`
+    """
+    assinatura = broker_eventos.assinar()
+    return StreamingResponse(
+        _fluxo_eventos(assinatura),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
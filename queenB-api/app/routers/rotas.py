@@ -5,6 +5,7 @@ Endpoints para CRUD de Rotas
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from typing import Optional
 from ..database import execute_query, execute_insert
+from ..services.alteracoes import notificar_alteracao
 from ..schemas.rota import (
     RotaCadastro, RotaEdicao,
     RotaResposta, RotaListaResposta
@@ -101,6 +102,7 @@ def criar_rota(
         WHERE r.id_rota = ?
     """
     rota = execute_query(query_select, (rota_id,))[0]
+    notificar_alteracao("rota", rota_id, "criacao", rota)
     
     return RotaResposta(**rota)
 
@@ -225,6 +227,17 @@ def atualizar_rota(
             detail="Aeroporto de origem e destino devem ser diferentes"
         )
     
+    # Verifica se já existe outra rota com o mesmo par origem/destino
+    query_par = """
+        SELECT id_rota FROM rota 
+        WHERE id_aeroporto_origem = ? AND id_aeroporto_destino = ? AND id_rota != ?
+    """
+    if execute_query(query_par, (nova_origem, novo_destino, rota_id)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Rota entre estes aeroportos já existe"
+        )
+    
     if dados.id_aeroporto_origem is not None:
         # Verifica se aeroporto existe
         query_aero = "SELECT id_aeroporto FROM aeroporto WHERE id_aeroporto = ? AND ativo = 1"
@@ -290,6 +303,11 @@ def atualizar_rota(
         WHERE r.id_rota = ?
     """
     rota = execute_query(query_select, (rota_id,))[0]
+    notificar_alteracao(
+        "rota", rota_id,
+        "remocao" if dados.ativo == 0 else "atualizacao",
+        rota
+    )
     
     return RotaResposta(**rota)
 
@@ -320,6 +338,7 @@ def deletar_rota(
     # Soft delete - marca como inativo
     query_delete = "UPDATE rota SET ativo = 0 WHERE id_rota = ?"
     execute_insert(query_delete, (rota_id,))
+    notificar_alteracao("rota", rota_id, "remocao")
     
     return MensagemResposta(
         mensagem=f"Rota ID {rota_id} desativada com sucesso",
@@ -0,0 +1,264 @@
+"""
+Endpoints para CRUD de Voos programados
+"""
+
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import Optional
+from ..database import execute_query, execute_insert
+from ..services.alteracoes import notificar_alteracao
+from ..services.horarios_service import HorariosService
+from ..schemas.voo import (
+    VooCadastro, VooEdicao,
+    VooResposta, VooListaResposta
+)
+from ..schemas.usuario import MensagemResposta
+from ..auth import verificar_token
+
+router = APIRouter(prefix="/voos", tags=["Voos"])
+
+# Voo com os códigos IATA no sentido em que opera
+QUERY_VOO = """
+    SELECT
+        v.*,
+        CASE WHEN v.invertido = 1 THEN ad.codigo_iata ELSE ao.codigo_iata END AS origem_codigo,
+        CASE WHEN v.invertido = 1 THEN ao.codigo_iata ELSE ad.codigo_iata END AS destino_codigo
+    FROM voo v
+    INNER JOIN rota r ON v.id_rota = r.id_rota
+    INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
+    INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
+"""
+
+
+@router.post("", response_model=VooResposta, status_code=status.HTTP_201_CREATED)
+def criar_voo(
+    dados: VooCadastro,
+    current_user: dict = Depends(verificar_token)
+):
+    """
+    Cadastra novo voo programado em uma rota.
+    
+    Campos obrigatórios:
+    - **id_rota**: ID da rota operada
+    - **partida**, **chegada**: Horários do voo (sem fuso são tratados como UTC)
+    
+    Campos opcionais:
+    - **codigo_voo**: Código do voo (ex: LA3000)
+    - **invertido**: 1 se o voo opera no sentido destino → origem da rota
+    
+    Requer autenticação.
+    """
+    # Verifica se rota existe
+    query_rota = "SELECT id_rota FROM rota WHERE id_rota = ? AND ativo = 1"
+    if not execute_query(query_rota, (dados.id_rota,)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Rota ID {dados.id_rota} não encontrada ou inativa"
+        )
+    
+    partida = HorariosService.normalizar_horario(dados.partida)
+    chegada = HorariosService.normalizar_horario(dados.chegada)
+    
+    if chegada <= partida:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Chegada deve ser posterior à partida"
+        )
+    
+    # Insere voo
+    query_insert = """
+        INSERT INTO voo (id_rota, codigo_voo, invertido, partida, chegada)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    voo_id = execute_insert(query_insert, (
+        dados.id_rota,
+        dados.codigo_voo,
+        dados.invertido,
+        partida,
+        chegada
+    ))
+    
+    voo = execute_query(QUERY_VOO + " WHERE v.id_voo = ?", (voo_id,))[0]
+    notificar_alteracao("voo", voo_id, "criacao", voo)
+    
+    return VooResposta(**voo)
+
+
+@router.get("", response_model=VooListaResposta)
+def listar_voos(
+    ativo: Optional[int] = Query(None, ge=0, le=1, description="Filtrar por status (0=inativo, 1=ativo)"),
+    id_rota: Optional[int] = Query(None, description="Filtrar por rota"),
+    partida_de: Optional[datetime] = Query(None, description="Partidas a partir deste horário"),
+    partida_ate: Optional[datetime] = Query(None, description="Partidas até este horário")
+):
+    """
+    Lista voos programados, ordenados por horário de partida.
+    
+    Filtros opcionais:
+    - **ativo**: 0 (inativo) ou 1 (ativo)
+    - **id_rota**: Voos de uma rota específica
+    - **partida_de**, **partida_ate**: Intervalo de partidas
+    """
+    query = QUERY_VOO + " WHERE 1=1"
+    params = []
+    
+    if ativo is not None:
+        query += " AND v.ativo = ?"
+        params.append(ativo)
+    
+    if id_rota is not None:
+        query += " AND v.id_rota = ?"
+        params.append(id_rota)
+    
+    if partida_de is not None:
+        query += " AND v.partida >= ?"
+        params.append(HorariosService.normalizar_horario(partida_de))
+    
+    if partida_ate is not None:
+        query += " AND v.partida <= ?"
+        params.append(HorariosService.normalizar_horario(partida_ate))
+    
+    query += " ORDER BY v.partida"
+    
+    voos = execute_query(query, tuple(params) if params else None)
+    
+    return VooListaResposta(
+        total=len(voos),
+        voos=[VooResposta(**v) for v in voos]
+    )
+
+
+@router.get("/{voo_id}", response_model=VooResposta)
+def buscar_voo(voo_id: int):
+    """
+    Busca voo por ID.
+    """
+    resultado = execute_query(QUERY_VOO + " WHERE v.id_voo = ?", (voo_id,))
+    
+    if not resultado:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Voo com ID {voo_id} não encontrado"
+        )
+    
+    return VooResposta(**resultado[0])
+
+
+@router.put("/{voo_id}", response_model=VooResposta)
+def atualizar_voo(
+    voo_id: int,
+    dados: VooEdicao,
+    current_user: dict = Depends(verificar_token)
+):
+    """
+    Atualiza dados de um voo existente.
+    
+    Campos não informados permanecem inalterados.
+    
+    Requer autenticação.
+    """
+    # Verifica se voo existe
+    query_check = "SELECT * FROM voo WHERE id_voo = ?"
+    voo_atual = execute_query(query_check, (voo_id,))
+    
+    if not voo_atual:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Voo com ID {voo_id} não encontrado"
+        )
+    
+    voo_atual = voo_atual[0]
+    
+    # Campos para atualizar
+    campos = []
+    valores = []
+    
+    partida = HorariosService.normalizar_horario(dados.partida) if dados.partida else voo_atual['partida']
+    chegada = HorariosService.normalizar_horario(dados.chegada) if dados.chegada else voo_atual['chegada']
+    
+    if chegada <= partida:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Chegada deve ser posterior à partida"
+        )
+    
+    if dados.id_rota is not None:
+        # Verifica se rota existe
+        query_rota = "SELECT id_rota FROM rota WHERE id_rota = ? AND ativo = 1"
+        if not execute_query(query_rota, (dados.id_rota,)):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Rota ID {dados.id_rota} não encontrada ou inativa"
+            )
+        campos.append("id_rota = ?")
+        valores.append(dados.id_rota)
+    
+    if dados.codigo_voo is not None:
+        campos.append("codigo_voo = ?")
+        valores.append(dados.codigo_voo)
+    
+    if dados.invertido is not None:
+        campos.append("invertido = ?")
+        valores.append(dados.invertido)
+    
+    if dados.partida is not None:
+        campos.append("partida = ?")
+        valores.append(partida)
+    
+    if dados.chegada is not None:
+        campos.append("chegada = ?")
+        valores.append(chegada)
+    
+    if dados.ativo is not None:
+        campos.append("ativo = ?")
+        valores.append(dados.ativo)
+    
+    if not campos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nenhum campo para atualizar"
+        )
+    
+    # Atualiza voo
+    valores.append(voo_id)
+    query_update = f"UPDATE voo SET {', '.join(campos)} WHERE id_voo = ?"
+    execute_insert(query_update, tuple(valores))
+    
+    voo = execute_query(QUERY_VOO + " WHERE v.id_voo = ?", (voo_id,))[0]
+    notificar_alteracao(
+        "voo", voo_id,
+        "remocao" if dados.ativo == 0 else "atualizacao",
+        voo
+    )
+    
+    return VooResposta(**voo)
+
+
+@router.delete("/{voo_id}", response_model=MensagemResposta)
+def deletar_voo(
+    voo_id: int,
+    current_user: dict = Depends(verificar_token)
+):
+    """
+    Deleta (desativa) um voo.
+    
+    Realiza soft delete, marcando o voo como inativo.
+    
+    Requer autenticação.
+    """
+    # Verifica se voo existe
+    query_check = "SELECT id_voo FROM voo WHERE id_voo = ?"
+    if not execute_query(query_check, (voo_id,)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Voo com ID {voo_id} não encontrado"
+        )
+    
+    # Soft delete - marca como inativo
+    execute_insert("UPDATE voo SET ativo = 0 WHERE id_voo = ?", (voo_id,))
+    notificar_alteracao("voo", voo_id, "remocao")
+    
+    return MensagemResposta(
+        mensagem=f"Voo ID {voo_id} desativado com sucesso",
+        sucesso=True
+    )
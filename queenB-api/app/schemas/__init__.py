@@ -5,6 +5,17 @@ Schemas Pydantic para validação de I/O
 from .caminho import (
     AeroportoNoCaminho,
     RespostaCaminho,
+    EspacoBusca,
+    RespostaALT,
+    RespostaMetrica,
+    TrechoItinerario,
+    RespostaItinerario,
+    VooNoItinerario,
+    ViagemHorario,
+    RespostaHorario,
+    ParCaminho,
+    ConsultaLote,
+    RespostaLote,
     ErroRota
 )
 from .usuario import (
@@ -27,11 +38,28 @@ from .rota import (
     RotaResposta,
     RotaListaResposta
 )
+from .voo import (
+    VooCadastro,
+    VooEdicao,
+    VooResposta,
+    VooListaResposta
+)
 
 __all__ = [
     # Caminhos
     "AeroportoNoCaminho",
     "RespostaCaminho",
+    "EspacoBusca",
+    "RespostaALT",
+    "RespostaMetrica",
+    "TrechoItinerario",
+    "RespostaItinerario",
+    "VooNoItinerario",
+    "ViagemHorario",
+    "RespostaHorario",
+    "ParCaminho",
+    "ConsultaLote",
+    "RespostaLote",
     "ErroRota",
     # Usuários
     "UsuarioCadastro",
@@ -50,4 +78,9 @@ __all__ = [
     "RotaEdicao",
     "RotaResposta",
     "RotaListaResposta",
+    # Voos
+    "VooCadastro",
+    "VooEdicao",
+    "VooResposta",
+    "VooListaResposta",
 ]
\ No newline at end of file
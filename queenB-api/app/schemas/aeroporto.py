@@ -16,6 +16,7 @@ class AeroportoCadastro(BaseModel):
     latitude: Optional[float] = Field(None, ge=-90, le=90, description="Latitude (-90 a 90)")
     longitude: Optional[float] = Field(None, ge=-180, le=180, description="Longitude (-180 a 180)")
     fuso_horario: Optional[str] = Field(None, max_length=50, description="Fuso horário (ex: America/Sao_Paulo)")
+    conexao_minima_min: Optional[int] = Field(None, ge=0, description="Tempo mínimo de conexão em minutos")
 
 
 class AeroportoEdicao(BaseModel):
@@ -28,6 +29,7 @@ class AeroportoEdicao(BaseModel):
     latitude: Optional[float] = Field(None, ge=-90, le=90)
     longitude: Optional[float] = Field(None, ge=-180, le=180)
     fuso_horario: Optional[str] = Field(None, max_length=50)
+    conexao_minima_min: Optional[int] = Field(None, ge=0)
     ativo: Optional[int] = Field(None, ge=0, le=1)
 
 
@@ -42,6 +44,7 @@ class AeroportoResposta(BaseModel):
     latitude: Optional[float]
     longitude: Optional[float]
     fuso_horario: Optional[str]
+    conexao_minima_min: Optional[int] = None
     ativo: int
     data_criacao: str
 
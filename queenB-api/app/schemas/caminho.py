@@ -2,8 +2,9 @@
 Schemas Pydantic simples para I/O da API
 """
 
-from pydantic import BaseModel
-from typing import List
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional, Union
 
 
 class AeroportoNoCaminho(BaseModel):
@@ -22,10 +23,98 @@ class RespostaCaminho(BaseModel):
     distancia_total_km: float
     tempo_estimado_min: int
     numero_paradas: int
+    peso: Optional[str] = None  # métrica minimizada ('distancia', 'tempo' ou 'combustivel')
+    custo_total: Optional[float] = None  # custo do caminho na métrica
+    sucesso: bool = True
+
+
+class EspacoBusca(BaseModel):
+    """Trabalho de uma busca ponto a ponto"""
+    vertices_visitados: int
+    arcos_relaxados: int
+    tempo_ms: float
+
+
+class RespostaALT(RespostaCaminho):
+    """Caminho calculado por ALT com o espaço de busca de cada algoritmo"""
+    landmarks: List[str]
+    espaco_busca: Dict[str, EspacoBusca]
+
+
+class RespostaMetrica(RespostaCaminho):
+    """Caminho de menor custo em uma métrica (distância, tempo ou combustível)"""
+    metrica: str
+    espaco_busca: EspacoBusca
+
+
+class TrechoItinerario(BaseModel):
+    """Trecho entre duas paradas consecutivas de um itinerário"""
+    origem_codigo: str
+    destino_codigo: str
+    distancia_km: float
+    tempo_min: int
+    custo: float  # custo na métrica do itinerário
+    numero_paradas: int
+
+
+class RespostaItinerario(RespostaCaminho):
+    """Itinerário por várias paradas: ordem de visita, trechos e caminho completo"""
+    ordem: List[str]
+    trechos: List[TrechoItinerario]
+    metodo: str  # 'held-karp' (exato) ou 'heuristica'
+    otimo: bool
+    tempo_ms: float
+
+
+class VooNoItinerario(BaseModel):
+    """Trecho de uma viagem por horários"""
+    id_voo: int
+    codigo_voo: Optional[str]
+    origem_codigo: str
+    destino_codigo: str
+    partida: datetime
+    chegada: datetime
+
+
+class ViagemHorario(BaseModel):
+    """Viagem composta por voos programados"""
+    partida: datetime
+    chegada: datetime
+    duracao_min: int
+    numero_paradas: int
+    voos: List[VooNoItinerario]
+
+
+class RespostaHorario(BaseModel):
+    """Resposta do cálculo de viagens por horário (CSA)"""
+    algoritmo: str
+    origem_codigo: str
+    destino_codigo: str
+    partida_solicitada: datetime
+    viagens: List[ViagemHorario]
     sucesso: bool = True
 
 
 class ErroRota(BaseModel):
     """Resposta de erro"""
     sucesso: bool = False
-    mensagem: str
\ No newline at end of file
+    mensagem: str
+
+
+class ParCaminho(BaseModel):
+    """Consulta individual de um lote"""
+    origem: str = Field(..., description="Código IATA ou ID do aeroporto de origem")
+    destino: str = Field(..., description="Código IATA ou ID do aeroporto de destino")
+
+
+class ConsultaLote(BaseModel):
+    """Lote de consultas de caminhos"""
+    algoritmo: Literal["dijkstra", "bfs"] = "dijkstra"
+    peso: Literal["distancia", "tempo", "combustivel"] = "distancia"
+    consultas: List[ParCaminho] = Field(..., min_length=1, max_length=1000)
+
+
+class RespostaLote(BaseModel):
+    """Resultados de um lote, na ordem das consultas"""
+    total: int
+    resultados: List[Union[RespostaCaminho, ErroRota]]
\ No newline at end of file
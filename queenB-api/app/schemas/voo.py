@@ -0,0 +1,46 @@
+"""
+Schemas Pydantic para módulo de Voos programados
+"""
+
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+
+class VooCadastro(BaseModel):
+    """Schema para cadastro de novo voo programado (horários em UTC)"""
+    id_rota: int = Field(..., gt=0, description="ID da rota operada pelo voo")
+    codigo_voo: Optional[str] = Field(None, max_length=10, description="Código do voo (ex: LA3000)")
+    invertido: int = Field(0, ge=0, le=1, description="1 se o voo opera no sentido destino → origem da rota")
+    partida: datetime = Field(..., description="Horário de partida")
+    chegada: datetime = Field(..., description="Horário de chegada")
+
+
+class VooEdicao(BaseModel):
+    """Schema para edição de voo"""
+    id_rota: Optional[int] = Field(None, gt=0)
+    codigo_voo: Optional[str] = Field(None, max_length=10)
+    invertido: Optional[int] = Field(None, ge=0, le=1)
+    partida: Optional[datetime] = None
+    chegada: Optional[datetime] = None
+    ativo: Optional[int] = Field(None, ge=0, le=1)
+
+
+class VooResposta(BaseModel):
+    """Schema de resposta com dados do voo"""
+    id_voo: int
+    id_rota: int
+    codigo_voo: Optional[str]
+    invertido: int
+    origem_codigo: str
+    destino_codigo: str
+    partida: str
+    chegada: str
+    ativo: int
+    data_criacao: str
+
+
+class VooListaResposta(BaseModel):
+    """Schema de resposta para lista de voos"""
+    total: int
+    voos: List[VooResposta]
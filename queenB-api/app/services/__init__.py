@@ -3,5 +3,40 @@ Serviços de lógica de negócio
 """
 
 from .grafo_service import GrafoService
+from .horarios_service import HorariosService
+from .resolvedor_aeroportos import ResolvedorAeroportos, resolvedor_aeroportos
+from .delta_grafo import DeltaGrafoService
+from .eventos import BrokerEventos, broker_eventos
+from .alteracoes import notificar_alteracao
+from .coalescencia import Coalescedor, metricas_coalescencia
+from .agendador import Agendador, agendador
+from .pool_caminhos import PoolCaminhos, pool_caminhos
+from .sincronizacao import SincronizadorProcessos, sincronizador
+from .cache_caminhos import CacheCaminhos, cache_caminhos
+from .overlay_service import OverlayService
+from .itinerario_service import ItinerarioService
+from .criticos_service import CriticosService
 
-__all__ = ["GrafoService"]
\ No newline at end of file
+__all__ = [
+    "GrafoService",
+    "HorariosService",
+    "ResolvedorAeroportos",
+    "resolvedor_aeroportos",
+    "DeltaGrafoService",
+    "BrokerEventos",
+    "broker_eventos",
+    "notificar_alteracao",
+    "Coalescedor",
+    "metricas_coalescencia",
+    "Agendador",
+    "agendador",
+    "PoolCaminhos",
+    "pool_caminhos",
+    "SincronizadorProcessos",
+    "sincronizador",
+    "CacheCaminhos",
+    "cache_caminhos",
+    "OverlayService",
+    "ItinerarioService",
+    "CriticosService"
+]
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+Agendador com controle de admissão para endpoints de alto custo de CPU.
+
+Cada classe de endpoint tem seu próprio executor e fila limitada, separados
+do threadpool onde rodam os endpoints baratos (CRUD, login, listagens).
+"""
+
+import asyncio
+import math
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+from fastapi import HTTPException, Request, status
+from ..config import settings
+
+# Intervalo entre verificações de desconexão do cliente e de prazo na fila
+INTERVALO_VERIFICACAO_S = 0.25
+
+
+class ClasseAgendamento:
+    """
+    Executor limitado e fila de espera de uma classe de endpoints.
+    
+    Admite no máximo `workers + max_fila` requisições simultâneas; as demais
+    recebem 503. Requisições que esperam na fila além de `tempo_max_fila_s`
+    também recebem 503. A vaga de uma requisição só é liberada quando sua
+    computação termina, mesmo que o cliente tenha desistido antes.
+    """
+    
+    def __init__(self, nome: str, workers: int, max_fila: int, tempo_max_fila_s: float):
+        self.nome = nome
+        self.workers = workers
+        self.max_fila = max_fila
+        self.tempo_max_fila_s = tempo_max_fila_s
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"agendador-{nome}")
+        self._lock = threading.Lock()
+        self._admitidas = 0
+        self._em_execucao = 0
+        self._duracao_media_s = 0.0
+        self._contadores = {"aceitas": 0, "rejeitadas": 0, "expiradas": 0, "canceladas": 0}
+    
+    def admitir(self) -> bool:
+        """Reserva uma vaga (execução ou fila); False se a classe está cheia"""
+        with self._lock:
+            if self._admitidas >= self.workers + self.max_fila:
+                self._contadores["rejeitadas"] += 1
+                return False
+            self._admitidas += 1
+            self._contadores["aceitas"] += 1
+            return True
+    
+    def liberar(self) -> None:
+        """Libera a vaga reservada em admitir"""
+        with self._lock:
+            self._admitidas -= 1
+    
+    def registrar(self, evento: str) -> None:
+        """Incrementa um contador ('expiradas' ou 'canceladas')"""
+        with self._lock:
+            self._contadores[evento] += 1
+    
+    def iniciar(self) -> None:
+        with self._lock:
+            self._em_execucao += 1
+    
+    def concluir(self, duracao_s: float) -> None:
+        with self._lock:
+            self._em_execucao -= 1
+            # Média móvel exponencial do tempo de execução
+            self._duracao_media_s += 0.2 * (duracao_s - self._duracao_media_s)
+    
+    def retry_after(self) -> int:
+        """Estimativa, em segundos, de quando haverá vaga"""
+        with self._lock:
+            return max(1, math.ceil(self._duracao_media_s * self._admitidas / self.workers))
+    
+    def metricas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_fila": self.max_fila,
+                "em_execucao": self._em_execucao,
+                "na_fila": max(0, self._admitidas - self._em_execucao),
+                "tempo_medio_ms": round(self._duracao_media_s * 1000, 1),
+                **self._contadores
+            }
+
+
+class ReservaFluxo:
+    """
+    Vaga de uma resposta em streaming: liberada uma única vez, quando o
+    fluxo termina ou é abandonado e nenhum lote está em execução.
+    """
+    
+    def __init__(self, classe: ClasseAgendamento):
+        self.classe = classe
+        self.lote: Optional[Future] = None
+        self.iniciado = False
+        self.duracao_s = 0.0
+        self._liberada = False
+        self._lock = threading.Lock()
+    
+    def liberar(self) -> None:
+        lote = self.lote
+        if lote is not None and not lote.done():
+            # O lote em execução não é interrompido: a vaga sai quando ele terminar
+            lote.add_done_callback(lambda _: self.liberar())
+            return
+        with self._lock:
+            if self._liberada:
+                return
+            self._liberada = True
+        if self.iniciado:
+            self.classe.concluir(self.duracao_s)
+        self.classe.liberar()
+
+
+class Agendador:
+    """Encaminha computações de cada classe de endpoint para seu executor"""
+    
+    def __init__(self, classes: List[ClasseAgendamento]):
+        self.classes = {c.nome: c for c in classes}
+    
+    def _indisponivel(self, classe: ClasseAgendamento, motivo: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=motivo,
+            headers={"Retry-After": str(classe.retry_after())}
+        )
+    
+    async def executar(self, nome_classe: str, request: Request, funcao: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa `funcao(*args)` no executor da classe.
+        
+        - Classe cheia: 503 imediato com Retry-After
+        - Espera na fila acima do limite: 503 com Retry-After
+        - Cliente desconectado antes do início: a computação é descartada
+        
+        Uma computação já iniciada não é interrompida; seu resultado é
+        descartado se o cliente tiver desconectado, e a vaga só é liberada
+        quando ela termina.
+        
+        Args:
+            nome_classe: Classe do endpoint ('caminhos' ou 'exportacao')
+            request: Requisição, usada para detectar desconexão
+            funcao: Computação síncrona
+        
+        Returns:
+            Resultado de funcao
+        """
+        classe = self.classes[nome_classe]
+        if not classe.admitir():
+            raise self._indisponivel(classe, f"Servidor ocupado ({classe.nome}); tente novamente")
+        
+        cancelado = threading.Event()
+        
+        def tarefa():
+            if cancelado.is_set():
+                return None
+            classe.iniciar()
+            inicio = time.monotonic()
+            try:
+                return funcao(*args)
+            finally:
+                classe.concluir(time.monotonic() - inicio)
+        
+        try:
+            futuro = classe.executor.submit(tarefa)
+        except BaseException:
+            classe.liberar()
+            raise
+        # Liberada ao fim da tarefa (ou ao sair da fila), não quando a espera termina
+        futuro.add_done_callback(lambda _: classe.liberar())
+        aguardado = asyncio.wrap_future(futuro)
+        prazo = time.monotonic() + classe.tempo_max_fila_s
+        
+        try:
+            while True:
+                concluidos, _ = await asyncio.wait({aguardado}, timeout=INTERVALO_VERIFICACAO_S)
+                if concluidos:
+                    return aguardado.result()
+                
+                # cancel() só tem efeito enquanto a tarefa ainda está na fila
+                if time.monotonic() > prazo and futuro.cancel():
+                    classe.registrar("expiradas")
+                    raise self._indisponivel(classe, f"Tempo de espera esgotado ({classe.nome}); tente novamente")
+                
+                if await request.is_disconnected():
+                    cancelado.set()
+                    futuro.cancel()
+                    classe.registrar("canceladas")
+                    raise HTTPException(status_code=499, detail="Cliente desconectado")
+        except asyncio.CancelledError:
+            cancelado.set()
+            futuro.cancel()
+            classe.registrar("canceladas")
+            raise
+    
+    def iterar(self, nome_classe: str, gerador: Iterator[Any], lote: int = 64) -> AsyncIterator[Any]:
+        """
+        Consome um gerador síncrono no executor da classe, em lotes.
+        
+        Usado por respostas em streaming. A vaga é reservada aqui, antes de
+        a resposta começar, e vale até o último lote terminar. Se o cliente
+        desconectar, o lote em execução termina e o restante do gerador não
+        é calculado.
+        
+        Raises:
+            HTTPException: 503 com Retry-After se a classe está cheia
+        """
+        classe = self.classes[nome_classe]
+        if not classe.admitir():
+            raise self._indisponivel(classe, f"Servidor ocupado ({classe.nome}); tente novamente")
+        
+        reserva = ReservaFluxo(classe)
+        fluxo = self._consumir(reserva, gerador, lote)
+        # Fluxo descartado sem nunca ser iterado (ex.: cliente saiu antes)
+        weakref.finalize(fluxo, reserva.liberar)
+        return fluxo
+    
+    async def _consumir(self, reserva: ReservaFluxo, gerador: Iterator[Any], lote: int) -> AsyncIterator[Any]:
+        classe = reserva.classe
+        
+        def proximo_lote() -> List[Any]:
+            if not reserva.iniciado:
+                reserva.iniciado = True
+                classe.iniciar()
+            inicio = time.monotonic()
+            itens = []
+            try:
+                for item in gerador:
+                    itens.append(item)
+                    if len(itens) >= lote:
+                        break
+            finally:
+                reserva.duracao_s += time.monotonic() - inicio
+            return itens
+        
+        try:
+            while True:
+                reserva.lote = classe.executor.submit(proximo_lote)
+                itens = await asyncio.wrap_future(reserva.lote)
+                for item in itens:
+                    yield item
+                if len(itens) < lote:
+                    return
+        except asyncio.CancelledError:
+            classe.registrar("canceladas")
+            raise
+        finally:
+            reserva.liberar()
+    
+    def metricas(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas de cada classe"""
+        return {nome: classe.metricas() for nome, classe in self.classes.items()}
+
+
+agendador = Agendador([
+    ClasseAgendamento(
+        "caminhos",
+        settings.AGENDADOR_CAMINHOS_WORKERS,
+        settings.AGENDADOR_CAMINHOS_FILA,
+        settings.AGENDADOR_TEMPO_MAX_FILA_S
+    ),
+    ClasseAgendamento(
+        "exportacao",
+        settings.AGENDADOR_EXPORTACAO_WORKERS,
+        settings.AGENDADOR_EXPORTACAO_FILA,
+        settings.AGENDADOR_TEMPO_MAX_FILA_S
+    ),
+])
@@ -0,0 +1,32 @@
+"""
+Propagação das escritas dos routers para os componentes em memória
+"""
+
+from typing import Any, Dict, Optional
+from .sincronizacao import sincronizador
+
+
+def notificar_alteracao(
+    entidade: str,
+    id_entidade: int,
+    operacao: str,
+    dados: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Propaga uma escrita já confirmada no banco para os componentes em memória:
+    incrementa a versão dos dados, aplica a alteração ao grafo e publica o
+    evento para os clientes SSE.
+    
+    A escrita é aplicada junto com as de outros processos ainda pendentes
+    no log de alterações, na ordem do log (ver SincronizadorProcessos).
+    
+    Args:
+        entidade: 'aeroporto', 'rota' ou 'voo'
+        id_entidade: ID do registro alterado
+        operacao: 'criacao', 'atualizacao' ou 'remocao'
+        dados: Estado atual do registro (opcional)
+        
+    Returns:
+        Nova versão dos dados
+    """
+    return sincronizador.sincronizar((entidade, id_entidade, operacao, dados))
@@ -0,0 +1,240 @@
+"""
+Cache L2 de resultados de caminhos em um arquivo SQLite próprio,
+compartilhado entre workers e preservado entre reinicializações
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Tuple
+from ..config import settings
+from ..database import execute_query
+from .pool_caminhos import ResultadoBusca
+
+logger = logging.getLogger(__name__)
+
+# Acessos mais próximos que isto não atualizam ultimo_acesso (evita uma escrita por leitura)
+INTERVALO_ATUALIZACAO_ACESSO_S = 60.0
+# A cada quantas inserções o tamanho do cache é verificado
+INSERCOES_POR_LIMPEZA = 64
+
+
+class CacheCaminhos:
+    """
+    Resultados de buscas indexados por (versão do log de alterações,
+    algoritmo, origem, destino, restrições).
+    
+    O caminho é guardado compacto (códigos IATA separados por vírgula);
+    nomes dos aeroportos são resolvidos na leitura. Consultas sem rota
+    também são guardadas (caminho NULL).
+    
+    Fica em um arquivo separado do banco principal (modo WAL) para que as
+    gravações do cache não disputem o lock das escritas de dados nem
+    alterem o PRAGMA data_version observado pelos workers. A remoção é LRU
+    por tamanho total: entradas de versões anteriores saem primeiro, depois
+    as acessadas há mais tempo. O arquivo guarda o identificador da
+    instância do banco e o sentido das rotas, e é esvaziado se o banco for
+    recriado ou GRAFO_DIRIGIDO mudar.
+    """
+    
+    def __init__(self, caminho: Path, max_bytes: int):
+        self.caminho = caminho
+        self.max_bytes = max_bytes
+        self._conexoes = threading.local()
+        self._lock = threading.Lock()
+        self._acertos = 0
+        self._faltas = 0
+        self._insercoes = 0
+        self._erros = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._apos_fork)
+    
+    def _apos_fork(self) -> None:
+        self._conexoes = threading.local()
+        self._lock = threading.Lock()
+    
+    @property
+    def ativo(self) -> bool:
+        return self.max_bytes > 0
+    
+    def _conexao(self) -> sqlite3.Connection:
+        """Conexão persistente da thread atual, criando o esquema na primeira vez"""
+        conexao = getattr(self._conexoes, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=1.0, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode = WAL")
+            conexao.execute("PRAGMA synchronous = NORMAL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS caminho_cache (
+                    versao INTEGER NOT NULL,
+                    algoritmo TEXT NOT NULL,
+                    origem TEXT NOT NULL,
+                    destino TEXT NOT NULL,
+                    restricoes TEXT NOT NULL DEFAULT '',
+                    caminho TEXT,
+                    distancia INTEGER,
+                    tempo INTEGER,
+                    tamanho INTEGER NOT NULL,
+                    ultimo_acesso REAL NOT NULL,
+                    PRIMARY KEY (versao, algoritmo, origem, destino, restricoes)
+                ) WITHOUT ROWID
+            """)
+            conexao.execute("""
+                CREATE INDEX IF NOT EXISTS idx_caminho_cache_acesso
+                ON caminho_cache(ultimo_acesso)
+            """)
+            conexao.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+            
+            # Versões do log só valem para a instância do banco em que foram
+            # geradas, e os caminhos para o sentido das rotas com que foram calculados
+            instancia = execute_query("SELECT id FROM instancia")[0]['id']
+            modo = "dirigido" if settings.GRAFO_DIRIGIDO else "bidirecional"
+            registrados = dict(conexao.execute("SELECT chave, valor FROM meta").fetchall())
+            if registrados.get('instancia') != instancia or registrados.get('grafo') != modo:
+                conexao.execute("BEGIN IMMEDIATE")
+                conexao.execute("DELETE FROM caminho_cache")
+                conexao.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('instancia', ?)", (instancia,))
+                conexao.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('grafo', ?)", (modo,))
+                conexao.execute("COMMIT")
+            self._conexoes.conexao = conexao
+        return conexao
+    
+    def consultar(
+        self,
+        versao: int,
+        algoritmo: str,
+        origem: str,
+        destino: str,
+        restricoes: str = ""
+    ) -> Tuple[bool, ResultadoBusca]:
+        """
+        Busca um resultado no cache.
+        
+        Returns:
+            Tupla (encontrado, resultado); resultado None com encontrado
+            True significa que não existe rota
+        """
+        chave = (versao, algoritmo, origem, destino, restricoes)
+        try:
+            conexao = self._conexao()
+            linha = conexao.execute("""
+                SELECT caminho, distancia, tempo, ultimo_acesso FROM caminho_cache
+                WHERE versao = ? AND algoritmo = ? AND origem = ? AND destino = ? AND restricoes = ?
+            """, chave).fetchone()
+            
+            if linha is None:
+                with self._lock:
+                    self._faltas += 1
+                return False, None
+            
+            caminho, distancia, tempo, ultimo_acesso = linha
+            agora = time.time()
+            if agora - ultimo_acesso >= INTERVALO_ATUALIZACAO_ACESSO_S:
+                conexao.execute("""
+                    UPDATE caminho_cache SET ultimo_acesso = ?
+                    WHERE versao = ? AND algoritmo = ? AND origem = ? AND destino = ? AND restricoes = ?
+                """, (agora,) + chave)
+        except sqlite3.Error:
+            logger.debug("Falha ao consultar o cache de caminhos", exc_info=True)
+            with self._lock:
+                self._erros += 1
+            return False, None
+        
+        with self._lock:
+            self._acertos += 1
+        if caminho is None:
+            return True, None
+        return True, (caminho.split(","), distancia, tempo)
+    
+    def guardar(
+        self,
+        versao: int,
+        algoritmo: str,
+        origem: str,
+        destino: str,
+        resultado: ResultadoBusca,
+        restricoes: str = ""
+    ) -> None:
+        """Grava o resultado de uma busca (None = não existe rota)"""
+        if resultado is None:
+            caminho, distancia, tempo = None, None, None
+        else:
+            caminho, distancia, tempo = ",".join(resultado[0]), resultado[1], resultado[2]
+        tamanho = len(algoritmo) + len(origem) + len(destino) + len(restricoes) + len(caminho or "") + 48
+        
+        try:
+            conexao = self._conexao()
+            conexao.execute("""
+                INSERT OR REPLACE INTO caminho_cache
+                (versao, algoritmo, origem, destino, restricoes, caminho, distancia, tempo, tamanho, ultimo_acesso)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (versao, algoritmo, origem, destino, restricoes, caminho, distancia, tempo, tamanho, time.time()))
+        except sqlite3.Error:
+            logger.debug("Falha ao gravar no cache de caminhos", exc_info=True)
+            with self._lock:
+                self._erros += 1
+            return
+        
+        with self._lock:
+            self._insercoes += 1
+            limpar = self._insercoes % INSERCOES_POR_LIMPEZA == 0
+        if limpar:
+            self.limpar(versao)
+    
+    def limpar(self, versao_atual: int) -> int:
+        """
+        Remove entradas de versões anteriores e, se o total ainda passar de
+        max_bytes, as menos usadas recentemente até ficar em 90% do limite.
+        
+        Returns:
+            Número de entradas removidas
+        """
+        try:
+            conexao = self._conexao()
+            removidas = conexao.execute(
+                "DELETE FROM caminho_cache WHERE versao < ?", (versao_atual,)
+            ).rowcount
+            
+            total, quantidade = conexao.execute(
+                "SELECT COALESCE(SUM(tamanho), 0), COUNT(*) FROM caminho_cache"
+            ).fetchone()
+            if total > self.max_bytes and quantidade:
+                excesso = total - int(self.max_bytes * 0.9)
+                remover = min(quantidade, -(-excesso * quantidade // total))
+                removidas += conexao.execute("""
+                    DELETE FROM caminho_cache
+                    WHERE (versao, algoritmo, origem, destino, restricoes) IN (
+                        SELECT versao, algoritmo, origem, destino, restricoes
+                        FROM caminho_cache ORDER BY ultimo_acesso LIMIT ?
+                    )
+                """, (remover,)).rowcount
+            return removidas
+        except sqlite3.Error:
+            logger.debug("Falha ao limpar o cache de caminhos", exc_info=True)
+            return 0
+    
+    def metricas(self) -> dict:
+        """Contadores deste processo e ocupação do cache compartilhado"""
+        with self._lock:
+            metricas = {
+                "ativo": self.ativo,
+                "acertos": self._acertos,
+                "faltas": self._faltas,
+                "insercoes": self._insercoes,
+                "erros": self._erros
+            }
+        if self.ativo:
+            try:
+                total, quantidade = self._conexao().execute(
+                    "SELECT COALESCE(SUM(tamanho), 0), COUNT(*) FROM caminho_cache"
+                ).fetchone()
+                metricas.update(entradas=quantidade, bytes=total, max_bytes=self.max_bytes)
+            except sqlite3.Error:
+                pass
+        return metricas
+
+
+cache_caminhos = CacheCaminhos(settings.cache_caminhos_path, settings.CACHE_CAMINHOS_MAX_MB * 1024 * 1024)
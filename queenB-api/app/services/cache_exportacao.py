@@ -0,0 +1,162 @@
+"""
+Cache dos corpos serializados das exportações JSON, por versão do log de alterações
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from .sincronizacao import sincronizador
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, serve apenas gzip
+    brotli = None
+
+
+@dataclass
+class CorpoExportado:
+    """Corpo serializado de uma exportação com suas variantes comprimidas"""
+    etag: str
+    corpos: Dict[str, bytes]  # codificação ("identity", "gzip", "br") -> bytes
+    media_type: str = "application/json"
+    
+    def etag_codificacao(self, codificacao: str) -> str:
+        """ETag forte da variante (cada codificação tem seu próprio validador)"""
+        if codificacao == "identity":
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{codificacao}"'
+
+
+def _codificacoes_aceitas(accept_encoding: str) -> Dict[str, float]:
+    """Interpreta o cabeçalho Accept-Encoding em {codificação: q}"""
+    aceitas = {}
+    for parte in accept_encoding.split(","):
+        item = parte.strip()
+        if not item:
+            continue
+        nome, _, parametros = item.partition(";")
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        aceitas[nome.strip().lower()] = q
+    return aceitas
+
+
+class CacheExportacao:
+    """
+    Guarda os bytes JSON (e versões gzip/brotli pré-comprimidas) de cada
+    exportação, indexados por (versão do log de alterações, endpoint,
+    parâmetros).
+    
+    Requisições repetidas na mesma versão custam uma busca no dicionário,
+    sem SQL nem serialização; com If-None-Match válido a resposta é 304.
+    A versão do log é comum a todos os workers e o ETag vem só do conteúdo,
+    então workers diferentes validam o mesmo ETag para os mesmos bytes.
+    """
+    
+    def __init__(self, max_entradas: int = 64):
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[tuple, CorpoExportado]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def consultar(self, chave: tuple) -> Optional[CorpoExportado]:
+        """Retorna o corpo em cache para a chave na versão atual, sem gerar"""
+        return self._entradas.get((sincronizador.versao_log,) + chave)
+    
+    def obter(
+        self,
+        chave: tuple,
+        gerar: Callable[[], Any],
+        serializar: Optional[Callable[[Any], bytes]] = None,
+        media_type: str = "application/json"
+    ) -> CorpoExportado:
+        """
+        Retorna o corpo em cache para a chave na versão atual, gerando-o se necessário.
+        
+        Args:
+            chave: Identificação da exportação (endpoint e parâmetros)
+            gerar: Função que monta o conteúdo (chamada apenas em cache miss)
+            serializar: Função que converte o conteúdo em bytes (padrão: JSON)
+            media_type: Content-Type da resposta
+        """
+        versao = sincronizador.versao_log
+        chave_versao = (versao,) + chave
+        
+        entrada = self._entradas.get(chave_versao)
+        if entrada is not None:
+            return entrada
+        
+        conteudo = gerar()
+        if serializar is None:
+            corpo = json.dumps(
+                jsonable_encoder(conteudo), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+        else:
+            corpo = serializar(conteudo)
+        
+        corpos = {"identity": corpo, "gzip": gzip.compress(corpo, compresslevel=6)}
+        if brotli is not None:
+            corpos["br"] = brotli.compress(corpo, quality=5)
+        
+        entrada = CorpoExportado(
+            etag=hashlib.sha1(corpo).hexdigest()[:24],
+            corpos=corpos,
+            media_type=media_type
+        )
+        
+        with self._lock:
+            # Descarta entradas de versões anteriores e limita o tamanho
+            for chave_antiga in [c for c in self._entradas if c[0] != versao]:
+                del self._entradas[chave_antiga]
+            self._entradas[chave_versao] = entrada
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        
+        return entrada
+    
+    def responder(self, request: Request, entrada: CorpoExportado) -> Response:
+        """
+        Monta a resposta HTTP para a entrada, respeitando If-None-Match
+        e escolhendo a melhor variante segundo Accept-Encoding.
+        """
+        aceitas = _codificacoes_aceitas(request.headers.get("accept-encoding", ""))
+        codificacao = "identity"
+        for candidata in ("br", "gzip"):
+            if candidata in entrada.corpos and aceitas.get(candidata, 0) > 0:
+                codificacao = candidata
+                break
+        
+        headers = {
+            "ETag": entrada.etag_codificacao(codificacao),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding"
+        }
+        
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            validos = {entrada.etag_codificacao(c) for c in entrada.corpos}
+            enviados = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in enviados or validos & enviados:
+                return Response(status_code=304, headers=headers)
+        
+        if codificacao != "identity":
+            headers["Content-Encoding"] = codificacao
+        
+        return Response(
+            content=entrada.corpos[codificacao],
+            media_type=entrada.media_type,
+            headers=headers
+        )
+
+
+cache_exportacao = CacheExportacao()
@@ -0,0 +1,104 @@
+"""
+Coalescência (single-flight) de computações idênticas concorrentes
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Chamada:
+    """Computação em andamento compartilhada pelos solicitantes da mesma chave"""
+    
+    def __init__(self):
+        self.concluida = threading.Event()
+        self.resultado: Any = None
+        self.erro: Optional[BaseException] = None
+
+
+class Coalescedor:
+    """
+    Garante uma única execução por chave em andamento.
+    
+    A primeira requisição de uma chave executa a função; as que chegam
+    enquanto ela está em andamento aguardam e recebem o mesmo resultado
+    (ou a mesma exceção). Terminada a execução, a chave é liberada: o
+    resultado não fica em cache. As chaves devem incluir a versão dos
+    dados para que requisições após uma escrita não recebam resultado antigo.
+    """
+    
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._lock = threading.Lock()
+        self._em_andamento: Dict[Hashable, _Chamada] = {}
+        self._execucoes = 0
+        self._coalescidas = 0
+        self._erros = 0
+    
+    def executar(self, chave: Hashable, funcao: Callable[[], T]) -> T:
+        """
+        Executa `funcao` ou aguarda a execução em andamento da mesma chave.
+        
+        Args:
+            chave: Identifica computações equivalentes
+            funcao: Computação a executar (sem argumentos)
+        
+        Returns:
+            Resultado da execução compartilhada
+        """
+        with self._lock:
+            chamada = self._em_andamento.get(chave)
+            lider = chamada is None
+            if lider:
+                chamada = _Chamada()
+                self._em_andamento[chave] = chamada
+                self._execucoes += 1
+            else:
+                self._coalescidas += 1
+        
+        if not lider:
+            chamada.concluida.wait()
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+        
+        try:
+            chamada.resultado = funcao()
+            return chamada.resultado
+        except BaseException as erro:
+            chamada.erro = erro
+            with self._lock:
+                self._erros += 1
+            raise
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+            chamada.concluida.set()
+    
+    def metricas(self) -> Dict[str, int]:
+        """Contadores de execuções reais, requisições coalescidas e erros"""
+        with self._lock:
+            total = self._execucoes + self._coalescidas
+            return {
+                "requisicoes": total,
+                "execucoes": self._execucoes,
+                "coalescidas": self._coalescidas,
+                "erros": self._erros,
+                "em_andamento": len(self._em_andamento)
+            }
+
+
+# Consultas de caminhos (chave: versão dos dados, algoritmo e parâmetros)
+coalescedor_consultas = Coalescedor("consultas")
+
+# Reconstruções de estruturas em memória (chave: estrutura e versão)
+coalescedor_reconstrucoes = Coalescedor("reconstrucoes")
+
+
+def metricas_coalescencia() -> Dict[str, Dict[str, int]]:
+    """Métricas de todos os coalescedores"""
+    return {
+        c.nome: c.metricas()
+        for c in (coalescedor_consultas, coalescedor_reconstrucoes)
+    }
@@ -0,0 +1,163 @@
+"""
+Serviço de análise de resiliência da malha: aeroportos e rotas cuja
+perda desconecta pares origem-destino
+"""
+
+import time
+from itertools import islice
+from typing import Any, Dict, Optional, Tuple
+from ..algoritmos.grafo import Grafo
+from ..algoritmos.criticos import Tarjan, AnaliseCriticos
+from ..schemas.caminho import ErroRota
+from .grafo_service import GrafoService
+from .coalescencia import coalescedor_reconstrucoes
+
+
+class CriticosService:
+    """
+    Articulações, pontes e componentes biconexos da malha ativa, calculados
+    uma vez por versão do grafo (O(V + E)) e reaproveitados pelas consultas
+    de impacto.
+    
+    A análise considera a malha sem sentido: em grafos dirigidos, um par
+    é dado como desconectado quando não resta ligação em nenhum sentido.
+    """
+    
+    # (grafo, versão, análise, duração em ms) da última análise
+    _estado: Optional[Tuple[Grafo, Optional[int], AnaliseCriticos, float]] = None
+    
+    @staticmethod
+    def obter_analise() -> Tuple[Optional[int], AnaliseCriticos]:
+        """
+        Retorna a análise da versão atual do grafo; consultas concorrentes
+        aguardam a mesma execução.
+        
+        Returns:
+            Tupla (versão do grafo, AnaliseCriticos)
+        """
+        grafo, _ = GrafoService.obter_grafo()
+        versao = GrafoService._versao
+        estado = CriticosService._estado
+        if estado is not None and estado[0] is grafo and estado[1] == versao:
+            return estado[1], estado[2]
+        
+        return coalescedor_reconstrucoes.executar(("criticos", versao), CriticosService._analisar)
+    
+    @staticmethod
+    def _analisar() -> Tuple[Optional[int], AnaliseCriticos]:
+        """Executa o Tarjan sobre as rotas da versão atual, guardando-o se o grafo não mudou"""
+        grafo, _ = GrafoService.obter_grafo()
+        with GrafoService._lock:
+            versao = GrafoService._versao
+            estado = CriticosService._estado
+            if estado is not None and estado[0] is grafo and estado[1] == versao:
+                return estado[1], estado[2]
+            codigos = sorted(grafo.vertices())
+            rotas = grafo.rotas_registradas()
+        
+        inicio = time.perf_counter()
+        indice = {codigo: i for i, codigo in enumerate(codigos)}
+        arestas = [
+            (indice[origem], indice[aresta.destino], id_rota)
+            for id_rota, origem, aresta, _ in sorted(rotas, key=lambda r: r[0])
+        ]
+        analise = Tarjan.analisar(codigos, arestas)
+        
+        with GrafoService._lock:
+            if grafo is GrafoService._grafo and versao == GrafoService._versao:
+                CriticosService._estado = (grafo, versao, analise, (time.perf_counter() - inicio) * 1000)
+        return versao, analise
+    
+    @staticmethod
+    def resumo() -> Dict[str, Any]:
+        """
+        Articulações e pontes (mais pares desconectados primeiro) e
+        componentes biconexos (maiores primeiro) da versão atual.
+        """
+        versao, analise = CriticosService.obter_analise()
+        _, aeroportos_map = GrafoService.obter_grafo()
+        codigos = analise.codigos
+        
+        articulacoes = [
+            {
+                "codigo_iata": codigos[v],
+                "nome": (aeroportos_map.get(codigos[v]) or {}).get('nome'),
+                "grupos": analise.total_grupos(v),
+                "pares_desconectados": pares
+            }
+            for v, pares in sorted(analise.articulacoes.items(), key=lambda item: (-item[1], codigos[item[0]]))
+        ]
+        pontes = []
+        for e, pares in sorted(analise.pontes.items(), key=lambda item: (-item[1], analise.arestas[item[0]][2])):
+            u, v, id_rota = analise.arestas[e]
+            pontes.append({
+                "id_rota": id_rota,
+                "origem_codigo": codigos[u],
+                "destino_codigo": codigos[v],
+                "pares_desconectados": pares
+            })
+        componentes = sorted(analise.componentes, key=lambda c: (-len(c), codigos[c[0]]))
+        
+        return {
+            "versao": versao,
+            "aeroportos": len(codigos),
+            "rotas": len(analise.arestas),
+            "componentes_conexos": len(analise.tamanhos_conexos),
+            "articulacoes": articulacoes,
+            "pontes": pontes,
+            "componentes_biconexos": [[codigos[v] for v in componente] for componente in componentes]
+        }
+    
+    @staticmethod
+    def impacto(identificador: str, limite_pares: int = 100) -> Dict[str, Any] | ErroRota:
+        """
+        Efeito de fechar um aeroporto, a partir da análise em cache (O(V),
+        sem nova busca no grafo).
+        
+        Args:
+            identificador: Código IATA ou ID do aeroporto
+            limite_pares: Máximo de pares desconectados listados
+        
+        Returns:
+            Tamanho do maior grupo que continua ligado, grupos isolados dele
+            (códigos), total de pares origem-destino desconectados entre os
+            demais aeroportos e os primeiros desses pares, ou ErroRota se o
+            aeroporto não existe
+        """
+        aeroporto = GrafoService.buscar_aeroporto(identificador)
+        if not aeroporto:
+            return ErroRota(mensagem=f"Aeroporto '{identificador}' não encontrado")
+        
+        codigo = aeroporto['codigo_iata']
+        _, analise = CriticosService.obter_analise()
+        codigos = analise.codigos
+        v = codigos.index(codigo) if codigo in codigos else None
+        # Sem rotas ativas, fechá-lo não afeta os demais
+        grupos = analise.grupos_sem(v) if v is not None else []
+        pares = AnaliseCriticos.pares_entre(grupos)
+        return {
+            "codigo_iata": codigo,
+            "articulacao": v in analise.articulacoes,
+            "rotas_fechadas": sum(1 for a, b, _ in analise.arestas if v in (a, b)),
+            "maior_grupo": len(grupos[0]) if grupos else 0,
+            "grupos_isolados": [sorted(codigos[w] for w in grupo) for grupo in grupos[1:]],
+            "pares_desconectados": analise.articulacoes.get(v, 0),
+            "pares": [[codigos[a], codigos[b]] for a, b in islice(pares, limite_pares)]
+        }
+    
+    @staticmethod
+    def metricas() -> Dict[str, Any]:
+        """Estado da última análise"""
+        estado = CriticosService._estado
+        if estado is None:
+            return {"calculado": False}
+        
+        grafo, versao, analise, tempo_ms = estado
+        return {
+            "calculado": True,
+            "atual": grafo is GrafoService._grafo and versao == GrafoService._versao,
+            "versao": versao,
+            "articulacoes": len(analise.articulacoes),
+            "pontes": len(analise.pontes),
+            "tempo_ms": round(tempo_ms, 1)
+        }
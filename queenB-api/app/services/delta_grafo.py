@@ -0,0 +1,174 @@
+"""
+Serviço de sincronização incremental do grafo a partir do log de alterações
+"""
+
+import threading
+from typing import Any, Dict, List
+from ..config import settings
+from ..database import execute_query, execute_insert
+
+
+class DeltaGrafoService:
+    """
+    Calcula os vértices e arestas alterados desde uma versão do log
+    (tabela alteracao) e compacta entradas antigas do log.
+    """
+    
+    _lock = threading.Lock()
+    _versao_ultima_compactacao = 0
+    
+    @staticmethod
+    def versao_atual() -> int:
+        """Retorna a versão mais recente registrada no log (0 se vazio)"""
+        resultado = execute_query("SELECT MAX(versao) AS versao FROM alteracao")
+        return resultado[0]['versao'] or 0
+    
+    @staticmethod
+    def compactar() -> int:
+        """
+        Remove entradas antigas do log que já foram sucedidas por outra
+        alteração da mesma entidade.
+        
+        A compactação é sem perdas para o delta: como ele devolve o estado
+        atual de cada entidade alterada, basta a entrada mais recente.
+        As últimas ALTERACOES_RETIDAS versões são preservadas como histórico.
+        
+        Returns:
+            Número de entradas removidas
+        """
+        limite = DeltaGrafoService.versao_atual() - settings.ALTERACOES_RETIDAS
+        if limite <= 0:
+            return 0
+        
+        query = """
+            DELETE FROM alteracao
+            WHERE versao <= ?
+              AND versao NOT IN (
+                  SELECT MAX(versao) FROM alteracao GROUP BY entidade, id_entidade
+              )
+        """
+        return execute_insert(query, (limite,))
+    
+    @staticmethod
+    def _compactar_se_necessario(versao: int) -> None:
+        """Compacta o log a cada ALTERACOES_RETIDAS novas versões"""
+        with DeltaGrafoService._lock:
+            if versao - DeltaGrafoService._versao_ultima_compactacao < settings.ALTERACOES_RETIDAS:
+                return
+            DeltaGrafoService._versao_ultima_compactacao = versao
+        DeltaGrafoService.compactar()
+    
+    @staticmethod
+    def calcular_delta(desde: int) -> Dict[str, Any]:
+        """
+        Retorna as alterações do grafo posteriores à versão informada.
+        
+        Args:
+            desde: Última versão que o cliente já possui
+            
+        Returns:
+            Dicionário com a nova versão, vértices/arestas a inserir ou
+            atualizar e IDs de vértices/arestas removidos
+        """
+        versao = DeltaGrafoService.versao_atual()
+        
+        # Cliente à frente do servidor (ex.: banco recriado): precisa recarregar tudo
+        if desde > versao:
+            return {
+                "desde": desde,
+                "versao": versao,
+                "resincronizar": True,
+                "vertices": [],
+                "vertices_removidos": [],
+                "arestas": [],
+                "arestas_removidas": []
+            }
+        
+        alteradas = execute_query("""
+            SELECT DISTINCT entidade, id_entidade
+            FROM alteracao
+            WHERE versao > ? AND versao <= ?
+        """, (desde, versao))
+        
+        ids_aeroportos = {a['id_entidade'] for a in alteradas if a['entidade'] == 'aeroporto'}
+        ids_rotas = {a['id_entidade'] for a in alteradas if a['entidade'] == 'rota'}
+        
+        # Desativar ou reativar um aeroporto retira ou devolve suas rotas ao grafo
+        for coluna in ('id_aeroporto_origem', 'id_aeroporto_destino'):
+            ids_rotas.update(rota['id_rota'] for rota in DeltaGrafoService._buscar_em_lotes(
+                f"SELECT id_rota FROM rota WHERE {coluna} IN ({{marcadores}})",
+                sorted(ids_aeroportos)
+            ))
+        
+        arestas = []
+        arestas_removidas = []
+        for rota in DeltaGrafoService._buscar_em_lotes("""
+            SELECT 
+                r.*,
+                ao.codigo_iata as origem_codigo,
+                ad.codigo_iata as destino_codigo,
+                ao.ativo as origem_ativo,
+                ad.ativo as destino_ativo
+            FROM rota r
+            INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
+            INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
+            WHERE r.id_rota IN ({marcadores})
+        """, sorted(ids_rotas)):
+            # Mesmo filtro de construir_grafo: rota sem os dois extremos ativos não é aresta
+            if not (rota['ativo'] and rota['origem_ativo'] and rota['destino_ativo']):
+                arestas_removidas.append(rota['id_rota'])
+                continue
+            arestas.append({
+                "id": rota['id_rota'],
+                "origem": rota['origem_codigo'],
+                "destino": rota['destino_codigo'],
+                "distancia_km": rota['distancia_km'],
+                "tempo_estimado_min": rota['tempo_estimado_min'],
+                "combustivel_litros": rota.get('combustivel_litros')
+            })
+            # Extremidades de arestas novas podem ainda não existir no cliente
+            ids_aeroportos.add(rota['id_aeroporto_origem'])
+            ids_aeroportos.add(rota['id_aeroporto_destino'])
+        
+        vertices = []
+        vertices_removidos = []
+        for aero in DeltaGrafoService._buscar_em_lotes(
+            "SELECT * FROM aeroporto WHERE id_aeroporto IN ({marcadores})",
+            sorted(ids_aeroportos)
+        ):
+            if not aero['ativo']:
+                vertices_removidos.append(aero['id_aeroporto'])
+                continue
+            vertices.append({
+                "id": aero['id_aeroporto'],
+                "codigo_iata": aero['codigo_iata'],
+                "nome": aero['nome'],
+                "cidade": aero.get('cidade'),
+                "estado": aero.get('estado'),
+                "pais": aero.get('pais'),
+                "latitude": aero.get('latitude'),
+                "longitude": aero.get('longitude'),
+                "fuso_horario": aero.get('fuso_horario')
+            })
+        
+        DeltaGrafoService._compactar_se_necessario(versao)
+        
+        return {
+            "desde": desde,
+            "versao": versao,
+            "resincronizar": False,
+            "vertices": vertices,
+            "vertices_removidos": vertices_removidos,
+            "arestas": arestas,
+            "arestas_removidas": arestas_removidas
+        }
+    
+    @staticmethod
+    def _buscar_em_lotes(query: str, ids: List[int], tamanho_lote: int = 500) -> List[dict]:
+        """Executa uma query com cláusula IN em lotes (limite de parâmetros do SQLite)"""
+        resultados = []
+        for i in range(0, len(ids), tamanho_lote):
+            lote = ids[i:i + tamanho_lote]
+            marcadores = ", ".join("?" for _ in lote)
+            resultados.extend(execute_query(query.format(marcadores=marcadores), tuple(lote)))
+        return resultados
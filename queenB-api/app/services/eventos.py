@@ -0,0 +1,91 @@
+"""
+Broker pub/sub em processo para enviar alterações de aeroportos e rotas
+aos clientes conectados via Server-Sent Events
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Set, Tuple
+
+
+class Assinatura:
+    """
+    Fila de eventos de um cliente.
+    
+    Eventos pendentes são coalescidos por (entidade, id): rajadas de
+    alterações na mesma entidade resultam em um único evento com o estado
+    mais recente. Se o cliente acumular mais que `max_pendentes`, os
+    eventos são descartados e ele recebe um pedido de ressincronização.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pendentes: int):
+        self.loop = loop
+        self.max_pendentes = max_pendentes
+        self.sinal = asyncio.Event()
+        self._lock = threading.Lock()
+        self._pendentes: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+        self._resincronizar = False
+    
+    def enfileirar(self, evento: Dict[str, Any]) -> None:
+        """Adiciona evento (pode ser chamado de qualquer thread)"""
+        chave = (evento["entidade"], evento["id"])
+        with self._lock:
+            if self._resincronizar:
+                return
+            self._pendentes.pop(chave, None)
+            self._pendentes[chave] = evento
+            if len(self._pendentes) > self.max_pendentes:
+                self._pendentes.clear()
+                self._resincronizar = True
+        self.loop.call_soon_threadsafe(self.sinal.set)
+    
+    def retirar(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Retorna (eventos pendentes, precisa ressincronizar) e esvazia a fila"""
+        self.sinal.clear()
+        with self._lock:
+            eventos = list(self._pendentes.values())
+            resincronizar = self._resincronizar
+            self._pendentes.clear()
+            self._resincronizar = False
+        return eventos, resincronizar
+
+
+class BrokerEventos:
+    """Distribui alterações publicadas pelos routers para todas as assinaturas ativas"""
+    
+    def __init__(self, max_pendentes: int = 500):
+        self.max_pendentes = max_pendentes
+        self._lock = threading.Lock()
+        self._assinaturas: Set[Assinatura] = set()
+    
+    def assinar(self) -> Assinatura:
+        """Cria uma assinatura ligada ao event loop atual"""
+        assinatura = Assinatura(asyncio.get_running_loop(), self.max_pendentes)
+        with self._lock:
+            self._assinaturas.add(assinatura)
+        return assinatura
+    
+    def cancelar(self, assinatura: Assinatura) -> None:
+        """Remove uma assinatura (cliente desconectado)"""
+        with self._lock:
+            self._assinaturas.discard(assinatura)
+    
+    def publicar(self, evento: Dict[str, Any]) -> None:
+        """Envia o evento a todas as assinaturas (thread-safe)"""
+        with self._lock:
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            try:
+                assinatura.enfileirar(evento)
+            except RuntimeError:
+                # Event loop da assinatura já foi encerrado
+                self.cancelar(assinatura)
+    
+    @property
+    def total_assinaturas(self) -> int:
+        """Número de clientes conectados"""
+        return len(self._assinaturas)
+
+
+broker_eventos = BrokerEventos()
@@ -2,22 +2,77 @@
 ServiÃ§o para construir grafo do SQLite e executar algoritmos
 """
 
-from typing import Dict, Tuple, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple, Optional
+from ..config import settings
 from ..database import execute_query
-from ..algoritmos.grafo import Grafo
-from ..algoritmos.dijkstra import Dijkstra
+from ..algoritmos.grafo import Grafo, Aresta
+from ..algoritmos.dijkstra import Dijkstra, ResultadoDijkstra
+from ..algoritmos.sssp_dinamico import CaminhosDinamicos
 from ..algoritmos.bfs import BuscaLargura
-from ..schemas.caminho import RespostaCaminho, AeroportoNoCaminho, ErroRota
+from ..algoritmos.alcance import BuscaLimitada
+from ..algoritmos.geometria import fecho_convexo
+from ..algoritmos.grafo_compacto import GrafoCompacto, OPCAO_DIRIGIDO, OPCAO_PARALELAS_MESCLADAS
+from ..algoritmos.alt import Landmarks, BuscaALT
+from ..algoritmos.restricoes import Restricoes, MascarasRestricao
+from ..schemas.caminho import RespostaCaminho, RespostaALT, EspacoBusca, AeroportoNoCaminho, ErroRota
+from .resolvedor_aeroportos import resolvedor_aeroportos
+from .coalescencia import coalescedor_consultas, coalescedor_reconstrucoes
+from .pool_caminhos import pool_caminhos, ResultadoBusca
+from .snapshot_grafo import snapshot_grafo
+from .cache_caminhos import cache_caminhos
+from .delta_grafo import DeltaGrafoService
+from ..versao_dados import versao_dados
 
 
 class GrafoService:
     """ServiÃ§o para operaÃ§Ãµes com grafo e algoritmos"""
     
+    # Grafo em memória, válido para a versão dos dados em _versao
+    _lock = threading.RLock()
+    _grafo: Optional[Grafo] = None
+    _aeroportos_map: Dict[str, dict] = {}
+    _codigo_por_id: Dict[int, str] = {}
+    _versao: Optional[int] = None
+    # Versão do log de alterações (persistente, comum a todos os processos) refletida no grafo
+    _versao_log: Optional[int] = None
+    # O grafo pode já conter alterações posteriores a _versao_log (aplicadas antes
+    # de registradas no log deste processo): o cache L2 fica desligado
+    _log_pendente: bool = False
+    _ultima_verificacao: float = 0.0
+    # Litros por km das rotas com combustível cadastrado, usado nas que não o têm.
+    # Fixado na construção do grafo: escritas incrementais não o recalculam, e a
+    # verificação periódica reconstrói o grafo quando a média do banco se afasta
+    _consumo_medio: float = 1.0
+    # Rotas do grafo sem combustível cadastrado (o da aresta é estimado)
+    _combustivel_estimado: Set[int] = set()
+    
+    # Árvores de caminhos mínimos por (origem, métrica) (LRU), reparadas a cada alteração
+    _arvores: "OrderedDict[Tuple[str, str], ResultadoDijkstra]" = OrderedDict()
+    
+    # Índice ALT: (grafo, versão, grafo compilado, landmarks), válido enquanto
+    # grafo e versão forem os atuais
+    _alt: Optional[Tuple[Grafo, Optional[int], GrafoCompacto, Landmarks]] = None
+    _alt_preprocessamento_ms: float = 0.0
+    
+    # Mapas de bloqueio das restrições: (grafo, versão, grafo compilado, mapas),
+    # válidos enquanto grafo e versão forem os atuais
+    _restricoes: Optional[Tuple[Grafo, Optional[int], GrafoCompacto, MascarasRestricao]] = None
+    
     @staticmethod
     def construir_grafo() -> Tuple[Grafo, Dict[str, dict]]:
         """
         ConstrÃ³i grafo a partir das rotas no SQLite.
         
+        Cada aresta guarda distância, tempo e combustível; rotas sem
+        combustível cadastrado usam a distância vezes o consumo médio.
+        
+        Rotas valem nos dois sentidos, ou só no cadastrado com
+        GRAFO_DIRIGIDO. Com GRAFO_MESCLAR_PARALELAS, arcos paralelos entre
+        o mesmo par (ex.: A->B e B->A cadastradas) são mesclados ao final.
+        
         Returns:
             Tupla (Grafo, dicionÃ¡rio de aeroportos por cÃ³digo IATA)
         """
@@ -27,17 +82,21 @@ class GrafoService:
                 r.id_rota,
                 r.distancia_km,
                 r.tempo_estimado_min,
+                r.combustivel_litros,
+                ao.id_aeroporto as origem_id,
                 ao.codigo_iata as origem_codigo,
                 ao.nome as origem_nome,
+                ad.id_aeroporto as destino_id,
                 ad.codigo_iata as destino_codigo,
                 ad.nome as destino_nome
             FROM rota r
             INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
             INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
-            WHERE r.ativo = 1
+            WHERE r.ativo = 1 AND ao.ativo = 1 AND ad.ativo = 1
         """
         
         rotas = execute_query(query)
+        consumo = GrafoService._consumo_medio_banco()
         
         grafo = Grafo()
         aeroportos_map = {}
@@ -48,25 +107,686 @@ class GrafoService:
             
             # Armazena informaÃ§Ãµes dos aeroportos
             aeroportos_map[origem_codigo] = {
+                'id': rota['origem_id'],
                 'codigo': origem_codigo,
                 'nome': rota['origem_nome']
             }
             aeroportos_map[destino_codigo] = {
+                'id': rota['destino_id'],
                 'codigo': destino_codigo,
                 'nome': rota['destino_nome']
             }
             
-            # Adiciona aresta bidirecional ao grafo
+            # Adiciona aresta ao grafo (nos dois sentidos, salvo no modo dirigido)
             grafo.adicionar_aresta(
                 origem=origem_codigo,
                 destino=destino_codigo,
                 peso=int(rota['distancia_km']),
                 tempo=rota['tempo_estimado_min'] or 0,
-                bidirecional=True
+                bidirecional=not settings.GRAFO_DIRIGIDO,
+                id_rota=rota['id_rota'],
+                combustivel=GrafoService._combustivel_rota(rota, consumo)
             )
         
+        if settings.GRAFO_MESCLAR_PARALELAS:
+            grafo.mesclar_paralelas()
+        
         return grafo, aeroportos_map
     
+    @staticmethod
+    def _opcoes_grafo() -> int:
+        """Bits OPCAO_* da configuração atual, gravados no snapshot"""
+        opcoes = 0
+        if settings.GRAFO_DIRIGIDO:
+            opcoes |= OPCAO_DIRIGIDO
+        if settings.GRAFO_MESCLAR_PARALELAS:
+            opcoes |= OPCAO_PARALELAS_MESCLADAS
+        return opcoes
+    
+    @staticmethod
+    def _consumo_medio_banco() -> float:
+        """Litros por km das rotas ativas com combustível cadastrado (1.0 se nenhuma)"""
+        resultado = execute_query("""
+            SELECT SUM(combustivel_litros) AS litros, SUM(distancia_km) AS km
+            FROM rota
+            WHERE ativo = 1 AND combustivel_litros IS NOT NULL AND distancia_km > 0
+        """)[0]
+        if not resultado['km']:
+            return 1.0
+        return resultado['litros'] / resultado['km']
+    
+    @staticmethod
+    def _rotas_sem_combustivel() -> Set[int]:
+        """IDs das rotas ativas sem combustível cadastrado"""
+        return {
+            rota['id_rota']
+            for rota in execute_query("SELECT id_rota FROM rota WHERE ativo = 1 AND combustivel_litros IS NULL")
+        }
+    
+    @staticmethod
+    def _combustivel_rota(rota: dict, consumo: float) -> float:
+        """Combustível cadastrado da rota ou a estimativa pela distância"""
+        if rota.get('combustivel_litros') is not None:
+            return float(rota['combustivel_litros'])
+        return rota['distancia_km'] * consumo
+    
+    @staticmethod
+    def obter_grafo() -> Tuple[Grafo, Dict[str, dict]]:
+        """
+        Retorna o grafo em memória da versão atual dos dados.
+        
+        O grafo é construído do SQLite apenas na primeira chamada ou quando
+        ficou desatualizado; escritas feitas pelos routers são aplicadas
+        incrementalmente por aplicar_alteracao. Periodicamente o grafo é
+        comparado com o banco (verificar_consistencia).
+        
+        Returns:
+            Tupla (Grafo, dicionário de aeroportos por código IATA)
+        """
+        versao = versao_dados.atual()
+        grafo = GrafoService._grafo
+        
+        if grafo is not None and GrafoService._versao == versao:
+            if time.monotonic() - GrafoService._ultima_verificacao >= settings.INTERVALO_VERIFICACAO_GRAFO_S:
+                GrafoService.verificar_consistencia()
+                grafo = GrafoService._grafo
+            if grafo is not None:
+                return grafo, GrafoService._aeroportos_map
+        
+        # Requisições concorrentes aguardam uma única reconstrução
+        return coalescedor_reconstrucoes.executar(("grafo", versao), GrafoService._reconstruir)
+    
+    @staticmethod
+    def _reconstruir() -> Tuple[Grafo, Dict[str, dict]]:
+        """Reconstrói o grafo se ainda estiver desatualizado e o retorna"""
+        with GrafoService._lock:
+            if GrafoService._grafo is None or GrafoService._versao != versao_dados.atual():
+                GrafoService._recarregar()
+            return GrafoService._grafo, GrafoService._aeroportos_map
+    
+    @staticmethod
+    def _recarregar(usar_snapshot: bool = True) -> None:
+        """
+        Reconstrói o grafo em memória (chamar com _lock).
+        
+        Usa o snapshot em disco se ele corresponder à versão atual do log de
+        alterações; senão constrói a partir do SQLite e grava novo snapshot.
+        """
+        versao = versao_dados.atual()
+        # Lida antes da construção: o grafo contém ao menos as alterações até ela
+        versao_log = DeltaGrafoService.versao_atual()
+        consumo = GrafoService._consumo_medio_banco()
+        carregado = None
+        if settings.SNAPSHOT_GRAFO and usar_snapshot:
+            carregado = snapshot_grafo.carregar(versao_log, GrafoService._opcoes_grafo())
+            # Banco recriado pode repetir a versão: confere também as arestas
+            if carregado is not None and GrafoService._assinatura_grafo(*carregado) != GrafoService._assinatura_banco(consumo):
+                carregado = None
+        
+        if carregado is not None:
+            grafo, aeroportos_map = carregado
+        else:
+            grafo, aeroportos_map = GrafoService.construir_grafo()
+            if settings.SNAPSHOT_GRAFO:
+                snapshot_grafo.salvar(grafo, aeroportos_map, versao_log, GrafoService._opcoes_grafo())
+        GrafoService._consumo_medio = consumo
+        GrafoService._combustivel_estimado = GrafoService._rotas_sem_combustivel()
+        GrafoService._aeroportos_map = aeroportos_map
+        GrafoService._codigo_por_id = {a['id']: codigo for codigo, a in aeroportos_map.items()}
+        GrafoService._grafo = grafo
+        GrafoService._versao = versao
+        GrafoService._versao_log = versao_log
+        # Escrita confirmada durante a construção: o grafo pode estar à frente do log
+        GrafoService._log_pendente = DeltaGrafoService.versao_atual() != versao_log
+        GrafoService._arvores = OrderedDict()
+        GrafoService._alt = None
+        GrafoService._restricoes = None
+        GrafoService._ultima_verificacao = time.monotonic()
+    
+    @staticmethod
+    def registrar_versao_log(versao_log: int, em_dia: bool = True) -> None:
+        """
+        Registra que as alterações do log até a versão já foram aplicadas ao grafo.
+        
+        Args:
+            versao_log: Última versão do log aplicada
+            em_dia: Se o log não tinha versões posteriores ao fim da aplicação;
+                senão o grafo pode já conter parte delas e o cache L2 segue
+                desligado até o próximo registro
+        """
+        with GrafoService._lock:
+            if GrafoService._versao_log is None:
+                return
+            if versao_log > GrafoService._versao_log:
+                GrafoService._versao_log = versao_log
+            if em_dia and versao_log == GrafoService._versao_log:
+                GrafoService._log_pendente = False
+    
+    @staticmethod
+    def salvar_snapshot(versao_log: int) -> None:
+        """
+        Grava o snapshot do grafo atual (ex.: ao encerrar o processo).
+        
+        Args:
+            versao_log: Última versão do log de alterações já aplicada ao grafo
+        """
+        if not settings.SNAPSHOT_GRAFO:
+            return
+        with GrafoService._lock:
+            # Combustível estimado com média antiga: a próxima carga reconstrói do banco
+            if GrafoService._consumo_medio != GrafoService._consumo_medio_banco():
+                return
+            if GrafoService._grafo is not None and GrafoService._versao == versao_dados.atual():
+                snapshot_grafo.salvar(
+                    GrafoService._grafo, GrafoService._aeroportos_map, versao_log, GrafoService._opcoes_grafo()
+                )
+    
+    @staticmethod
+    def _assinatura_grafo(grafo: Grafo, aeroportos_map: Dict[str, dict]) -> Tuple[int, int, int, int, int, int, int, int]:
+        """Assinatura do grafo, com os extremos das rotas pelos IDs dos aeroportos"""
+        return grafo.assinatura({codigo: a['id'] for codigo, a in aeroportos_map.items()})
+    
+    @staticmethod
+    def _assinatura_banco(consumo: float) -> Tuple[int, int, int, int, int, int, int, int]:
+        """
+        Assinatura das rotas ativas no banco, comparável a Grafo.assinatura().
+        
+        Args:
+            consumo: Litros por km usados no combustível estimado das rotas
+                sem cadastro (o do grafo comparado)
+        """
+        resultado = execute_query("""
+            SELECT
+                COUNT(*) AS total,
+                COALESCE(SUM(r.id_rota), 0) AS soma_ids,
+                COALESCE(SUM(r.distancia_km), 0) AS soma_pesos,
+                COALESCE(SUM(COALESCE(r.tempo_estimado_min, 0)), 0) AS soma_tempos,
+                COALESCE(SUM(r.id_rota * r.distancia_km), 0) AS soma_ponderada,
+                COALESCE(SUM(r.id_rota * r.id_aeroporto_origem), 0) AS soma_origens,
+                COALESCE(SUM(r.id_rota * r.id_aeroporto_destino), 0) AS soma_destinos,
+                COALESCE(SUM(CAST(COALESCE(r.combustivel_litros, r.distancia_km * ?) * 1000 AS INTEGER)), 0)
+                    AS soma_combustivel
+            FROM rota r
+            INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
+            INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
+            WHERE r.ativo = 1 AND ao.ativo = 1 AND ad.ativo = 1
+        """, (consumo,))[0]
+        return (
+            resultado['total'], resultado['soma_ids'], resultado['soma_pesos'],
+            resultado['soma_tempos'], resultado['soma_ponderada'], resultado['soma_origens'],
+            resultado['soma_destinos'], resultado['soma_combustivel']
+        )
+    
+    @staticmethod
+    def verificar_consistencia() -> bool:
+        """
+        Compara a assinatura das arestas em memória com a das rotas ativas
+        no banco e reconstrói o grafo se houver divergência ou se o consumo
+        médio do banco mudou desde a construção (o combustível estimado das
+        rotas sem cadastro é atualizado aqui, não a cada escrita).
+        
+        Returns:
+            True se o grafo estava consistente
+        """
+        with GrafoService._lock:
+            GrafoService._ultima_verificacao = time.monotonic()
+            grafo = GrafoService._grafo
+            if grafo is None:
+                return True
+            
+            consumo = GrafoService._consumo_medio
+            if (GrafoService._assinatura_banco(consumo) == GrafoService._assinatura_grafo(grafo, GrafoService._aeroportos_map)
+                    and GrafoService._consumo_medio_banco() == consumo):
+                return True
+            
+            GrafoService._recarregar(usar_snapshot=False)
+            return False
+    
+    @staticmethod
+    def aplicar_alteracao(entidade: str, id_entidade: int, dados: Optional[dict]) -> int:
+        """
+        Incrementa a versão dos dados e aplica ao grafo em memória uma escrita
+        já confirmada no banco, de forma atômica para os leitores.
+        
+        Rotas são inseridas, reponderadas ou removidas em O(grau); aeroportos
+        desativados são removidos com suas rotas. Alterações que não podem ser
+        aplicadas incrementalmente (ex.: troca de código IATA) descartam o
+        grafo, que é reconstruído na próxima consulta.
+        
+        Args:
+            entidade: 'aeroporto', 'rota' ou 'voo'
+            id_entidade: ID do registro alterado
+            dados: Estado atual do registro (None para remoções)
+        
+        Returns:
+            Nova versão dos dados
+        """
+        with GrafoService._lock:
+            versao_anterior = versao_dados.atual()
+            versao = versao_dados.incrementar()
+            
+            grafo = GrafoService._grafo
+            if grafo is None or GrafoService._versao != versao_anterior:
+                return versao
+            # Até registrar_versao_log, o grafo está à frente de _versao_log
+            GrafoService._log_pendente = True
+            
+            ids_rotas = GrafoService._rotas_tocadas(grafo, entidade, id_entidade, dados)
+            arcos = GrafoService._arcos_das_rotas(grafo, ids_rotas)
+            
+            if entidade == 'rota':
+                aplicado = GrafoService._aplicar_rota(grafo, id_entidade, dados)
+            elif entidade == 'aeroporto':
+                aplicado = GrafoService._aplicar_aeroporto(grafo, id_entidade, dados)
+            else:
+                # Voos não alteram o grafo de rotas
+                aplicado = True
+            
+            if aplicado:
+                ids_rotas |= GrafoService._rotas_tocadas(grafo, entidade, id_entidade, dados)
+                arcos |= GrafoService._arcos_das_rotas(grafo, ids_rotas)
+                GrafoService._reparar_arvores(grafo, arcos)
+                GrafoService._versao = versao
+            else:
+                GrafoService._grafo = None
+                GrafoService._arvores = OrderedDict()
+            return versao
+    
+    @staticmethod
+    def _rotas_tocadas(grafo: Grafo, entidade: str, id_entidade: int, dados: Optional[dict]) -> Set[int]:
+        """IDs das rotas cujas arestas podem mudar com a alteração"""
+        if entidade == 'rota':
+            return {id_entidade}
+        if entidade != 'aeroporto':
+            return set()
+        
+        ids = set()
+        codigos = {GrafoService._codigo_por_id.get(id_entidade)}
+        if dados:
+            codigos.add(dados['codigo_iata'])
+        for codigo in codigos:
+            if codigo:
+                ids.update(grafo.rotas_incidentes(codigo))
+        return ids
+    
+    @staticmethod
+    def _arcos_das_rotas(grafo: Grafo, ids_rotas: Iterable[int]) -> Set[Tuple[str, str]]:
+        """Arcos (origem, destino) que as rotas ocupam no grafo"""
+        arcos = set()
+        for id_rota in ids_rotas:
+            extremos = grafo.extremos(id_rota)
+            if extremos is None:
+                continue
+            origem, destino, bidirecional = extremos
+            arcos.add((origem, destino))
+            if bidirecional:
+                arcos.add((destino, origem))
+        return arcos
+    
+    @staticmethod
+    def _reparar_arvores(grafo: Grafo, arcos: Set[Tuple[str, str]]) -> None:
+        """Repara as árvores guardadas após alteração de arcos (chamar com _lock)"""
+        if not arcos:
+            return
+        
+        arvores = GrafoService._arvores
+        for chave in list(arvores):
+            # Origem removida do grafo: descarta a árvore
+            if grafo.tem_vertice(chave[0]):
+                CaminhosDinamicos.reparar(grafo, arvores[chave], arcos)
+            else:
+                del arvores[chave]
+    
+    @staticmethod
+    def arvore_caminhos(grafo: Grafo, origem: str, metrica: str = "distancia") -> ResultadoDijkstra:
+        """
+        Retorna a árvore de caminhos mínimos a partir da origem na métrica.
+        
+        Árvores recentes ficam em memória e são reparadas incrementalmente,
+        no lugar, a cada escrita em vez de recalculadas; cada métrica tem a
+        sua. Leituras de uma árvore guardada devem ser feitas com _lock.
+        
+        Args:
+            grafo: Grafo em memória (obtido por obter_grafo)
+            origem: Código IATA do aeroporto de origem
+            metrica: 'distancia', 'tempo' ou 'combustivel'
+        
+        Returns:
+            ResultadoDijkstra da origem
+        """
+        chave = (origem, metrica)
+        arvore = GrafoService._arvores.get(chave)
+        if arvore is not None and grafo is GrafoService._grafo:
+            return arvore
+        
+        versao = GrafoService._versao
+        arvore = Dijkstra.executar(grafo, origem, metrica, settings.DIJKSTRA_FILA)
+        
+        with GrafoService._lock:
+            # Guarda só se nenhuma escrita ocorreu durante o cálculo
+            if grafo is GrafoService._grafo and versao == GrafoService._versao:
+                arvores = GrafoService._arvores
+                arvores[chave] = arvore
+                arvores.move_to_end(chave)
+                while len(arvores) > settings.ARVORES_CAMINHOS_MAX:
+                    arvores.popitem(last=False)
+        return arvore
+    
+    @staticmethod
+    def obter_landmarks() -> Tuple[GrafoCompacto, Landmarks]:
+        """
+        Retorna o grafo compilado e os landmarks da versão atual do grafo.
+        
+        O pré-processamento (2k buscas completas) roda uma vez por versão;
+        consultas concorrentes aguardam a mesma execução.
+        
+        Returns:
+            Tupla (GrafoCompacto, Landmarks)
+        """
+        grafo, _ = GrafoService.obter_grafo()
+        versao = GrafoService._versao
+        indice = GrafoService._alt
+        if indice is not None and indice[0] is grafo and indice[1] == versao:
+            return indice[2], indice[3]
+        
+        return coalescedor_reconstrucoes.executar(("landmarks", versao), GrafoService._preprocessar_landmarks)
+    
+    @staticmethod
+    def _preprocessar_landmarks() -> Tuple[GrafoCompacto, Landmarks]:
+        """Compila o grafo e escolhe os landmarks, guardando o índice se o grafo não mudou"""
+        grafo, _ = GrafoService.obter_grafo()
+        with GrafoService._lock:
+            versao = GrafoService._versao
+            indice = GrafoService._alt
+            if indice is not None and indice[0] is grafo and indice[1] == versao:
+                return indice[2], indice[3]
+            compacto = GrafoCompacto.de_grafo(grafo, versao or 0)
+        
+        inicio = time.perf_counter()
+        landmarks = Landmarks.preprocessar(
+            compacto, settings.ALT_LANDMARKS, settings.ALT_SELECAO, fila=settings.DIJKSTRA_COMPACTO_FILA
+        )
+        
+        with GrafoService._lock:
+            if grafo is GrafoService._grafo and versao == GrafoService._versao:
+                GrafoService._alt = (grafo, versao, compacto, landmarks)
+                GrafoService._alt_preprocessamento_ms = (time.perf_counter() - inicio) * 1000
+        return compacto, landmarks
+    
+    @staticmethod
+    def metricas_grafo() -> Dict[str, Any]:
+        """Modo do grafo em memória e arcos antes e depois da mesclagem de paralelos"""
+        grafo = GrafoService._grafo
+        if grafo is None:
+            return {"construido": False}
+        
+        return {
+            "construido": True,
+            "dirigido": settings.GRAFO_DIRIGIDO,
+            "paralelas_mescladas": grafo.paralelas_mescladas,
+            "vertices": len(grafo.adjacencias),
+            "rotas": grafo.total_arestas(),
+            "arcos_sem_mesclar": grafo.arcos_sem_mesclar(),
+            "arcos": grafo.total_arcos()
+        }
+    
+    @staticmethod
+    def rotas_exportacao() -> Tuple[int, List[Tuple[int, str, Aresta, bool]], Dict[str, dict], Set[int]]:
+        """
+        Rotas do grafo em memória para exportação, lidas sob _lock junto com
+        a versão do log de alterações que o grafo reflete.
+        
+        Returns:
+            Tupla (versão do log, rotas como em Grafo.rotas_registradas
+            ordenadas por ID, aeroportos por código IATA, IDs das rotas com
+            combustível estimado)
+        """
+        while True:
+            grafo, aeroportos_map = GrafoService.obter_grafo()
+            with GrafoService._lock:
+                # Grafo descartado por uma escrita entre as duas leituras: obtém o novo
+                if grafo is not GrafoService._grafo:
+                    continue
+                return (
+                    GrafoService._versao_log or 0,
+                    sorted(grafo.rotas_registradas(), key=lambda rota: rota[0]),
+                    dict(aeroportos_map),
+                    set(GrafoService._combustivel_estimado)
+                )
+    
+    @staticmethod
+    def metricas_alt() -> Dict[str, Any]:
+        """Landmarks do índice ALT atual e custo do pré-processamento"""
+        indice = GrafoService._alt
+        if indice is None:
+            return {"preprocessado": False}
+        
+        grafo, versao, compacto, landmarks = indice
+        return {
+            "preprocessado": True,
+            "atual": grafo is GrafoService._grafo and versao == GrafoService._versao,
+            "versao": versao,
+            "selecao": landmarks.selecao,
+            "landmarks": [compacto.codigos[i] for i in landmarks.escolhidos],
+            "bytes": landmarks.tamanho_bytes,
+            "preprocessamento_ms": round(GrafoService._alt_preprocessamento_ms, 1)
+        }
+    
+    @staticmethod
+    def interpretar_restricoes(
+        evitar: Optional[str] = None,
+        evitar_paises: Optional[str] = None,
+        max_trecho_km: Optional[int] = None
+    ) -> Optional[Restricoes] | ErroRota:
+        """
+        Normaliza as restrições recebidas como parâmetros de consulta.
+        
+        Args:
+            evitar: Aeroportos a evitar (códigos IATA ou IDs separados por vírgula)
+            evitar_paises: Países a evitar (nomes separados por vírgula)
+            max_trecho_km: Distância máxima de cada trecho
+        
+        Returns:
+            Restricoes, None se nenhuma foi informada ou ErroRota se um
+            aeroporto a evitar não existe
+        """
+        aeroportos = set()
+        for identificador in (evitar or "").split(","):
+            identificador = identificador.strip()
+            if not identificador:
+                continue
+            aeroporto = GrafoService.buscar_aeroporto(identificador)
+            if not aeroporto:
+                return ErroRota(mensagem=f"Aeroporto a evitar '{identificador}' não encontrado")
+            aeroportos.add(aeroporto['codigo_iata'])
+        
+        paises = {p.strip().lower() for p in (evitar_paises or "").split(",") if p.strip()}
+        restricoes = Restricoes(tuple(sorted(aeroportos)), tuple(sorted(paises)), max_trecho_km)
+        return None if restricoes.vazia else restricoes
+    
+    @staticmethod
+    def obter_mascaras() -> Tuple[GrafoCompacto, MascarasRestricao]:
+        """
+        Retorna o grafo compilado e os mapas de bloqueio da versão atual.
+        
+        O grafo é compilado em CSR e os mapas por país são montados uma vez
+        por versão; consultas concorrentes aguardam a mesma execução.
+        
+        Returns:
+            Tupla (GrafoCompacto, MascarasRestricao)
+        """
+        grafo, _ = GrafoService.obter_grafo()
+        versao = GrafoService._versao
+        indice = GrafoService._restricoes
+        if indice is not None and indice[0] is grafo and indice[1] == versao:
+            return indice[2], indice[3]
+        
+        return coalescedor_reconstrucoes.executar(("restricoes", versao), GrafoService._compilar_mascaras)
+    
+    @staticmethod
+    def _compilar_mascaras() -> Tuple[GrafoCompacto, MascarasRestricao]:
+        """Compila o grafo e os mapas por país, guardando-os se o grafo não mudou"""
+        grafo, _ = GrafoService.obter_grafo()
+        with GrafoService._lock:
+            versao = GrafoService._versao
+            indice = GrafoService._restricoes
+            if indice is not None and indice[0] is grafo and indice[1] == versao:
+                return indice[2], indice[3]
+            compacto = GrafoCompacto.de_grafo(grafo, versao or 0)
+        
+        paises = [
+            (resolvedor_aeroportos.por_codigo(codigo) or {}).get('pais') or ""
+            for codigo in compacto.codigos
+        ]
+        mascaras = MascarasRestricao(compacto, paises)
+        
+        with GrafoService._lock:
+            if grafo is GrafoService._grafo and versao == GrafoService._versao:
+                GrafoService._restricoes = (grafo, versao, compacto, mascaras)
+        return compacto, mascaras
+    
+    @staticmethod
+    def metricas_restricoes() -> Dict[str, Any]:
+        """Estado dos mapas de bloqueio compilados"""
+        indice = GrafoService._restricoes
+        if indice is None:
+            return {"compilado": False}
+        
+        grafo, versao, _, mascaras = indice
+        return {
+            "compilado": True,
+            "atual": grafo is GrafoService._grafo and versao == GrafoService._versao,
+            "versao": versao,
+            "paises": len(mascaras.paises),
+            "limites_trecho": mascaras.limites_trecho
+        }
+    
+    @staticmethod
+    def _buscar_restrito(
+        algoritmo: str,
+        origem: str,
+        destino: str,
+        restricoes: Restricoes,
+        metrica: str = "distancia"
+    ) -> ResultadoBusca:
+        """
+        Caminho entre dois vértices respeitando as restrições, sobre o grafo
+        compilado: os arcos e vértices bloqueados são pulados na busca.
+        
+        Returns:
+            Tupla (caminho, distância, tempo) ou None se não houver caminho
+        """
+        compacto, mascaras = GrafoService.obter_mascaras()
+        i = compacto.indice.get(origem)
+        j = compacto.indice.get(destino)
+        if i is None or j is None:
+            return None
+        
+        mascara = mascaras.compilar(restricoes)
+        if mascara.bloqueia_vertice(i) or mascara.bloqueia_vertice(j):
+            return None
+        
+        if algoritmo == "dijkstra":
+            custo, anterior, _ = compacto.dijkstra(
+                i, {j}, metrica, mascara.vertices, mascara.arcos, settings.DIJKSTRA_COMPACTO_FILA
+            )
+            if custo[j] == float("inf"):
+                return None
+            caminho = GrafoCompacto.reconstruir(anterior, j)
+            distancia_total, tempo_total, _ = compacto.totais(caminho, metrica, mascara.arcos)
+        else:
+            caminho = compacto.bfs(i, j, mascara.vertices, mascara.arcos)
+            if caminho is None:
+                return None
+            distancia_total, tempo_total = compacto.distancia_tempo(caminho, mascara.arcos)
+        return [compacto.codigos[k] for k in caminho], distancia_total, tempo_total
+    
+    @staticmethod
+    def _aplicar_rota(grafo: Grafo, id_rota: int, rota: Optional[dict]) -> bool:
+        """
+        Insere, repondera ou remove a aresta de uma rota.
+        
+        Rotas sem combustível cadastrado usam o consumo médio fixado na
+        construção do grafo (ver verificar_consistencia).
+        
+        Returns:
+            True (a alteração sempre é aplicada)
+        """
+        if rota is None or not rota['ativo']:
+            grafo.remover_aresta(id_rota)
+            GrafoService._combustivel_estimado.discard(id_rota)
+            return True
+        
+        origem = resolvedor_aeroportos.por_id(rota['id_aeroporto_origem'])
+        destino = resolvedor_aeroportos.por_id(rota['id_aeroporto_destino'])
+        if not origem or not destino or not origem['ativo'] or not destino['ativo']:
+            grafo.remover_aresta(id_rota)
+            GrafoService._combustivel_estimado.discard(id_rota)
+            return True
+        
+        for aeroporto in (origem, destino):
+            GrafoService._aeroportos_map[aeroporto['codigo_iata']] = {
+                'id': aeroporto['id_aeroporto'],
+                'codigo': aeroporto['codigo_iata'],
+                'nome': aeroporto['nome']
+            }
+            GrafoService._codigo_por_id[aeroporto['id_aeroporto']] = aeroporto['codigo_iata']
+        
+        combustivel = GrafoService._combustivel_rota(rota, GrafoService._consumo_medio)
+        if rota.get('combustivel_litros') is None:
+            GrafoService._combustivel_estimado.add(id_rota)
+        else:
+            GrafoService._combustivel_estimado.discard(id_rota)
+        
+        bidirecional = not settings.GRAFO_DIRIGIDO
+        
+        # Mesmos extremos: repondera no lugar, preservando a ordem dos arcos
+        if grafo.extremos(id_rota) == (origem['codigo_iata'], destino['codigo_iata'], bidirecional):
+            grafo.reponderar_aresta(id_rota, int(rota['distancia_km']), rota['tempo_estimado_min'] or 0, combustivel)
+            return True
+        
+        grafo.adicionar_aresta(
+            origem=origem['codigo_iata'],
+            destino=destino['codigo_iata'],
+            peso=int(rota['distancia_km']),
+            tempo=rota['tempo_estimado_min'] or 0,
+            bidirecional=bidirecional,
+            id_rota=id_rota,
+            combustivel=combustivel
+        )
+        return True
+    
+    @staticmethod
+    def _aplicar_aeroporto(grafo: Grafo, id_aeroporto: int, aeroporto: Optional[dict]) -> bool:
+        """Remove aeroporto desativado ou reinsere as rotas de um aeroporto ativo"""
+        codigo_atual = GrafoService._codigo_por_id.get(id_aeroporto)
+        
+        if aeroporto is None or not aeroporto['ativo']:
+            if codigo_atual:
+                grafo.remover_vertice(codigo_atual)
+            return True
+        
+        # Troca de código IATA renomearia o vértice: reconstrução completa
+        if codigo_atual and codigo_atual != aeroporto['codigo_iata']:
+            return False
+        
+        if codigo_atual:
+            GrafoService._aeroportos_map[codigo_atual] = {
+                'id': id_aeroporto,
+                'codigo': codigo_atual,
+                'nome': aeroporto['nome']
+            }
+        
+        # Aeroporto (re)ativado: insere suas rotas ativas (operação idempotente)
+        rotas = execute_query("""
+            SELECT * FROM rota
+            WHERE ativo = 1 AND (id_aeroporto_origem = ? OR id_aeroporto_destino = ?)
+        """, (id_aeroporto, id_aeroporto))
+        for rota in rotas:
+            if not GrafoService._aplicar_rota(grafo, rota['id_rota'], rota):
+                return False
+        return True
+    
     @staticmethod
     def buscar_aeroporto(identificador: str) -> Optional[dict]:
         """
@@ -74,29 +794,260 @@ class GrafoService:
         
         Args:
             identificador: CÃ³digo IATA (ex: 'GRU') ou ID numÃ©rico
-            
+        
         Returns:
             DicionÃ¡rio com dados do aeroporto ou None
         """
-        if identificador.isdigit():
-            query = "SELECT * FROM aeroporto WHERE id_aeroporto = ?"
-            params = (int(identificador),)
+        return resolvedor_aeroportos.resolver(identificador)
+    
+    @staticmethod
+    def _chave_consulta(algoritmo: str, *parametros: str) -> tuple:
+        """Chave de coalescência: versão dos dados, algoritmo e parâmetros normalizados"""
+        return (versao_dados.atual(), algoritmo) + tuple(p.strip().upper() for p in parametros)
+    
+    @staticmethod
+    def calcular_menor_caminho(
+        origem_id: str,
+        destino_id: str,
+        metrica: str = "distancia",
+        restricoes: Optional[Restricoes] = None
+    ) -> RespostaCaminho | ErroRota:
+        """
+        Calcula menor caminho usando Dijkstra.
+        
+        Consultas idênticas simultâneas compartilham uma única execução.
+        
+        Args:
+            origem_id: Código IATA ou ID do aeroporto de origem
+            destino_id: Código IATA ou ID do aeroporto de destino
+            metrica: Peso minimizado: 'distancia', 'tempo' ou 'combustivel'
+            restricoes: Aeroportos/países a evitar e alcance máximo por trecho
+        
+        Returns:
+            RespostaCaminho ou ErroRota
+        """
+        return coalescedor_consultas.executar(
+            GrafoService._chave_consulta(
+                "dijkstra", origem_id, destino_id, metrica, restricoes.chave if restricoes else ""
+            ),
+            lambda: GrafoService._calcular_menor_caminho(origem_id, destino_id, metrica, restricoes)
+        )
+    
+    @staticmethod
+    def _compilar_grafo() -> GrafoCompacto:
+        """Compila o grafo em memória para CSR (instantâneo consistente, sob _lock)"""
+        grafo, _ = GrafoService.obter_grafo()
+        with GrafoService._lock:
+            return GrafoCompacto.de_grafo(grafo, GrafoService._versao or 0)
+    
+    @staticmethod
+    def _buscar_dijkstra(grafo: Grafo, origem: str, destino: str, metrica: str = "distancia") -> ResultadoBusca:
+        """
+        Menor caminho entre dois vértices do grafo na métrica.
+        
+        Usa a árvore da origem em memória quando existe; sem ela, em grafos
+        grandes e com o pool ativo, a busca é feita em outro processo.
+        
+        Returns:
+            Tupla (caminho, distância, tempo) ou None se não houver caminho
+        """
+        if (pool_caminhos.ativo
+                and (origem, metrica) not in GrafoService._arvores
+                and 2 * grafo.total_arestas() >= settings.POOL_LIMIAR_ARCOS):
+            return pool_caminhos.buscar(
+                GrafoService._versao or 0, GrafoService._compilar_grafo, "dijkstra", [(origem, destino)], metrica
+            )[0]
+        
+        # Árvore de caminhos mínimos da origem (Dijkstra, reaproveitada entre escritas)
+        arvore = GrafoService.arvore_caminhos(grafo, origem, metrica)
+        # A árvore guardada é reparada no lugar pelas escritas
+        with GrafoService._lock:
+            if arvore.distancia.get(destino, float('inf')) == float('inf'):
+                return None
+            
+            caminho = Dijkstra.reconstruir_caminho(arvore.anterior, destino)
+            if metrica == "distancia":
+                return caminho, arvore.distancia[destino], arvore.tempo_total[destino]
+        distancia_total, tempo_total, _ = GrafoService._totais_caminho(grafo, caminho, metrica)
+        return caminho, distancia_total, tempo_total
+    
+    @staticmethod
+    def _totais_caminho(
+        grafo: Grafo,
+        caminho: List[str],
+        metrica: str,
+        max_trecho_km: Optional[int] = None
+    ) -> Tuple[int, int, float]:
+        """
+        Distância, tempo e combustível de um caminho usando, entre cada par,
+        a aresta permitida de menor peso na métrica (a mesma que o Dijkstra escolhe).
+        """
+        distancia_total = 0
+        tempo_total = 0
+        combustivel_total = 0.0
+        for origem, destino in zip(caminho, caminho[1:]):
+            arestas = [
+                a for a in grafo.vizinhos(origem)
+                if a.destino == destino and (max_trecho_km is None or a.peso <= max_trecho_km)
+            ]
+            if not arestas:
+                continue
+            aresta = min(arestas, key=lambda a: a.custo(metrica))
+            distancia_total += aresta.peso
+            tempo_total += aresta.tempo
+            combustivel_total += aresta.combustivel
+        return distancia_total, tempo_total, combustivel_total
+    
+    @staticmethod
+    def _custo_caminho(grafo: Grafo, caminho: List[str], metrica: str, restricoes: Optional[Restricoes] = None) -> float:
+        """Custo de um caminho na métrica, arredondado para a resposta"""
+        distancia_total, tempo_total, combustivel_total = GrafoService._totais_caminho(
+            grafo, caminho, metrica, restricoes.max_trecho_km if restricoes else None
+        )
+        custos = {"distancia": distancia_total, "tempo": tempo_total, "combustivel": combustivel_total}
+        return round(custos[metrica], 3)
+    
+    @staticmethod
+    def _buscar_bfs(grafo: Grafo, origem: str, destino: str) -> ResultadoBusca:
+        """Caminho com menos trechos: tupla (caminho, distância, tempo) ou None"""
+        caminho = BuscaLargura.encontrar_caminho(grafo, origem, destino)
+        if not caminho:
+            return None
+        return (caminho, *BuscaLargura.calcular_distancia_tempo(grafo, caminho))
+    
+    @staticmethod
+    def _buscar_com_cache(
+        algoritmo: str,
+        origem: str,
+        destino: str,
+        buscar: Callable[[], ResultadoBusca],
+        restricoes: str = ""
+    ) -> ResultadoBusca:
+        """
+        Consulta o cache L2 (SQLite, comum aos workers) antes de calcular e
+        grava nele o resultado calculado.
+        
+        A chave é a versão do log refletida no grafo; enquanto há alterações
+        aplicadas e ainda não registradas o cache não é usado, e o resultado
+        não é gravado se o grafo mudou durante o cálculo.
+        """
+        if not cache_caminhos.ativo:
+            return buscar()
+        
+        with GrafoService._lock:
+            versao = GrafoService._versao
+            versao_log = GrafoService._versao_log
+            utilizavel = (
+                GrafoService._grafo is not None
+                and versao_log is not None
+                and not GrafoService._log_pendente
+                and versao == versao_dados.atual()
+            )
+        if not utilizavel:
+            return buscar()
+        
+        encontrado, resultado = cache_caminhos.consultar(versao_log, algoritmo, origem, destino, restricoes)
+        if encontrado:
+            return resultado
+        
+        resultado = buscar()
+        with GrafoService._lock:
+            inalterado = (
+                GrafoService._versao == versao
+                and GrafoService._versao_log == versao_log
+                and not GrafoService._log_pendente
+            )
+        if inalterado:
+            cache_caminhos.guardar(versao_log, algoritmo, origem, destino, resultado, restricoes)
+        return resultado
+    
+    @staticmethod
+    def calcular_lote(
+        consultas: List[Tuple[str, str]],
+        algoritmo: str = "dijkstra",
+        metrica: str = "distancia"
+    ) -> List[RespostaCaminho | ErroRota]:
+        """
+        Calcula vários caminhos de uma vez.
+        
+        Com o pool de processos ativo, as consultas são agrupadas por origem
+        e distribuídas entre os workers (uma busca por origem); sem ele,
+        são resolvidas no processo usando as árvores em memória.
+        
+        Args:
+            consultas: Pares (origem, destino) por código IATA ou ID
+            algoritmo: 'dijkstra' ou 'bfs'
+            metrica: Peso minimizado pelo Dijkstra
+        
+        Returns:
+            RespostaCaminho ou ErroRota para cada consulta, na mesma ordem
+        """
+        grafo, aeroportos_map = GrafoService.obter_grafo()
+        versao = GrafoService._versao or 0
+        
+        resultados: List[Optional[RespostaCaminho | ErroRota]] = [None] * len(consultas)
+        resolvidas: List[Tuple[int, str, str]] = []
+        for posicao, (origem_id, destino_id) in enumerate(consultas):
+            aeroporto_origem = GrafoService.buscar_aeroporto(origem_id)
+            aeroporto_destino = GrafoService.buscar_aeroporto(destino_id)
+            if not aeroporto_origem:
+                resultados[posicao] = ErroRota(mensagem=f"Aeroporto de origem '{origem_id}' não encontrado")
+            elif not aeroporto_destino:
+                resultados[posicao] = ErroRota(mensagem=f"Aeroporto de destino '{destino_id}' não encontrado")
+            else:
+                resolvidas.append((posicao, aeroporto_origem['codigo_iata'], aeroporto_destino['codigo_iata']))
+        
+        pares = [(origem, destino) for _, origem, destino in resolvidas]
+        if pool_caminhos.ativo and pares:
+            buscas = pool_caminhos.buscar(versao, GrafoService._compilar_grafo, algoritmo, pares, metrica)
         else:
-            query = "SELECT * FROM aeroporto WHERE UPPER(codigo_iata) = UPPER(?)"
-            params = (identificador,)
+            buscas = []
+            for origem, destino in pares:
+                if not grafo.tem_vertice(origem) or not grafo.tem_vertice(destino):
+                    buscas.append(None)
+                elif algoritmo == "dijkstra":
+                    buscas.append(GrafoService._buscar_dijkstra(grafo, origem, destino, metrica))
+                else:
+                    buscas.append(GrafoService._buscar_bfs(grafo, origem, destino))
         
-        resultados = execute_query(query, params)
-        return resultados[0] if resultados else None
+        for (posicao, origem, destino), busca in zip(resolvidas, buscas):
+            if busca is None:
+                resultados[posicao] = ErroRota(mensagem=f"Não existe rota entre {origem} e {destino}")
+                continue
+            caminho, distancia_total, tempo_total = busca
+            ponderado = algoritmo == "dijkstra"
+            resultados[posicao] = RespostaCaminho(
+                algoritmo=algoritmo,
+                origem_codigo=origem,
+                destino_codigo=destino,
+                caminho=[
+                    AeroportoNoCaminho(codigo_iata=codigo, nome=aeroportos_map[codigo]['nome'], ordem=i)
+                    for i, codigo in enumerate(caminho)
+                ],
+                distancia_total_km=distancia_total,
+                tempo_estimado_min=tempo_total,
+                numero_paradas=len(caminho) - 1,
+                peso=metrica if ponderado else None,
+                custo_total=GrafoService._custo_caminho(grafo, caminho, metrica) if ponderado else None
+            )
+        return resultados
     
     @staticmethod
-    def calcular_menor_caminho(origem_id: str, destino_id: str) -> RespostaCaminho | ErroRota:
+    def _calcular_menor_caminho(
+        origem_id: str,
+        destino_id: str,
+        metrica: str,
+        restricoes: Optional[Restricoes] = None
+    ) -> RespostaCaminho | ErroRota:
         """
         Calcula menor caminho usando Dijkstra.
         
         Args:
             origem_id: CÃ³digo IATA ou ID do aeroporto de origem
             destino_id: CÃ³digo IATA ou ID do aeroporto de destino
-            
+            metrica: Peso minimizado
+            restricoes: Restrições da consulta (opcional)
+        
         Returns:
             RespostaCaminho ou ErroRota
         """
@@ -110,21 +1061,40 @@ class GrafoService:
         if not aeroporto_destino:
             return ErroRota(mensagem=f"Aeroporto de destino '{destino_id}' nÃ£o encontrado")
         
-        # ConstrÃ³i grafo
-        grafo, aeroportos_map = GrafoService.construir_grafo()
+        # Obtém grafo em memória (construído do SQLite só quando desatualizado)
+        grafo, aeroportos_map = GrafoService.obter_grafo()
         
         origem_codigo = aeroporto_origem['codigo_iata']
         destino_codigo = aeroporto_destino['codigo_iata']
         
-        # Executa Dijkstra
-        resultado = Dijkstra.encontrar_menor_caminho(grafo, origem_codigo, destino_codigo)
+        if not grafo.tem_vertice(origem_codigo) or not grafo.tem_vertice(destino_codigo):
+            return ErroRota(
+                mensagem=f"NÃ£o existe rota entre {origem_codigo} e {destino_codigo}"
+            )
+        
+        if restricoes is not None:
+            # Árvores guardadas não valem com restrições: busca ponto a ponto com os mapas de bloqueio
+            busca = GrafoService._buscar_com_cache(
+                f"dijkstra:{metrica}", origem_codigo, destino_codigo,
+                lambda: GrafoService._buscar_restrito("dijkstra", origem_codigo, destino_codigo, restricoes, metrica),
+                restricoes.chave
+            )
+        elif (origem_codigo, metrica) in GrafoService._arvores:
+            # Árvore da origem em memória: mais barata que o cache L2
+            busca = GrafoService._buscar_dijkstra(grafo, origem_codigo, destino_codigo, metrica)
+        else:
+            # Cada métrica tem suas próprias entradas no cache
+            busca = GrafoService._buscar_com_cache(
+                f"dijkstra:{metrica}", origem_codigo, destino_codigo,
+                lambda: GrafoService._buscar_dijkstra(grafo, origem_codigo, destino_codigo, metrica)
+            )
         
-        if not resultado:
+        if busca is None:
             return ErroRota(
                 mensagem=f"NÃ£o existe rota entre {origem_codigo} e {destino_codigo}"
             )
         
-        caminho_codigos, distancia_total, tempo_total = resultado
+        caminho_codigos, distancia_total, tempo_total = busca
         
         # Monta lista de aeroportos no caminho
         caminho_detalhado = [
@@ -143,18 +1113,45 @@ class GrafoService:
             caminho=caminho_detalhado,
             distancia_total_km=distancia_total,
             tempo_estimado_min=tempo_total,
-            numero_paradas=len(caminho_codigos) - 1
+            numero_paradas=len(caminho_codigos) - 1,
+            peso=metrica,
+            custo_total=GrafoService._custo_caminho(grafo, caminho_codigos, metrica, restricoes)
+        )
+    
+    @staticmethod
+    def calcular_caminho_bfs(
+        origem_id: str,
+        destino_id: str,
+        restricoes: Optional[Restricoes] = None
+    ) -> RespostaCaminho | ErroRota:
+        """
+        Calcula caminho com menor número de paradas usando BFS.
+        
+        Consultas idênticas simultâneas compartilham uma única execução.
+        
+        Args:
+            origem_id: Código IATA ou ID do aeroporto de origem
+            destino_id: Código IATA ou ID do aeroporto de destino
+            restricoes: Aeroportos/países a evitar e alcance máximo por trecho
+        
+        Returns:
+            RespostaCaminho ou ErroRota
+        """
+        return coalescedor_consultas.executar(
+            GrafoService._chave_consulta("bfs", origem_id, destino_id, restricoes.chave if restricoes else ""),
+            lambda: GrafoService._calcular_caminho_bfs(origem_id, destino_id, restricoes)
         )
     
     @staticmethod
-    def calcular_caminho_bfs(origem_id: str, destino_id: str) -> RespostaCaminho | ErroRota:
+    def _calcular_caminho_bfs(origem_id: str, destino_id: str, restricoes: Optional[Restricoes] = None) -> RespostaCaminho | ErroRota:
         """
         Calcula caminho com menor nÃºmero de paradas usando BFS.
         
         Args:
             origem_id: CÃ³digo IATA ou ID do aeroporto de origem
             destino_id: CÃ³digo IATA ou ID do aeroporto de destino
-            
+            restricoes: Restrições da consulta (opcional)
+        
         Returns:
             RespostaCaminho ou ErroRota
         """
@@ -168,22 +1165,31 @@ class GrafoService:
         if not aeroporto_destino:
             return ErroRota(mensagem=f"Aeroporto de destino '{destino_id}' nÃ£o encontrado")
         
-        # ConstrÃ³i grafo
-        grafo, aeroportos_map = GrafoService.construir_grafo()
+        # Obtém grafo em memória (construído do SQLite só quando desatualizado)
+        grafo, aeroportos_map = GrafoService.obter_grafo()
         
         origem_codigo = aeroporto_origem['codigo_iata']
         destino_codigo = aeroporto_destino['codigo_iata']
         
-        # Executa BFS
-        caminho_codigos = BuscaLargura.encontrar_caminho(grafo, origem_codigo, destino_codigo)
+        # Executa BFS (ou reaproveita o resultado do cache L2)
+        if restricoes is not None:
+            busca = GrafoService._buscar_com_cache(
+                "bfs", origem_codigo, destino_codigo,
+                lambda: GrafoService._buscar_restrito("bfs", origem_codigo, destino_codigo, restricoes),
+                restricoes.chave
+            )
+        else:
+            busca = GrafoService._buscar_com_cache(
+                "bfs", origem_codigo, destino_codigo,
+                lambda: GrafoService._buscar_bfs(grafo, origem_codigo, destino_codigo)
+            )
         
-        if not caminho_codigos:
+        if busca is None:
             return ErroRota(
                 mensagem=f"NÃ£o existe rota entre {origem_codigo} e {destino_codigo}"
             )
         
-        # Calcula distÃ¢ncia e tempo total
-        distancia_total, tempo_total = BuscaLargura.calcular_distancia_tempo(grafo, caminho_codigos)
+        caminho_codigos, distancia_total, tempo_total = busca
         
         # Monta lista de aeroportos no caminho
         caminho_detalhado = [
@@ -203,4 +1209,174 @@ class GrafoService:
             distancia_total_km=distancia_total,
             tempo_estimado_min=tempo_total,
             numero_paradas=len(caminho_codigos) - 1
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    def calcular_caminho_alt(origem_id: str, destino_id: str, comparar: bool = True) -> RespostaALT | ErroRota:
+        """
+        Calcula menor caminho usando ALT (A* com landmarks).
+        
+        Consultas idênticas simultâneas compartilham uma única execução.
+        
+        Args:
+            origem_id: Código IATA ou ID do aeroporto de origem
+            destino_id: Código IATA ou ID do aeroporto de destino
+            comparar: Executa também o Dijkstra ponto a ponto e informa seu
+                espaço de busca
+        
+        Returns:
+            RespostaALT ou ErroRota
+        """
+        return coalescedor_consultas.executar(
+            GrafoService._chave_consulta("alt", origem_id, destino_id, str(comparar)),
+            lambda: GrafoService._calcular_caminho_alt(origem_id, destino_id, comparar)
+        )
+    
+    @staticmethod
+    def _calcular_caminho_alt(origem_id: str, destino_id: str, comparar: bool) -> RespostaALT | ErroRota:
+        """Calcula o caminho por ALT e, opcionalmente, o espaço de busca do Dijkstra"""
+        aeroporto_origem = GrafoService.buscar_aeroporto(origem_id)
+        aeroporto_destino = GrafoService.buscar_aeroporto(destino_id)
+        
+        if not aeroporto_origem:
+            return ErroRota(mensagem=f"Aeroporto de origem '{origem_id}' não encontrado")
+        
+        if not aeroporto_destino:
+            return ErroRota(mensagem=f"Aeroporto de destino '{destino_id}' não encontrado")
+        
+        _, aeroportos_map = GrafoService.obter_grafo()
+        compacto, landmarks = GrafoService.obter_landmarks()
+        
+        origem_codigo = aeroporto_origem['codigo_iata']
+        destino_codigo = aeroporto_destino['codigo_iata']
+        origem = compacto.indice.get(origem_codigo)
+        destino = compacto.indice.get(destino_codigo)
+        
+        if origem is None or destino is None:
+            return ErroRota(mensagem=f"Não existe rota entre {origem_codigo} e {destino_codigo}")
+        
+        inicio = time.perf_counter()
+        resultado, usados = BuscaALT.buscar(compacto, origem, destino, landmarks)
+        espaco_busca = {
+            "alt": EspacoBusca(
+                vertices_visitados=resultado.visitados,
+                arcos_relaxados=resultado.relaxados,
+                tempo_ms=round((time.perf_counter() - inicio) * 1000, 3)
+            )
+        }
+        
+        if comparar:
+            inicio = time.perf_counter()
+            referencia, _ = BuscaALT.buscar(compacto, origem, destino)
+            espaco_busca["dijkstra"] = EspacoBusca(
+                vertices_visitados=referencia.visitados,
+                arcos_relaxados=referencia.relaxados,
+                tempo_ms=round((time.perf_counter() - inicio) * 1000, 3)
+            )
+        
+        if resultado.caminho is None:
+            return ErroRota(mensagem=f"Não existe rota entre {origem_codigo} e {destino_codigo}")
+        
+        caminho_codigos = [compacto.codigos[i] for i in resultado.caminho]
+        return RespostaALT(
+            algoritmo="alt",
+            origem_codigo=origem_codigo,
+            destino_codigo=destino_codigo,
+            caminho=[
+                AeroportoNoCaminho(codigo_iata=codigo, nome=aeroportos_map[codigo]['nome'], ordem=i)
+                for i, codigo in enumerate(caminho_codigos)
+            ],
+            distancia_total_km=resultado.distancia,
+            tempo_estimado_min=resultado.tempo,
+            numero_paradas=len(caminho_codigos) - 1,
+            peso="distancia",
+            custo_total=resultado.distancia,
+            landmarks=[compacto.codigos[landmarks.escolhidos[i]] for i in usados],
+            espaco_busca=espaco_busca
+        )
+    
+    @staticmethod
+    def calcular_alcance(
+        origem_id: str,
+        max_km: Optional[int] = None,
+        max_min: Optional[int] = None,
+        max_paradas: Optional[int] = None,
+        contorno: bool = False,
+        max_litros: Optional[float] = None,
+        metrica: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]] | ErroRota:
+        """
+        Lista os aeroportos alcançáveis a partir da origem dentro do orçamento.
+        
+        A origem é validada imediatamente; o resultado é um gerador, consumido
+        à medida que a busca avança.
+        
+        Args:
+            origem_id: Código IATA ou ID do aeroporto de origem
+            max_km: Distância máxima acumulada
+            max_min: Tempo máximo acumulado
+            max_paradas: Número máximo de trechos
+            contorno: Inclui ao final o fecho convexo das coordenadas alcançadas
+            max_litros: Combustível máximo acumulado
+            metrica: Critério da ordem ('distancia', 'tempo' ou 'combustivel');
+                None = primeiro limite informado
+        
+        Returns:
+            Gerador de dicionários (um por aeroporto) ou ErroRota
+        """
+        aeroporto_origem = GrafoService.buscar_aeroporto(origem_id)
+        
+        if not aeroporto_origem:
+            return ErroRota(mensagem=f"Aeroporto de origem '{origem_id}' não encontrado")
+        
+        grafo, _ = GrafoService.obter_grafo()
+        return GrafoService._gerar_alcance(
+            grafo, aeroporto_origem, max_km, max_min, max_paradas, contorno, max_litros, metrica
+        )
+    
+    @staticmethod
+    def _gerar_alcance(
+        grafo: Grafo,
+        aeroporto_origem: dict,
+        max_km: Optional[int],
+        max_min: Optional[int],
+        max_paradas: Optional[int],
+        contorno: bool,
+        max_litros: Optional[float] = None,
+        metrica: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Gera as linhas da resposta de alcance e, opcionalmente, o contorno"""
+        pontos = []
+        if aeroporto_origem.get('latitude') is not None and aeroporto_origem.get('longitude') is not None:
+            pontos.append((aeroporto_origem['longitude'], aeroporto_origem['latitude']))
+        
+        busca = BuscaLimitada.explorar(
+            grafo, aeroporto_origem['codigo_iata'], max_km, max_min, max_paradas, max_litros, metrica
+        )
+        for alcance in busca:
+            aeroporto = resolvedor_aeroportos.por_codigo(alcance.codigo) or {}
+            latitude = aeroporto.get('latitude')
+            longitude = aeroporto.get('longitude')
+            if latitude is not None and longitude is not None:
+                pontos.append((longitude, latitude))
+            
+            yield {
+                "codigo_iata": alcance.codigo,
+                "nome": aeroporto.get('nome'),
+                "latitude": latitude,
+                "longitude": longitude,
+                "distancia_km": alcance.distancia_km,
+                "tempo_min": alcance.tempo_min,
+                "combustivel_litros": round(alcance.combustivel_litros, 3),
+                "paradas": alcance.paradas,
+                "anterior": alcance.anterior
+            }
+        
+        if contorno:
+            fecho = fecho_convexo(pontos)
+            geometria = None
+            if len(fecho) >= 3:
+                # Anel GeoJSON fechado (primeiro ponto repetido ao final)
+                anel = [list(p) for p in fecho] + [list(fecho[0])]
+                geometria = {"type": "Polygon", "coordinates": [anel]}
+            yield {"contorno": geometria}
\ No newline at end of file
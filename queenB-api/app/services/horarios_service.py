@@ -0,0 +1,231 @@
+"""
+Serviço de roteamento por horários de voos (Connection Scan Algorithm)
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from ..config import settings
+from ..database import execute_query
+from ..algoritmos.csa import Conexao, ConnectionScan, TabelaConexoes
+from ..schemas.caminho import RespostaHorario, ViagemHorario, VooNoItinerario, ErroRota
+from .resolvedor_aeroportos import resolvedor_aeroportos
+from .coalescencia import coalescedor_consultas, coalescedor_reconstrucoes
+from ..versao_dados import versao_dados
+
+# Horários são tratados em UTC e convertidos para minutos desde esta época
+EPOCA = datetime(1970, 1, 1)
+
+
+class HorariosService:
+    """Serviço para consultas de viagens sobre voos programados"""
+    
+    # Vetor de conexões válido para a versão dos dados
+    _lock = threading.Lock()
+    _tabela: Tuple[Optional[int], Optional[TabelaConexoes]] = (None, None)
+    
+    @staticmethod
+    def normalizar_horario(horario: datetime) -> str:
+        """
+        Converte um horário para o texto armazenado no banco (UTC, minutos).
+        
+        Args:
+            horario: Horário com ou sem fuso (sem fuso é tratado como UTC)
+        
+        Returns:
+            Texto no formato 'AAAA-MM-DD HH:MM'
+        """
+        if horario.tzinfo is not None:
+            horario = horario.astimezone(timezone.utc).replace(tzinfo=None)
+        return horario.strftime('%Y-%m-%d %H:%M')
+    
+    @staticmethod
+    def para_minutos(horario: datetime | str) -> int:
+        """Converte horário (datetime ou texto ISO) em minutos desde a época"""
+        if isinstance(horario, str):
+            horario = datetime.fromisoformat(horario)
+        if horario.tzinfo is not None:
+            horario = horario.astimezone(timezone.utc).replace(tzinfo=None)
+        return int((horario - EPOCA).total_seconds() // 60)
+    
+    @staticmethod
+    def para_horario(minutos: int) -> datetime:
+        """Converte minutos desde a época em horário UTC"""
+        return (EPOCA + timedelta(minutes=minutos)).replace(tzinfo=timezone.utc)
+    
+    @staticmethod
+    def construir_tabela() -> TabelaConexoes:
+        """
+        Constrói o vetor de conexões a partir dos voos ativos no SQLite.
+        
+        Considera apenas voos de rotas ativas entre aeroportos ativos.
+        
+        Returns:
+            TabelaConexoes ordenada por partida
+        """
+        query = """
+            SELECT
+                v.id_voo,
+                v.codigo_voo,
+                v.partida,
+                v.chegada,
+                CASE WHEN v.invertido = 1 THEN ad.codigo_iata ELSE ao.codigo_iata END AS origem_codigo,
+                CASE WHEN v.invertido = 1 THEN ao.codigo_iata ELSE ad.codigo_iata END AS destino_codigo
+            FROM voo v
+            INNER JOIN rota r ON v.id_rota = r.id_rota
+            INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
+            INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
+            WHERE v.ativo = 1 AND r.ativo = 1 AND ao.ativo = 1 AND ad.ativo = 1
+            ORDER BY v.partida
+        """
+        conexoes = [
+            Conexao(
+                origem=voo['origem_codigo'],
+                destino=voo['destino_codigo'],
+                partida=HorariosService.para_minutos(voo['partida']),
+                chegada=HorariosService.para_minutos(voo['chegada']),
+                id_voo=voo['id_voo'],
+                codigo_voo=voo['codigo_voo']
+            )
+            for voo in execute_query(query)
+        ]
+        
+        minimos = execute_query("""
+            SELECT codigo_iata, conexao_minima_min FROM aeroporto
+            WHERE conexao_minima_min IS NOT NULL
+        """)
+        
+        return TabelaConexoes(
+            conexoes,
+            {a['codigo_iata']: a['conexao_minima_min'] for a in minimos},
+            settings.CONEXAO_MINIMA_PADRAO_MIN
+        )
+    
+    @staticmethod
+    def obter_tabela() -> TabelaConexoes:
+        """Retorna o vetor de conexões da versão atual, reconstruindo-o se necessário"""
+        versao = versao_dados.atual()
+        tabela = HorariosService._tabela
+        if tabela[0] == versao:
+            return tabela[1]
+        
+        return coalescedor_reconstrucoes.executar(("horarios", versao), HorariosService._reconstruir)
+    
+    @staticmethod
+    def _reconstruir() -> TabelaConexoes:
+        """Reconstrói o vetor de conexões se ainda estiver desatualizado e o retorna"""
+        with HorariosService._lock:
+            versao = versao_dados.atual()
+            if HorariosService._tabela[0] != versao:
+                HorariosService._tabela = (versao, HorariosService.construir_tabela())
+            return HorariosService._tabela[1]
+    
+    @staticmethod
+    def _montar_viagem(conexoes: List[Conexao]) -> ViagemHorario:
+        """Converte uma lista de conexões na resposta da API"""
+        return ViagemHorario(
+            partida=HorariosService.para_horario(conexoes[0].partida),
+            chegada=HorariosService.para_horario(conexoes[-1].chegada),
+            duracao_min=conexoes[-1].chegada - conexoes[0].partida,
+            numero_paradas=len(conexoes) - 1,
+            voos=[
+                VooNoItinerario(
+                    id_voo=c.id_voo,
+                    codigo_voo=c.codigo_voo,
+                    origem_codigo=c.origem,
+                    destino_codigo=c.destino,
+                    partida=HorariosService.para_horario(c.partida),
+                    chegada=HorariosService.para_horario(c.chegada)
+                )
+                for c in conexoes
+            ]
+        )
+    
+    @staticmethod
+    def calcular_viagens(
+        origem_id: str,
+        destino_id: str,
+        partida: datetime,
+        janela_min: int = 0
+    ) -> RespostaHorario | ErroRota:
+        """
+        Calcula viagens por horário entre dois aeroportos, compartilhando
+        uma única execução entre consultas idênticas simultâneas.
+        
+        Args:
+            origem_id: Código IATA ou ID do aeroporto de origem
+            destino_id: Código IATA ou ID do aeroporto de destino
+            partida: Horário mínimo de partida
+            janela_min: Largura da janela de partidas em minutos
+            
+        Returns:
+            RespostaHorario ou ErroRota
+        """
+        chave = (
+            versao_dados.atual(), "csa",
+            origem_id.strip().upper(), destino_id.strip().upper(),
+            HorariosService.para_minutos(partida), janela_min
+        )
+        return coalescedor_consultas.executar(
+            chave,
+            lambda: HorariosService._calcular_viagens(origem_id, destino_id, partida, janela_min)
+        )
+    
+    @staticmethod
+    def _calcular_viagens(
+        origem_id: str,
+        destino_id: str,
+        partida: datetime,
+        janela_min: int = 0
+    ) -> RespostaHorario | ErroRota:
+        """
+        Calcula viagens por horário entre dois aeroportos.
+        
+        Sem janela, retorna a viagem de chegada mais cedo partindo a partir
+        de `partida`. Com janela, retorna o perfil: todas as viagens
+        Pareto-ótimas que partem entre `partida` e `partida + janela_min`.
+        
+        Args:
+            origem_id: Código IATA ou ID do aeroporto de origem
+            destino_id: Código IATA ou ID do aeroporto de destino
+            partida: Horário mínimo de partida
+            janela_min: Largura da janela de partidas em minutos
+        
+        Returns:
+            RespostaHorario ou ErroRota
+        """
+        aeroporto_origem = resolvedor_aeroportos.resolver(origem_id)
+        aeroporto_destino = resolvedor_aeroportos.resolver(destino_id)
+        
+        if not aeroporto_origem:
+            return ErroRota(mensagem=f"Aeroporto de origem '{origem_id}' não encontrado")
+        
+        if not aeroporto_destino:
+            return ErroRota(mensagem=f"Aeroporto de destino '{destino_id}' não encontrado")
+        
+        origem_codigo = aeroporto_origem['codigo_iata']
+        destino_codigo = aeroporto_destino['codigo_iata']
+        
+        tabela = HorariosService.obter_tabela()
+        inicio = HorariosService.para_minutos(partida)
+        fim = inicio + janela_min
+        limite = fim + settings.HORIZONTE_VIAGEM_H * 60
+        
+        if janela_min > 0:
+            viagens = ConnectionScan.perfil(tabela, origem_codigo, destino_codigo, inicio, fim, limite)
+        else:
+            viagem = ConnectionScan.chegada_mais_cedo(tabela, origem_codigo, destino_codigo, inicio, limite)
+            viagens = [viagem] if viagem else []
+        
+        if not viagens:
+            return ErroRota(
+                mensagem=f"Não existe viagem programada entre {origem_codigo} e {destino_codigo}"
+            )
+        
+        return RespostaHorario(
+            algoritmo="csa_perfil" if janela_min > 0 else "csa",
+            origem_codigo=origem_codigo,
+            destino_codigo=destino_codigo,
+            partida_solicitada=HorariosService.para_horario(inicio),
+            viagens=[HorariosService._montar_viagem(v) for v in viagens]
+        )
@@ -0,0 +1,163 @@
+"""
+Serviço de itinerários por várias paradas (ordem de visita ótima ou
+heurística sobre os caminhos mínimos entre os aeroportos pedidos)
+"""
+
+import time
+from typing import List, Optional, Tuple
+from ..config import settings
+from ..algoritmos.grafo_compacto import GrafoCompacto
+from ..algoritmos.itinerario import OrdemVisitas
+from ..algoritmos.restricoes import Restricoes, Mascara
+from ..schemas.caminho import RespostaItinerario, TrechoItinerario, AeroportoNoCaminho, ErroRota
+from .grafo_service import GrafoService
+from .coalescencia import coalescedor_consultas
+
+
+class ItinerarioService:
+    """
+    Itinerários que visitam um conjunto de aeroportos na melhor ordem.
+    
+    Os custos entre todas as paradas saem de uma busca por parada sobre o
+    grafo compilado da versão atual (o mesmo das restrições), interrompida
+    quando todas as demais paradas são definidas. A ordem é resolvida sobre
+    essa matriz e só os trechos escolhidos têm seus caminhos reconstruídos.
+    """
+    
+    @staticmethod
+    def calcular_itinerario(
+        paradas: List[str],
+        metrica: str = "distancia",
+        retornar: bool = False,
+        fixar_destino: bool = False,
+        restricoes: Optional[Restricoes] = None
+    ) -> RespostaItinerario | ErroRota:
+        """
+        Calcula a ordem de visita de menor custo e o caminho completo.
+        
+        Consultas idênticas simultâneas compartilham uma única execução.
+        
+        Args:
+            paradas: Códigos IATA ou IDs; o primeiro é o ponto de partida
+            metrica: Peso minimizado: 'distancia', 'tempo' ou 'combustivel'
+            retornar: Se o itinerário termina de volta no ponto de partida
+            fixar_destino: Se o último aeroporto informado é o final
+            restricoes: Aeroportos/países a evitar e alcance máximo por trecho
+        
+        Returns:
+            RespostaItinerario ou ErroRota
+        """
+        return coalescedor_consultas.executar(
+            GrafoService._chave_consulta(
+                "itinerario", ",".join(paradas), metrica, str(retornar), str(fixar_destino),
+                restricoes.chave if restricoes else ""
+            ),
+            lambda: ItinerarioService._calcular_itinerario(paradas, metrica, retornar, fixar_destino, restricoes)
+        )
+    
+    @staticmethod
+    def _matriz_custos(
+        compacto: GrafoCompacto,
+        indices: List[int],
+        metrica: str,
+        mascara: Mascara
+    ) -> Tuple[List[List[float]], List[List[int]]]:
+        """
+        Custos entre todas as paradas e os anteriores da busca de cada uma.
+        
+        Returns:
+            Tupla (custos[i][j], anteriores[i]) na ordem das paradas
+        """
+        custos = []
+        anteriores = []
+        for i in indices:
+            alvos = set(indices) - {i}
+            distancia, anterior, _ = compacto.dijkstra(
+                i, alvos, metrica, mascara.vertices, mascara.arcos, settings.DIJKSTRA_COMPACTO_FILA
+            )
+            custos.append([distancia[j] for j in indices])
+            anteriores.append(anterior)
+        return custos, anteriores
+    
+    @staticmethod
+    def _calcular_itinerario(
+        paradas: List[str],
+        metrica: str,
+        retornar: bool,
+        fixar_destino: bool,
+        restricoes: Optional[Restricoes]
+    ) -> RespostaItinerario | ErroRota:
+        """Matriz de custos, ordem de visita e montagem da resposta"""
+        codigos: List[str] = []
+        for identificador in paradas:
+            aeroporto = GrafoService.buscar_aeroporto(identificador)
+            if not aeroporto:
+                return ErroRota(mensagem=f"Aeroporto '{identificador}' não encontrado")
+            # Paradas repetidas contam uma vez; a volta à origem é pedida com retornar
+            if aeroporto['codigo_iata'] not in codigos:
+                codigos.append(aeroporto['codigo_iata'])
+        
+        if len(codigos) < 2:
+            return ErroRota(mensagem="Informe ao menos dois aeroportos distintos")
+        
+        _, aeroportos_map = GrafoService.obter_grafo()
+        compacto, mascaras = GrafoService.obter_mascaras()
+        mascara = mascaras.compilar(restricoes) if restricoes else Mascara()
+        
+        indices = []
+        for codigo in codigos:
+            i = compacto.indice.get(codigo)
+            if i is None or mascara.bloqueia_vertice(i):
+                return ErroRota(mensagem=f"Não existe rota que passe por {codigo}")
+            indices.append(i)
+        
+        inicio = time.perf_counter()
+        custos, anteriores = ItinerarioService._matriz_custos(compacto, indices, metrica, mascara)
+        resultado = OrdemVisitas.resolver(
+            custos,
+            retornar=retornar,
+            fim=len(codigos) - 1 if fixar_destino and not retornar else None,
+            exato_max=settings.ITINERARIO_EXATO_MAX,
+            tempo_max_s=settings.ITINERARIO_TEMPO_MAX_MS / 1000
+        )
+        tempo_ms = round((time.perf_counter() - inicio) * 1000, 3)
+        
+        if resultado is None:
+            return ErroRota(mensagem=f"Não existe itinerário que visite {', '.join(codigos)}")
+        
+        # Costura os caminhos de cada trecho (a chegada de um é a partida do seguinte)
+        caminho: List[int] = [indices[resultado.ordem[0]]]
+        trechos: List[TrechoItinerario] = []
+        for a, b in zip(resultado.ordem, resultado.ordem[1:]):
+            trecho = GrafoCompacto.reconstruir(anteriores[a], indices[b])
+            distancia, tempo, _ = compacto.totais(trecho, metrica, mascara.arcos)
+            trechos.append(TrechoItinerario(
+                origem_codigo=codigos[a],
+                destino_codigo=codigos[b],
+                distancia_km=distancia,
+                tempo_min=tempo,
+                custo=round(custos[a][b], 3),
+                numero_paradas=len(trecho) - 1
+            ))
+            caminho.extend(trecho[1:])
+        
+        caminho_codigos = [compacto.codigos[v] for v in caminho]
+        return RespostaItinerario(
+            algoritmo="itinerario",
+            origem_codigo=caminho_codigos[0],
+            destino_codigo=caminho_codigos[-1],
+            caminho=[
+                AeroportoNoCaminho(codigo_iata=codigo, nome=aeroportos_map[codigo]['nome'], ordem=i)
+                for i, codigo in enumerate(caminho_codigos)
+            ],
+            distancia_total_km=sum(t.distancia_km for t in trechos),
+            tempo_estimado_min=sum(t.tempo_min for t in trechos),
+            numero_paradas=len(caminho_codigos) - 1,
+            peso=metrica,
+            custo_total=round(resultado.custo, 3),
+            ordem=[codigos[i] for i in resultado.ordem],
+            trechos=trechos,
+            metodo=resultado.metodo,
+            otimo=resultado.otimo,
+            tempo_ms=tempo_ms
+        )
@@ -0,0 +1,219 @@
+"""
+Serviço de caminhos por métrica sobre o overlay multinível (CRP)
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from ..config import settings
+from ..algoritmos.grafo import Grafo
+from ..algoritmos.grafo_compacto import GrafoCompacto
+from ..algoritmos.crp import Particao, Overlay, Customizacao, BuscaCRP
+from ..schemas.caminho import RespostaMetrica, EspacoBusca, AeroportoNoCaminho, ErroRota
+from .grafo_service import GrafoService
+from .resolvedor_aeroportos import resolvedor_aeroportos
+from .coalescencia import coalescedor_consultas, coalescedor_reconstrucoes
+
+
+class _EstadoOverlay:
+    """Overlay e customizações de uma versão do grafo"""
+    
+    def __init__(self, grafo: Grafo, versao: Optional[int], compacto: GrafoCompacto, overlay: Overlay, topologia: tuple):
+        self.grafo = grafo
+        self.versao = versao
+        self.compacto = compacto
+        self.overlay = overlay
+        self.topologia = topologia
+        self.customizacoes: Dict[str, Customizacao] = {}
+        # Customizações da versão anterior (mesma topologia), base das incrementais
+        self.anteriores: Dict[str, Customizacao] = {}
+        self.tempos_ms: Dict[str, float] = {}
+
+
+class OverlayService:
+    """
+    Caminhos mínimos por distância, tempo ou combustível com um único
+    pré-processamento da estrutura.
+    
+    A partição (por país e estado, com regiões grandes subdivididas) e as
+    fronteiras das células só são refeitas quando a topologia muda. A cada
+    versão do grafo, cada métrica é customizada na primeira consulta que a
+    usa: só as células com arcos cujo peso mudou desde a versão anterior
+    têm seus cliques recalculados.
+    """
+    
+    _lock = threading.Lock()
+    _estado: Optional[_EstadoOverlay] = None
+    
+    @staticmethod
+    def obter_customizacao(metrica: str) -> Tuple[GrafoCompacto, Customizacao]:
+        """
+        Retorna o grafo compilado e os cliques da métrica na versão atual.
+        
+        Args:
+            metrica: 'distancia', 'tempo' ou 'combustivel'
+        
+        Returns:
+            Tupla (GrafoCompacto, Customizacao)
+        """
+        grafo, _ = GrafoService.obter_grafo()
+        estado = OverlayService._estado
+        if (estado is not None and estado.grafo is grafo and estado.versao == GrafoService._versao
+                and metrica in estado.customizacoes):
+            return estado.compacto, estado.customizacoes[metrica]
+        
+        return coalescedor_reconstrucoes.executar(
+            ("overlay", GrafoService._versao, metrica),
+            lambda: OverlayService._customizar(metrica)
+        )
+    
+    @staticmethod
+    def _customizar(metrica: str) -> Tuple[GrafoCompacto, Customizacao]:
+        """Atualiza o overlay para a versão atual, se preciso, e customiza a métrica"""
+        grafo, _ = GrafoService.obter_grafo()
+        with GrafoService._lock:
+            versao = GrafoService._versao
+            atual = OverlayService._estado
+            compacto = None
+            if atual is None or atual.grafo is not grafo or atual.versao != versao:
+                compacto = GrafoCompacto.de_grafo(grafo, versao or 0)
+        
+        with OverlayService._lock:
+            estado = OverlayService._estado
+            if compacto is not None and (estado is None or estado.grafo is not grafo or estado.versao != versao):
+                estado = OverlayService._novo_estado(grafo, versao, compacto, estado)
+                OverlayService._estado = estado
+            
+            if metrica not in estado.customizacoes:
+                inicio = time.perf_counter()
+                pesos = OverlayService._pesos(estado.compacto, metrica)
+                estado.customizacoes[metrica] = Customizacao.calcular(
+                    estado.overlay, pesos, estado.anteriores.get(metrica)
+                )
+                estado.tempos_ms[metrica] = (time.perf_counter() - inicio) * 1000
+            return estado.compacto, estado.customizacoes[metrica]
+    
+    @staticmethod
+    def _novo_estado(
+        grafo: Grafo,
+        versao: Optional[int],
+        compacto: GrafoCompacto,
+        anterior: Optional[_EstadoOverlay]
+    ) -> _EstadoOverlay:
+        """Reaproveita o overlay da versão anterior se a topologia não mudou"""
+        regioes = []
+        for codigo in compacto.codigos:
+            aeroporto = resolvedor_aeroportos.por_codigo(codigo) or {}
+            regioes.append((aeroporto.get('pais') or "", aeroporto.get('estado') or ""))
+        topologia = (
+            tuple(compacto.codigos),
+            compacto.deslocamentos.tobytes(),
+            compacto.destinos.tobytes(),
+            tuple(regioes)
+        )
+        
+        if anterior is not None and anterior.topologia == topologia:
+            estado = _EstadoOverlay(grafo, versao, compacto, anterior.overlay, topologia)
+            # Métricas ainda não customizadas na versão anterior continuam valendo como base
+            estado.anteriores = {**anterior.anteriores, **anterior.customizacoes}
+            return estado
+        
+        particao = Particao.por_regioes(compacto, regioes, settings.OVERLAY_TAMANHO_CELULA)
+        return _EstadoOverlay(grafo, versao, compacto, Overlay(compacto, particao), topologia)
+    
+    @staticmethod
+    def _pesos(compacto: GrafoCompacto, metrica: str) -> List[float]:
+        """Peso de cada arco do grafo compilado na métrica (coluna do próprio grafo)"""
+        return list(compacto.coluna(metrica))
+    
+    @staticmethod
+    def calcular_caminho(origem_id: str, destino_id: str, metrica: str = "distancia") -> RespostaMetrica | ErroRota:
+        """
+        Calcula o menor caminho na métrica pelo overlay multinível.
+        
+        Consultas idênticas simultâneas compartilham uma única execução.
+        
+        Args:
+            origem_id: Código IATA ou ID do aeroporto de origem
+            destino_id: Código IATA ou ID do aeroporto de destino
+            metrica: 'distancia', 'tempo' ou 'combustivel'
+        
+        Returns:
+            RespostaMetrica ou ErroRota
+        """
+        return coalescedor_consultas.executar(
+            GrafoService._chave_consulta("overlay", origem_id, destino_id, metrica),
+            lambda: OverlayService._calcular_caminho(origem_id, destino_id, metrica)
+        )
+    
+    @staticmethod
+    def _calcular_caminho(origem_id: str, destino_id: str, metrica: str) -> RespostaMetrica | ErroRota:
+        """Busca multinível e montagem da resposta"""
+        aeroporto_origem = GrafoService.buscar_aeroporto(origem_id)
+        aeroporto_destino = GrafoService.buscar_aeroporto(destino_id)
+        
+        if not aeroporto_origem:
+            return ErroRota(mensagem=f"Aeroporto de origem '{origem_id}' não encontrado")
+        
+        if not aeroporto_destino:
+            return ErroRota(mensagem=f"Aeroporto de destino '{destino_id}' não encontrado")
+        
+        _, aeroportos_map = GrafoService.obter_grafo()
+        compacto, customizacao = OverlayService.obter_customizacao(metrica)
+        
+        origem_codigo = aeroporto_origem['codigo_iata']
+        destino_codigo = aeroporto_destino['codigo_iata']
+        origem = compacto.indice.get(origem_codigo)
+        destino = compacto.indice.get(destino_codigo)
+        
+        if origem is None or destino is None:
+            return ErroRota(mensagem=f"Não existe rota entre {origem_codigo} e {destino_codigo}")
+        
+        inicio = time.perf_counter()
+        resultado = BuscaCRP.buscar(customizacao, origem, destino)
+        espaco_busca = EspacoBusca(
+            vertices_visitados=resultado.visitados,
+            arcos_relaxados=resultado.relaxados,
+            tempo_ms=round((time.perf_counter() - inicio) * 1000, 3)
+        )
+        
+        if resultado.caminho is None:
+            return ErroRota(mensagem=f"Não existe rota entre {origem_codigo} e {destino_codigo}")
+        
+        caminho_codigos = [compacto.codigos[i] for i in resultado.caminho]
+        return RespostaMetrica(
+            algoritmo="overlay",
+            origem_codigo=origem_codigo,
+            destino_codigo=destino_codigo,
+            caminho=[
+                AeroportoNoCaminho(codigo_iata=codigo, nome=aeroportos_map[codigo]['nome'], ordem=i)
+                for i, codigo in enumerate(caminho_codigos)
+            ],
+            distancia_total_km=sum(compacto.pesos[posicao] for posicao in resultado.arcos),
+            tempo_estimado_min=sum(compacto.tempos[posicao] for posicao in resultado.arcos),
+            numero_paradas=len(caminho_codigos) - 1,
+            peso=metrica,
+            metrica=metrica,
+            custo_total=round(resultado.custo, 3),
+            espaco_busca=espaco_busca
+        )
+    
+    @staticmethod
+    def metricas() -> Dict[str, Any]:
+        """Estrutura do overlay atual e duração da última customização de cada métrica"""
+        estado = OverlayService._estado
+        if estado is None:
+            return {"construido": False}
+        
+        return {
+            "construido": True,
+            "versao": estado.versao,
+            "niveis": estado.overlay.resumo(),
+            "customizacoes": {
+                metrica: {
+                    "celulas_recalculadas": customizacao.recalculadas,
+                    "tempo_ms": round(estado.tempos_ms.get(metrica, 0.0), 1)
+                }
+                for metrica, customizacao in estado.customizacoes.items()
+            }
+        }
@@ -0,0 +1,214 @@
+"""
+Pool de processos para buscas de caminhos sobre o grafo publicado em
+memória compartilhada (multiprocessing.shared_memory).
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+from ..config import settings
+from ..algoritmos.grafo_compacto import GrafoCompacto
+
+# Resultado de uma consulta: (caminho em códigos IATA, distância, tempo) ou None
+ResultadoBusca = Optional[Tuple[List[str], int, int]]
+
+# Estado de cada processo worker: último segmento anexado
+_anexado: Optional[Tuple[str, shared_memory.SharedMemory, GrafoCompacto]] = None
+
+
+def _desanexar() -> None:
+    """Solta o grafo e fecha o segmento anexado neste worker"""
+    global _anexado
+    if _anexado is not None:
+        _anexado[2].liberar()
+        _anexado[1].close()
+        _anexado = None
+
+
+def _iniciar_worker() -> None:
+    atexit.register(_desanexar)
+
+
+def _grafo_do_segmento(nome: str) -> GrafoCompacto:
+    """Anexa (sem cópia) o segmento publicado pelo processo principal"""
+    global _anexado
+    if _anexado is not None and _anexado[0] == nome:
+        return _anexado[2]
+    
+    # Workers 'spawn' compartilham o resource_tracker do processo principal,
+    # que é o dono do segmento e o remove quando fica obsoleto
+    segmento = shared_memory.SharedMemory(name=nome)
+    grafo = GrafoCompacto.de_buffer(segmento.buf)
+    
+    _desanexar()
+    _anexado = (nome, segmento, grafo)
+    return grafo
+
+
+def _buscar_lote(
+    nome: str,
+    algoritmo: str,
+    origem: str,
+    destinos: List[str],
+    metrica: str = "distancia"
+) -> List[ResultadoBusca]:
+    """
+    Executado nos workers: resolve todas as consultas de uma mesma origem.
+    
+    Para Dijkstra, uma única busca (interrompida quando todos os destinos
+    são definidos) atende todos os destinos, minimizando a métrica.
+    """
+    grafo = _grafo_do_segmento(nome)
+    i = grafo.indice.get(origem)
+    if i is None:
+        return [None] * len(destinos)
+    
+    resultados: List[ResultadoBusca] = []
+    if algoritmo == "dijkstra":
+        alvos = {grafo.indice[d] for d in destinos if d in grafo.indice}
+        custo, anterior, _ = grafo.dijkstra(i, alvos, metrica, fila=settings.DIJKSTRA_COMPACTO_FILA)
+        for destino in destinos:
+            j = grafo.indice.get(destino)
+            if j is None or custo[j] == float("inf"):
+                resultados.append(None)
+                continue
+            caminho = GrafoCompacto.reconstruir(anterior, j)
+            distancia_total, tempo_total, _ = grafo.totais(caminho, metrica)
+            resultados.append(([grafo.codigos[k] for k in caminho], distancia_total, tempo_total))
+    else:
+        for destino in destinos:
+            j = grafo.indice.get(destino)
+            caminho = grafo.bfs(i, j) if j is not None else None
+            if caminho is None:
+                resultados.append(None)
+                continue
+            distancia_total, tempo_total = grafo.distancia_tempo(caminho)
+            resultados.append(([grafo.codigos[k] for k in caminho], distancia_total, tempo_total))
+    return resultados
+
+
+class PoolCaminhos:
+    """
+    Publica o grafo compacto uma vez por versão em memória compartilhada e
+    distribui buscas entre processos, que anexam o segmento sem cópia.
+    
+    Os workers são criados com 'spawn' (o processo da API tem threads) e
+    apenas sob demanda. Os dois segmentos mais recentes são mantidos para
+    que tarefas já enviadas com a versão anterior ainda os encontrem.
+    """
+    
+    def __init__(self, processos: int):
+        self.processos = processos
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._segmentos: List[Tuple[int, shared_memory.SharedMemory]] = []
+    
+    @property
+    def ativo(self) -> bool:
+        return self.processos > 0
+    
+    def _obter_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processos,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_iniciar_worker
+                )
+            return self._executor
+    
+    def publicar(self, versao: int, compilar: Callable[[], GrafoCompacto]) -> str:
+        """
+        Publica o grafo da versão (se ainda não publicado) e retorna o nome do segmento.
+        
+        Args:
+            versao: Versão dos dados do grafo
+            compilar: Função que produz o GrafoCompacto dessa versão
+        """
+        with self._lock:
+            for versao_publicada, segmento in self._segmentos:
+                if versao_publicada == versao:
+                    return segmento.name
+            
+            dados = compilar().serializar()
+            segmento = shared_memory.SharedMemory(
+                create=True,
+                size=max(1, len(dados)),
+                name=f"queenb_{os.getpid()}_{versao}_{uuid.uuid4().hex[:8]}"
+            )
+            segmento.buf[:len(dados)] = dados
+            self._segmentos.append((versao, segmento))
+            
+            while len(self._segmentos) > 2:
+                _, antigo = self._segmentos.pop(0)
+                antigo.close()
+                antigo.unlink()
+            return segmento.name
+    
+    def buscar(
+        self,
+        versao: int,
+        compilar: Callable[[], GrafoCompacto],
+        algoritmo: str,
+        consultas: List[Tuple[str, str]],
+        metrica: str = "distancia"
+    ) -> List[ResultadoBusca]:
+        """
+        Executa consultas (origem, destino) em paralelo, uma tarefa por origem.
+        
+        Args:
+            versao: Versão dos dados do grafo
+            compilar: Função que produz o GrafoCompacto dessa versão
+            algoritmo: 'dijkstra' ou 'bfs'
+            consultas: Pares de códigos IATA
+            metrica: Peso minimizado pelo Dijkstra
+        
+        Returns:
+            Resultados na mesma ordem das consultas
+        """
+        nome = self.publicar(versao, compilar)
+        executor = self._obter_executor()
+        
+        por_origem: Dict[str, List[int]] = {}
+        for posicao, (origem, _) in enumerate(consultas):
+            por_origem.setdefault(origem, []).append(posicao)
+        
+        futuros = {
+            origem: executor.submit(
+                _buscar_lote, nome, algoritmo, origem, [consultas[p][1] for p in posicoes], metrica
+            )
+            for origem, posicoes in por_origem.items()
+        }
+        
+        resultados: List[ResultadoBusca] = [None] * len(consultas)
+        for origem, futuro in futuros.items():
+            destinos = [consultas[p][1] for p in por_origem[origem]]
+            try:
+                lote = futuro.result()
+            except FileNotFoundError:
+                # Segmento removido por publicações mais novas: republica e repete
+                lote = executor.submit(
+                    _buscar_lote, self.publicar(versao, compilar), algoritmo, origem, destinos, metrica
+                ).result()
+            for posicao, resultado in zip(por_origem[origem], lote):
+                resultados[posicao] = resultado
+        return resultados
+    
+    def encerrar(self) -> None:
+        """Encerra os workers e remove os segmentos publicados"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            for _, segmento in self._segmentos:
+                segmento.close()
+                segmento.unlink()
+            self._segmentos = []
+
+
+pool_caminhos = PoolCaminhos(settings.POOL_PROCESSOS)
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Mapa em memória para resolver aeroportos por código IATA ou ID sem consultar o SQLite
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+from ..database import execute_query
+from ..versao_dados import versao_dados
+
+
+class ResolvedorAeroportos:
+    """
+    Resolve identificadores de aeroportos (IATA ou ID) a partir de um mapa
+    em memória, recarregado apenas quando a versão dos dados muda.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (versão, aeroportos por código IATA em maiúsculas, aeroportos por ID)
+        self._mapas: Tuple[Optional[int], Dict[str, dict], Dict[int, dict]] = (None, {}, {})
+    
+    def _obter_mapas(self) -> Tuple[Optional[int], Dict[str, dict], Dict[int, dict]]:
+        """Retorna os mapas da versão atual, recarregando-os se estiverem desatualizados"""
+        versao = versao_dados.atual()
+        mapas = self._mapas
+        if mapas[0] == versao:
+            return mapas
+        
+        with self._lock:
+            if self._mapas[0] != versao:
+                aeroportos = execute_query("SELECT * FROM aeroporto")
+                self._mapas = (
+                    versao,
+                    {a['codigo_iata'].upper(): a for a in aeroportos},
+                    {a['id_aeroporto']: a for a in aeroportos}
+                )
+            return self._mapas
+    
+    def por_codigo(self, codigo_iata: str) -> Optional[dict]:
+        """Busca aeroporto pelo código IATA (sem diferenciar maiúsculas)"""
+        aeroporto = self._obter_mapas()[1].get(codigo_iata.upper())
+        return dict(aeroporto) if aeroporto else None
+    
+    def por_id(self, id_aeroporto: int) -> Optional[dict]:
+        """Busca aeroporto pelo ID"""
+        aeroporto = self._obter_mapas()[2].get(id_aeroporto)
+        return dict(aeroporto) if aeroporto else None
+    
+    def resolver(self, identificador: str) -> Optional[dict]:
+        """
+        Busca aeroporto por código IATA ou ID numérico.
+        
+        Args:
+            identificador: Código IATA (ex: 'GRU') ou ID numérico
+            
+        Returns:
+            Dicionário com dados do aeroporto ou None
+        """
+        if identificador.isdigit():
+            return self.por_id(int(identificador))
+        return self.por_codigo(identificador)
+
+
+resolvedor_aeroportos = ResolvedorAeroportos()
@@ -0,0 +1,178 @@
+"""
+Sincronização do estado em memória entre processos (workers) que
+compartilham o mesmo banco SQLite
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from ..config import settings
+from ..database import execute_query
+from .grafo_service import GrafoService
+from .delta_grafo import DeltaGrafoService
+from .eventos import broker_eventos
+from ..versao_dados import versao_dados
+
+# Tabela e chave primária de cada entidade registrada no log de alterações
+TABELAS = {
+    "aeroporto": ("aeroporto", "id_aeroporto"),
+    "rota": ("rota", "id_rota"),
+    "voo": ("voo", "id_voo")
+}
+
+# Escrita feita por este processo: (entidade, id, operação, dados)
+AlteracaoLocal = Tuple[str, int, str, Optional[Dict[str, Any]]]
+
+
+class SincronizadorProcessos:
+    """
+    Mantém o grafo e os caches deste processo alinhados com escritas
+    feitas por qualquer processo no mesmo banco.
+    
+    Toda escrita em aeroporto, rota ou voo grava, por trigger e na mesma
+    transação, uma linha no log `alteracao`. O processo guarda a última
+    versão do log já aplicada e reaplica em ordem as linhas mais novas,
+    lendo do banco o estado atual de cada entidade.
+    
+    A verificação por requisição é barata: `PRAGMA data_version`, em uma
+    conexão dedicada por thread, só muda quando outra conexão confirmou
+    uma escrita; apenas então o log é consultado.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conexoes = threading.local()
+        self._versao_log = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._apos_fork)
+    
+    def _apos_fork(self) -> None:
+        # Conexões SQLite e locks do processo pai não podem ser reutilizados
+        self._lock = threading.Lock()
+        self._conexoes = threading.local()
+    
+    def iniciar(self) -> None:
+        """Considera aplicadas todas as alterações já registradas no log"""
+        with self._lock:
+            self._versao_log = DeltaGrafoService.versao_atual()
+    
+    @property
+    def versao_log(self) -> int:
+        """Última versão do log de alterações aplicada neste processo"""
+        return self._versao_log
+    
+    def houve_escrita(self) -> bool:
+        """
+        Indica se outra conexão confirmou escritas desde a última chamada
+        nesta thread (a primeira chamada de cada thread retorna True).
+        """
+        conexao = getattr(self._conexoes, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(settings.database_url)
+            self._conexoes.conexao = conexao
+            self._conexoes.data_version = None
+        
+        valor = conexao.execute("PRAGMA data_version").fetchone()[0]
+        alterado = valor != self._conexoes.data_version
+        self._conexoes.data_version = valor
+        return alterado
+    
+    def sincronizar(self, local: Optional[AlteracaoLocal] = None) -> int:
+        """
+        Aplica as alterações do log ainda não vistas por este processo e
+        publica os eventos correspondentes aos clientes SSE conectados a ele.
+        
+        Várias linhas da mesma entidade resultam em uma única aplicação,
+        com o estado atual lido do banco. O `versao` de cada evento é a
+        versão do log da última dessas linhas, comum a todos os processos e
+        aceita por `/dados/grafo/delta?desde=`.
+        
+        Args:
+            local: Escrita recém-confirmada por este processo; seus dados e
+                operação são usados no evento (ela é aplicada mesmo que o
+                log já tenha sido consumido)
+        
+        Returns:
+            Versão dos dados deste processo após a sincronização
+        """
+        with self._lock:
+            linhas = execute_query("""
+                SELECT versao, entidade, id_entidade, operacao
+                FROM alteracao
+                WHERE versao > ?
+                ORDER BY versao
+            """, (self._versao_log,))
+            
+            versao_log = linhas[-1]['versao'] if linhas else self._versao_log
+            
+            # (entidade, id) -> (operação, versão do log da última linha)
+            pendentes: "OrderedDict[Tuple[str, int], Tuple[str, int]]" = OrderedDict()
+            for linha in linhas:
+                chave = (linha['entidade'], linha['id_entidade'])
+                pendentes.pop(chave, None)
+                pendentes[chave] = (linha['operacao'], linha['versao'])
+            if local is not None:
+                # Linha já consumida por outra thread: a versão aplicada a inclui
+                anterior = pendentes.pop(local[:2], None)
+                pendentes[local[:2]] = (local[2], anterior[1] if anterior else versao_log)
+            
+            versao = versao_dados.atual()
+            for (entidade, id_entidade), (operacao, versao_evento) in pendentes.items():
+                if entidade not in TABELAS:
+                    continue
+                tabela, chave_primaria = TABELAS[entidade]
+                resultado = execute_query(f"SELECT * FROM {tabela} WHERE {chave_primaria} = ?", (id_entidade,))
+                estado = resultado[0] if resultado else None
+                
+                dados = estado
+                if local is not None and (entidade, id_entidade) == local[:2]:
+                    dados = local[3]
+                
+                versao = GrafoService.aplicar_alteracao(entidade, id_entidade, estado)
+                broker_eventos.publicar({
+                    "entidade": entidade,
+                    "id": id_entidade,
+                    "operacao": operacao,
+                    "versao": versao_evento,
+                    "dados": dados
+                })
+            
+            if linhas:
+                self._versao_log = versao_log
+            if pendentes:
+                # Escrita confirmada durante a aplicação pode já estar no grafo
+                em_dia = DeltaGrafoService.versao_atual() == self._versao_log
+                GrafoService.registrar_versao_log(self._versao_log, em_dia)
+            return versao
+    
+    async def monitorar(self, intervalo: float) -> None:
+        """
+        Verifica periodicamente escritas de outros processos, para que
+        workers ociosos (ou apenas com clientes SSE) também se atualizem.
+        """
+        while True:
+            await asyncio.sleep(intervalo)
+            if self.houve_escrita():
+                await run_in_threadpool(self.sincronizar)
+
+
+class MiddlewareSincronizacao:
+    """
+    Middleware ASGI que, antes de cada requisição HTTP, aplica escritas
+    confirmadas por outros processos desde a requisição anterior.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and sincronizador.houve_escrita():
+            await run_in_threadpool(sincronizador.sincronizar)
+        await self.app(scope, receive, send)
+
+
+sincronizador = SincronizadorProcessos()
@@ -0,0 +1,87 @@
+"""
+Snapshot binário do grafo compilado em disco, carregado via mmap na inicialização
+"""
+
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from ..config import settings
+from ..algoritmos.grafo import Grafo
+from ..algoritmos.grafo_compacto import GrafoCompacto
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotGrafo:
+    """
+    Guarda o grafo no layout do GrafoCompacto (tabela de vértices e vetores
+    de arcos) junto com a versão do log de alterações em que foi montado.
+    
+    O arquivo é lido por mmap: só o cabeçalho é consultado para validar a
+    versão, e os vetores são percorridos direto do page cache, sem a junção
+    SQL de rotas e aeroportos. A escrita é atômica (arquivo temporário +
+    rename), segura com vários workers.
+    """
+    
+    def __init__(self, caminho: Path):
+        self.caminho = caminho
+    
+    def salvar(self, grafo: Grafo, aeroportos_map: Dict[str, dict], versao: int, opcoes: int = 0) -> None:
+        """
+        Grava o snapshot do grafo, com o registro completo de rotas.
+        
+        Args:
+            grafo: Grafo em memória
+            aeroportos_map: Aeroportos por código IATA
+            versao: Versão do log de alterações que o grafo reflete
+            opcoes: Bits OPCAO_* com que o grafo foi montado
+        """
+        dados = GrafoCompacto.de_grafo(grafo, versao, aeroportos_map, com_registro=True, opcoes=opcoes).serializar()
+        temporario = self.caminho.with_name(f"{self.caminho.name}.{os.getpid()}.tmp")
+        try:
+            with open(temporario, "wb") as arquivo:
+                arquivo.write(dados)
+            os.replace(temporario, self.caminho)
+        except OSError:
+            logger.warning("Não foi possível gravar o snapshot do grafo em %s", self.caminho, exc_info=True)
+            temporario.unlink(missing_ok=True)
+    
+    def carregar(self, versao: int, opcoes: int = 0) -> Optional[Tuple[Grafo, Dict[str, dict]]]:
+        """
+        Carrega o snapshot se ele corresponder à versão e às opções informadas.
+        
+        Args:
+            versao: Versão atual do log de alterações no banco
+            opcoes: Bits OPCAO_* da configuração atual
+        
+        Returns:
+            Tupla (Grafo, aeroportos por código IATA) ou None se o snapshot
+            não existe, é inválido ou está desatualizado
+        """
+        try:
+            with open(self.caminho, "rb") as arquivo:
+                mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Inexistente ou vazio
+            return None
+        
+        compacto = None
+        try:
+            cabecalho = GrafoCompacto.ler_cabecalho(mapa)
+            # Montado com outra configuração (sentido das rotas, mesclagem): refaz
+            if cabecalho[0] != versao or cabecalho[6] != opcoes:
+                return None
+            compacto = GrafoCompacto.de_buffer(mapa)
+            return compacto.para_grafo()
+        except ValueError:
+            logger.warning("Snapshot do grafo inválido em %s; ignorado", self.caminho)
+            return None
+        finally:
+            if compacto is not None:
+                compacto.liberar()
+            mapa.close()
+
+
+snapshot_grafo = SnapshotGrafo(settings.snapshot_grafo_path)
@@ -0,0 +1,31 @@
+"""
+Versão dos dados de aeroportos e rotas usada para invalidar caches em memória
+"""
+
+import threading
+
+
+class VersaoDados:
+    """
+    Contador monotônico de alterações em aeroportos e rotas.
+    
+    Cada escrita nos routers incrementa a versão; caches em memória
+    guardam a versão em que foram montados e se recarregam quando ela muda.
+    """
+    
+    def __init__(self):
+        self._valor = 0
+        self._lock = threading.Lock()
+    
+    def atual(self) -> int:
+        """Retorna a versão atual dos dados"""
+        return self._valor
+    
+    def incrementar(self) -> int:
+        """Registra uma alteração e retorna a nova versão"""
+        with self._lock:
+            self._valor += 1
+            return self._valor
+
+
+versao_dados = VersaoDados()
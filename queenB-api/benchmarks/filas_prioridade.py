@@ -0,0 +1,168 @@
+"""
+Benchmark das filas de prioridade do Dijkstra nos dois motores (árvores
+sobre o Grafo e grafo compilado) e em formatos de malha aérea.
+
+Uso (a partir de queenB-api/):
+    python -m benchmarks.filas_prioridade
+    python -m benchmarks.filas_prioridade --vertices 5000 --origens 20
+    python -m benchmarks.filas_prioridade --banco aeroportos.db
+
+Formatos sintéticos:
+- hubs: poucos hubs densamente ligados entre si, aeroportos regionais
+  ligados a alguns hubs e a vizinhos próximos (rede hub-and-spoke)
+- regional: cada aeroporto ligado aos vizinhos mais próximos (malha
+  esparsa de trechos curtos)
+
+Com --banco, mede também o grafo das rotas ativas do banco informado.
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.algoritmos.grafo import Grafo
+from app.algoritmos.grafo_compacto import GrafoCompacto
+from app.algoritmos.dijkstra import Dijkstra
+from app.algoritmos.filas import FILAS
+
+METRICAS_MEDIDAS = ("distancia", "tempo")
+
+
+def _distancia_km(a: Tuple[float, float], b: Tuple[float, float]) -> int:
+    """Distância de círculo máximo entre (latitude, longitude) em km"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return max(1, int(2 * 6371 * math.asin(math.sqrt(h))))
+
+
+def _adicionar_rota(grafo: Grafo, id_rota: int, origem: str, destino: str, km: int, aleatorio: random.Random) -> None:
+    """Rota com tempo de voo (~800 km/h mais taxiamento) e combustível proporcionais à distância"""
+    tempo = km * 60 // 800 + 30 + aleatorio.randint(0, 15)
+    grafo.adicionar_aresta(origem, destino, km, tempo, True, id_rota, km * 3.2)
+
+
+def _pontos(n: int, aleatorio: random.Random) -> List[Tuple[float, float]]:
+    return [(aleatorio.uniform(-50, 60), aleatorio.uniform(-120, 140)) for _ in range(n)]
+
+
+def _vizinhos_proximos(pontos: List[Tuple[float, float]], i: int, k: int) -> List[int]:
+    # Aproximação plana, suficiente para escolher vizinhos
+    lat, lon = pontos[i]
+    return sorted(
+        (j for j in range(len(pontos)) if j != i),
+        key=lambda j: (pontos[j][0] - lat) ** 2 + (pontos[j][1] - lon) ** 2
+    )[:k]
+
+
+def grafo_hubs(n: int, semente: int) -> Grafo:
+    """Rede hub-and-spoke: hubs quase completos entre si, regionais em 2-3 hubs"""
+    aleatorio = random.Random(semente)
+    pontos = _pontos(n, aleatorio)
+    hubs = list(range(max(2, n // 25)))
+    grafo = Grafo()
+    id_rota = 0
+    pares = set()
+    for i in hubs:
+        for j in hubs:
+            if i < j and aleatorio.random() < 0.6:
+                pares.add((i, j))
+    for i in range(len(hubs), n):
+        for h in aleatorio.sample(hubs, min(3, len(hubs))):
+            pares.add((h, i))
+        for j in _vizinhos_proximos(pontos, i, 2):
+            pares.add((min(i, j), max(i, j)))
+    for i, j in sorted(pares):
+        id_rota += 1
+        _adicionar_rota(grafo, id_rota, f"A{i}", f"A{j}", _distancia_km(pontos[i], pontos[j]), aleatorio)
+    return grafo
+
+
+def grafo_regional(n: int, semente: int) -> Grafo:
+    """Malha esparsa: cada aeroporto ligado aos 4 vizinhos mais próximos"""
+    aleatorio = random.Random(semente)
+    pontos = _pontos(n, aleatorio)
+    grafo = Grafo()
+    pares = set()
+    for i in range(n):
+        for j in _vizinhos_proximos(pontos, i, 4):
+            pares.add((min(i, j), max(i, j)))
+    for id_rota, (i, j) in enumerate(sorted(pares), start=1):
+        _adicionar_rota(grafo, id_rota, f"A{i}", f"A{j}", _distancia_km(pontos[i], pontos[j]), aleatorio)
+    return grafo
+
+
+def grafo_banco(caminho: str) -> Grafo:
+    """Grafo das rotas ativas de um banco (usa a configuração da aplicação)"""
+    os.environ["DATABASE_PATH"] = caminho
+    from app.services.grafo_service import GrafoService
+    return GrafoService.construir_grafo()[0]
+
+
+def _medir(buscar: Callable[[str], object], origens: List, repeticoes: int) -> float:
+    """Menor tempo médio por busca (ms) entre as repetições"""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for origem in origens:
+            buscar(origem)
+        melhor = min(melhor, (time.perf_counter() - inicio) / len(origens))
+    return melhor * 1000
+
+
+def comparar(nome: str, grafo: Grafo, total_origens: int, repeticoes: int, semente: int) -> None:
+    """Mede cada fila nos dois motores e confere que as distâncias coincidem"""
+    compacto = GrafoCompacto.de_grafo(grafo)
+    aleatorio = random.Random(semente)
+    vertices = sorted(grafo.vertices())
+    origens = aleatorio.sample(vertices, min(total_origens, len(vertices)))
+    indices = [compacto.indice[v] for v in origens]
+    print(f"\n{nome}: {len(vertices)} vértices, {grafo.total_arcos()} arcos")
+    
+    for metrica in METRICAS_MEDIDAS:
+        referencia = Dijkstra.executar(grafo, origens[0], metrica).distancia
+        tempos: Dict[Tuple[str, str], float] = {}
+        for fila in FILAS:
+            resultado = Dijkstra.executar(grafo, origens[0], metrica, fila).distancia
+            if resultado != referencia:
+                raise AssertionError(f"Fila '{fila}' divergiu em {nome}/{metrica}")
+            tempos[("dijkstra", fila)] = _medir(
+                lambda o: Dijkstra.executar(grafo, o, metrica, fila), origens, repeticoes
+            )
+            tempos[("compacto", fila)] = _medir(
+                lambda i: compacto.dijkstra(i, None, metrica, fila=fila), indices, repeticoes
+            )
+        
+        for motor in ("dijkstra", "compacto"):
+            base = tempos[(motor, "binaria")]
+            colunas = "  ".join(
+                f"{fila} {tempos[(motor, fila)]:7.2f} ms ({base / tempos[(motor, fila)]:.2f}x)" for fila in FILAS
+            )
+            vencedora = min(FILAS, key=lambda fila: tempos[(motor, fila)])
+            print(f"  {metrica:9} {motor:8}  {colunas}  -> {vencedora}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark das filas de prioridade do Dijkstra")
+    parser.add_argument("--vertices", type=int, default=2000, help="Vértices dos grafos sintéticos")
+    parser.add_argument("--origens", type=int, default=10, help="Buscas completas por medição")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições (vale a melhor)")
+    parser.add_argument("--semente", type=int, default=1)
+    parser.add_argument("--banco", help="Banco SQLite cujo grafo também é medido")
+    args = parser.parse_args()
+    
+    formatos = [
+        ("hubs", lambda: grafo_hubs(args.vertices, args.semente)),
+        ("regional", lambda: grafo_regional(args.vertices, args.semente))
+    ]
+    if args.banco:
+        formatos.append((f"banco {args.banco}", lambda: grafo_banco(args.banco)))
+    
+    for nome, construir in formatos:
+        comparar(nome, construir(), args.origens, args.repeticoes, args.semente)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Configuração do Gunicorn para produção: vários workers Uvicorn com a
+aplicação pré-carregada no processo mestre (preload-then-fork).
+
+O mestre aplica as migrações e carrega o grafo uma única vez (do snapshot
+em disco, se atual); os workers
+herdam essa memória por copy-on-write e se mantêm atualizados pelo log de
+alterações (ver app/services/sincronizacao.py).
+
+Uso: gunicorn -c gunicorn.conf.py app.main:app
+"""
+
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+
+
+def when_ready(server):
+    """Executado no mestre após carregar a aplicação e antes do fork"""
+    from app.services.grafo_service import GrafoService
+    
+    GrafoService.obter_grafo()
+    # Objetos já criados vão para a geração permanente: o GC dos workers não
+    # os percorre nem altera seus contadores, preservando as páginas compartilhadas
+    gc.freeze()
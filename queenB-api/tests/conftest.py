@@ -0,0 +1,103 @@
+"""
+Configuração comum dos testes.
+
+Os testes dos algoritmos comparam cada motor com uma referência simples
+(Dijkstra sobre o Grafo ou força bruta) em grafos aleatórios pequenos; os
+de serviço usam a API sobre um banco SQLite temporário.
+
+Uso (a partir de queenB-api/):
+    python -m pytest -q
+"""
+
+import itertools
+import os
+import random
+import string
+import sys
+import tempfile
+from typing import Callable, Dict
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# As configurações são lidas no primeiro import de app.config: o banco
+# temporário precisa estar definido antes dele
+_diretorio_banco = tempfile.TemporaryDirectory(prefix="queenb-testes-")
+os.environ["DATABASE_PATH"] = os.path.join(_diretorio_banco.name, "aeroportos.db")
+os.environ.setdefault("JWT_SECRET_KEY", "testes")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.algoritmos.grafo import Grafo  # noqa: E402
+
+
+@pytest.fixture
+def grafo_aleatorio() -> Callable[..., Grafo]:
+    """
+    Fábrica de grafos aleatórios com rotas identificadas (id_rota 1..n).
+    
+    Os pesos são inteiros em todas as métricas (combustível inclusive),
+    para que somas em ordens diferentes deem exatamente o mesmo custo.
+    """
+    def gerar(
+        semente: int,
+        vertices: int = 12,
+        arestas: int = 24,
+        bidirecional: float = 0.5,
+        peso_max: int = 20
+    ) -> Grafo:
+        aleatorio = random.Random(semente)
+        nomes = [f"A{i:02d}" for i in range(vertices)]
+        grafo = Grafo()
+        for nome in nomes:
+            grafo.adicionar_vertice(nome)
+        for id_rota in range(1, arestas + 1):
+            origem, destino = aleatorio.sample(nomes, 2)
+            grafo.adicionar_aresta(
+                origem=origem,
+                destino=destino,
+                peso=aleatorio.randint(1, peso_max),
+                tempo=aleatorio.randint(1, peso_max),
+                bidirecional=aleatorio.random() < bidirecional,
+                id_rota=id_rota,
+                combustivel=float(aleatorio.randint(1, peso_max))
+            )
+        return grafo
+    
+    return gerar
+
+
+# Códigos IATA distintos entre os testes, que compartilham o banco
+_codigos = ("".join(letras) for letras in itertools.product(string.ascii_uppercase, repeat=3))
+
+
+@pytest.fixture(scope="session")
+def api():
+    """Cliente da API sobre o banco temporário, autenticado"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    
+    cliente = TestClient(app)
+    resposta = cliente.post(
+        "/usuarios/cadastro",
+        json={"nome": "Testes", "email": "testes@queenb.dev", "senha": "123456"}
+    )
+    cliente.headers["Authorization"] = f"Bearer {resposta.json()['access_token']}"
+    return cliente
+
+
+@pytest.fixture
+def aeroportos(api) -> Callable[[int], Dict[str, int]]:
+    """Fábrica de aeroportos ativos com códigos novos; retorna código -> ID"""
+    def criar(quantidade: int) -> Dict[str, int]:
+        ids = {}
+        for _ in range(quantidade):
+            codigo = next(_codigos)
+            resposta = api.post("/aeroportos", json={"codigo_iata": codigo, "nome": f"Aeroporto {codigo}"})
+            assert resposta.status_code == 201, resposta.text
+            ids[codigo] = resposta.json()["id_aeroporto"]
+        return ids
+    
+    return criar
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Busca ALT (A* com landmarks) contra Dijkstra sobre o Grafo.
+"""
+
+import pytest
+
+from app.algoritmos.alt import BuscaALT, Landmarks
+from app.algoritmos.dijkstra import Dijkstra
+from app.algoritmos.grafo_compacto import GrafoCompacto
+
+
+@pytest.mark.parametrize("selecao", ["distante", "evitar"])
+@pytest.mark.parametrize("quantidade", [1, 3, 6])
+@pytest.mark.parametrize("semente", range(6))
+def test_alt_equivale_a_dijkstra(grafo_aleatorio, semente, quantidade, selecao):
+    # Poucos arcos e muitos de mão única: há pares sem caminho
+    grafo = grafo_aleatorio(semente, vertices=14, arestas=22, bidirecional=0.3)
+    compacto = GrafoCompacto.de_grafo(grafo)
+    landmarks = Landmarks.preprocessar(compacto, quantidade, selecao=selecao, semente=semente)
+    assert 1 <= landmarks.quantidade <= quantidade
+    
+    for origem in compacto.codigos:
+        referencia = Dijkstra.executar(grafo, origem)
+        for destino in compacto.codigos:
+            esperado = referencia.distancia[destino]
+            for indice in (None, landmarks):
+                resultado, _ = BuscaALT.buscar(
+                    compacto, compacto.indice[origem], compacto.indice[destino], indice, ativos=2
+                )
+                if esperado == float('inf'):
+                    assert resultado.caminho is None, (origem, destino)
+                    continue
+                assert resultado.distancia == esperado, (origem, destino)
+                caminho = resultado.caminho
+                assert caminho[0] == compacto.indice[origem] and caminho[-1] == compacto.indice[destino]
+                assert compacto.totais(caminho)[0] == esperado
+
+
+def test_landmarks_reduzem_busca(grafo_aleatorio):
+    grafo = grafo_aleatorio(3, vertices=30, arestas=80, bidirecional=1.0)
+    compacto = GrafoCompacto.de_grafo(grafo)
+    landmarks = Landmarks.preprocessar(compacto, 4)
+    sem = com = 0
+    for origem in range(compacto.total_vertices):
+        for destino in range(compacto.total_vertices):
+            sem += BuscaALT.buscar(compacto, origem, destino)[0].visitados
+            com += BuscaALT.buscar(compacto, origem, destino, landmarks)[0].visitados
+    assert com <= sem
+
+
+def test_selecao_desconhecida(grafo_aleatorio):
+    compacto = GrafoCompacto.de_grafo(grafo_aleatorio(0))
+    with pytest.raises(ValueError):
+        Landmarks.preprocessar(compacto, 2, selecao="aleatoria")
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Chave do cache L2 de caminhos intercalando escritas com consultas.
+
+A chave é a versão do log de alterações: um resultado só pode ser lido ou
+gravado sob a versão cujo grafo o produziu.
+"""
+
+import sqlite3
+
+import pytest
+
+from app.algoritmos.dijkstra import Dijkstra
+from app.config import settings
+from app.database import execute_query
+from app.services.cache_caminhos import cache_caminhos
+from app.services.grafo_service import GrafoService
+from app.services.sincronizacao import sincronizador
+
+
+def buscar(origem, destino):
+    """Busca no grafo atual, no formato guardado pelo cache"""
+    grafo, _ = GrafoService.obter_grafo()
+    return [origem, destino], Dijkstra.executar(grafo, origem).distancia[destino], 0
+
+
+def consultar(origem, destino, durante=None):
+    """Distância pelo cache L2; `durante` roda no meio do cálculo"""
+    def calcular():
+        if durante is not None:
+            durante()
+        return buscar(origem, destino)
+    return GrafoService._buscar_com_cache("teste", origem, destino, calcular)[1]
+
+
+def guardada(versao_log, origem, destino):
+    """Distância guardada no cache sob a versão (None se ausente)"""
+    encontrado, resultado = cache_caminhos.consultar(versao_log, "teste", origem, destino)
+    return resultado[1] if encontrado else None
+
+
+def escrever_distancia(id_rota, distancia_km):
+    """Escrita externa (outro processo): só o log a leva ao grafo"""
+    conexao = sqlite3.connect(settings.database_url)
+    with conexao:
+        conexao.execute("UPDATE rota SET distancia_km = ? WHERE id_rota = ?", (distancia_km, id_rota))
+    conexao.close()
+
+
+@pytest.fixture
+def rede(api, aeroportos):
+    """Rotas A-B e B-C de 100 km, no grafo e com o log registrado"""
+    ids = aeroportos(3)
+    a, b, c = ids
+    rotas = []
+    for origem, destino in ((a, b), (b, c)):
+        resposta = api.post("/rotas", json={
+            "id_aeroporto_origem": ids[origem],
+            "id_aeroporto_destino": ids[destino],
+            "distancia_km": 100
+        })
+        rotas.append(resposta.json()["id_rota"])
+    sincronizador.sincronizar()
+    GrafoService.obter_grafo()
+    assert cache_caminhos.ativo and not GrafoService._log_pendente
+    return a, c, rotas[0]
+
+
+def test_consulta_entre_aplicacao_e_registro(rede):
+    a, c, rota = rede
+    versao_log = GrafoService._versao_log
+    assert consultar(a, c) == 200
+    assert guardada(versao_log, a, c) == 200
+    
+    # Como em sincronizar: o grafo muda antes de registrar_versao_log
+    escrever_distancia(rota, 10)
+    estado = execute_query("SELECT * FROM rota WHERE id_rota = ?", (rota,))[0]
+    GrafoService.aplicar_alteracao("rota", rota, estado)
+    assert GrafoService._versao_log == versao_log and GrafoService._log_pendente
+    
+    # Nem lê o caminho antigo nem grava o novo sob a versão antiga
+    assert consultar(a, c) == 110
+    assert guardada(versao_log, a, c) == 200
+    
+    sincronizador.sincronizar()
+    assert GrafoService._versao_log > versao_log and not GrafoService._log_pendente
+    assert consultar(a, c) == 110
+    assert guardada(GrafoService._versao_log, a, c) == 110
+
+
+def test_escrita_durante_o_calculo(rede):
+    a, c, rota = rede
+    versao_log = GrafoService._versao_log
+    
+    def escrever():
+        escrever_distancia(rota, 20)
+        sincronizador.sincronizar()
+    
+    # Calculado já com o grafo novo: não vale para a versão lida antes
+    assert consultar(a, c, durante=escrever) == 120
+    assert guardada(versao_log, a, c) is None
+    assert consultar(a, c) == 120
+    assert guardada(GrafoService._versao_log, a, c) == 120
+
+
+def test_escrita_durante_a_reconstrucao(rede, monkeypatch):
+    a, c, rota = rede
+    construir = GrafoService.construir_grafo
+    
+    def construir_com_escrita():
+        resultado = construir()
+        escrever_distancia(rota, 30)
+        return resultado
+    
+    monkeypatch.setattr(GrafoService, "construir_grafo", staticmethod(construir_com_escrita))
+    with GrafoService._lock:
+        GrafoService._recarregar(usar_snapshot=False)
+    monkeypatch.undo()
+    
+    # O log avançou durante a construção: o grafo não corresponde a nenhuma versão
+    versao_log = GrafoService._versao_log
+    assert GrafoService._log_pendente
+    assert consultar(a, c) == 200
+    assert guardada(versao_log, a, c) is None
+    
+    sincronizador.sincronizar()
+    assert not GrafoService._log_pendente
+    assert consultar(a, c) == 130
+    assert guardada(GrafoService._versao_log, a, c) == 130
+
+
+def test_versoes_anteriores_descartadas(rede):
+    a, c, rota = rede
+    anterior = GrafoService._versao_log
+    assert consultar(a, c) == 200
+    
+    escrever_distancia(rota, 40)
+    sincronizador.sincronizar()
+    assert consultar(a, c) == 140
+    
+    cache_caminhos.limpar(GrafoService._versao_log)
+    assert guardada(anterior, a, c) is None
+    assert guardada(GrafoService._versao_log, a, c) == 140
@@ -0,0 +1,121 @@
+"""
+Articulações, pontes e grupos (Tarjan) contra remoção e busca de componentes.
+"""
+
+import random
+
+import pytest
+
+from app.algoritmos.criticos import AnaliseCriticos, Tarjan
+
+
+def arestas_aleatorias(semente, n, m):
+    """Arestas (u, v, id_rota) com paralelas, laços e vértices isolados possíveis"""
+    aleatorio = random.Random(semente)
+    arestas = []
+    for id_rota in range(1, m + 1):
+        if arestas and aleatorio.random() < 0.1:
+            u, v, _ = aleatorio.choice(arestas)
+        elif aleatorio.random() < 0.05:
+            u = v = aleatorio.randrange(n)
+        else:
+            u, v = aleatorio.sample(range(n), 2)
+        arestas.append((u, v, id_rota))
+    return arestas
+
+
+def componentes(n, arestas, sem_vertice=None, sem_aresta=None):
+    """Rótulo do componente conexo de cada vértice (None para o vértice removido)"""
+    adjacencia = [[] for _ in range(n)]
+    for e, (u, v, _) in enumerate(arestas):
+        if e == sem_aresta or sem_vertice in (u, v):
+            continue
+        adjacencia[u].append(v)
+        adjacencia[v].append(u)
+    rotulo = [None] * n
+    for raiz in range(n):
+        if raiz == sem_vertice or rotulo[raiz] is not None:
+            continue
+        rotulo[raiz] = raiz
+        pilha = [raiz]
+        while pilha:
+            u = pilha.pop()
+            for w in adjacencia[u]:
+                if rotulo[w] is None:
+                    rotulo[w] = raiz
+                    pilha.append(w)
+    return rotulo
+
+
+def pares_desconectados(antes, depois):
+    """Pares ligados antes e separados depois (ignorando vértices removidos)"""
+    vertices = [v for v in range(len(antes)) if depois[v] is not None]
+    return sum(
+        1
+        for i, u in enumerate(vertices)
+        for w in vertices[i + 1:]
+        if antes[u] == antes[w] and depois[u] != depois[w]
+    )
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_tarjan_equivale_a_remocao(semente):
+    aleatorio = random.Random(semente)
+    n = aleatorio.randint(2, 14)
+    arestas = arestas_aleatorias(semente, n, aleatorio.randint(1, 2 * n))
+    analise = Tarjan.analisar([f"A{i:02d}" for i in range(n)], arestas)
+    antes = componentes(n, arestas)
+    
+    articulacoes = {}
+    for v in range(n):
+        depois = componentes(n, arestas, sem_vertice=v)
+        pares = pares_desconectados(antes, depois)
+        if pares:
+            articulacoes[v] = pares
+        
+        # Grupos do componente de v que continuam ligados sem ele
+        grupos = {}
+        for w in range(n):
+            if w != v and antes[w] == antes[v]:
+                grupos.setdefault(depois[w], set()).add(w)
+        obtidos = analise.grupos_sem(v)
+        assert {frozenset(g) for g in obtidos} == {frozenset(g) for g in grupos.values()}, v
+        assert [len(g) for g in obtidos] == sorted((len(g) for g in obtidos), reverse=True)
+        assert analise.total_grupos(v) == len(grupos)
+        assert sum(1 for _ in AnaliseCriticos.pares_entre(obtidos)) == pares
+    assert analise.articulacoes == articulacoes
+    
+    pontes = {}
+    for e in range(len(arestas)):
+        pares = pares_desconectados(antes, componentes(n, arestas, sem_aresta=e))
+        if pares:
+            pontes[e] = pares
+    assert analise.pontes == pontes
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_componentes_biconexos(semente):
+    aleatorio = random.Random(semente)
+    n = aleatorio.randint(2, 14)
+    arestas = arestas_aleatorias(semente, n, aleatorio.randint(1, 2 * n))
+    analise = Tarjan.analisar([f"A{i:02d}" for i in range(n)], arestas)
+    
+    # Toda aresta (exceto laços) fica dentro de algum componente
+    for u, v, _ in arestas:
+        if u != v:
+            assert any(u in c and v in c for c in analise.componentes)
+    
+    # Vértices em mais de um componente biconexo são exatamente as articulações
+    ocorrencias = {}
+    for componente in analise.componentes:
+        for v in componente:
+            ocorrencias[v] = ocorrencias.get(v, 0) + 1
+    assert {v for v, total in ocorrencias.items() if total > 1} == set(analise.articulacoes)
+
+
+def test_rotas_paralelas_nao_sao_pontes():
+    # Duas rotas entre A00 e A01 (uma em cada sentido) e uma única até A02
+    arestas = [(0, 1, 1), (1, 0, 2), (1, 2, 3)]
+    analise = Tarjan.analisar(["A00", "A01", "A02"], arestas)
+    assert analise.pontes == {2: 2}
+    assert analise.articulacoes == {1: 1}
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Overlay multinível (CRP) contra Dijkstra sobre os arcos do grafo compilado.
+"""
+
+import heapq
+import random
+
+import pytest
+
+from app.algoritmos.crp import BuscaCRP, Customizacao, Overlay, Particao
+from app.algoritmos.grafo import METRICAS
+from app.algoritmos.grafo_compacto import GrafoCompacto
+
+
+def dijkstra(compacto, pesos, origem):
+    """Distâncias a partir da origem com um peso qualquer por arco"""
+    distancia = {origem: 0}
+    fila = [(0, origem)]
+    while fila:
+        dist_u, u = heapq.heappop(fila)
+        if dist_u > distancia[u]:
+            continue
+        for posicao in range(compacto.deslocamentos[u], compacto.deslocamentos[u + 1]):
+            w = compacto.destinos[posicao]
+            nova_dist = dist_u + pesos[posicao]
+            if nova_dist < distancia.get(w, float('inf')):
+                distancia[w] = nova_dist
+                heapq.heappush(fila, (nova_dist, w))
+    return distancia
+
+
+def montar_overlay(grafo, semente, tamanho_maximo=4):
+    """Grafo compilado e overlay com regiões (país, estado) sorteadas"""
+    aleatorio = random.Random(semente)
+    compacto = GrafoCompacto.de_grafo(grafo)
+    regioes = [
+        (aleatorio.choice("XYZ"), aleatorio.choice("ab"))
+        for _ in range(compacto.total_vertices)
+    ]
+    particao = Particao.por_regioes(compacto, regioes, tamanho_maximo)
+    return compacto, Overlay(compacto, particao)
+
+
+def conferir(compacto, customizacao):
+    """Toda consulta tem o custo do Dijkstra e um caminho de arcos encadeados"""
+    pesos = customizacao.pesos
+    for origem in range(compacto.total_vertices):
+        referencia = dijkstra(compacto, pesos, origem)
+        for destino in range(compacto.total_vertices):
+            resultado = BuscaCRP.buscar(customizacao, origem, destino)
+            if destino not in referencia:
+                assert resultado.caminho is None, (origem, destino)
+                continue
+            assert resultado.custo == referencia[destino], (origem, destino)
+            assert resultado.caminho[0] == origem and resultado.caminho[-1] == destino
+            atual = origem
+            for posicao in resultado.arcos:
+                assert compacto.deslocamentos[atual] <= posicao < compacto.deslocamentos[atual + 1]
+                atual = compacto.destinos[posicao]
+            assert sum(pesos[posicao] for posicao in resultado.arcos) == referencia[destino]
+
+
+@pytest.mark.parametrize("metrica", list(METRICAS))
+@pytest.mark.parametrize("semente", range(5))
+def test_busca_equivale_a_dijkstra(grafo_aleatorio, semente, metrica):
+    grafo = grafo_aleatorio(semente, vertices=24, arestas=50, bidirecional=0.6)
+    compacto, overlay = montar_overlay(grafo, semente)
+    assert overlay.niveis >= 2
+    customizacao = Customizacao.calcular(overlay, compacto.coluna(metrica))
+    conferir(compacto, customizacao)
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_customizacao_incremental(grafo_aleatorio, semente):
+    grafo = grafo_aleatorio(semente, vertices=24, arestas=50, bidirecional=0.6)
+    compacto, overlay = montar_overlay(grafo, semente)
+    aleatorio = random.Random(semente)
+    pesos = list(compacto.coluna("distancia"))
+    customizacao = Customizacao.calcular(overlay, pesos)
+    total = customizacao.recalculadas
+    
+    for _ in range(6):
+        pesos = list(pesos)
+        for posicao in aleatorio.sample(range(len(pesos)), 3):
+            pesos[posicao] = aleatorio.randint(1, 40)
+        incremental = Customizacao.calcular(overlay, pesos, customizacao)
+        completa = Customizacao.calcular(overlay, pesos)
+        assert incremental.cliques == completa.cliques
+        assert incremental.recalculadas <= total
+        conferir(compacto, incremental)
+        customizacao = incremental
+    
+    # Pesos iguais: nada a recalcular
+    assert Customizacao.calcular(overlay, pesos, customizacao).recalculadas == 0
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Connection Scan (chegada mais cedo e perfil) contra enumeração de viagens.
+"""
+
+import random
+
+import pytest
+
+from app.algoritmos.csa import Conexao, ConnectionScan, TabelaConexoes
+
+
+def tabela_aleatoria(semente, aeroportos=6, voos=45):
+    aleatorio = random.Random(semente)
+    nomes = [f"A{i:02d}" for i in range(aeroportos)]
+    conexoes = []
+    for id_voo in range(voos):
+        origem, destino = aleatorio.sample(nomes, 2)
+        partida = aleatorio.randrange(0, 600, 5)
+        conexoes.append(Conexao(origem, destino, partida, partida + aleatorio.randrange(30, 180, 5), id_voo))
+    minimos = {nome: aleatorio.choice([0, 15, 30, 60]) for nome in nomes}
+    return nomes, TabelaConexoes(conexoes, minimos, conexao_minima_padrao=30)
+
+
+def viagens(tabela, origem, destino, inicio, limite=None):
+    """
+    Todas as viagens sem aeroportos repetidos de origem a destino que partem
+    em `inicio` ou depois, respeitando o tempo mínimo de conexão.
+    """
+    encontradas = []
+    
+    def estender(aeroporto, pronto, visitados, viagem):
+        for c in tabela.conexoes:
+            if c.origem != aeroporto or c.partida < pronto or c.destino in visitados:
+                continue
+            if limite is not None and c.partida > limite:
+                continue
+            if c.destino == destino:
+                encontradas.append(viagem + [c])
+            else:
+                estender(c.destino, c.chegada + tabela.minimo_conexao(c.destino), visitados | {c.destino}, viagem + [c])
+    
+    estender(origem, inicio, {origem}, [])
+    return encontradas
+
+
+def conferir_viagem(tabela, viagem, origem, destino):
+    """Encadeamento e tempos mínimos de conexão de uma viagem"""
+    assert viagem[0].origem == origem and viagem[-1].destino == destino
+    for anterior, seguinte in zip(viagem, viagem[1:]):
+        assert anterior.destino == seguinte.origem
+        assert seguinte.partida >= anterior.chegada + tabela.minimo_conexao(anterior.destino)
+
+
+def pareto(pares):
+    """Pares (partida, chegada) não dominados por outro de partida >= e chegada <="""
+    pares = set(pares)
+    return {
+        (p, c) for p, c in pares
+        if not any(p2 >= p and c2 <= c and (p2, c2) != (p, c) for p2, c2 in pares)
+    }
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_chegada_mais_cedo(semente):
+    nomes, tabela = tabela_aleatoria(semente)
+    aleatorio = random.Random(semente)
+    for _ in range(15):
+        origem, destino = aleatorio.sample(nomes, 2)
+        partida = aleatorio.randrange(0, 400, 5)
+        limite = aleatorio.choice([None, partida + 240])
+        
+        candidatas = viagens(tabela, origem, destino, partida, limite)
+        viagem = ConnectionScan.chegada_mais_cedo(tabela, origem, destino, partida, limite)
+        
+        if not candidatas:
+            assert viagem is None
+            continue
+        assert viagem is not None
+        conferir_viagem(tabela, viagem, origem, destino)
+        assert viagem[0].partida >= partida
+        assert limite is None or all(c.partida <= limite for c in viagem)
+        assert viagem[-1].chegada == min(v[-1].chegada for v in candidatas)
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_perfil_pareto(semente):
+    nomes, tabela = tabela_aleatoria(semente)
+    aleatorio = random.Random(semente)
+    for _ in range(15):
+        origem, destino = aleatorio.sample(nomes, 2)
+        inicio = aleatorio.randrange(0, 300, 5)
+        fim = inicio + aleatorio.randrange(0, 300, 5)
+        limite = aleatorio.choice([None, fim + 120])
+        
+        candidatas = [
+            v for v in viagens(tabela, origem, destino, inicio, limite)
+            if v[0].partida <= fim
+        ]
+        perfil = ConnectionScan.perfil(tabela, origem, destino, inicio, fim, limite)
+        
+        for viagem in perfil:
+            conferir_viagem(tabela, viagem, origem, destino)
+            assert inicio <= viagem[0].partida <= fim
+        partidas = [v[0].partida for v in perfil]
+        assert partidas == sorted(partidas)
+        assert {(v[0].partida, v[-1].chegada) for v in perfil} == pareto(
+            (v[0].partida, v[-1].chegada) for v in candidatas
+        )
+        assert len(perfil) == len(pareto((v[0].partida, v[-1].chegada) for v in candidatas))
+
+
+def test_mesmo_aeroporto():
+    _, tabela = tabela_aleatoria(0)
+    assert ConnectionScan.chegada_mais_cedo(tabela, "A00", "A00", 0) == []
+    assert ConnectionScan.perfil(tabela, "A00", "A00", 0, 600) == []
\ No newline at end of file
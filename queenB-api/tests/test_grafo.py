@@ -0,0 +1,122 @@
+"""
+Atualizações incrementais do Grafo contra a reconstrução a partir das rotas.
+"""
+
+import random
+
+import pytest
+
+from app.algoritmos.grafo import Grafo
+
+
+def montar(vertices, rotas, mesclar):
+    """Grafo construído do zero, como em construir_grafo"""
+    grafo = Grafo()
+    for vertice in sorted(vertices):
+        grafo.adicionar_vertice(vertice)
+    for id_rota in sorted(rotas):
+        origem, destino, peso, tempo, combustivel, bidirecional = rotas[id_rota]
+        grafo.adicionar_aresta(origem, destino, peso, tempo, bidirecional, id_rota, combustivel)
+    if mesclar:
+        grafo.mesclar_paralelas()
+    return grafo
+
+
+def estado(grafo):
+    """Arcos, índice de rotas, incidências e predecessores, sem depender da ordem"""
+    def arco(aresta):
+        return aresta.destino, aresta.peso, aresta.tempo, aresta.id_rota, aresta.combustivel
+    
+    return (
+        {v: sorted(arco(a) for a in adjacencia) for v, adjacencia in grafo.adjacencias.items()},
+        {
+            id_rota: (origem, *arco(aresta), bidirecional)
+            for id_rota, origem, aresta, bidirecional in grafo.rotas_registradas()
+        },
+        {v: sorted(grafo.rotas_incidentes(v)) for v in grafo.vertices()},
+        {v: sorted((u, *arco(a)) for u, a in grafo.predecessores(v)) for v in grafo.vertices()}
+    )
+
+
+@pytest.mark.parametrize("mesclar", [False, True])
+@pytest.mark.parametrize("semente", range(10))
+def test_operacoes_equivalem_a_reconstrucao(semente, mesclar):
+    # Poucos vértices e pesos pequenos: muitas rotas paralelas e empates
+    aleatorio = random.Random(semente)
+    nomes = [f"A{i:02d}" for i in range(5)]
+    
+    def sortear_rota():
+        origem, destino = aleatorio.sample(nomes, 2)
+        return (
+            origem, destino, aleatorio.randint(1, 5), aleatorio.randint(0, 5),
+            float(aleatorio.randint(1, 5)), aleatorio.random() < 0.6
+        )
+    
+    vertices = set(nomes)
+    rotas = {id_rota: sortear_rota() for id_rota in range(1, 9)}
+    inativas = {}
+    grafo = montar(vertices, rotas, mesclar)
+    
+    for _ in range(60):
+        operacao = aleatorio.choice(
+            ["adicionar", "reponderar", "mover", "desativar", "reativar", "remover_vertice"]
+        )
+        if operacao == "adicionar":
+            id_rota = max([*rotas, *inativas]) + 1
+            rotas[id_rota] = sortear_rota()
+            origem, destino, peso, tempo, combustivel, bidirecional = rotas[id_rota]
+            grafo.adicionar_aresta(origem, destino, peso, tempo, bidirecional, id_rota, combustivel)
+        elif operacao == "reponderar" and rotas:
+            id_rota = aleatorio.choice(sorted(rotas))
+            peso, tempo, combustivel = aleatorio.randint(1, 5), aleatorio.randint(0, 5), float(aleatorio.randint(1, 5))
+            rotas[id_rota] = (*rotas[id_rota][:2], peso, tempo, combustivel, rotas[id_rota][5])
+            assert grafo.reponderar_aresta(id_rota, peso, tempo, combustivel)
+        elif operacao == "mover" and rotas:
+            # Mesmo ID com outros extremos: a aresta antiga é substituída
+            id_rota = aleatorio.choice(sorted(rotas))
+            rotas[id_rota] = sortear_rota()
+            origem, destino, peso, tempo, combustivel, bidirecional = rotas[id_rota]
+            grafo.adicionar_aresta(origem, destino, peso, tempo, bidirecional, id_rota, combustivel)
+        elif operacao == "desativar" and rotas:
+            id_rota = aleatorio.choice(sorted(rotas))
+            inativas[id_rota] = rotas.pop(id_rota)
+            assert grafo.remover_aresta(id_rota)
+            assert not grafo.remover_aresta(id_rota)
+        elif operacao == "reativar" and inativas:
+            id_rota = aleatorio.choice(sorted(inativas))
+            rotas[id_rota] = inativas.pop(id_rota)
+            origem, destino, peso, tempo, combustivel, bidirecional = rotas[id_rota]
+            grafo.adicionar_aresta(origem, destino, peso, tempo, bidirecional, id_rota, combustivel)
+        elif operacao == "remover_vertice":
+            vertice = aleatorio.choice(nomes)
+            for id_rota in [i for i, rota in rotas.items() if vertice in rota[:2]]:
+                inativas[id_rota] = rotas.pop(id_rota)
+            grafo.remover_vertice(vertice)
+            vertices.discard(vertice)
+            assert not grafo.tem_vertice(vertice)
+        
+        vertices |= {v for rota in rotas.values() for v in rota[:2]}
+        assert estado(grafo) == estado(montar(vertices, rotas, mesclar)), operacao
+        assert not mesclar or grafo.arcos_sem_mesclar() == montar(vertices, rotas, False).total_arcos()
+
+
+def test_remover_vertice_com_paralelas_mescladas():
+    # A00-A01 em três rotas, a terceira dominada pelas outras; A01-A02 em uma
+    grafo = Grafo()
+    grafo.adicionar_aresta("A00", "A01", 10, 5, True, 1, 3.0)
+    grafo.adicionar_aresta("A01", "A00", 4, 9, True, 2, 3.0)
+    grafo.adicionar_aresta("A00", "A01", 12, 12, True, 3, 3.0)
+    grafo.adicionar_aresta("A01", "A02", 7, 7, True, 4, 7.0)
+    assert grafo.mesclar_paralelas() == (8, 6)
+    
+    grafo.remover_vertice("A00")
+    assert not grafo.tem_vertice("A00")
+    assert grafo.total_arcos() == 2
+    assert grafo.total_arestas() == 1 and grafo.rotas_incidentes("A01") == [4]
+    assert [a.id_rota for a in grafo.vizinhos("A01")] == [4]
+    assert [u for u, _ in grafo.predecessores("A01")] == ["A02"]
+    
+    # Reativadas, as rotas voltam mescladas
+    grafo.adicionar_aresta("A00", "A01", 10, 5, True, 1, 3.0)
+    grafo.adicionar_aresta("A01", "A00", 4, 9, True, 2, 3.0)
+    assert sorted(a.id_rota for a in grafo.vizinhos("A00")) == [1, 2]
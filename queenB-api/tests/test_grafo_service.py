@@ -0,0 +1,223 @@
+"""
+Grafo em memória e exportações após escritas, contra a reconstrução do SQLite.
+
+As escritas passam pela API (aplicadas incrementalmente por este processo)
+ou direto pelo banco (como as de outro processo, aplicadas pelo log).
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from app.config import settings
+from app.database import execute_query
+from app.services.grafo_service import GrafoService
+from app.services.sincronizacao import sincronizador
+
+
+def rotas_do_grafo(grafo, estimadas):
+    """id_rota -> (origem, destino, distância, tempo, bidirecional, combustível cadastrado)"""
+    return {
+        id_rota: (
+            origem, aresta.destino, aresta.peso, aresta.tempo, bidirecional,
+            None if id_rota in estimadas else aresta.combustivel
+        )
+        for id_rota, origem, aresta, bidirecional in grafo.rotas_registradas()
+    }
+
+
+def arcos(grafo):
+    """Arcos de cada vértice que tem algum, sem depender da ordem"""
+    return {
+        vertice: sorted((a.destino, a.peso, a.tempo, a.id_rota) for a in adjacencia)
+        for vertice, adjacencia in grafo.adjacencias.items()
+        if adjacencia
+    }
+
+
+def exportacao_json(api):
+    """(códigos dos vértices, arestas por ID) de /dados/grafo"""
+    grafo = api.get("/dados/grafo").json()["grafo"]
+    return (
+        {v["codigo_iata"] for v in grafo["vertices"]},
+        {
+            e["id"]: (e["origem"], e["destino"], e["distancia_km"], e["tempo_estimado_min"], e["combustivel_litros"])
+            for e in grafo["arestas"]
+        }
+    )
+
+
+def exportacao_colunar(api):
+    """Mesmo formato de exportacao_json, a partir das colunas"""
+    grafo = api.get("/dados/grafo", params={"formato": "colunar"}).json()["grafo"]
+    codigos = grafo["vertices"]["codigo_iata"]
+    colunas = grafo["arestas"]
+    return (
+        set(codigos),
+        {
+            id_rota: (codigos[origem], codigos[destino], distancia, tempo, combustivel)
+            for id_rota, origem, destino, distancia, tempo, combustivel in zip(
+                colunas["id"], colunas["origem"], colunas["destino"], colunas["distancia_km"],
+                colunas["tempo_estimado_min"], colunas["combustivel_litros"]
+            )
+        }
+    )
+
+
+def arestas_do_banco():
+    """Rotas ativas entre aeroportos ativos, lidas do SQLite"""
+    rotas = execute_query("""
+        SELECT r.*, ao.codigo_iata AS origem, ad.codigo_iata AS destino
+        FROM rota r
+        INNER JOIN aeroporto ao ON r.id_aeroporto_origem = ao.id_aeroporto
+        INNER JOIN aeroporto ad ON r.id_aeroporto_destino = ad.id_aeroporto
+        WHERE r.ativo = 1 AND ao.ativo = 1 AND ad.ativo = 1
+    """)
+    return {
+        r["id_rota"]: (r["origem"], r["destino"], r["distancia_km"], r["tempo_estimado_min"], r["combustivel_litros"])
+        for r in rotas
+    }
+
+
+def conferir_com_banco(api):
+    """Grafo em memória e exportações iguais ao que se obtém do banco"""
+    vertices, arestas = exportacao_json(api)
+    sincronizador.sincronizar()
+    grafo, aeroportos_map = GrafoService.obter_grafo()
+    reconstruido, mapa_banco = GrafoService.construir_grafo()
+    
+    assert rotas_do_grafo(grafo, GrafoService._combustivel_estimado) == \
+        rotas_do_grafo(reconstruido, GrafoService._rotas_sem_combustivel())
+    assert arcos(grafo) == arcos(reconstruido)
+    assert all(aeroportos_map[c] == mapa_banco[c] for c in reconstruido.vertices())
+    assert GrafoService._assinatura_grafo(grafo, aeroportos_map) == \
+        GrafoService._assinatura_banco(GrafoService._consumo_medio)
+    
+    assert arestas == arestas_do_banco()
+    assert vertices == {codigo for aresta in arestas.values() for codigo in aresta[:2]}
+    assert exportacao_colunar(api) == (vertices, arestas)
+
+
+def escrever(api, ids, semente):
+    """
+    Escritas aleatórias de rotas e aeroportos; gera o nome de cada uma
+    depois de feita.
+    
+    Poucos aeroportos: rotas nos dois sentidos do mesmo par são paralelas.
+    """
+    aleatorio = random.Random(semente)
+    codigos = list(ids)
+    rotas = []
+    
+    def sortear_par():
+        origem, destino = aleatorio.sample(codigos, 2)
+        return {"id_aeroporto_origem": ids[origem], "id_aeroporto_destino": ids[destino]}
+    
+    def sortear_pesos():
+        pesos = {"distancia_km": aleatorio.randint(1, 20)}
+        if aleatorio.random() < 0.7:
+            pesos["tempo_estimado_min"] = aleatorio.randint(1, 20)
+        if aleatorio.random() < 0.7:
+            pesos["combustivel_litros"] = float(aleatorio.randint(1, 20))
+        return pesos
+    
+    # Começa povoando a rede; depois as operações vêm em ordem aleatória
+    operacoes = [
+        "criar", "reponderar", "reponderar", "mover", "desativar_rota", "reativar_rota",
+        "desativar_aeroporto", "reativar_aeroporto", "reativar_aeroporto", "externa"
+    ] * 6
+    aleatorio.shuffle(operacoes)
+    for operacao in ["criar"] * 12 + operacoes:
+        if operacao == "criar":
+            resposta = api.post("/rotas", json={**sortear_par(), **sortear_pesos()})
+            # Par já cadastrado ou aeroporto inativo
+            assert resposta.status_code in (201, 400, 404), resposta.text
+            if resposta.status_code == 201:
+                rotas.append(resposta.json()["id_rota"])
+        elif operacao == "reponderar":
+            resposta = api.put(f"/rotas/{aleatorio.choice(rotas)}", json=sortear_pesos())
+            assert resposta.status_code == 200, resposta.text
+        elif operacao == "mover":
+            resposta = api.put(f"/rotas/{aleatorio.choice(rotas)}", json=sortear_par())
+            assert resposta.status_code in (200, 400, 404), resposta.text
+        elif operacao == "desativar_rota":
+            assert api.delete(f"/rotas/{aleatorio.choice(rotas)}").status_code == 200
+        elif operacao == "reativar_rota":
+            assert api.put(f"/rotas/{aleatorio.choice(rotas)}", json={"ativo": 1}).status_code == 200
+        elif operacao == "desativar_aeroporto":
+            assert api.delete(f"/aeroportos/{ids[aleatorio.choice(codigos)]}").status_code == 200
+        elif operacao == "reativar_aeroporto":
+            assert api.put(f"/aeroportos/{ids[aleatorio.choice(codigos)]}", json={"ativo": 1}).status_code == 200
+        else:
+            # Outro processo: o grafo só a vê pelo log de alterações
+            conexao = sqlite3.connect(settings.database_url)
+            with conexao:
+                conexao.execute(
+                    "UPDATE rota SET distancia_km = ?, combustivel_litros = NULL WHERE id_rota = ?",
+                    (aleatorio.randint(1, 20), aleatorio.choice(rotas))
+                )
+            conexao.close()
+        
+        yield operacao
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_escritas_equivalem_a_reconstrucao(api, aeroportos, semente):
+    for _ in escrever(api, aeroportos(6), semente):
+        conferir_com_banco(api)
+
+
+class Espelho:
+    """Cópia do grafo de um cliente, mantida por /dados/grafo/delta"""
+    
+    def __init__(self, api, desde=None):
+        self.api = api
+        self.vertices = {}
+        self.arestas = {}
+        self.versao = 0
+        if desde is None:
+            exportacao = api.get("/dados/grafo").json()
+            self.vertices = {v["id"]: v["codigo_iata"] for v in exportacao["grafo"]["vertices"]}
+            self.arestas = {
+                e["id"]: (e["origem"], e["destino"], e["distancia_km"], e["tempo_estimado_min"], e["combustivel_litros"])
+                for e in exportacao["grafo"]["arestas"]
+            }
+            self.versao = exportacao["versao"]
+        self.atualizar()
+    
+    def atualizar(self):
+        delta = self.api.get("/dados/grafo/delta", params={"desde": self.versao}).json()
+        assert not delta["resincronizar"]
+        for id_aeroporto in delta["vertices_removidos"]:
+            self.vertices.pop(id_aeroporto, None)
+        for id_rota in delta["arestas_removidas"]:
+            self.arestas.pop(id_rota, None)
+        for v in delta["vertices"]:
+            self.vertices[v["id"]] = v["codigo_iata"]
+        for e in delta["arestas"]:
+            self.arestas[e["id"]] = (
+                e["origem"], e["destino"], e["distancia_km"], e["tempo_estimado_min"], e["combustivel_litros"]
+            )
+        self.versao = delta["versao"]
+    
+    def conferir(self):
+        """Mesmas arestas do banco, com as extremidades e só aeroportos ativos"""
+        assert self.arestas == arestas_do_banco()
+        codigos = set(self.vertices.values())
+        assert {codigo for aresta in self.arestas.values() for codigo in aresta[:2]} <= codigos
+        ativos = execute_query("SELECT codigo_iata FROM aeroporto WHERE ativo = 1")
+        assert codigos <= {a["codigo_iata"] for a in ativos}
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_delta_equivale_ao_banco(api, aeroportos, semente):
+    espelho = Espelho(api)
+    for _ in escrever(api, aeroportos(6), semente + 10):
+        espelho.atualizar()
+        espelho.conferir()
+    
+    # Um cliente novo, só pelo log, chega ao mesmo estado
+    do_inicio = Espelho(api, desde=0)
+    do_inicio.conferir()
+    assert do_inicio.arestas == espelho.arestas
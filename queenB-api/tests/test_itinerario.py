@@ -0,0 +1,95 @@
+"""
+Ordem de visitas (Held-Karp e heurísticas) contra força bruta sobre as permutações.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from app.algoritmos.itinerario import OrdemVisitas
+
+INFINITO = float("inf")
+
+
+def matriz_aleatoria(semente, n, sem_caminho=0.0):
+    """Custos inteiros assimétricos; uma fração dos pares fica sem caminho"""
+    aleatorio = random.Random(semente)
+    return [
+        [
+            0 if i == j else (INFINITO if aleatorio.random() < sem_caminho else aleatorio.randint(1, 50))
+            for j in range(n)
+        ]
+        for i in range(n)
+    ]
+
+
+def custo(custos, ordem):
+    return sum(custos[a][b] for a, b in zip(ordem, ordem[1:]))
+
+
+def forca_bruta(custos, retornar, fim):
+    """Menor custo entre todas as ordens que começam em 0 (infinito se nenhuma)"""
+    n = len(custos)
+    meios = [v for v in range(1, n) if v != fim or retornar]
+    melhor = INFINITO
+    for permutacao in itertools.permutations(meios):
+        ordem = [0, *permutacao]
+        if retornar:
+            ordem.append(0)
+        elif fim is not None:
+            ordem.append(fim)
+        melhor = min(melhor, custo(custos, ordem))
+    return melhor
+
+
+def modos(n):
+    """(retornar, fim): volta à origem, cada fim fixo e fim livre"""
+    return [(True, None), (False, None)] + [(False, fim) for fim in range(1, n)]
+
+
+def conferir_ordem(custos, resultado, retornar, fim):
+    """A ordem visita cada parada uma vez, no formato pedido, pelo custo informado"""
+    n = len(custos)
+    ordem = resultado.ordem
+    visitas = ordem[:-1] if retornar else ordem
+    assert ordem[0] == 0 and sorted(visitas) == list(range(n))
+    if retornar:
+        assert ordem[-1] == 0
+    elif fim is not None:
+        assert ordem[-1] == fim
+    assert resultado.custo == custo(custos, ordem)
+
+
+@pytest.mark.parametrize("sem_caminho", [0.0, 0.3])
+@pytest.mark.parametrize("n", [2, 3, 5, 7])
+@pytest.mark.parametrize("semente", range(4))
+def test_held_karp_otimo(semente, n, sem_caminho):
+    custos = matriz_aleatoria(semente, n, sem_caminho)
+    for retornar, fim in modos(n):
+        esperado = forca_bruta(custos, retornar, fim)
+        resultado = OrdemVisitas.resolver(custos, retornar=retornar, fim=fim)
+        if esperado == INFINITO:
+            assert resultado is None
+            continue
+        assert resultado.metodo == "held-karp" and resultado.otimo
+        assert resultado.custo == esperado
+        conferir_ordem(custos, resultado, retornar, fim)
+
+
+@pytest.mark.parametrize("n", [4, 6, 8])
+@pytest.mark.parametrize("semente", range(4))
+def test_heuristica_viavel(semente, n):
+    custos = matriz_aleatoria(semente, n)
+    for retornar, fim in modos(n):
+        resultado = OrdemVisitas.resolver(
+            custos, retornar=retornar, fim=fim, exato_max=0, tempo_max_s=0.05, semente=semente
+        )
+        assert resultado.metodo == "heuristica" and not resultado.otimo
+        assert resultado.custo >= forca_bruta(custos, retornar, fim)
+        conferir_ordem(custos, resultado, retornar, fim)
+
+
+def test_parada_unica():
+    assert OrdemVisitas.resolver([[0]]).ordem == [0]
+    assert OrdemVisitas.resolver([[0]], retornar=True).ordem == [0, 0]
\ No newline at end of file
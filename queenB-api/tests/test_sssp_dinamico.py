@@ -0,0 +1,100 @@
+"""
+Reparo incremental de árvores (CaminhosDinamicos) contra Dijkstra do zero.
+"""
+
+import random
+
+import pytest
+
+from app.algoritmos.dijkstra import Dijkstra
+from app.algoritmos.grafo import METRICAS
+from app.algoritmos.sssp_dinamico import CaminhosDinamicos
+
+
+def arcos_da_rota(grafo, id_rota):
+    """Pares (origem, destino) afetados por uma rota, nos dois sentidos se bidirecional"""
+    origem, destino, bidirecional = grafo.extremos(id_rota)
+    return [(origem, destino), (destino, origem)] if bidirecional else [(origem, destino)]
+
+
+def conferir(grafo, arvore, origem):
+    """A árvore reparada tem as distâncias de Dijkstra e caminhos coerentes"""
+    referencia = Dijkstra.executar(grafo, origem, arvore.metrica)
+    for vertice in grafo.vertices():
+        esperado = referencia.distancia[vertice]
+        assert arvore.distancia.get(vertice, float('inf')) == esperado, vertice
+        if esperado == float('inf'):
+            continue
+        caminho = Dijkstra.reconstruir_caminho(arvore.anterior, vertice)
+        assert caminho[0] == origem
+        custo = sum(
+            min(a.custo(arvore.metrica) for a in grafo.vizinhos(u) if a.destino == v)
+            for u, v in zip(caminho, caminho[1:])
+        )
+        assert custo == esperado
+    
+    # Índice de filhos mantido junto com `anterior`
+    if arvore.filhos is not None:
+        indice = {}
+        for vertice, pai in arvore.anterior.items():
+            if pai is not None:
+                indice.setdefault(pai, set()).add(vertice)
+        assert arvore.filhos == indice
+
+
+@pytest.mark.parametrize("metrica", list(METRICAS))
+@pytest.mark.parametrize("semente", range(8))
+def test_reparo_equivale_a_dijkstra(grafo_aleatorio, semente, metrica):
+    grafo = grafo_aleatorio(semente)
+    aleatorio = random.Random(semente)
+    origem = "A00"
+    arvore = Dijkstra.executar(grafo, origem, metrica)
+    proximo_id = 100
+    
+    for _ in range(60):
+        rotas = [id_rota for id_rota, _, _, _ in grafo.rotas_registradas()]
+        operacao = aleatorio.random()
+        if operacao < 0.4 and rotas:
+            id_rota = aleatorio.choice(rotas)
+            grafo.reponderar_aresta(
+                id_rota,
+                aleatorio.randint(1, 20),
+                aleatorio.randint(1, 20),
+                float(aleatorio.randint(1, 20))
+            )
+            arcos = arcos_da_rota(grafo, id_rota)
+        elif operacao < 0.7 and rotas:
+            id_rota = aleatorio.choice(rotas)
+            arcos = arcos_da_rota(grafo, id_rota)
+            grafo.remover_aresta(id_rota)
+        else:
+            # Inserção, às vezes com um vértice novo
+            vertices = sorted(grafo.vertices())
+            origem_rota = aleatorio.choice(vertices)
+            destino_rota = aleatorio.choice([v for v in vertices if v != origem_rota])
+            if aleatorio.random() < 0.15:
+                destino_rota = f"N{proximo_id}"
+            grafo.adicionar_aresta(
+                origem=origem_rota,
+                destino=destino_rota,
+                peso=aleatorio.randint(1, 20),
+                tempo=aleatorio.randint(1, 20),
+                bidirecional=aleatorio.random() < 0.5,
+                id_rota=proximo_id,
+                combustivel=float(aleatorio.randint(1, 20))
+            )
+            arcos = arcos_da_rota(grafo, proximo_id)
+            proximo_id += 1
+        
+        reparada = CaminhosDinamicos.reparar(grafo, arvore, arcos)
+        assert reparada is arvore
+        conferir(grafo, arvore, origem)
+
+
+def test_reparo_sem_alteracoes_nao_muda_arvore(grafo_aleatorio):
+    grafo = grafo_aleatorio(42)
+    arvore = Dijkstra.executar(grafo, "A00")
+    distancias = dict(arvore.distancia)
+    CaminhosDinamicos.reparar(grafo, arvore, [])
+    assert arvore.distancia == distancias
+    conferir(grafo, arvore, "A00")
\ No newline at end of file
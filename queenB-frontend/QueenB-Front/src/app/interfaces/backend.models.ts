@@ -221,4 +221,16 @@ export interface Estatisticas {
     vertices: number;
     arestas: number;
   };
+}
+
+// ========================
+// EVENTS (SSE) MODELS
+// ========================
+
+export interface AlteracaoEvento {
+  entidade: 'aeroporto' | 'rota' | 'resincronizar';
+  id?: number;
+  operacao?: 'criacao' | 'atualizacao' | 'remocao';
+  versao?: number;
+  dados?: AeroportoResposta | RotaResposta | null;
 }
\ No newline at end of file
@@ -1,11 +1,13 @@
 // src/app/pages/aeroportos/aeroportos.component.ts
-import { Component, OnInit, inject } from '@angular/core';
+import { Component, OnInit, OnDestroy, inject } from '@angular/core';
+import { Subscription } from 'rxjs';
 import { CommonModule } from '@angular/common';
 import { Aeroporto } from '../../interfaces/aeroporto.model';
 import { AeroportoResposta, AeroportoCadastro, AeroportoEdicao } from '../../interfaces/backend.models';
 import { NovoAeroportoModalComponent } from '../../components/novo-aeroporto-modal/novo-aeroporto-modal.component';
 import { AeroportoDetailsModalComponent } from '../../components/aeroporto-details-modal/aeroporto-details-modal.component';
 import { AirportService } from '../../services/airport.service';
+import { EventsService } from '../../services/events.service';
 
 @Component({
   selector: 'app-aeroportos',
@@ -14,8 +16,10 @@ import { AirportService } from '../../services/airport.service';
   templateUrl: './aeroportos.component.html',
   styleUrl: './aeroportos.component.css'
 })
-export class AeroportosComponent implements OnInit {
+export class AeroportosComponent implements OnInit, OnDestroy {
   private airportService = inject(AirportService);
+  private eventsService = inject(EventsService);
+  private alteracoesSub?: Subscription;
 
   // Controle dos Modais
   isModalOpen = false;
@@ -31,6 +35,17 @@ export class AeroportosComponent implements OnInit {
 
   ngOnInit(): void {
     this.carregarAeroportos();
+
+    // Recarrega quando outro usuário altera aeroportos (SSE em vez de polling)
+    this.alteracoesSub = this.eventsService.alteracoes$.subscribe(evento => {
+      if (evento.entidade === 'aeroporto' || evento.entidade === 'resincronizar') {
+        this.carregarAeroportos();
+      }
+    });
+  }
+
+  ngOnDestroy(): void {
+    this.alteracoesSub?.unsubscribe();
   }
 
   carregarAeroportos(): void {
@@ -1,5 +1,6 @@
 // src/app/pages/ger-rotas/ger-rotas.component.ts
-import { Component, OnInit, inject } from '@angular/core';
+import { Component, OnInit, OnDestroy, inject } from '@angular/core';
+import { Subscription } from 'rxjs';
 import { CommonModule } from '@angular/common'; 
 import { NovaRotaModalComponent } from '../../components/nova-rota-modal/nova-rota-modal.component';
 import { RotaDetailsModalComponent } from '../../components/rota-details-modal/rota-details-modal.component';
@@ -7,6 +8,7 @@ import { Rota } from '../../interfaces/rota.model';
 import { RotaResposta, RotaCadastro, RotaEdicao } from '../../interfaces/backend.models';
 import { RouteService } from '../../services/route.service';
 import { AirportService } from '../../services/airport.service';
+import { EventsService } from '../../services/events.service';
 
 @Component({
   selector: 'app-ger-rotas',
@@ -15,9 +17,11 @@ import { AirportService } from '../../services/airport.service';
   templateUrl: './ger-rotas.component.html',
   styleUrl: './ger-rotas.component.css'
 })
-export class GerRotasComponent implements OnInit {
+export class GerRotasComponent implements OnInit, OnDestroy {
   private routeService = inject(RouteService);
   private airportService = inject(AirportService);
+  private eventsService = inject(EventsService);
+  private alteracoesSub?: Subscription;
 
   // Lógica do Modal de Edição/Criação
   isModalOpen = false;
@@ -37,6 +41,19 @@ export class GerRotasComponent implements OnInit {
 
   ngOnInit(): void {
     this.carregarAeroportos();
+
+    // Recarrega quando outro usuário altera rotas ou aeroportos (SSE em vez de polling)
+    this.alteracoesSub = this.eventsService.alteracoes$.subscribe(evento => {
+      if (evento.entidade === 'rota') {
+        this.carregarRotas();
+      } else {
+        this.carregarAeroportos();
+      }
+    });
+  }
+
+  ngOnDestroy(): void {
+    this.alteracoesSub?.unsubscribe();
   }
 
   carregarAeroportos(): void {
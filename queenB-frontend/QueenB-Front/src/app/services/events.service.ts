@@ -0,0 +1,34 @@
+// src/app/services/events.service.ts
+import { Injectable, NgZone, inject } from '@angular/core';
+import { Observable, share } from 'rxjs';
+import { environment } from '../../environments/environment';
+import { AlteracaoEvento } from '../interfaces/backend.models';
+
+@Injectable({
+  providedIn: 'root'
+})
+export class EventsService {
+  private zone = inject(NgZone);
+  private apiUrl = environment.apiUrl;
+
+  /**
+   * Alterações de aeroportos e rotas enviadas pelo backend via SSE (/eventos).
+   * Uma única conexão é compartilhada entre todos os inscritos da aba
+   * e fechada quando o último cancela a inscrição.
+   */
+  readonly alteracoes$: Observable<AlteracaoEvento> = new Observable<AlteracaoEvento>(subscriber => {
+    const source = new EventSource(`${this.apiUrl}/eventos`);
+
+    const emitir = (event: MessageEvent) => {
+      this.zone.run(() => subscriber.next(JSON.parse(event.data)));
+    };
+
+    source.addEventListener('aeroporto', emitir);
+    source.addEventListener('rota', emitir);
+    source.addEventListener('resincronizar', () => {
+      this.zone.run(() => subscriber.next({ entidade: 'resincronizar' }));
+    });
+
+    return () => source.close();
+  }).pipe(share());
+}
\ No newline at end of file